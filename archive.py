@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archivage par partitions temporelles : collection chaude + archives froides annuelles
+
+La compaction (python archive.py compact) déplace les articles dont created_at dépasse
+ARCHIVE_AFTER_DAYS de la collection principale (et de sa collection des corps) vers
+`<collection>_archive_<année>` : compression zstd, contenu gardé dans le document, index
+de recherche mais pas d'index texte sur le contenu. La collection chaude ne garde que
+l'historique récent : l'ingestion, ses index et les recherches récentes ne grossissent
+plus avec l'historique.
+
+Le catalogue `<collection>_partitions` liste les années archivées et la borne de la
+collection chaude (tout article plus ancien est archivé) ; MongoDBManager y lit les
+partitions à interroger selon la plage created_at de chaque requête.
+
+Usage : python archive.py compact [--days 365]
+        python archive.py status
+"""
+
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List, Mapping, Optional
+
+# Archives compressées plus fortement que la collection chaude (snappy par défaut)
+ARCHIVE_STORAGE_OPTIONS = {'wiredTiger': {'configString': 'block_compressor=zstd'}}
+HOT_BOUNDARY_ID = 'hot'
+CATALOG_REFRESH_SECONDS = 60
+DEFAULT_ARCHIVE_AFTER_DAYS = 365
+
+
+def archive_after_days() -> int:
+    return int(os.getenv('ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS))
+
+
+def archive_cutoff(older_than_days: Optional[int] = None, now: Optional[datetime] = None) -> datetime:
+    """Borne de compaction : minuit du jour situé older_than_days jours avant maintenant"""
+    days = archive_after_days() if older_than_days is None else older_than_days
+    cutoff = (now or datetime.now()) - timedelta(days=days)
+    return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(collection_name: str, year: int) -> str:
+    return f"{collection_name}_archive_{year}"
+
+
+def catalog_name(collection_name: str) -> str:
+    return f"{collection_name}_partitions"
+
+
+class PartitionCatalog:
+    """Années archivées et borne de la collection chaude, lues depuis les documents du catalogue"""
+
+    def __init__(self, documents: Iterable[Mapping] = ()):
+        self.years: List[int] = []
+        self.hot_since: Optional[datetime] = None
+        for document in documents:
+            if document.get('_id') == HOT_BOUNDARY_ID:
+                self.hot_since = document.get('since')
+            elif 'year' in document:
+                self.years.append(int(document['year']))
+        self.years.sort()
+
+    def years_for(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """
+        Années archivées qui recoupent la plage created_at [start, end] (borne absente : ouverte)
+        Une plage qui commence après la borne chaude n'interroge aucune archive
+        """
+        if start is not None and self.hot_since is not None and start >= self.hot_since:
+            return []
+        return [year for year in self.years
+                if (start is None or year >= start.year) and (end is None or year <= end.year)]
+
+
+def main():
+    from mongodb_manager import MongoDBManager
+
+    parser = argparse.ArgumentParser(description='Archivage des articles anciens (partitions annuelles compressées)')
+    parser.add_argument('action', choices=['compact', 'status'],
+                        help="compact : déplace les articles anciens vers les archives ; status : taille des partitions")
+    parser.add_argument('--days', type=int, default=None,
+                        help=f'Âge (created_at) au-delà duquel un article est archivé (default: ARCHIVE_AFTER_DAYS, '
+                             f'{DEFAULT_ARCHIVE_AFTER_DAYS})')
+    parser.add_argument('--batch-size', type=int, default=500, help='Articles déplacés par lot (default: 500)')
+    args = parser.parse_args()
+
+    try:
+        db_manager = MongoDBManager()
+        if args.action == 'compact':
+            db_manager.compact_archive(args.days, args.batch_size)
+        else:
+            print(f"{'partition':<32} {'articles':>9} {'données':>10} {'index':>10}")
+            for partition in db_manager.archive_status():
+                print(f"{partition['name']:<32} {partition['count']:>9} "
+                      f"{partition['storage_mb']:>8.1f}Mo {partition['index_mb']:>8.1f}Mo")
+        db_manager.close()
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
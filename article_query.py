@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche combinée : catégorie, sous-catégorie, auteur, plage de dates, texte et
+sous-chaîne du titre dans une seule requête, avec tri et pagination
+
+ArticleQuery décrit la recherche indépendamment du backend ; chaque backend la traduit
+(find_articles) : MongoDB en une requête servie par un index composé, SQLite en une
+clause WHERE, l'index local en intersection de postings.
+
+    query = ArticleQuery(category='IA').where(author='Thomas Coëffé').sorted_by('oldest').paginate(2)
+    page = db_manager.find_articles(query)   # {'articles', 'total', 'page', 'per_page', 'pages'}
+"""
+
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+FILTER_FIELDS = ('category', 'subcategory', 'author', 'start_date', 'end_date', 'text', 'title')
+SORTS = ('recent', 'oldest', 'relevance')
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+# Paramètres d'URL (/api/articles) -> champs de la requête
+URL_PARAMETERS = {
+    'category': 'category', 'subcategory': 'subcategory', 'author': 'author',
+    'start': 'start_date', 'end': 'end_date', 'q': 'text', 'title': 'title',
+}
+
+_LABELS = {
+    'category': 'catégorie', 'subcategory': 'sous-catégorie', 'author': 'auteur',
+    'start_date': 'depuis', 'end_date': "jusqu'au", 'text': 'texte', 'title': 'titre',
+}
+
+
+def _parse_day(value: Optional[str], name: str) -> Optional[str]:
+    if not value:
+        return None
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Date invalide pour {name}: '{value}' (format AAAA-MM-JJ)")
+    return value
+
+
+class ArticleQuery:
+    """Recherche combinée immuable : where(), sorted_by() et paginate() retournent une copie"""
+
+    __slots__ = FILTER_FIELDS + ('sort', 'page', 'per_page')
+
+    def __init__(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                 author: Optional[str] = None, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None, text: Optional[str] = None,
+                 title: Optional[str] = None, sort: str = 'recent', page: int = 1,
+                 per_page: int = DEFAULT_PER_PAGE):
+        self.category = (category or '').strip() or None
+        self.subcategory = (subcategory or '').strip() or None
+        self.author = (author or '').strip() or None
+        self.start_date = _parse_day((start_date or '').strip(), 'start_date')
+        self.end_date = _parse_day((end_date or '').strip(), 'end_date')
+        self.text = (text or '').strip() or None
+        self.title = (title or '').strip() or None
+        if sort not in SORTS:
+            raise ValueError(f"Tri inconnu: '{sort}' (choix: {', '.join(SORTS)})")
+        # Sans texte, pas de score de pertinence : les plus récents d'abord
+        self.sort = 'recent' if sort == 'relevance' and not self.text else sort
+        self.page = max(1, int(page))
+        self.per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+
+    # ------------------------------------------------------------------
+    # Composition
+    # ------------------------------------------------------------------
+    def _replace(self, **changes) -> 'ArticleQuery':
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return ArticleQuery(**values)
+
+    def where(self, **filters) -> 'ArticleQuery':
+        """Ajoute ou remplace des filtres (une valeur vide retire le filtre) ; retour à la page 1"""
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Filtre inconnu: {', '.join(sorted(unknown))} (choix: {', '.join(FILTER_FIELDS)})")
+        return self._replace(page=1, **filters)
+
+    def sorted_by(self, sort: str) -> 'ArticleQuery':
+        return self._replace(sort=sort, page=1)
+
+    def paginate(self, page: int, per_page: Optional[int] = None) -> 'ArticleQuery':
+        return self._replace(page=page, per_page=per_page or self.per_page)
+
+    @classmethod
+    def from_mapping(cls, params: Mapping, prefix: str = '') -> 'ArticleQuery':
+        """
+        Depuis les paramètres d'URL ou d'un formulaire (category, subcategory, author,
+        start, end, q, title, sort, page, per_page) ; ValueError si une valeur est invalide
+        """
+        values = {field: params.get(prefix + name, '') for name, field in URL_PARAMETERS.items()}
+        page = str(params.get(prefix + 'page', '') or '1').strip()
+        per_page = str(params.get(prefix + 'per_page', '') or DEFAULT_PER_PAGE).strip()
+        if not page.isdigit() or not per_page.isdigit():
+            raise ValueError('Paramètres de pagination invalides')
+        return cls(sort=(params.get(prefix + 'sort', '') or 'recent').strip(),
+                   page=int(page), per_page=int(per_page), **values)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    @property
+    def filters(self) -> Dict[str, str]:
+        """Filtres renseignés, dans l'ordre de FILTER_FIELDS"""
+        return {field: getattr(self, field) for field in FILTER_FIELDS if getattr(self, field)}
+
+    @property
+    def combination(self) -> Tuple[str, ...]:
+        """Filtres utilisés (les deux bornes de date comptent pour 'date') : clé de choix d'index"""
+        fields = []
+        for field in self.filters:
+            name = 'date' if field in ('start_date', 'end_date') else field
+            if name not in fields:
+                fields.append(name)
+        return tuple(fields)
+
+    @property
+    def skip(self) -> int:
+        return (self.page - 1) * self.per_page
+
+    def key(self) -> Tuple:
+        """Clé hachable (cache web)"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def total_from_page(self, returned: int) -> Optional[int]:
+        """Total déduit d'une page incomplète (pas de comptage séparé), None s'il faut compter"""
+        if returned < self.per_page and (returned or self.page == 1):
+            return self.skip + returned
+        return None
+
+    def page_result(self, articles, total: int) -> Dict:
+        """Résultat d'une page, commun à tous les backends"""
+        return {
+            'articles': articles,
+            'total': total,
+            'page': self.page,
+            'per_page': self.per_page,
+            'pages': -(-total // self.per_page),
+        }
+
+    def describe(self) -> str:
+        filters = ', '.join(f"{_LABELS[field]}='{value}'" for field, value in self.filters.items())
+        return filters or 'tous les articles'
+
+    def __eq__(self, other):
+        return isinstance(other, ArticleQuery) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"ArticleQuery({self.describe()}, sort={self.sort!r}, page={self.page}, per_page={self.per_page})"
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gestionnaire MongoDB asynchrone (driver motor) pour la variante async de l'interface web
+Mêmes méthodes que MongoDBManager, en coroutines ; les requêtes indépendantes
+(compteurs et listes de facettes) sont lancées en parallèle
+"""
+
+import asyncio
+import os
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from archive import CATALOG_REFRESH_SECONDS, PartitionCatalog, catalog_name, partition_name
+from mongodb_manager import (
+    BODY_FIELDS, LISTING_PROJECTION, SEARCH_QUERIES, SUBCATEGORIES_PIPELINE, _env_int, author_query,
+    category_and_subcategory_query, category_query, combined_find, date_range_query, merge_facet_values,
+    subcategory_query, title_query
+)
+from trends import TOP_VALUES, build_series, mongo_trend_filter, mongo_trend_rows, resolve_trend_query
+
+
+class AsyncMongoDBManager:
+    def __init__(self, connection_string=None, database_name=None, collection_name=None):
+        """
+        Prépare le client motor (aucune I/O avant la première requête)
+        """
+        connection_string = connection_string or os.getenv('MONGODB_URI')
+        if not connection_string:
+            raise ValueError("MONGODB_URI non trouvé dans les variables d'environnement. Veuillez configurer le fichier .env")
+
+        self.client = AsyncIOMotorClient(
+            connection_string,
+            maxPoolSize=_env_int('MONGODB_MAX_POOL_SIZE', 100),
+            minPoolSize=_env_int('MONGODB_MIN_POOL_SIZE', 0),
+            serverSelectionTimeoutMS=_env_int('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 5000),
+            connectTimeoutMS=_env_int('MONGODB_CONNECT_TIMEOUT_MS', 5000),
+            socketTimeoutMS=_env_int('MONGODB_SOCKET_TIMEOUT_MS', 30000),
+        )
+        self.db = self.client[database_name or os.getenv('MONGODB_DATABASE', 'wscrap')]
+        self.collection = self.db[collection_name or os.getenv('MONGODB_COLLECTION', 'articles')]
+        self.bodies = self.db[f"{self.collection.name}_bodies"]
+        self.trends = self.db[f"{self.collection.name}_trends"]
+        self.partitions_catalog = self.db[catalog_name(self.collection.name)]
+        self._partitions = None
+        self._partitions_loaded_at = 0.0
+
+    async def _tiers(self, conditions=None, newest_first=True):
+        """Collection chaude puis archives qui recoupent la plage created_at (cf. MongoDBManager._tiers)"""
+        if self._partitions is None or time.monotonic() - self._partitions_loaded_at > CATALOG_REFRESH_SECONDS:
+            self._partitions = PartitionCatalog(await self.partitions_catalog.find().to_list(length=None))
+            self._partitions_loaded_at = time.monotonic()
+        bounds = (conditions or {}).get('created_at') or {}
+        years = self._partitions.years_for(bounds.get('$gte'), bounds.get('$lte'))
+        archives = [self.db[partition_name(self.collection.name, year)] for year in sorted(years, reverse=newest_first)]
+        return [self.collection] + archives if newest_first else archives + [self.collection]
+
+    async def attach_bodies(self, articles):
+        """Contenu et images depuis la collection des corps, en une requête (cf. MongoDBManager)"""
+        missing = [article['url'] for article in articles if 'content' not in article and article.get('url')]
+        if missing:
+            bodies = {body['_id']: body async for body in self.bodies.find({'_id': {'$in': missing}})}
+            for article in articles:
+                body = bodies.get(article.get('url'))
+                if body:
+                    for field in BODY_FIELDS:
+                        article[field] = body.get(field)
+        return articles
+
+    async def _find(self, query, label):
+        try:
+            found = await asyncio.gather(*(tier.find(query).to_list(length=None) for tier in await self._tiers(query)))
+            articles = await self.attach_bodies([article for tier_articles in found for article in tier_articles])
+            print(f"🔍 Trouvé {len(articles)} articles {label}")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche {label}: {e}")
+            return []
+
+    async def get_all_categories(self):
+        try:
+            return merge_facet_values(*await asyncio.gather(*(tier.distinct('categories')
+                                                               for tier in await self._tiers())))
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des catégories: {e}")
+            return ['Web', 'Marketing', 'Social', 'Tech']
+
+    async def get_all_subcategories(self):
+        try:
+            tiers = await self._tiers()
+            from_arrays = await asyncio.gather(*(tier.aggregate(SUBCATEGORIES_PIPELINE).to_list(length=None)
+                                                 for tier in tiers))
+            main_subcategories = await asyncio.gather(*(tier.distinct('subcategory') for tier in tiers))
+            return merge_facet_values([doc['_id'] for docs in from_arrays for doc in docs], *main_subcategories)
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des sous-catégories: {e}")
+            return []
+
+    async def get_subcategories_by_category(self, category):
+        try:
+            query = category_query(category)
+            tiers = await self._tiers()
+            from_arrays = await asyncio.gather(*(tier.aggregate([{'$match': query}] + SUBCATEGORIES_PIPELINE)
+                                                 .to_list(length=None) for tier in tiers))
+            main_subcategories = await asyncio.gather(*(tier.distinct('subcategory', query) for tier in tiers))
+            return merge_facet_values([doc['_id'] for docs in from_arrays for doc in docs], *main_subcategories)
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des sous-catégories pour '{category}': {e}")
+            return []
+
+    async def get_all_authors(self):
+        try:
+            return merge_facet_values(*await asyncio.gather(*(tier.distinct('author') for tier in await self._tiers())))
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des auteurs: {e}")
+            return []
+
+    async def get_articles_by_category(self, category):
+        return await self._find(category_query(category), f"dans la catégorie '{category}'")
+
+    async def get_articles_by_category_and_subcategory(self, category, subcategory):
+        return await self._find(category_and_subcategory_query(category, subcategory),
+                                f"pour '{category}' > '{subcategory}'")
+
+    async def get_articles_by_subcategory(self, subcategory):
+        return await self._find(subcategory_query(subcategory), f"avec la sous-catégorie '{subcategory}'")
+
+    async def get_articles_by_author(self, author):
+        return await self._find(author_query(author), f"de l'auteur '{author}'")
+
+    async def get_articles_by_date_range(self, start_date, end_date):
+        # Une date illisible donne [] comme dans MongoDBManager, pas une exception dans la route
+        try:
+            query = date_range_query(start_date, end_date)
+        except (TypeError, ValueError) as e:
+            print(f"❌ Erreur lors de la recherche par date: {e}")
+            return []
+        return await self._find(query, f"entre {start_date} et {end_date}")
+
+    async def search_in_title(self, search_term):
+        return await self._find(title_query(search_term), f"avec '{search_term}' dans le titre")
+
+    async def find_articles(self, query):
+        """Recherche combinée paginée (cf. MongoDBManager.find_articles)"""
+        try:
+            conditions, projection, sort, collation = combined_find(query)
+            tiers = await self._tiers(conditions, newest_first=query.sort != 'oldest')
+            if len(tiers) > 1:
+                return query.page_result(*await self._find_articles_in_tiers(tiers, query, conditions, projection,
+                                                                            sort, collation))
+            cursor = (self.collection.find(conditions, projection, collation=collation)
+                      .sort(sort).skip(query.skip).limit(query.per_page))
+            articles = await cursor.to_list(length=None)
+            total = query.total_from_page(len(articles))
+            if total is None:
+                total = await self.collection.count_documents(conditions, collation=collation)
+            return query.page_result(articles, total)
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche combinée: {e}")
+            return query.page_result([], 0)
+
+    @staticmethod
+    async def _find_articles_in_tiers(tiers, query, conditions, projection, sort, collation):
+        """Page répartie sur plusieurs partitions (cf. MongoDBManager._find_articles_in_tiers)"""
+        counts = await asyncio.gather(*(tier.count_documents(conditions, collation=collation) for tier in tiers))
+        if query.sort == 'relevance':
+            found = await asyncio.gather(*(tier.find(conditions, projection).sort(sort)
+                                           .limit(query.skip + query.per_page).to_list(length=None) for tier in tiers))
+            articles = sorted((article for tier_articles in found for article in tier_articles),
+                              key=lambda article: article['score'], reverse=True)
+            return articles[query.skip:query.skip + query.per_page], sum(counts)
+        skip, articles = query.skip, []
+        for tier, count in zip(tiers, counts):
+            if skip >= count:
+                skip -= count
+            elif len(articles) < query.per_page:
+                articles.extend(await tier.find(conditions, projection, collation=collation).sort(sort).skip(skip)
+                                .limit(query.per_page - len(articles)).to_list(length=None))
+                skip = 0
+        return articles, sum(counts)
+
+    async def iter_articles(self, method_name, *args):
+        """Itère de manière asynchrone sur le curseur d'une recherche"""
+        query = SEARCH_QUERIES[method_name](*args)
+        for tier in await self._tiers(query):
+            async for article in tier.find(query, LISTING_PROJECTION).batch_size(100):
+                yield article
+
+    async def iter_listings(self):
+        """Tous les articles avec la projection de liste"""
+        for tier in await self._tiers():
+            async for article in tier.find({}, LISTING_PROJECTION).batch_size(1000):
+                yield article
+
+    async def get_trends(self, facet='all', value=None, start=None, end=None, days=None, bucket='day',
+                         limit=TOP_VALUES):
+        """Séries temporelles depuis les agrégats maintenus par MongoDBManager.save_articles"""
+        key, start_day, end_day = resolve_trend_query(facet, value, start, end, days, bucket)
+        documents = await self.trends.find(mongo_trend_filter(facet, key, start_day, end_day)).to_list(length=None)
+        return build_series(mongo_trend_rows(documents), facet, start_day, end_day, bucket, limit)
+
+    async def _facets(self):
+        """Compteur total et listes de facettes, en parallèle"""
+        return await asyncio.gather(
+            self._count_all(),
+            self.get_all_categories(),
+            self.get_all_subcategories(),
+            self.get_all_authors()
+        )
+
+    async def _count_all(self):
+        return sum(await asyncio.gather(*(tier.count_documents({}) for tier in await self._tiers())))
+
+    @staticmethod
+    def _stats(total_articles, categories, subcategories, authors):
+        return {
+            'total_articles': total_articles,
+            'categories_count': len(categories),
+            'subcategories_count': len(subcategories),
+            'authors_count': len(authors)
+        }
+
+    async def get_stats(self):
+        try:
+            return self._stats(*await self._facets())
+        except Exception as e:
+            print(f"❌ Erreur lors du calcul des statistiques: {e}")
+            return {
+                'total_articles': 0,
+                'categories_count': 4,
+                'subcategories_count': 0,
+                'authors_count': 0
+            }
+
+    async def get_data_for_interface(self):
+        """Statistiques et facettes en un seul aller-retour parallèle (sans recalcul des listes)"""
+        try:
+            total_articles, categories, subcategories, authors = await self._facets()
+            return {
+                'stats': self._stats(total_articles, categories, subcategories, authors),
+                'categories': categories,
+                'subcategories': subcategories,
+                'authors': authors
+            }
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des données: {e}")
+            return {
+                'stats': {
+                    'total_articles': 0,
+                    'categories_count': 4,
+                    'subcategories_count': 0,
+                    'authors_count': 0
+                },
+                'categories': ['Web', 'Marketing', 'Social', 'Tech'],
+                'subcategories': [],
+                'authors': []
+            }
+
+    def close(self):
+        self.client.close()
+        print("Connexion MongoDB fermée")
+
+
+class AsyncRepositoryAdapter:
+    """
+    Expose un backend synchrone (SQLite, index local) avec des méthodes awaitables,
+    exécutées dans un thread pour ne pas bloquer la boucle d'événements
+    """
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    async def iter_articles(self, method_name, *args):
+        for article in await asyncio.to_thread(getattr(self.repository, method_name), *args):
+            yield article
+
+    def __getattr__(self, name):
+        method = getattr(self.repository, name)
+        if not callable(method) or name == 'close':
+            return method
+
+        async def call(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return call
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark mémoire du modèle Article (__slots__) face aux anciens dicts du pipeline
+Rejoue l'assemblage d'un article (prévisualisation → détails → export JSON) sur
+le jeu articles.json et mesure la mémoire retenue par article et le pic pendant l'export
+
+Usage : python benchmarks/bench_article_model.py [--source articles.json] [--repeat 50]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from local_search_index import iter_json_articles  # noqa: E402
+from models import Article, Image  # noqa: E402
+
+PREVIEW_FIELDS = ('title', 'thumbnail', 'subcategory', 'summary', 'date', 'original_date', 'url')
+
+
+def build_dicts(sources):
+    """Ancien pipeline : dict de prévisualisation puis copie fusionnée {**preview, ...}"""
+    articles = []
+    for source in sources:
+        preview = {field: source.get(field) for field in PREVIEW_FIELDS}
+        images = {key: {'url': image['url'], 'caption': image['caption']}
+                  for key, image in (source.get('images') or {}).items()}
+        articles.append({
+            **preview,
+            'author': source.get('author'),
+            'content': source.get('content'),
+            'images': images,
+            'categories': list(source.get('categories') or []),
+            'subcategories': list(source.get('subcategories') or []),
+            'scraped_at': datetime.now()
+        })
+    return articles
+
+
+def build_models(sources):
+    """Nouveau pipeline : un seul Article complété sur place"""
+    articles = []
+    for source in sources:
+        article = Article(source.get('url'), source.get('title'),
+                          **{field: source.get(field) for field in PREVIEW_FIELDS[1:-1]})
+        article.author = source.get('author')
+        article.content = source.get('content')
+        article.images = {key: Image(image['url'], image['caption'])
+                          for key, image in (source.get('images') or {}).items()}
+        article.categories = list(source.get('categories') or [])
+        article.subcategories = list(source.get('subcategories') or [])
+        article.scraped_at = datetime.now()
+        articles.append(article)
+    return articles
+
+
+def export_dicts(articles):
+    """Ancien save_to_json : copie de chaque article puis liste complète sérialisable"""
+    serializable = []
+    for article in articles:
+        article_copy = article.copy()
+        article_copy['scraped_at'] = article_copy['scraped_at'].isoformat()
+        serializable.append(article_copy)
+    return len(serializable)
+
+
+def export_models(articles):
+    """Nouveau save_to_json : un dict JSON à la fois"""
+    count = 0
+    for article in articles:
+        article.to_json()
+        count += 1
+    return count
+
+
+def measure(build, export, sources):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    articles = build(sources)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    export(articles)
+    _, export_peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    return retained, export_peak - retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark mémoire du modèle Article')
+    parser.add_argument('--source', default=os.path.join(ROOT, 'articles.json'),
+                        help='Jeu d\'articles JSON/JSONL (default: articles.json)')
+    parser.add_argument('--repeat', type=int, default=50,
+                        help='Nombre de répétitions du jeu pour simuler un gros crawl (default: 50)')
+    args = parser.parse_args()
+
+    # Les chaînes sources sont partagées : seule la structure des conteneurs est mesurée
+    sources = list(iter_json_articles(args.source)) * args.repeat
+    print(f"📦 {len(sources)} articles ({args.repeat} x {args.source})")
+
+    results = {}
+    for label, build, export in (('dicts', build_dicts, export_dicts),
+                                 ('Article (__slots__)', build_models, export_models)):
+        retained, export_peak, elapsed = measure(build, export, sources)
+        results[label] = retained
+        print(f"   {label:<20} {retained / len(sources):>8.0f} o/article retenus, "
+              f"pic export +{export_peak / 1024:.0f} Kio, {elapsed * 1000:.0f} ms")
+
+    gain = 1 - results['Article (__slots__)'] / results['dicts']
+    print(f"✅ Mémoire retenue par article réduite de {gain:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la file de travaux du crawl distribué (SQLiteJobQueue)
+Des processus workers réservent et acquittent des travaux dont l'exécution est
+simulée (attente réseau fixe) : débit selon le nombre de workers, et vérification
+qu'aucun travail n'est exécuté deux fois ni perdu
+
+Usage : python benchmarks/bench_job_queue.py [--jobs 400] [--work-ms 50] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_queue import SQLiteJobQueue  # noqa: E402
+
+
+def worker(path, work_seconds):
+    """Vide la file ; retourne les URLs traitées par ce processus"""
+    queue = SQLiteJobQueue(path)
+    done = []
+    worker_id = f"bench-{os.getpid()}"
+    while True:
+        job = queue.lease(worker_id)
+        if job is None:
+            break
+        time.sleep(work_seconds)  # requête HTTP + analyse simulées
+        if queue.ack(job):
+            done.append(job.url)
+    queue.close()
+    return done
+
+
+def run(workers, jobs, work_seconds):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'jobs.db')
+        queue = SQLiteJobQueue(path)
+        queue.enqueue(('article', f"https://example.org/article-{i}/", None) for i in range(jobs))
+        queue.close()
+
+        start = time.perf_counter()
+        with Pool(workers) as pool:
+            results = pool.starmap(worker, [(path, work_seconds)] * workers)
+        elapsed = time.perf_counter() - start
+
+        counts = Counter(url for done in results for url in done)
+        duplicates = sum(1 for count in counts.values() if count > 1)
+        stats = SQLiteJobQueue(path).stats()
+        return elapsed, len(counts), duplicates, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la file de travaux')
+    parser.add_argument('--jobs', type=int, default=400, help='Nombre de travaux (default: 400)')
+    parser.add_argument('--work-ms', type=float, default=50, help='Durée simulée d\'un travail (default: 50 ms)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Nombres de workers à comparer (default: 1 2 4 8)')
+    args = parser.parse_args()
+
+    print(f"📦 {args.jobs} travaux de {args.work_ms:.0f} ms")
+    baseline = None
+    for workers in args.workers:
+        elapsed, unique, duplicates, stats = run(workers, args.jobs, args.work_ms / 1000)
+        throughput = unique / elapsed
+        baseline = baseline or throughput / workers
+        print(f"   {workers:>2} worker(s): {throughput:>7.1f} travaux/s "
+              f"(x{throughput / baseline:.1f}, idéal x{workers}), {unique} uniques, "
+              f"{duplicates} doublons, restants {stats['pending'] + stats['leased']}")
+
+
+if __name__ == "__main__":
+    main()
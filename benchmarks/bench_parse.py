@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'analyse sélective des pages (listes et articles)
+Compare, par page, l'analyse complète historique (response.text + BeautifulSoup
+entier) à l'analyse sélective (lecture jusqu'à </main> + parse_only) : octets lus,
+temps d'analyse et d'extraction, mémoire allouée (pic tracemalloc), et vérifie
+que les données extraites sont identiques
+
+Fixtures : pages synthétiques au gabarit du Blog du Modérateur (en-tête, menus,
+scripts, barre latérale, pied de page) générées depuis articles.json, ou pages
+réelles enregistrées (--html-dir : list-*.html pour les listes, *.html pour les articles)
+
+Usage : python benchmarks/bench_parse.py [--source articles.json] [--pages 20] [--html-dir pages/]
+"""
+
+import argparse
+import contextlib
+import glob
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+from html import escape
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core_scraper import BlogScraperCore  # noqa: E402
+from local_search_index import iter_json_articles  # noqa: E402
+from selective_parse import parse_detail, parse_listing, read_until  # noqa: E402
+
+
+# ----------------------------------------------------------------------
+# Fixtures synthétiques
+# ----------------------------------------------------------------------
+def _chrome_head(title):
+    scripts = ''.join(f'<script>window.__cfg{i} = {{"id": {i}, "flags": [{", ".join(str(j) for j in range(40))}]}};</script>\n'
+                      for i in range(25))
+    styles = ''.join(f'<link rel="stylesheet" href="/wp-content/themes/bdm/css/part-{i}.css">\n' for i in range(20))
+    return (f'<!DOCTYPE html><html lang="fr"><head><meta charset="UTF-8"><title>{escape(title)}</title>\n'
+            f'{styles}<style>{"body{margin:0} .x{color:red} " * 200}</style>\n{scripts}')
+
+
+def _chrome_nav():
+    items = ''.join(f'<li class="menu-item"><a href="/rubrique-{i}/">Rubrique {i}</a>'
+                    f'<ul class="sub-menu">{"".join(f"<li><a href=/r{i}/s{j}/>Sous-rubrique {j}</a></li>" for j in range(12))}</ul></li>'
+                    for i in range(25))
+    return f'<header id="masthead" class="site-header"><nav class="main-navigation"><ul>{items}</ul></nav></header>\n'
+
+
+def _chrome_tail():
+    sidebar = ''.join(f'<div class="widget"><h4>Populaire {i}</h4><a href="/populaire-{i}/">'
+                      f'<img src="https://f.hellowork.com/blogdumoderateur/pop-{i}.png" alt="Populaire {i}"></a>'
+                      f'<p>{"Texte de mise en avant. " * 10}</p></div>' for i in range(30))
+    footer = ''.join(f'<li><a href="/page-{i}/">Lien de pied de page {i}</a></li>' for i in range(150))
+    scripts = ''.join(f'<script src="/wp-content/plugins/p{i}/app.js"></script>' for i in range(30))
+    return (f'<aside id="secondary" class="widget-area">{sidebar}</aside>\n'
+            f'<footer id="colophon"><ul>{footer}</ul></footer>{scripts}</body></html>')
+
+
+def _card(article):
+    return (f'<article class="post"><div class="post-thumbnail picture rounded-img">'
+            f'<img data-lazy-src="{escape(article.get("thumbnail") or "")}"></div>'
+            f'<div class="entry-meta ms-md-5 pt-md-0 pt-3"><span class="favtag color-b">{escape(article.get("subcategory") or "")}</span>'
+            f'<time class="entry-date published updated" datetime="{article.get("date") or ""}T10:00:00+02:00">{escape(article.get("original_date") or "")}</time>'
+            f'<header class="entry-header pt-1"><a href="{escape(article["url"])}"><h3>{escape(article["title"])}</h3></a></header>'
+            f'<div class="entry-excerpt t-def t-size-def pt-1">{escape(article.get("summary") or "")}</div></div></article>\n')
+
+
+def listing_page(articles):
+    cards = ''.join(_card(article) for article in articles)
+    return (_chrome_head('Web') + '</head><body>' + _chrome_nav()
+            + f'<main id="main" class="site-main">{cards}</main>\n' + _chrome_tail())
+
+
+def detail_page(article):
+    paragraphs = ''.join(f'<p>{escape(part)}</p>' for part in (article.get('content') or '').split('\n\n'))
+    figures = ''.join(f'<figure><img src="{escape(image["url"])}"><figcaption>{escape(image["caption"])}</figcaption></figure>'
+                      for image in (article.get('images') or {}).values())
+    cats = ''.join(f'<span class="cat" data-cat="{escape(category)}">{escape(category)}</span>'
+                   for category in article.get('categories') or [])
+    tags = ''.join(f'<li><a href="/tag/{i}/">{escape(tag)}</a></li>'
+                   for i, tag in enumerate(article.get('subcategories') or []))
+    head = (_chrome_head(article['title'])
+            + f'<meta property="og:url" content="{escape(article["url"])}">'
+            + f'<meta property="og:image" content="{escape(article.get("thumbnail") or "")}">'
+            + f'<meta property="og:description" content="{escape(article.get("summary") or "")}">'
+            + f'<meta name="author" content="{escape(article.get("author") or "")}"></head><body>')
+    body = (f'<main id="main" class="site-main"><div class="cats-list">{cats}</div>'
+            f'<article class="post"><header><h1 class="entry-title">{escape(article["title"])}</h1>'
+            f'<time class="entry-date published updated" datetime="{article.get("date") or ""}T10:00:00+02:00">{escape(article.get("original_date") or "")}</time>'
+            f'<span class="byline">{escape(article.get("author") or "")}</span></header>'
+            f'<div class="entry-content">{paragraphs}{figures}</div></article>'
+            f'<ul class="tags-list">{tags}</ul></main>\n')
+    return head + _chrome_nav() + body + _chrome_tail()
+
+
+# ----------------------------------------------------------------------
+# Mesures
+# ----------------------------------------------------------------------
+def fake_response(data: bytes) -> requests.Response:
+    """Réponse requests lue en flux depuis la mémoire (aucun accès réseau)"""
+    response = requests.models.Response()
+    response.raw = io.BytesIO(data)
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    return response
+
+
+def extract_listing(scraper, soup):
+    main_tag = soup.find('main')
+    return [article.to_json() for article in map(scraper.extract_article_preview, main_tag.find_all('article'))
+            if article]
+
+
+def extract_detail(scraper, soup):
+    author, content, images, categories, subcategories = scraper.parse_article_details(soup)
+    return author, content, {key: image.to_dict() for key, image in images.items()}, categories, subcategories
+
+
+def run(kind, data: bytes, selective: bool, scraper):
+    """Lecture + analyse + extraction d'une page ; retourne (octets lus, secondes, pic mémoire, résultat)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    if selective:
+        html, read, _ = read_until(fake_response(data))
+    else:
+        html, read = data.decode('utf-8'), len(data)
+    parse = parse_listing if kind == 'liste' else parse_detail
+    with contextlib.redirect_stdout(io.StringIO()):
+        soup = parse(html, selective)
+        result = (extract_listing if kind == 'liste' else extract_detail)(scraper, soup)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return read, elapsed, peak, result
+
+
+def load_fixtures(args):
+    if args.html_dir:
+        fixtures = []
+        for path in sorted(glob.glob(os.path.join(args.html_dir, '*.html'))):
+            kind = 'liste' if os.path.basename(path).startswith('list') else 'article'
+            with open(path, 'rb') as f:
+                fixtures.append((kind, f.read()))
+        return fixtures
+
+    articles = list(iter_json_articles(args.source))
+    fixtures = [('liste', listing_page(articles[i:i + 12]).encode('utf-8'))
+                for i in range(0, min(len(articles), args.pages * 12), 12)][:max(1, args.pages // 4)]
+    fixtures += [('article', detail_page(article).encode('utf-8')) for article in articles[:args.pages]]
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'analyse sélective des pages")
+    parser.add_argument('--source', default=os.path.join(ROOT, 'articles.json'),
+                        help='Articles servant à générer les pages (default: articles.json)')
+    parser.add_argument('--pages', type=int, default=20, help="Nombre de pages d'article (default: 20)")
+    parser.add_argument('--html-dir', default=None, help='Répertoire de pages HTML réelles enregistrées')
+    args = parser.parse_args()
+
+    scraper = BlogScraperCore()
+    fixtures = load_fixtures(args)
+    print(f"📄 {len(fixtures)} pages ({sum(len(data) for _, data in fixtures) / 1024:.0f} Kio)")
+
+    for kind in ('liste', 'article'):
+        pages = [data for page_kind, data in fixtures if page_kind == kind]
+        if not pages:
+            continue
+        totals = {False: [0, 0.0, 0], True: [0, 0.0, 0]}
+        mismatches = 0
+        for data in pages:
+            results = {}
+            for selective in (False, True):
+                read, elapsed, peak, results[selective] = run(kind, data, selective, scraper)
+                totals[selective][0] += read
+                totals[selective][1] += elapsed
+                totals[selective][2] += peak
+            mismatches += results[False] != results[True]
+
+        print(f"\n📰 Pages {kind} ({len(pages)})")
+        for selective, label in ((False, 'complète'), (True, 'sélective')):
+            read, elapsed, peak = totals[selective]
+            print(f"   {label:<10} {read / len(pages) / 1024:>7.1f} Kio lus  {elapsed / len(pages) * 1000:>7.2f} ms  "
+                  f"pic {peak / len(pages) / 1024:>7.0f} Kio")
+        full, fast = totals[False], totals[True]
+        print(f"   ✅ temps -{1 - fast[1] / full[1]:.0%}, mémoire -{1 - fast[2] / full[2]:.0%}, "
+              f"octets lus -{1 - fast[0] / full[0]:.0%}"
+              + (f" ⚠️ {mismatches} extraction(s) différente(s)" if mismatches else ", extractions identiques"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des plans de la recherche combinée : chaque combinaison de filtres
+(catégorie, sous-catégorie, auteur, dates, texte) doit rester sur un index
+
+Pour chaque combinaison : plan gagnant (explain executionStats), index utilisé,
+clés et documents examinés, articles retournés et durée médiane de find_articles.
+Code de sortie 1 si une combinaison passe par un COLLSCAN.
+
+Avec --seed N, les requêtes portent sur une collection jetable remplie de N articles
+synthétiques (le choix de plan n'a de sens qu'au-delà de quelques centaines de documents).
+
+Usage : python benchmarks/bench_query_plans.py [--seed 20000] [--runs 5]
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from article_query import ArticleQuery  # noqa: E402
+from mongodb_manager import MongoDBManager  # noqa: E402
+
+FILTERS = ('category', 'subcategory', 'author', 'date', 'text')
+SEED_CATEGORIES = ['Web', 'Marketing', 'Social', 'Tech', 'IA', 'Emploi']
+SEED_WORDS = ['google', 'chatgpt', 'instagram', 'linkedin', 'seo', 'formation', 'navigateur', 'podcast',
+              'cybersécurité', 'tiktok', 'apple', 'meta', 'publicité', 'emploi', 'analytics', 'startup']
+
+
+def seed_collection(manager, count):
+    """Remplit la collection de `count` articles synthétiques (facettes et dates réalistes)"""
+    rng = random.Random(42)
+    authors = [f"Auteur {i}" for i in range(60)]
+    subcategories = [f"Tag {i}" for i in range(120)]
+    start = datetime(2023, 1, 1)
+    documents = []
+    for i in range(count):
+        created = start + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        tags = rng.sample(subcategories, 3)
+        documents.append({
+            'url': f"https://bench.example/{i}",
+            'title': ' '.join(rng.sample(SEED_WORDS, 5)).capitalize(),
+            'summary': ' '.join(rng.sample(SEED_WORDS, 8)),
+            'author': rng.choice(authors),
+            'categories': rng.sample(SEED_CATEGORIES, rng.randint(1, 2)),
+            'subcategory': tags[0],
+            'subcategories': tags,
+            'date': created.strftime('%Y-%m-%d'),
+            'created_at': created,
+            'images_count': 0,
+        })
+        if len(documents) == 1000:
+            manager.collection.insert_many(documents)
+            documents = []
+    if documents:
+        manager.collection.insert_many(documents)
+    manager.create_indexes()
+
+
+def sample_values(manager):
+    """Valeurs de filtres tirées d'un article récent, pour que chaque combinaison ait des résultats"""
+    article = manager.collection.find_one({'categories.0': {'$exists': True}, 'author': {'$nin': [None, '']}},
+                                          sort=[('created_at', -1)])
+    if not article:
+        raise SystemExit("❌ Aucun article avec catégorie et auteur : lancer avec --seed N")
+    created = article.get('created_at') or datetime.now()
+    return {
+        'category': article['categories'][0],
+        # Casse modifiée : la collation doit rester insensible à la casse
+        'subcategory': (article.get('subcategories') or [article.get('subcategory')])[0].upper(),
+        'author': article['author'].lower(),
+        'start_date': (created - timedelta(days=180)).strftime('%Y-%m-%d'),
+        'end_date': (created + timedelta(days=1)).strftime('%Y-%m-%d'),
+        'text': (article.get('title') or 'google').split()[0],
+    }
+
+
+def combinations():
+    for size in range(len(FILTERS) + 1):
+        yield from itertools.combinations(FILTERS, size)
+
+
+def build_query(combination, values, sort):
+    filters = {}
+    for name in combination:
+        if name == 'date':
+            filters.update(start_date=values['start_date'], end_date=values['end_date'])
+        else:
+            filters[name] = values[name]
+    return ArticleQuery(sort='relevance' if sort == 'relevance' and 'text' in combination else sort, **filters)
+
+
+def measure(manager, query, runs):
+    timings = []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            page = manager.find_articles(query)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), page['total']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark des plans de la recherche combinée')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Collection jetable remplie de N articles synthétiques (default: collection configurée)')
+    parser.add_argument('--runs', type=int, default=5, help='Exécutions par combinaison (default: 5)')
+    parser.add_argument('--sort', choices=('recent', 'oldest', 'relevance'), default='recent',
+                        help='Tri des requêtes (default: recent)')
+    args = parser.parse_args()
+
+    collection_name = f"bench_plans_{os.getpid()}" if args.seed else None
+    manager = MongoDBManager(collection_name=collection_name)
+    failures = 0
+    try:
+        if args.seed:
+            print(f"🌱 {args.seed} articles synthétiques dans {collection_name}")
+            seed_collection(manager, args.seed)
+        else:
+            manager.create_indexes()
+        values = sample_values(manager)
+        total = manager.collection.estimated_document_count()
+
+        print(f"\n📐 Recherche combinée sur {total} articles (tri {args.sort}, {args.runs} exécutions)")
+        print(f"   {'filtres':<40} {'plan':<34} {'clés':>7} {'docs':>7} {'total':>6} {'médiane':>9}")
+        for combination in combinations():
+            query = build_query(combination, values, args.sort)
+            plan = manager.explain_articles(query)
+            median, matched = measure(manager, query, args.runs)
+            label = ' + '.join(combination) or '(aucun)'
+            index = ', '.join(plan['indexes']) or plan['plan']
+            flag = '✅' if plan['uses_index'] and not plan['collscan'] else '❌'
+            failures += flag == '❌'
+            print(f"{flag} {label:<40} {index[:34]:<34} {plan['keys_examined']:>7} "
+                  f"{plan['docs_examined']:>7} {matched:>6} {median * 1000:>7.1f}ms")
+    finally:
+        if args.seed:
+            # Collection jetable et ses collections compagnons créées par create_indexes
+            for suffix in ('', '_bodies', '_minhash', '_trends'):
+                manager.db.drop_collection(f"{collection_name}{suffix}")
+        manager.close()
+
+    if failures:
+        print(f"\n❌ {failures} combinaison(s) sans index")
+        sys.exit(1)
+    print("\n✅ Toutes les combinaisons sont servies par un index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du temps de démarrage : connexion paresseuse vs ancien démarrage
+(ping bloquant + create_index à chaque processus, via MONGODB_EAGER_INIT=true)
+
+Usage : python benchmarks/bench_startup.py [--runs 5] [--module web_interface]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module, eager, runs):
+    """Temps (s) d'import du module dans un interpréteur neuf, `runs` fois"""
+    env = dict(os.environ, MONGODB_EAGER_INIT='true' if eager else 'false', STORAGE_BACKEND='mongo')
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', f'import {module}'], cwd=ROOT, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+        # Un import en échec serait chronométré comme un démarrage rapide
+        if result.returncode != 0:
+            raise SystemExit(f"❌ Échec de l'import de '{module}' (code {result.returncode}):\n{result.stderr}")
+        timings.append(elapsed)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du démarrage MongoDB')
+    parser.add_argument('--runs', type=int, default=5, help='Nombre de démarrages par mode (default: 5)')
+    parser.add_argument('--module', default='web_interface', help='Module importé (default: web_interface)')
+    args = parser.parse_args()
+
+    print(f"⏱️ Démarrage de '{args.module}' ({args.runs} exécutions par mode)")
+    results = {}
+    for label, eager in (('eager (ping + index)', True), ('lazy', False)):
+        timings = measure(args.module, eager, args.runs)
+        results[label] = statistics.median(timings)
+        print(f"   {label:<22} médiane {results[label] * 1000:8.1f} ms   "
+              f"min {min(timings) * 1000:8.1f} ms   max {max(timings) * 1000:8.1f} ms")
+
+    eager_time, lazy_time = results['eager (ping + index)'], results['lazy']
+    if lazy_time:
+        print(f"🚀 Gain: x{eager_time / lazy_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
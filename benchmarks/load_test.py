@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge : débit et latences de l'interface web avec N clients concurrents
+Compare par exemple l'app Flask (web_interface.py) et la variante async (web_interface_async.py)
+
+Usage :
+    python web_interface.py                                  # port 5000
+    hypercorn web_interface_async:app --bind 0.0.0.0:5001 --workers 1
+    python benchmarks/load_test.py --targets http://localhost:5000 http://localhost:5001 --clients 150
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlencode, urlparse
+
+SCENARIOS = {
+    'stats': ('GET', '/api/stats', None),
+    'subcategories': ('GET', '/api/subcategories/Web', None),
+    'search': ('POST', '/search', {'search_type': 'title', 'title_search': 'IA'}),
+    'index': ('GET', '/', None),
+}
+
+
+def client_loop(target, scenario, deadline, latencies, errors, lock):
+    """Un client : requêtes en boucle sur une connexion keep-alive jusqu'à l'échéance"""
+    parsed = urlparse(target)
+    method, path, form = SCENARIOS[scenario]
+    body = urlencode(form) if form else None
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'} if form else {}
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    local_latencies, local_errors = [], 0
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                local_errors += 1
+            else:
+                local_latencies.append(time.perf_counter() - start)
+        except Exception:
+            local_errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    conn.close()
+
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run(target, scenario, clients, duration):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client_loop, args=(target, scenario, deadline, latencies, errors, lock))
+               for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'mean': statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test de charge de l\'interface web')
+    parser.add_argument('--targets', nargs='+', default=['http://localhost:5000'],
+                        help='URLs de base à comparer (default: http://localhost:5000)')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='stats',
+                        help='Route testée (default: stats)')
+    parser.add_argument('--clients', type=int, default=100, help='Clients concurrents (default: 100)')
+    parser.add_argument('--duration', type=float, default=20.0, help='Durée par cible en secondes (default: 20)')
+    args = parser.parse_args()
+
+    print(f"🔥 Test de charge '{args.scenario}' - {args.clients} clients, {args.duration:.0f}s par cible")
+    for target in args.targets:
+        result = run(target, args.scenario, args.clients, args.duration)
+        print(f"\n🎯 {target}")
+        print(f"   Requêtes: {result['requests']} (erreurs: {result['errors']})")
+        print(f"   Débit: {result['throughput']:.1f} req/s")
+        print(f"   Latence: moyenne {result['mean']:.1f} ms | p50 {result['p50']:.1f} ms | "
+              f"p95 {result['p95']:.1f} ms | p99 {result['p99']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
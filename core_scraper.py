@@ -1,30 +1,45 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Module principal de scraping - Blog du Modérateur
+Module principal de scraping - Blog du Modérateur par défaut
 Respecte le principe DRY et évite toutes les répétitions
+Sélecteurs, formats de date et pages de départ viennent du profil du site (site_profiles)
 """
 
 import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import time
 import json
 from typing import List, Dict, Optional, Tuple
+from urllib.parse import urljoin
+from models import Article, Image
+from selective_parse import fetch_html, parse_detail, parse_listing, selective_parsing_enabled
+from site_profiles import SiteProfile, default_profile, select_all, select_first
+from profiling import stage
 
 class BlogScraperCore:
-    """Classe principale pour le scraping du Blog du Modérateur"""
+    """Classe principale pour le scraping d'un site décrit par son profil (Blog du Modérateur par défaut)"""
     
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        self.mois_fr = {
-            'janvier': '01', 'février': '02', 'mars': '03', 'avril': '04',
-            'mai': '05', 'juin': '06', 'juillet': '07', 'août': '08',
-            'septembre': '09', 'octobre': '10', 'novembre': '11', 'décembre': '12'
-        }
+    def __init__(self, selective: Optional[bool] = None, profile: Optional[SiteProfile] = None,
+                 session=None, limiter=None):
+        self.profile = profile or default_profile()
+        # Analyse sélective : seules les régions utiles des pages (décrites par le profil) sont lues et construites
+        enabled = selective_parsing_enabled() if selective is None else selective
+        self.selective = enabled and self.profile.selective
+        self.headers = {'User-Agent': self.profile.user_agent}
+        # Session HTTP (pool de connexions de l'hôte) et limiteur de débit partagés par le crawl multi-sites
+        self.session = session
+        self.limiter = limiter
+
+    def _fetch(self, url: str) -> str:
+        """Télécharge une page du site, en respectant le limiteur de l'hôte s'il y en a un"""
+        if self.limiter is None:
+            return fetch_html(url, self.headers, self.selective, self.profile.timeout,
+                              self.session, self.profile.end_marker)
+        with self.limiter:
+            return fetch_html(url, self.headers, self.selective, self.profile.timeout,
+                              self.session, self.profile.end_marker)
         
     def extract_img_url(self, img_tag) -> Optional[str]:
         """Extrait l'URL d'une image depuis différents attributs"""
@@ -40,19 +55,28 @@ class BlogScraperCore:
         return None
 
     def format_date(self, date_str: str) -> Optional[str]:
-        """Convertit une date française en format AAAA-MM-JJ"""
+        """Convertit une date du site (noms de mois du profil, ou formats strptime) en format AAAA-MM-JJ"""
         if not date_str:
             return None
         
         try:
-            pattern = r'(\d{1,2})\s+(\w+)\s+(\d{4})'
-            match = re.search(pattern, date_str.lower())
+            match = self.profile.date_pattern.search(date_str.lower()) if self.profile.date_pattern else None
             
             if match:
-                jour, mois, annee = match.groups()
-                if mois in self.mois_fr:
-                    jour = jour.zfill(2)
-                    return f"{annee}-{self.mois_fr[mois]}-{jour}"
+                named = match.groupdict()
+                if named:
+                    jour, mois, annee = named['day'], named['month'], named['year']
+                else:
+                    jour, mois, annee = match.groups()
+                mois = self.profile.months.get(mois, mois if mois.isdigit() else None)
+                if mois:
+                    return f"{annee}-{mois.zfill(2)}-{jour.zfill(2)}"
+
+            for date_format in self.profile.date_formats:
+                try:
+                    return datetime.strptime(date_str.strip(), date_format).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
         except Exception as e:
             print(f"⚠️ Erreur formatage date '{date_str}': {e}")
         
@@ -60,34 +84,24 @@ class BlogScraperCore:
 
     def extract_date_from_article(self, article) -> Tuple[Optional[str], Optional[str]]:
         """Extrait la date d'un article (date lisible, date formatée)"""
-        # Méthode principale : time.entry-date
-        date_elem = article.find('time', class_='entry-date published updated')
-        if date_elem:
-            datetime_attr = date_elem.get('datetime')
-            if datetime_attr:
-                try:
-                    parsed_date = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                    formatted_date = parsed_date.strftime('%Y-%m-%d')
-                    date = date_elem.get_text(strip=True)
-                    return date, formatted_date
-                except:
-                    pass
-            
-            # Fallback sur le texte
-            date = date_elem.get_text(strip=True)
-            return date, self.format_date(date)
-        
-        # Fallback sur l'ancienne méthode
-        meta_div = article.find('div', class_='entry-meta')
-        if meta_div:
-            date_elem = meta_div.find('span', class_='posted-on')
-            if date_elem:
-                date = date_elem.get_text(strip=True)
-                return date, self.format_date(date)
+        # Premier sélecteur de date du profil qui trouve un élément (time.entry-date, puis span.posted-on)
+        date_elem = select_first(article, self.profile.date_selectors)
+        if not date_elem:
+            return None, None
+
+        date = date_elem.get_text(strip=True)
+        datetime_attr = date_elem.get(self.profile.date_attribute) if self.profile.date_attribute else None
+        if datetime_attr:
+            try:
+                parsed_date = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
+                return date, parsed_date.strftime('%Y-%m-%d')
+            except ValueError:
+                pass
         
-        return None, None
+        # Fallback sur le texte
+        return date, self.format_date(date)
 
-    def extract_images_with_captions(self, content_div) -> Dict[str, Dict[str, str]]:
+    def extract_images_with_captions(self, content_div) -> Dict[str, Image]:
         """Extrait les images avec leurs légendes"""
         images_dict = {}
         img_counter = 1
@@ -103,10 +117,7 @@ class BlogScraperCore:
                     caption = (figcaption.get_text(strip=True) if figcaption 
                              else img.get('alt', '') or img.get('title', '') or f"Image {img_counter}")
                     
-                    images_dict[f"image_{img_counter}"] = {
-                        'url': img_url,
-                        'caption': caption
-                    }
+                    images_dict[f"image_{img_counter}"] = Image(img_url, caption)
                     img_counter += 1
         
         # Méthode 2: Divs avec caption
@@ -123,55 +134,43 @@ class BlogScraperCore:
                     
                     img_key = f"image_{img_counter}"
                     if img_key not in images_dict:
-                        images_dict[img_key] = {
-                            'url': img_url,
-                            'caption': caption
-                        }
+                        images_dict[img_key] = Image(img_url, caption)
                         img_counter += 1
         
         # Méthode 3: Images isolées
         images = content_div.find_all('img')
         for img in images:
             img_url = self.extract_img_url(img)
-            if img_url and not any(existing['url'] == img_url for existing in images_dict.values()):
+            if img_url and not any(existing.url == img_url for existing in images_dict.values()):
                 caption = img.get('alt', '') or img.get('title', '') or f"Image {img_counter}"
-                images_dict[f"image_{img_counter}"] = {
-                    'url': img_url,
-                    'caption': caption
-                }
+                images_dict[f"image_{img_counter}"] = Image(img_url, caption)
                 img_counter += 1
         
         return images_dict
 
     def extract_categories_and_subcategories(self, article) -> Tuple[List[str], List[str]]:
         """
-        Extrait les catégories et sous-catégories depuis les éléments HTML appropriés
+        Extrait les catégories et sous-catégories avec les sélecteurs du profil
         - Catégorie : depuis cats-list > span.cat[data-cat] (une seule par article)
-        - Sous-catégories : depuis tags-list avec les li
+        - Sous-catégories : depuis les liens de tags-list
         """
         categories = []
         subcategories = []
         
         try:
-            # Catégorie principale (span.cat avec data-cat dans cats-list)
-            cats_div = article.find("div", class_="cats-list")
-            if cats_div:
-                cat_span = cats_div.find("span", class_="cat")
-                if cat_span and cat_span.has_attr("data-cat"):
-                    categorie = cat_span["data-cat"]
-                    if categorie and categorie.strip():
-                        categories.append(categorie.strip())
+            # Catégorie principale (attribut du profil, texte de l'élément sinon)
+            cat_elem = select_first(article, self.profile.article['category'])
+            if cat_elem:
+                attribute = self.profile.category_attribute
+                categorie = cat_elem.get(attribute) if attribute else cat_elem.get_text(strip=True)
+                if categorie and categorie.strip():
+                    categories.append(categorie.strip())
             
-            # Sous-catégories (li enfants de tags-list)
-            tags_lists = article.find_all(class_='tags-list')
-            for tags_list in tags_lists:
-                li_elements = tags_list.find_all('li')
-                for li in li_elements:
-                    link = li.find('a')
-                    if link:
-                        subcategory_name = link.get_text(strip=True)
-                        if subcategory_name and subcategory_name not in subcategories:
-                            subcategories.append(subcategory_name)
+            # Sous-catégories (liens de tags-list)
+            for link in select_all(article, self.profile.article['tags']):
+                subcategory_name = link.get_text(strip=True)
+                if subcategory_name and subcategory_name not in subcategories:
+                    subcategories.append(subcategory_name)
             
             print(f"📊 Extracté {len(categories)} catégorie(s) et {len(subcategories)} sous-catégories")
             if categories:
@@ -188,18 +187,27 @@ class BlogScraperCore:
         """Récupère les détails complets d'un article"""
         try:
             print(f"       🌐 Accès à: {article_url}")
-            response = requests.get(article_url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            article = soup.find('article')
+            with stage('detail_fetch'):
+                html = self._fetch(article_url)
+            with stage('extraction'):
+                soup = parse_detail(html, self.selective, self.profile.detail_filter)
+                return self.parse_article_details(soup)
+        
+        except Exception as e:
+            print(f"⚠️ Erreur article {article_url}: {e}")
+            return None, None, {}, [], []
+
+    def parse_article_details(self, soup) -> Tuple[Optional[str], Optional[str], Dict, List[str], List[str]]:
+        """Extrait auteur, contenu, images, catégories et sous-catégories d'une page d'article"""
+        try:
+            article = select_first(soup, self.profile.article['root'])
             if not article:
                 print(f"       ❌ Pas d'article trouvé sur la page")
                 return None, None, {}, [], []
             
             # Auteur
             author = None
-            byline_elem = article.find(class_='byline')
+            byline_elem = select_first(article, self.profile.article['author'])
             if byline_elem:
                 author = byline_elem.get_text(strip=True)
             else:
@@ -214,9 +222,7 @@ class BlogScraperCore:
             print(f"       📊 Trouvé: {len(categories)} catégorie(s), {len(subcategories)} sous-catégorie(s)")
             
             # Contenu principal
-            content_div = (article.find('div', class_='entry-content') or 
-                          article.find('div', class_='content') or 
-                          article.find('main'))
+            content_div = select_first(article, self.profile.article['content'])
             
             content_text = ""
             images_dict = {}
@@ -234,109 +240,137 @@ class BlogScraperCore:
             return author, content_text, images_dict, categories, subcategories
         
         except Exception as e:
-            print(f"⚠️ Erreur article {article_url}: {e}")
+            print(f"⚠️ Erreur extraction détails: {e}")
             return None, None, {}, [], []
 
-    def extract_article_preview(self, article) -> Optional[Dict]:
-        """Extrait les données de prévisualisation d'un article"""
+    def fetch_article(self, article_url: str) -> Optional[Article]:
+        """
+        Récupère un article complet depuis sa seule page de détail (une requête),
+        sans passer par une page de liste : titre, résumé, miniature et date
+        sont lus dans l'en-tête de l'article et ses balises meta (Open Graph)
+        """
+        try:
+            print(f"       🌐 Accès à: {article_url}")
+            with stage('detail_fetch'):
+                html = self._fetch(article_url)
+            with stage('extraction'):
+                soup = parse_detail(html, self.selective, self.profile.detail_filter)
+                return self.parse_article(soup, article_url)
+
+        except Exception as e:
+            print(f"⚠️ Erreur article {article_url}: {e}")
+            return None
+
+    def parse_article(self, soup, article_url: str) -> Optional[Article]:
+        """Construit l'article depuis le HTML de sa page de détail (titre, meta Open Graph, contenu)"""
+        def meta(prop):
+            tag = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
+            content = tag.get('content', '').strip() if tag else ''
+            return content or None
+
+        title_elem = select_first(soup, self.profile.article['title'])
+        title = title_elem.get_text(strip=True) if title_elem else meta('og:title')
+        if not title:
+            print(f"       ❌ Pas de titre trouvé sur la page")
+            return None
+
+        date, formatted_date = self.extract_date_from_article(soup)
+        if not formatted_date and meta('article:published_time'):
+            formatted_date = meta('article:published_time')[:10]
+
+        author, content, images, categories, subcategories = self.parse_article_details(soup)
+        return Article(
+            meta('og:url') or article_url, title,
+            thumbnail=meta('og:image'),
+            subcategory=meta('article:section') or (subcategories[0] if subcategories else None),
+            summary=meta('og:description') or meta('description'),
+            date=formatted_date,
+            original_date=date,
+            author=author,
+            content=content,
+            images=images,
+            categories=categories,
+            subcategories=subcategories,
+            scraped_at=datetime.now()
+        )
+
+    def extract_article_preview(self, article, page_url: str = '') -> Optional[Article]:
+        """Extrait les données de prévisualisation d'un article (liens relatifs résolus depuis page_url)"""
+        listing = self.profile.listing
         try:
             # Image
-            img_div = article.find('div', class_='post-thumbnail picture rounded-img')
-            img_tag = img_div.find('img') if img_div else None
-            img_url = self.extract_img_url(img_tag)
+            img_url = self.extract_img_url(select_first(article, listing['thumbnail']))
 
-            # Métadonnées
-            meta_div = (article.find('div', class_='entry-meta ms-md-5 pt-md-0 pt-3') or
-                       article.find('div', class_='entry-meta'))
-            
             # Tag principal
-            tag = None
-            if meta_div:
-                tag_elem = (meta_div.find('span', class_='favtag color-b') or
-                           meta_div.find('span', class_='favtag'))
-                tag = tag_elem.get_text(strip=True) if tag_elem else None
+            tag_elem = select_first(article, listing['subcategory'])
+            tag = tag_elem.get_text(strip=True) if tag_elem else None
             
             # Date
             date, formatted_date = self.extract_date_from_article(article)
 
             # Titre et URL
-            header = (meta_div.find('header', class_='entry-header pt-1') if meta_div 
-                     else article.find('header'))
-            a_tag = header.find('a') if header else None
-            article_url = a_tag.get('href') if a_tag and a_tag.has_attr('href') else None
-            
-            title = None
-            if a_tag:
-                title_elem = (a_tag.find('h3') or a_tag.find('h2') or a_tag.find('h1'))
-                title = title_elem.get_text(strip=True) if title_elem else None
+            link = select_first(article, listing['url'])
+            article_url = urljoin(page_url, link['href']) if link and link.get('href') else None
+            title_elem = select_first(article, listing['title'])
+            title = title_elem.get_text(strip=True) if title_elem else None
 
             # Résumé
-            summary = None
-            if meta_div:
-                summary_div = (meta_div.find('div', class_='entry-excerpt t-def t-size-def pt-1') or
-                              meta_div.find('div', class_='entry-excerpt'))
-                summary = summary_div.get_text(strip=True) if summary_div else None
+            summary_div = select_first(article, listing['summary'])
+            summary = summary_div.get_text(strip=True) if summary_div else None
 
             if not article_url or not title:
                 return None
 
-            return {
-                'title': title,
-                'thumbnail': img_url,
-                'subcategory': tag,
-                'summary': summary,
-                'date': formatted_date,
-                'original_date': date,
-                'url': article_url
-            }
+            return Article(
+                article_url, title,
+                thumbnail=img_url,
+                subcategory=tag,
+                summary=summary,
+                date=formatted_date,
+                original_date=date
+            )
         
         except Exception as e:
             print(f"⚠️ Erreur extraction preview: {e}")
             return None
 
-    def fetch_articles_from_url(self, url: str, max_articles: int = 30) -> List[Dict]:
-        """Récupère les articles depuis une URL donnée"""
-        try:
-            print(f"🌐 Récupération: {url}")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            main_tag = soup.find('main')
-            if not main_tag:
-                print(f"⚠️ Aucune balise <main> trouvée sur {url}")
+    def fetch_listing(self, url: str, max_articles: int = 30) -> List[Article]:
+        """
+        Prévisualisations d'une page de liste, sans les pages de détail
+        Les erreurs réseau sont propagées (le worker du crawl distribué les retente)
+        """
+        print(f"🌐 Récupération: {url}")
+        with stage('listing_fetch'):
+            html = self._fetch(url)
+        with stage('extraction'):
+            soup = parse_listing(html, self.selective, self.profile.listing_filter)
+            articles = select_all(soup, self.profile.listing['items'])[:max_articles]
+            if not articles:
+                print(f"⚠️ Aucun article trouvé sur {url}")
                 return []
-
-            articles = main_tag.find_all('article')[:max_articles]
             print(f"📰 {len(articles)} articles trouvés")
-            
+
+            previews = []
+            for article in articles:
+                preview = self.extract_article_preview(article, url)
+                if preview:
+                    previews.append(preview)
+        return previews
+
+    def fetch_articles_from_url(self, url: str, max_articles: int = 30) -> List[Article]:
+        """Récupère les articles depuis une URL donnée"""
+        try:
+            previews = self.fetch_listing(url, max_articles)
             articles_data = []
             
-            for i, article in enumerate(articles, 1):
-                print(f"📄 Article {i}/{len(articles)}: ", end="")
-                
-                # Extraction preview
-                preview_data = self.extract_article_preview(article)
-                if not preview_data:
-                    print("❌ Ignoré")
-                    continue
-                
-                print(f"{preview_data['title'][:40]}...")
+            for i, article_data in enumerate(previews, 1):
+                print(f"📄 Article {i}/{len(previews)}: {article_data.title[:40]}...")
                 
-                # Détails complets
+                # Détails complets, complétés sur le même objet (pas de copie)
                 print(f"   🔍 Récupération détails...")
-                author, content, images, categories, subcategories = self.fetch_article_details(preview_data['url'])
-                
-                # Assemblage final
-                article_data = {
-                    **preview_data,
-                    'author': author,
-                    'content': content,
-                    'images': images,
-                    'categories': categories,
-                    'subcategories': subcategories,
-                    'scraped_at': datetime.now()
-                }
+                (article_data.author, article_data.content, article_data.images,
+                 article_data.categories, article_data.subcategories) = self.fetch_article_details(article_data.url)
+                article_data.scraped_at = datetime.now()
                 
                 articles_data.append(article_data)
                 
@@ -349,10 +383,16 @@ class BlogScraperCore:
             print(f"❌ Erreur requête {url}: {e}")
             return []
 
-    def fetch_articles_multi_pages(self, base_urls: List[str], target_count: int = 30) -> List[Dict]:
-        """Récupère des articles depuis plusieurs pages/catégories"""
+    def fetch_articles_multi_pages(self, base_urls: List[str], target_count: int = 30,
+                                   duplicate_detector=None) -> List[Article]:
+        """
+        Récupère des articles depuis plusieurs pages/catégories
+        Si un détecteur de quasi-doublons est fourni, les copies d'un même article
+        publiées sous une autre URL sont fusionnées dans l'article déjà collecté
+        """
         all_articles = []
         seen_urls = set()
+        articles_by_url = {}
         
         for url in base_urls:
             if len(all_articles) >= target_count:
@@ -362,9 +402,22 @@ class BlogScraperCore:
             
             # Éviter les doublons
             for article in articles:
-                if article['url'] not in seen_urls:
-                    all_articles.append(article)
-                    seen_urls.add(article['url'])
+                if article.url in seen_urls:
+                    continue
+
+                if duplicate_detector:
+                    duplicate = duplicate_detector.check_and_add(article.url, article.content)
+                    if duplicate:
+                        canonical_url, score = duplicate
+                        print(f"♻️ Quasi-doublon ({score:.0%}) de {canonical_url}: {article.url}")
+                        if canonical_url in articles_by_url:
+                            articles_by_url[canonical_url].absorb_duplicate(article)
+                        seen_urls.add(article.url)
+                        continue
+
+                all_articles.append(article)
+                articles_by_url[article.url] = article
+                seen_urls.add(article.url)
                     
                 if len(all_articles) >= target_count:
                     break
@@ -372,22 +425,22 @@ class BlogScraperCore:
             # Pause entre les pages
             time.sleep(2)
         
+        if duplicate_detector:
+            duplicate_detector.save()
+
         print(f"\n📊 Total collecté: {len(all_articles)} articles uniques")
         return all_articles
 
-    def save_to_json(self, articles: List[Dict], filename: str = "articles.json") -> bool:
+    def save_to_json(self, articles: List[Article], filename: str = "articles.json") -> bool:
         """Sauvegarde les articles en JSON"""
         try:
-            # Sérialisation des datetime
-            articles_serializable = []
-            for article in articles:
-                article_copy = article.copy()
-                if isinstance(article_copy.get('scraped_at'), datetime):
-                    article_copy['scraped_at'] = article_copy['scraped_at'].isoformat()
-                articles_serializable.append(article_copy)
-            
+            # Sérialisation article par article (datetime en ISO via Article.to_json)
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(articles_serializable, f, ensure_ascii=False, indent=2)
+                f.write('[')
+                for i, article in enumerate(articles):
+                    f.write(',\n  ' if i else '\n  ')
+                    f.write(json.dumps(article.to_json(), ensure_ascii=False, indent=2).replace('\n', '\n  '))
+                f.write('\n]' if articles else ']')
             
             print(f"✅ Articles sauvegardés dans {filename}")
             return True
@@ -395,7 +448,7 @@ class BlogScraperCore:
             print(f"❌ Erreur sauvegarde JSON: {e}")
             return False
 
-    def display_summary(self, articles: List[Dict]) -> None:
+    def display_summary(self, articles: List[Article]) -> None:
         """Affiche un résumé des articles récupérés"""
         print(f"\n{'='*80}")
         print(f"🎉 RÉSUMÉ DU SCRAPING")
@@ -408,12 +461,10 @@ class BlogScraperCore:
         authors = set()
         
         for article in articles:
-            if article.get('categories'):
-                all_categories.update(article['categories'])
-            if article.get('subcategories'):
-                all_subcategories.update(article['subcategories'])
-            if article.get('author'):
-                authors.add(article['author'])
+            all_categories.update(article.categories)
+            all_subcategories.update(article.subcategories)
+            if article.author:
+                authors.add(article.author)
         
         print(f"🏷️ Catégories uniques: {len(all_categories)}")
         print(f"🔖 Sous-catégories uniques: {len(all_subcategories)}")
@@ -430,10 +481,10 @@ class BlogScraperCore:
         # Aperçu des premiers articles
         print(f"\n📋 APERÇU DES PREMIERS ARTICLES:")
         for i, article in enumerate(articles[:3], 1):
-            print(f"\n📄 ARTICLE {i}: {article.get('title', 'Sans titre')}")
-            print(f"   🏷️ Tag: {article.get('subcategory', 'N/A')}")
-            print(f"   📂 Catégories: {', '.join(article.get('categories', []))}")
-            print(f"   🔖 Sous-catégories: {', '.join(article.get('subcategories', []))}")
-            print(f"   ✍️ Auteur: {article.get('author', 'N/A')}")
-            print(f"   📅 Date: {article.get('date', 'N/A')}")
-            print(f"   🖼️ Images: {len(article.get('images', {}))}")
\ No newline at end of file
+            print(f"\n📄 ARTICLE {i}: {article.title or 'Sans titre'}")
+            print(f"   🏷️ Tag: {article.subcategory or 'N/A'}")
+            print(f"   📂 Catégories: {', '.join(article.categories)}")
+            print(f"   🔖 Sous-catégories: {', '.join(article.subcategories)}")
+            print(f"   ✍️ Auteur: {article.author or 'N/A'}")
+            print(f"   📅 Date: {article.date or 'N/A'}")
+            print(f"   🖼️ Images: {len(article.images)}")
\ No newline at end of file
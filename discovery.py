@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Découverte des articles nouveaux ou modifiés via les flux RSS et sitemaps XML
+(WordPress / Yoast) au lieu de re-télécharger les pages de liste
+
+- lecture en flux (iterparse) : aucun document XML complet en mémoire
+- requêtes conditionnelles (ETag / Last-Modified) : une section inchangée coûte une réponse 304
+- comparaison des dates (lastmod, pubDate, updated) avec l'état du dernier passage
+- les URLs à récupérer restent en attente dans l'état tant qu'elles n'ont pas été traitées
+
+État (discovery_state.json) :
+    {"sources": {url: {"etag", "last_modified", "lastmod"}},
+     "urls": {url_article: lastmod_iso},
+     "pending": {url_article: lastmod_iso}}
+"""
+
+import json
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+SITE_URL = 'https://www.blogdumoderateur.com'
+
+# Un flux par section : une petite requête (souvent 304) pour détecter les changements
+SECTION_FEEDS = [
+    f"{SITE_URL}/web/feed/",
+    f"{SITE_URL}/digital/feed/",
+    f"{SITE_URL}/social-media/feed/",
+    f"{SITE_URL}/tech/feed/",
+    f"{SITE_URL}/marketing/feed/",
+]
+SITEMAP_INDEX = f"{SITE_URL}/sitemap_index.xml"
+
+# Éléments délimitant une entrée : sitemap (url, sitemap), RSS (item), Atom (entry)
+ENTRY_TAGS = ('url', 'sitemap', 'item', 'entry')
+
+DEFAULT_STATE_PATH = 'discovery_state.json'
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def _local_name(tag: str) -> str:
+    """Nom d'élément sans espace de noms ({http://...}loc → loc)"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[str]:
+    """Date ISO 8601 (sitemap, Atom) ou RFC 822 (RSS pubDate) → ISO UTC comparable"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+class ChangeDiscovery:
+    """Détecte les articles nouveaux ou mis à jour depuis le dernier passage"""
+
+    def __init__(self, state_path: str = DEFAULT_STATE_PATH, timeout: int = 15):
+        self.state_path = state_path
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        self.state = self.load_state()
+
+    # ------------------------------------------------------------------
+    # État
+    # ------------------------------------------------------------------
+    def load_state(self) -> Dict:
+        state = {}
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except Exception as e:
+                print(f"⚠️ État de découverte illisible, repart de zéro: {e}")
+        for key in ('sources', 'urls', 'pending'):
+            state.setdefault(key, {})
+        return state
+
+    def save_state(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def mark_done(self, url: str) -> None:
+        """L'article a été récupéré : sa date devient la référence, il quitte la file"""
+        lastmod = self.state['pending'].pop(url, None)
+        self.state['urls'][url] = lastmod or datetime.now(timezone.utc).isoformat()
+
+    # ------------------------------------------------------------------
+    # Lecture en flux
+    # ------------------------------------------------------------------
+    def _open(self, url: str) -> Optional[requests.Response]:
+        """GET conditionnel ; None si la source n'a pas changé (304) ou est injoignable"""
+        source = self.state['sources'].setdefault(url, {})
+        headers = {}
+        if source.get('etag'):
+            headers['If-None-Match'] = source['etag']
+        if source.get('last_modified'):
+            headers['If-Modified-Since'] = source['last_modified']
+
+        try:
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+            if response.status_code == 304:
+                response.close()
+                print(f"⏸️ Inchangé: {url}")
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Erreur requête {url}: {e}")
+            return None
+
+        source['etag'] = response.headers.get('ETag')
+        source['last_modified'] = response.headers.get('Last-Modified')
+        response.raw.decode_content = True
+        return response
+
+    def iter_entries(self, url: str) -> Iterator[Tuple[str, Optional[str], bool]]:
+        """
+        Parcourt un flux RSS/Atom ou un sitemap en flux
+        Produit (url, lastmod_iso, est_un_sous_sitemap)
+        """
+        response = self._open(url)
+        if response is None:
+            return
+        try:
+            link = lastmod = None
+            # Ancêtres ouverts : une entrée traitée est détachée de son parent (<urlset>, <channel>, <feed>),
+            # sinon les éléments vidés resteraient accrochés à l'arbre et la mémoire croîtrait avec le flux
+            parents = []
+            for event, elem in ET.iterparse(response.raw, events=('start', 'end')):
+                name = _local_name(elem.tag)
+                if event == 'start':
+                    parents.append(elem)
+                    # Nouvelle entrée : on oublie le <link> / <lastBuildDate> du canal
+                    if name in ENTRY_TAGS:
+                        link = lastmod = None
+                    continue
+                parents.pop()
+                if name == 'loc' and not link:
+                    # Le premier <loc> est la page (les suivants : image:loc)
+                    link = (elem.text or '').strip()
+                elif name == 'link' and not link:
+                    # RSS : <link>url</link> ; Atom : <link href="url"/>
+                    link = (elem.text or elem.get('href') or '').strip()
+                elif name in ('lastmod', 'updated', 'pubDate') and not lastmod:
+                    lastmod = parse_lastmod(elem.text)
+                elif name in ENTRY_TAGS:
+                    if link:
+                        yield link, lastmod, name == 'sitemap'
+                    link = lastmod = None
+                    elem.clear()
+                    if parents:
+                        parents[-1].remove(elem)
+                elif name in ('channel', 'feed'):
+                    elem.clear()
+        except ET.ParseError as e:
+            print(f"❌ XML invalide {url}: {e}")
+        finally:
+            response.close()
+
+    # ------------------------------------------------------------------
+    # Découverte
+    # ------------------------------------------------------------------
+    def _is_changed(self, url: str, lastmod: Optional[str]) -> bool:
+        known = self.state['urls'].get(url)
+        if known is None:
+            return True
+        return bool(lastmod) and lastmod > known
+
+    def _scan(self, source_url: str, changed: Dict[str, Optional[str]]) -> None:
+        for url, lastmod, is_sitemap in self.iter_entries(source_url):
+            if is_sitemap:
+                # Sous-sitemap : ne le lire que si son lastmod a changé
+                source = self.state['sources'].setdefault(url, {})
+                if lastmod and source.get('lastmod') == lastmod:
+                    continue
+                self._scan(url, changed)
+                source['lastmod'] = lastmod
+            elif self._is_changed(url, lastmod):
+                changed[url] = lastmod
+
+    def discover(self, sources: Optional[List[str]] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        Lit les sources et retourne les articles à (re)récupérer : la file en attente
+        des passages précédents plus les nouveautés, les plus récentes d'abord
+        """
+        changed: Dict[str, Optional[str]] = {}
+        for source_url in sources or SECTION_FEEDS:
+            print(f"🛰️ Découverte: {source_url}")
+            self._scan(source_url, changed)
+
+        print(f"🆕 {len(changed)} article(s) nouveaux ou modifiés")
+        self.state['pending'].update(changed)
+        self.save_state()
+        return sorted(self.state['pending'].items(), key=lambda item: item[1] or '', reverse=True)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diffusion en direct des articles sauvegardés vers l'interface web (Server-Sent Events)
+
+Sources d'événements :
+- crochet local : ArticleRepository.save_articles publie sur le bus du processus
+  (scraper et interface web dans le même processus, backends SQLite ou local)
+- change streams MongoDB : les écritures d'un autre processus (scraper lancé à part)
+  sont relayées par un thread (Flask) ou une tâche asyncio (Quart)
+
+Chaque événement est encodé une seule fois en trame SSE puis remis à tous les abonnés ;
+un abonné trop lent perd ses plus anciens événements au lieu de bloquer la publication
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from models import as_document
+from web_utils import format_article_result, ndjson_line
+
+SSE_MIMETYPE = 'text/event-stream'
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no',  # pas de mise en tampon par un proxy nginx
+}
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+# Les compteurs de facettes ne sont pas recalculés plus souvent que cela
+STATS_MIN_INTERVAL = float(os.getenv('SSE_STATS_MIN_INTERVAL', '2'))
+
+HEARTBEAT_FRAME = b': ping\n\n'
+RETRY_FRAME = b'retry: 5000\n\n'
+
+
+def sse_frame(event: str, payload: Dict) -> bytes:
+    """Trame SSE : `event: <nom>` puis la charge utile JSON sur une ligne `data:`"""
+    return b'event: ' + event.encode('utf-8') + b'\ndata: ' + ndjson_line(payload) + b'\n'
+
+
+class _Subscription:
+    """Abonné synchrone (un générateur Flask) : file bornée lue par le thread de la requête"""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, frame: bytes) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def frames(self):
+        yield RETRY_FRAME
+        while True:
+            try:
+                yield self.queue.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield HEARTBEAT_FRAME
+
+
+class _AsyncSubscription:
+    """Abonné asynchrone (Quart) : une connexion inactive ne coûte qu'une file asyncio"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def _put(self, frame: bytes) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+    def deliver(self, frame: bytes) -> None:
+        # publish() peut être appelé depuis n'importe quel thread
+        self.loop.call_soon_threadsafe(self._put, frame)
+
+    async def frames(self):
+        yield RETRY_FRAME
+        while True:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT_FRAME
+
+
+class EventBus:
+    """Bus de publication en mémoire, partagé par le processus"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._last_stats = 0.0
+        # Vrai quand un change stream MongoDB alimente déjà le bus (pas de double publication)
+        self.external_source = False
+
+    def add_listener(self, callback) -> None:
+        """Rappel appelé avec chaque lot d'articles sauvegardés (ex. index d'autocomplétion)"""
+        self._listeners.append(callback)
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, asynchronous: bool = False):
+        subscription = _AsyncSubscription() if asynchronous else _Subscription()
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: str, payload: Dict) -> None:
+        if not self._subscribers:
+            return
+        frame = sse_frame(event, payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.deliver(frame)
+            except RuntimeError:
+                # Boucle d'événements fermée : l'abonné est parti
+                self.unsubscribe(subscription)
+
+    def publish_articles(self, articles: Iterable, repository=None, created: Optional[bool] = None) -> None:
+        """Résumés des articles sauvegardés, puis compteurs à jour (au plus tous les STATS_MIN_INTERVAL)"""
+        articles = list(articles)
+        for listener in self._listeners:
+            try:
+                listener(articles)
+            except Exception as e:
+                print(f"⚠️ Erreur de mise à jour après sauvegarde: {e}")
+        if not self._subscribers:
+            return
+        for article in articles:
+            payload = format_article_result(as_document(article))
+            if created is not None:
+                payload['created'] = created
+            self.publish('article', payload)
+        if repository is not None:
+            self.publish_stats(repository)
+
+    def stats_due(self, force: bool = False) -> bool:
+        """Vrai si les compteurs peuvent être republiés (limite de fréquence)"""
+        now = time.monotonic()
+        if not force and now - self._last_stats < STATS_MIN_INTERVAL:
+            return False
+        self._last_stats = now
+        return True
+
+    def publish_stats(self, repository, force: bool = False) -> None:
+        if not self.stats_due(force):
+            return
+        try:
+            self.publish('stats', repository.get_stats())
+        except Exception as e:
+            print(f"⚠️ Erreur statistiques SSE: {e}")
+
+
+event_bus = EventBus()
+
+
+# ----------------------------------------------------------------------
+# Change streams MongoDB
+# ----------------------------------------------------------------------
+CHANGE_STREAM_PIPELINE = [{'$match': {'operationType': {'$in': ['insert', 'update', 'replace']}}}]
+
+
+def change_streams_enabled() -> bool:
+    return os.getenv('SSE_CHANGE_STREAMS', 'true').lower() == 'true'
+
+
+def start_change_stream_thread(repository) -> Optional[threading.Thread]:
+    """Relaie les écritures MongoDB (pymongo) vers le bus, dans un thread démon"""
+    collection = getattr(repository, 'collection', None)
+    if collection is None or not change_streams_enabled():
+        return None
+
+    def watch():
+        try:
+            with collection.watch(CHANGE_STREAM_PIPELINE, full_document='updateLookup') as stream:
+                event_bus.external_source = True
+                print("📡 Change stream MongoDB actif")
+                for change in stream:
+                    document = change.get('fullDocument')
+                    if document:
+                        event_bus.publish_articles([document], repository,
+                                                   created=change['operationType'] == 'insert')
+        except Exception as e:
+            print(f"⚠️ Change stream MongoDB indisponible (replica set requis): {e}")
+        finally:
+            event_bus.external_source = False
+
+    thread = threading.Thread(target=watch, name='mongo-change-stream', daemon=True)
+    thread.start()
+    return thread
+
+
+async def watch_change_stream(repository) -> None:
+    """Variante asynchrone (motor) du relais de change stream, à lancer en tâche de fond"""
+    collection = getattr(repository, 'collection', None)
+    if collection is None or not change_streams_enabled():
+        return
+    try:
+        async with collection.watch(CHANGE_STREAM_PIPELINE, full_document='updateLookup') as stream:
+            event_bus.external_source = True
+            print("📡 Change stream MongoDB actif")
+            async for change in stream:
+                document = change.get('fullDocument')
+                if not document:
+                    continue
+                event_bus.publish_articles([document], created=change['operationType'] == 'insert')
+                if event_bus.has_subscribers() and event_bus.stats_due():
+                    event_bus.publish('stats', await repository.get_stats())
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Change stream MongoDB indisponible (replica set requis): {e}")
+    finally:
+        event_bus.external_source = False
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export colonnaire du corpus d'articles (Parquet ou Arrow IPC, compression zstd)
+pour les analyses : colonnes catégorielles encodées en dictionnaire, dates typées,
+images dans une table séparée, export incrémental des articles scrapés depuis le dernier export
+
+Structure produite :
+    export/
+    ├── articles/part-AAAAMMJJTHHMMSS.parquet
+    ├── images/part-AAAAMMJJTHHMMSS.parquet
+    └── export_state.json      # filigrane scraped_at du dernier export
+
+Chargement : pyarrow.dataset.dataset('export/articles').to_table()
+             (ou pandas.read_parquet('export/articles'))
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from local_search_index import iter_json_articles
+from storage import get_storage_backend
+
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+ARTICLES_SCHEMA = pa.schema([
+    ('url', pa.string()),
+    ('title', pa.string()),
+    ('thumbnail', pa.string()),
+    ('subcategory', DICT_STRING),
+    ('summary', pa.string()),
+    ('date', pa.date32()),
+    ('original_date', pa.string()),
+    ('author', DICT_STRING),
+    ('categories', pa.list_(pa.string())),
+    ('subcategories', pa.list_(pa.string())),
+    ('content', pa.large_string()),
+    ('images_count', pa.int16()),
+    ('scraped_at', pa.timestamp('us')),
+])
+
+IMAGES_SCHEMA = pa.schema([
+    ('article_url', pa.string()),
+    ('position', pa.int16()),
+    ('image_url', pa.string()),
+    ('caption', pa.string()),
+])
+
+STATE_FILE = 'export_state.json'
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def _image_position(key: str, default: int) -> int:
+    suffix = key.rsplit('_', 1)[-1]
+    return int(suffix) if suffix.isdigit() else default
+
+
+class ColumnarWriter:
+    """Écrit des lots de lignes dans un fichier Parquet ou Arrow IPC compressé en zstd"""
+
+    def __init__(self, path: str, schema: pa.Schema, file_format: str):
+        self.schema = schema
+        self.rows = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if file_format == 'parquet':
+            self.writer = pq.ParquetWriter(path, schema, compression='zstd', use_dictionary=True)
+        else:
+            self.sink = pa.OSFile(path, 'wb')
+            self.writer = ipc.new_file(self.sink, schema, options=ipc.IpcWriteOptions(compression='zstd'))
+
+    def write(self, columns: Dict[str, List]) -> None:
+        if not columns[self.schema.names[0]]:
+            return
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema
+        )
+        self.writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self.writer.close()
+        if hasattr(self, 'sink'):
+            self.sink.close()
+
+
+def _batches(articles: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_articles(articles: Iterable[Dict], output_dir: str, file_format: str = 'parquet',
+                    batch_size: int = 1000) -> Dict:
+    """
+    Exporte les articles en deux tables colonnaires (articles, images)
+    Retourne un résumé : nombre de lignes, chemins, plus grand scraped_at exporté
+    """
+    extension = 'parquet' if file_format == 'parquet' else 'arrow'
+    part_name = f"part-{datetime.now().strftime('%Y%m%dT%H%M%S')}.{extension}"
+    articles_path = os.path.join(output_dir, 'articles', part_name)
+    images_path = os.path.join(output_dir, 'images', part_name)
+
+    articles_writer = ColumnarWriter(articles_path, ARTICLES_SCHEMA, file_format)
+    images_writer = ColumnarWriter(images_path, IMAGES_SCHEMA, file_format)
+    watermark = None
+
+    try:
+        for batch in _batches(articles, batch_size):
+            article_columns = {name: [] for name in ARTICLES_SCHEMA.names}
+            image_columns = {name: [] for name in IMAGES_SCHEMA.names}
+
+            for article in batch:
+                scraped_at = _to_datetime(article.get('scraped_at'))
+                if scraped_at and (watermark is None or scraped_at > watermark):
+                    watermark = scraped_at
+                images = article.get('images') or {}
+
+                article_columns['url'].append(article.get('url'))
+                article_columns['title'].append(article.get('title'))
+                article_columns['thumbnail'].append(article.get('thumbnail'))
+                article_columns['subcategory'].append(article.get('subcategory'))
+                article_columns['summary'].append(article.get('summary'))
+                article_columns['date'].append(_to_date(article.get('date')))
+                article_columns['original_date'].append(article.get('original_date'))
+                article_columns['author'].append(article.get('author'))
+                article_columns['categories'].append(list(article.get('categories') or []))
+                article_columns['subcategories'].append(list(article.get('subcategories') or []))
+                article_columns['content'].append(article.get('content'))
+                article_columns['images_count'].append(len(images))
+                article_columns['scraped_at'].append(scraped_at)
+
+                for index, (key, image) in enumerate(images.items(), 1):
+                    image_columns['article_url'].append(article.get('url'))
+                    image_columns['position'].append(_image_position(key, index))
+                    image_columns['image_url'].append(image.get('url'))
+                    image_columns['caption'].append(image.get('caption'))
+
+            articles_writer.write(article_columns)
+            images_writer.write(image_columns)
+    finally:
+        articles_writer.close()
+        images_writer.close()
+
+    # Pas de fichiers vides dans le jeu de données
+    for writer, path in ((articles_writer, articles_path), (images_writer, images_path)):
+        if writer.rows == 0 and os.path.exists(path):
+            os.remove(path)
+
+    return {
+        'articles': articles_writer.rows,
+        'images': images_writer.rows,
+        'articles_path': articles_path if articles_writer.rows else None,
+        'images_path': images_path if images_writer.rows else None,
+        'watermark': watermark
+    }
+
+
+def load_state(output_dir: str) -> Dict:
+    path = os.path.join(output_dir, STATE_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(output_dir: str, state: Dict) -> None:
+    with open(os.path.join(output_dir, STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export colonnaire du corpus (Parquet / Arrow)')
+    parser.add_argument('--output', default='export', help='Répertoire de sortie (default: export)')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet',
+                        help='Format de fichier (default: parquet)')
+    parser.add_argument('--source', default=None,
+                        help='Export JSON/JSONL à convertir (default: backend STORAGE_BACKEND)')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore le filigrane et exporte tout le corpus')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Lignes par lot (default: 1000)')
+    args = parser.parse_args()
+
+    print("📦 EXPORT COLONNAIRE DU CORPUS")
+    print("=" * 60)
+
+    os.makedirs(args.output, exist_ok=True)
+    state = {} if args.full else load_state(args.output)
+    since = _to_datetime(state.get('last_scraped_at'))
+    if since:
+        print(f"⏩ Export incrémental: articles scrapés après {since.isoformat()}")
+
+    db_manager = None
+    try:
+        if args.source:
+            articles = (a for a in iter_json_articles(args.source)
+                        if since is None or (_to_datetime(a.get('scraped_at')) or datetime.min) > since)
+        else:
+            db_manager = get_storage_backend()
+            articles = db_manager.iter_all_articles(since)
+
+        summary = export_articles(articles, args.output, args.format, args.batch_size)
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+    finally:
+        if db_manager:
+            db_manager.close()
+
+    if summary['watermark']:
+        state['last_scraped_at'] = summary['watermark'].isoformat()
+    state['last_export_at'] = datetime.now().isoformat()
+    save_state(args.output, state)
+
+    print(f"✅ {summary['articles']} articles, {summary['images']} images exportés")
+    if summary['articles_path']:
+        print(f"   📄 {summary['articles_path']}")
+    if summary['images_path']:
+        print(f"   🖼️ {summary['images_path']}")
+
+
+if __name__ == "__main__":
+    main()
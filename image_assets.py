@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stockage local des images d'articles, adressé par contenu (SHA-256)
+- téléchargements parallèles (pool de threads, session HTTP partagée)
+- déduplication : une image publiée sous plusieurs URLs n'est stockée qu'une fois
+- miniatures WebP (Pillow, optionnel) servies par l'interface web sur /assets/<sha>.webp
+- éviction LRU quand le cache dépasse sa taille maximale
+
+Structure :
+    assets/
+    ├── originals/ab/abcdef....    # image téléchargée, nommée par son SHA-256
+    ├── thumbs/ab/abcdef....webp   # miniature
+    └── url_index.json             # URL distante → SHA-256
+
+Usage : python image_assets.py sync [--source articles.json] [--workers 8]
+        python image_assets.py evict
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Iterable, Optional, Set
+
+import requests
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # pas de miniatures sans Pillow : l'interface garde les URLs distantes
+    PILImage = None
+
+DEFAULT_ASSET_PATH = 'assets'
+THUMBNAIL_SIZE = (320, 320)
+DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+def article_image_urls(article) -> Set[str]:
+    """URLs d'images d'un article (miniature de liste + images du contenu), Article ou dict"""
+    if isinstance(article, dict):
+        thumbnail = article.get('thumbnail')
+        images = [image.get('url') for image in (article.get('images') or {}).values()]
+    else:
+        thumbnail = article.thumbnail
+        images = [image.url for image in article.images.values()]
+    return {url for url in [thumbnail] + images if url}
+
+
+class ImageAssetStore:
+    """Cache disque des images, adressé par SHA-256"""
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = root or os.getenv('ASSET_PATH', DEFAULT_ASSET_PATH)
+        self.max_bytes = max_bytes or int(os.getenv('ASSET_CACHE_MAX_MB', '500')) * 1024 * 1024
+        self.index_path = os.path.join(self.root, 'url_index.json')
+        self.url_index: Dict[str, str] = {}
+        self._index_mtime = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(self.root, exist_ok=True)
+        self._reload_index()
+
+    # ------------------------------------------------------------------
+    # Chemins
+    # ------------------------------------------------------------------
+    def original_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'originals', digest[:2], digest)
+
+    def thumbnail_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'thumbs', digest[:2], f"{digest}.webp")
+
+    # ------------------------------------------------------------------
+    # Index URL → SHA-256 (partagé entre le scraper et l'interface web)
+    # ------------------------------------------------------------------
+    def _reload_index(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.url_index = json.load(f)
+            self._index_mtime = mtime
+
+    def save_index(self) -> None:
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.url_index, f)
+            os.replace(tmp_path, self.index_path)
+            self._index_mtime = os.path.getmtime(self.index_path)
+
+    def local_thumbnail_url(self, url: Optional[str]) -> Optional[str]:
+        """Route locale de la miniature d'une image distante, None si elle n'est pas en cache"""
+        if not url:
+            return None
+        self._reload_index()
+        digest = self.url_index.get(url)
+        if digest and os.path.exists(self.thumbnail_path(digest)):
+            return f"/assets/{digest}.webp"
+        return None
+
+    # ------------------------------------------------------------------
+    # Téléchargement
+    # ------------------------------------------------------------------
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def make_thumbnail(self, digest: str, data: bytes) -> bool:
+        """Génère la miniature WebP d'une image (False sans Pillow ou si l'image est illisible)"""
+        if PILImage is None:
+            return False
+        try:
+            with PILImage.open(BytesIO(data)) as image:
+                image.thumbnail(THUMBNAIL_SIZE)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+                buffer = BytesIO()
+                image.save(buffer, 'WEBP', quality=80, method=4)
+            self._write_atomic(self.thumbnail_path(digest), buffer.getvalue())
+            return True
+        except Exception as e:
+            print(f"⚠️ Miniature impossible pour {digest[:12]}: {e}")
+            return False
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Télécharge une image, la stocke sous son SHA-256 et retourne ce dernier"""
+        try:
+            response = self._session().get(url, timeout=15)
+            response.raise_for_status()
+            data = response.content
+            digest = hashlib.sha256(data).hexdigest()
+
+            # Même contenu déjà présent sous une autre URL : rien à réécrire
+            if not os.path.exists(self.original_path(digest)):
+                self._write_atomic(self.original_path(digest), data)
+            if not os.path.exists(self.thumbnail_path(digest)):
+                self.make_thumbnail(digest, data)
+            return digest
+        except Exception as e:
+            print(f"⚠️ Erreur image {url}: {e}")
+            return None
+
+    def download_all(self, urls: Iterable[str], workers: int = 8) -> Dict[str, str]:
+        """
+        Télécharge en parallèle les URLs absentes du cache
+        Retourne le dictionnaire URL → SHA-256 des nouvelles images
+        """
+        self._reload_index()
+        pending = sorted({url for url in urls if url and url not in self.url_index})
+        if not pending:
+            return {}
+
+        print(f"🖼️ Téléchargement de {len(pending)} images ({workers} en parallèle)...")
+        downloaded = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for url, digest in zip(pending, executor.map(self.fetch, pending)):
+                if digest:
+                    downloaded[url] = digest
+
+        self.url_index.update(downloaded)
+        self.save_index()
+        unique = len(set(downloaded.values()))
+        print(f"✅ {len(downloaded)} images en cache ({unique} contenus distincts)")
+        self.evict()
+        return downloaded
+
+    def download_for_articles(self, articles: Iterable, workers: int = 8) -> Dict[str, str]:
+        urls = set()
+        for article in articles:
+            urls |= article_image_urls(article)
+        return self.download_all(urls, workers)
+
+    # ------------------------------------------------------------------
+    # Service et éviction LRU
+    # ------------------------------------------------------------------
+    def open_thumbnail(self, digest: str) -> Optional[str]:
+        """Chemin de la miniature à servir (None si absente) ; marque l'accès pour la LRU"""
+        if not DIGEST_PATTERN.match(digest):
+            return None
+        path = self.thumbnail_path(digest)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(path)
+            original = self.original_path(digest)
+            if os.path.exists(original):
+                os.utime(original)
+        except OSError:
+            pass
+        return path
+
+    def _cached_entries(self) -> Dict[str, list]:
+        """Par SHA-256 : [dernier accès, taille totale, fichiers] (original et miniature forment une entrée)"""
+        entries: Dict[str, list] = {}
+        for folder in ('originals', 'thumbs'):
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, folder)):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entry = entries.setdefault(filename.split('.')[0], [0.0, 0, []])
+                    entry[0] = max(entry[0], stat.st_mtime)
+                    entry[1] += stat.st_size
+                    entry[2].append(path)
+        return entries
+
+    def evict(self) -> int:
+        """
+        Supprime les images les moins récemment utilisées au-delà de la taille maximale :
+        original et miniature ensemble, puis leurs URLs de l'index pour qu'elles soient
+        téléchargées de nouveau au prochain passage
+        """
+        entries = sorted(self._cached_entries().items(), key=lambda item: item[1][0])
+        total = sum(size for _, (_, size, _) in entries)
+        evicted = set()
+        for digest, (_, size, paths) in entries:
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted.add(digest)
+        if evicted:
+            self._reload_index()
+            with self._lock:
+                self.url_index = {url: digest for url, digest in self.url_index.items() if digest not in evicted}
+            self.save_index()
+            print(f"🧹 {len(evicted)} images évincées du cache ({total / 1024 / 1024:.1f} Mo)")
+        return len(evicted)
+
+
+def open_asset_store() -> Optional[ImageAssetStore]:
+    """Store d'images si IMAGE_ASSETS=true, sinon None (l'interface garde les URLs distantes)"""
+    if os.getenv('IMAGE_ASSETS', 'false').lower() != 'true':
+        return None
+    try:
+        return ImageAssetStore()
+    except Exception as e:
+        print(f"❌ Erreur cache d'images: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache local des images d'articles")
+    parser.add_argument('action', choices=['sync', 'evict'], help='Action à effectuer')
+    parser.add_argument('--source', default=None,
+                        help='Export JSON/JSONL à parcourir (default: backend STORAGE_BACKEND)')
+    parser.add_argument('--path', default=None, help=f'Répertoire du cache (default: {DEFAULT_ASSET_PATH})')
+    parser.add_argument('--workers', type=int, default=8, help='Téléchargements parallèles (default: 8)')
+    args = parser.parse_args()
+
+    store = ImageAssetStore(args.path)
+    if args.action == 'evict':
+        store.evict()
+        return
+
+    if PILImage is None:
+        print("⚠️ Pillow non installé : images stockées sans miniatures")
+
+    start = time.perf_counter()
+    db_manager = None
+    try:
+        if args.source:
+            from local_search_index import iter_json_articles
+            articles = iter_json_articles(args.source)
+        else:
+            from storage import get_storage_backend
+            db_manager = get_storage_backend()
+            articles = db_manager.iter_all_articles()
+        store.download_for_articles(articles, args.workers)
+    finally:
+        if db_manager:
+            db_manager.close()
+    print(f"⏱️ Terminé en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
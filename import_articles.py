@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import en masse d'un export JSON (tableau) ou JSONL dans la base
+
+Le fichier est lu en flux (local_search_index.iter_json_records), sans être chargé en entier.
+Chaque article est converti : scraped_at, created_at, updated_at (ISO ou {"$date": ...} de
+mongoexport) en datetime, date en AAAA-MM-JJ, catégories en listes, images en dict. Les
+articles sont ensuite écrits par lots :
+- MongoDB : bulk_write non ordonnés (upsert sur l'URL) envoyés en parallèle par plusieurs
+  threads, contenus et images dans la collection des corps comme save_article ; les copies
+  archivées des URLs du lot sont supprimées (archives annuelles, archive.py)
+- SQLite  : save_articles par lot (une transaction, un seul écrivain)
+
+Un lot refusé par le backend interrompt l'import : le point de reprise s'arrête avant lui.
+Un enregistrement illisible (ligne JSONL tronquée, élément mal formé) est compté comme ignoré.
+
+Un article déjà présent (même URL) est mis à jour, jamais dupliqué, et garde son created_at.
+Sans created_at dans l'export, created_at reprend scraped_at : les recherches par date et
+l'archivage voient l'historique importé à sa date d'origine.
+
+Reprise : l'octet jusqu'où tous les lots sont écrits est enregistré dans `<fichier>.import.json` ;
+une nouvelle exécution reprend après lui (--restart pour tout relire). Les agrégats dérivés ne
+suivent pas l'import MongoDB : lancer ensuite python migrate.py trends et python related.py build.
+
+Usage : python import_articles.py articles.json [--workers 4] [--batch-size 1000]
+        python import_articles.py dump.jsonl --backend sqlite
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from local_search_index import iter_json_records
+from models import Article
+from mongodb_manager import BODY_FIELDS, MongoDBManager, split_article
+
+DATETIME_FIELDS = ('scraped_at', 'created_at', 'updated_at')
+LIST_FIELDS = ('categories', 'subcategories', 'duplicate_urls')
+STATE_SUFFIX = '.import.json'
+PROGRESS_INTERVAL = 2.0
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """datetime naïf depuis une chaîne ISO, un {"$date": ...} (JSON étendu) ou des millisecondes"""
+    if isinstance(value, Mapping):
+        value = value.get('$date')
+        if isinstance(value, Mapping):
+            value = int(value.get('$numberLong', 0))
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000, timezone.utc).replace(tzinfo=None)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            return None
+    return None
+
+
+def convert_article(raw: Mapping) -> Optional[Dict]:
+    """
+    Document à écrire depuis un article exporté (types convertis, champs inconnus ignorés),
+    None s'il n'a pas d'URL
+    """
+    data = {key: value for key, value in raw.items() if key != '_id'}
+    if not data.get('url'):
+        return None
+    for field in DATETIME_FIELDS:
+        if field in data:
+            data[field] = _to_datetime(data[field])
+    # Date de publication au format du scraper ; une valeur illisible est gardée telle quelle
+    published = _to_datetime(data.get('date'))
+    if published:
+        data['date'] = published.strftime('%Y-%m-%d')
+    for field in LIST_FIELDS:
+        if isinstance(data.get(field), str):
+            data[field] = [data[field]]
+    if isinstance(data.get('images'), list):
+        data['images'] = {f"image_{i}": image for i, image in enumerate(data['images'], 1)}
+
+    article = Article.from_json(data, strict=False)
+    document = article.to_mongo()
+    now = datetime.now()
+    document['created_at'] = article.created_at or article.scraped_at or now
+    document['updated_at'] = article.updated_at or now
+    return document
+
+
+def _batches(records: Iterator[Tuple[Dict, int]], batch_size: int) -> Iterator[Tuple[List[Dict], int, int]]:
+    """Lots de documents convertis : (documents, position après le lot, articles ignorés : sans URL ou illisibles)"""
+    batch, skipped, position = [], 0, None
+    for raw, position in records:
+        try:
+            document = convert_article(raw) if isinstance(raw, Mapping) else None
+        except Exception as e:
+            # Un article mal formé est ignoré : l'import (et sa reprise) ne bloque pas dessus
+            print(f"⚠️ Article illisible avant l'octet {position} ignoré: {e}")
+            document = None
+        if document is None:
+            skipped += 1
+        else:
+            batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch, position, skipped
+            batch, skipped = [], 0
+    if batch or skipped:
+        yield batch, position, skipped
+
+
+class BulkWriter:
+    """
+    Écrit des lots d'articles convertis : bulk_write MongoDB depuis plusieurs threads,
+    save_articles du backend sinon (un seul écrivain)
+    """
+
+    def __init__(self, repository, workers: int = 4):
+        self.repository = repository
+        self.mongo = isinstance(repository, MongoDBManager)
+        self.workers = max(1, workers) if self.mongo else 1
+
+    def write(self, documents: List[Dict]) -> int:
+        if not documents:
+            return 0
+        if not self.mongo:
+            # strict : un lot en échec est levé (jamais compté comme importé)
+            return self.repository.save_articles(documents, strict=True)
+
+        # Une URL répétée dans le lot : la dernière occurrence l'emporte
+        documents = list({document['url']: document for document in documents}.values())
+        body_writes, listing_writes = [], []
+        for document in documents:
+            created_at = document.pop('created_at')
+            if self.repository.split_bodies:
+                listing, body = split_article(document)
+                body_writes.append(ReplaceOne({'_id': document['url']},
+                                              {**body, 'updated_at': document['updated_at']}, upsert=True))
+                update = {'$set': listing, '$unset': {field: '' for field in BODY_FIELDS}}
+            else:
+                update = {'$set': document}
+            update['$setOnInsert'] = {'created_at': created_at}
+            listing_writes.append(UpdateOne({'url': document['url']}, update, upsert=True))
+
+        # Corps d'abord, comme save_article : un corps orphelin est sans effet
+        if body_writes:
+            self.repository.bodies.bulk_write(body_writes, ordered=False)
+        self._bulk_write(listing_writes)
+        # Un article déjà archivé est maintenant dans la collection chaude : pas de copie dans deux partitions
+        self.repository.drop_archived_copies(document['url'] for document in documents)
+        return len(documents)
+
+    def _bulk_write(self, writes):
+        """
+        bulk_write non ordonné ; deux threads qui insèrent la même URL au même moment
+        se heurtent à l'index unique : les upserts refusés sont rejoués une fois
+        """
+        try:
+            self.repository.collection.bulk_write(writes, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if not errors or any(error.get('code') != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            self.repository.collection.bulk_write([writes[error['index']] for error in errors], ordered=False)
+
+
+class ImportState:
+    """Point de reprise d'un import (`<fichier>.import.json`), valable tant que le fichier ne change pas"""
+
+    def __init__(self, source: str, path: Optional[str] = None):
+        self.path = path or source + STATE_SUFFIX
+        stat = os.stat(source)
+        self.source = {'source': os.path.abspath(source), 'size': stat.st_size, 'mtime': stat.st_mtime}
+        self.offset, self.imported, self.completed = 0, 0, False
+        self._saved_at = 0.0
+
+    def load(self) -> bool:
+        """Reprend l'état d'un import précédent du même fichier ; False s'il n'y en a pas"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if any(state.get(key) != value for key, value in self.source.items()):
+            print("⚠️ Le fichier a changé depuis l'import précédent : import complet")
+            return False
+        self.offset = state.get('offset', 0)
+        self.imported = state.get('imported', 0)
+        self.completed = state.get('completed', False)
+        return True
+
+    def advance(self, offset: int, imported: int, force: bool = False) -> None:
+        self.offset = offset
+        self.imported += imported
+        if force or time.monotonic() - self._saved_at >= 1.0:
+            self.save()
+
+    def save(self) -> None:
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({**self.source, 'offset': self.offset, 'imported': self.imported,
+                       'completed': self.completed, 'updated_at': datetime.now().isoformat()}, f, indent=2)
+        os.replace(temporary, self.path)
+        self._saved_at = time.monotonic()
+
+
+def import_file(repository, source: str, batch_size: int = 1000, workers: int = 4,
+                state_path: Optional[str] = None, restart: bool = False) -> Dict:
+    """
+    Importe un export JSON/JSONL dans le backend, reprend après le dernier lot écrit
+    Retourne un résumé : articles écrits, ignorés (sans URL ou illisibles), durée
+    """
+    state = ImportState(source, state_path)
+    if not restart and state.load():
+        if state.completed:
+            print(f"✅ {source} déjà importé ({state.imported} articles) : --restart pour le réimporter")
+            return {'imported': 0, 'skipped': 0, 'seconds': 0.0}
+        if state.offset:
+            print(f"⏩ Reprise à l'octet {state.offset} ({state.imported} articles déjà importés)")
+
+    writer = BulkWriter(repository, workers)
+    size = state.source['size'] or 1
+    imported = skipped = 0
+    start = last_report = time.monotonic()
+    # Lots en cours dans l'ordre de lecture : le point de reprise n'avance que
+    # jusqu'au dernier lot dont tous les prédécesseurs sont écrits
+    pending = deque()
+
+    def complete(future, position):
+        nonlocal imported
+        count = future.result()
+        imported += count
+        state.advance(position, count)
+
+    with ThreadPoolExecutor(max_workers=writer.workers) as executor:
+        try:
+            for batch, position, batch_skipped in _batches(iter_json_records(source, state.offset), batch_size):
+                skipped += batch_skipped
+                pending.append((executor.submit(writer.write, batch), position))
+                # Au plus deux lots d'avance par thread : la mémoire reste bornée
+                while pending and (pending[0][0].done() or len(pending) > writer.workers * 2):
+                    complete(*pending.popleft())
+
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    rate = imported / (last_report - start)
+                    print(f"   📥 {state.imported} articles importés ({position / size:.0%}, {rate:.0f}/s)")
+            while pending:
+                complete(*pending.popleft())
+        finally:
+            state.save()
+
+    state.completed = True
+    state.save()
+    return {'imported': imported, 'skipped': skipped, 'seconds': time.monotonic() - start}
+
+
+def main():
+    from storage import get_storage_backend
+
+    parser = argparse.ArgumentParser(description="Import en masse d'un export JSON/JSONL dans la base")
+    parser.add_argument('source', help='Export JSON (tableau) ou JSONL (un article par ligne)')
+    parser.add_argument('--backend', choices=['mongo', 'sqlite'], default=None,
+                        help='Backend de stockage (default: STORAGE_BACKEND)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Articles par lot (default: 1000)')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Lots écrits en parallèle avec MongoDB (default: 4)')
+    parser.add_argument('--state', default=None,
+                        help=f'Fichier du point de reprise (default: <source>{STATE_SUFFIX})')
+    parser.add_argument('--restart', action='store_true', help='Ignore le point de reprise et relit tout le fichier')
+    args = parser.parse_args()
+
+    print("📥 IMPORT EN MASSE")
+    print("=" * 60)
+
+    db_manager = None
+    try:
+        db_manager = get_storage_backend(args.backend)
+        summary = import_file(db_manager, args.source, args.batch_size, args.workers, args.state, args.restart)
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+    finally:
+        if db_manager:
+            db_manager.close()
+
+    if summary['seconds']:
+        rate = summary['imported'] / summary['seconds']
+        print(f"\n✅ {summary['imported']} articles importés en {summary['seconds']:.1f}s ({rate:.0f}/s)")
+        if summary['skipped']:
+            print(f"⚠️ {summary['skipped']} entrées sans URL ou illisibles ignorées")
+        if isinstance(db_manager, MongoDBManager):
+            print("ℹ️ Agrégats dérivés : python migrate.py trends && python related.py build")
+
+
+if __name__ == "__main__":
+    main()
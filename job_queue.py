@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File de travaux partagée pour le crawl distribué (baux à durée limitée)
+
+Chaque page de liste et chaque article est un travail identifié par son URL :
+- enqueue : upsert sur l'identifiant, un travail déjà connu n'est jamais dupliqué
+- lease   : réservation atomique (un seul worker obtient un travail donné) pour une
+            durée de visibilité ; passé ce délai sans acquittement, le travail redevient
+            disponible (worker arrêté, machine perdue)
+- ack     : acquittement, accepté seulement par le détenteur du bail en cours
+- fail    : nouvel essai avec attente exponentielle, puis lettre morte après max_attempts
+
+Deux implémentations de la même interface :
+- MongoJobQueue  : collection <collection>_jobs à côté des articles (plusieurs machines)
+- SQLiteJobQueue : fichier local jobs.db (plusieurs processus sur une même machine)
+
+Usage : python job_queue.py stats|requeue-dead|purge [--queue mongo|sqlite]
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from profiling import stage
+from storage import is_stored
+
+QUEUES = ('mongo', 'sqlite')
+JOB_STATUSES = ('pending', 'leased', 'done', 'dead')
+
+# Les articles passent avant les pages de liste : la file reste courte (parcours en profondeur)
+JOB_PRIORITIES = {'listing': 0, 'article': 1}
+
+DEFAULT_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '120'))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+RETRY_BASE_SECONDS = 10
+
+
+def job_id(kind: str, url: str) -> str:
+    return f"{kind}:{url}"
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class Job:
+    """Travail réservé : type, URL, charge utile et jeton du bail"""
+
+    __slots__ = ('id', 'kind', 'url', 'payload', 'attempts', 'token')
+
+    def __init__(self, kind: str, url: str, payload: Optional[Dict] = None,
+                 attempts: int = 0, token: Optional[str] = None):
+        self.id = job_id(kind, url)
+        self.kind = kind
+        self.url = url
+        self.payload = payload
+        self.attempts = attempts
+        self.token = token
+
+    def __repr__(self):
+        return f"Job({self.kind}, {self.url}, essai {self.attempts})"
+
+
+class JobQueue(ABC):
+    """Interface commune des files de travaux"""
+
+    def __init__(self, lease_seconds: int = DEFAULT_LEASE_SECONDS, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def retry_delay(self, attempts: int) -> float:
+        """Attente avant un nouvel essai : 10 s, 20 s, 40 s..."""
+        return RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+
+    @abstractmethod
+    def enqueue(self, jobs: Iterable[Tuple[str, str, Optional[Dict]]], refresh: bool = False) -> int:
+        """
+        Ajoute des travaux (type, url, charge utile) ; retourne le nombre de nouveaux
+        refresh=True remet aussi en attente les travaux déjà terminés (nouveau passage)
+        """
+
+    @abstractmethod
+    def lease(self, worker_id: str) -> Optional[Job]:
+        """Réserve atomiquement le prochain travail disponible (None si la file est vide)"""
+
+    @abstractmethod
+    def ack(self, job: Job) -> bool:
+        """Marque le travail terminé ; False si le bail a expiré et a été repris par un autre worker"""
+
+    @abstractmethod
+    def fail(self, job: Job, error: str) -> str:
+        """Échec : nouvel essai différé ou lettre morte ; retourne le nouveau statut"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Nombre de travaux par statut"""
+
+    @abstractmethod
+    def requeue_dead(self) -> int:
+        """Remet en attente les lettres mortes (après correction de la cause)"""
+
+    @abstractmethod
+    def purge(self, statuses: Iterable[str] = ('done',)) -> int:
+        """Supprime les travaux des statuts donnés"""
+
+    def close(self) -> None:
+        pass
+
+
+# ----------------------------------------------------------------------
+# MongoDB
+# ----------------------------------------------------------------------
+class MongoJobQueue(JobQueue):
+    """File dans la collection <collection>_jobs de la base des articles"""
+
+    def __init__(self, db_manager, **options):
+        super().__init__(**options)
+        self.db_manager = db_manager
+        self.jobs = db_manager.db[f"{db_manager.collection_name}_jobs"]
+
+    def create_indexes(self) -> None:
+        """Index de la réservation : statut, priorité puis date de disponibilité"""
+        self.jobs.create_index([('status', 1), ('priority', -1), ('available_at', 1)])
+        print("📊 Index de la file de travaux créés")
+
+    def enqueue(self, jobs, refresh=False):
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        now = datetime.now()
+        operations = []
+        for kind, url, payload in jobs:
+            pending = {'status': 'pending', 'attempts': 0, 'available_at': now, 'updated_at': now}
+            if refresh:
+                # Nouveau passage : un travail terminé repart, un travail en cours n'est pas touché
+                operations.append(UpdateOne({'_id': job_id(kind, url), 'status': {'$in': ['done', 'dead']}},
+                                            {'$set': {**pending, 'payload': payload}}))
+            operations.append(UpdateOne(
+                {'_id': job_id(kind, url)},
+                {'$setOnInsert': {**pending, 'kind': kind, 'url': url, 'payload': payload,
+                                  'priority': JOB_PRIORITIES.get(kind, 0), 'created_at': now}},
+                upsert=True
+            ))
+        if not operations:
+            return 0
+        try:
+            return self.jobs.bulk_write(operations, ordered=False).upserted_count
+        except BulkWriteError as e:
+            # Deux workers ajoutant le même article en même temps : l'un des upserts perd (clé dupliquée)
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                raise
+            return e.details.get('nUpserted', 0)
+
+    def _dead_letter_expired(self, now) -> int:
+        """Baux expirés au dernier essai autorisé : lettres mortes (worker tombé à chaque fois)"""
+        result = self.jobs.update_many(
+            {'status': 'leased', 'available_at': {'$lte': now}, 'attempts': {'$gte': self.max_attempts}},
+            {'$set': {'status': 'dead', 'last_error': 'bail expiré sans acquittement', 'updated_at': now}}
+        )
+        return result.modified_count
+
+    def lease(self, worker_id):
+        from pymongo import ReturnDocument
+
+        now = datetime.now()
+        token = uuid.uuid4().hex
+        document = self.jobs.find_one_and_update(
+            # 'leased' avec available_at dépassé = bail expiré, de nouveau visible
+            {'status': {'$in': ['pending', 'leased']}, 'available_at': {'$lte': now},
+             'attempts': {'$lt': self.max_attempts}},
+            {'$set': {'status': 'leased', 'leased_by': worker_id, 'lease_token': token,
+                      'available_at': now + timedelta(seconds=self.lease_seconds), 'updated_at': now},
+             '$inc': {'attempts': 1}},
+            sort=[('priority', -1), ('available_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            self._dead_letter_expired(now)
+            return None
+        return Job(document['kind'], document['url'], document.get('payload'),
+                   document['attempts'], token)
+
+    def ack(self, job):
+        result = self.jobs.update_one(
+            {'_id': job.id, 'lease_token': job.token, 'status': 'leased'},
+            {'$set': {'status': 'done', 'updated_at': datetime.now()},
+             '$unset': {'lease_token': '', 'last_error': ''}}
+        )
+        return result.modified_count == 1
+
+    def fail(self, job, error):
+        now = datetime.now()
+        if job.attempts >= self.max_attempts:
+            update = {'status': 'dead'}
+        else:
+            update = {'status': 'pending', 'available_at': now + timedelta(seconds=self.retry_delay(job.attempts))}
+        self.jobs.update_one(
+            {'_id': job.id, 'lease_token': job.token},
+            {'$set': {**update, 'last_error': error[:500], 'updated_at': now}, '$unset': {'lease_token': ''}}
+        )
+        return update['status']
+
+    def stats(self):
+        self._dead_letter_expired(datetime.now())
+        counts = {status: 0 for status in JOB_STATUSES}
+        for row in self.jobs.aggregate([{'$group': {'_id': '$status', 'count': {'$sum': 1}}}]):
+            counts[row['_id']] = row['count']
+        return counts
+
+    def requeue_dead(self):
+        result = self.jobs.update_many(
+            {'status': 'dead'},
+            {'$set': {'status': 'pending', 'attempts': 0, 'available_at': datetime.now()}}
+        )
+        return result.modified_count
+
+    def purge(self, statuses=('done',)):
+        return self.jobs.delete_many({'status': {'$in': list(statuses)}}).deleted_count
+
+
+# ----------------------------------------------------------------------
+# SQLite (une machine, plusieurs processus)
+# ----------------------------------------------------------------------
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    leased_by TEXT,
+    lease_token TEXT,
+    last_error TEXT,
+    created_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, priority DESC, available_at);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """File dans un fichier SQLite (WAL) : chaque réservation est une seule instruction UPDATE atomique"""
+
+    def __init__(self, path: Optional[str] = None, **options):
+        super().__init__(**options)
+        self.path = path or os.getenv('JOB_QUEUE_PATH', 'jobs.db')
+        # Autocommit : chaque instruction est sa propre transaction, verrou d'écriture bref
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(JOBS_SCHEMA)
+
+    def enqueue(self, jobs, refresh=False):
+        now = time.time()
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for kind, url, payload in jobs:
+                encoded = json.dumps(payload, ensure_ascii=False) if payload is not None else None
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (id, kind, url, payload, priority, available_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id(kind, url), kind, url, encoded, JOB_PRIORITIES.get(kind, 0), now, now, now)
+                )
+                added += cursor.rowcount
+                if refresh and not cursor.rowcount:
+                    self.conn.execute(
+                        "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ?, payload = ?, updated_at = ? "
+                        "WHERE id = ? AND status IN ('done', 'dead')",
+                        (now, encoded, now, job_id(kind, url))
+                    )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def _dead_letter_expired(self, now) -> int:
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'dead', last_error = 'bail expiré sans acquittement', updated_at = ? "
+            "WHERE status = 'leased' AND available_at <= ? AND attempts >= ?",
+            (now, now, self.max_attempts)
+        )
+        return cursor.rowcount
+
+    def lease(self, worker_id):
+        now = time.time()
+        token = uuid.uuid4().hex
+        row = self.conn.execute(
+            "UPDATE jobs SET status = 'leased', leased_by = ?, lease_token = ?, attempts = attempts + 1, "
+            "available_at = ?, updated_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status IN ('pending', 'leased') AND available_at <= ? "
+            "            AND attempts < ? ORDER BY priority DESC, available_at LIMIT 1) "
+            "RETURNING kind, url, payload, attempts",
+            (worker_id, token, now + self.lease_seconds, now, now, self.max_attempts)
+        ).fetchone()
+        if row is None:
+            self._dead_letter_expired(now)
+            return None
+        payload = json.loads(row['payload']) if row['payload'] else None
+        return Job(row['kind'], row['url'], payload, row['attempts'], token)
+
+    def ack(self, job):
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'done', lease_token = NULL, last_error = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+            (time.time(), job.id, job.token)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job, error):
+        now = time.time()
+        status = 'dead' if job.attempts >= self.max_attempts else 'pending'
+        available_at = now if status == 'dead' else now + self.retry_delay(job.attempts)
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_token = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_token = ?",
+            (status, available_at, error[:500], now, job.id, job.token)
+        )
+        return status
+
+    def stats(self):
+        self._dead_letter_expired(time.time())
+        counts = {status: 0 for status in JOB_STATUSES}
+        for row in self.conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"):
+            counts[row['status']] = row['count']
+        return counts
+
+    def requeue_dead(self):
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, available_at = ? WHERE status = 'dead'",
+            (time.time(),)
+        )
+        return cursor.rowcount
+
+    def purge(self, statuses=('done',)):
+        statuses = list(statuses)
+        placeholders = ', '.join('?' for _ in statuses)
+        return self.conn.execute(f"DELETE FROM jobs WHERE status IN ({placeholders})", statuses).rowcount
+
+    def close(self):
+        self.conn.close()
+
+
+def get_job_queue(name: Optional[str] = None, db_manager=None, **options) -> JobQueue:
+    """
+    Instancie la file configurée (JOB_QUEUE ou option --queue)
+    - mongo  : collection <collection>_jobs, partagée entre machines
+    - sqlite : fichier local JOB_QUEUE_PATH (default: jobs.db)
+    """
+    name = (name or os.getenv('JOB_QUEUE', 'sqlite')).lower()
+    if name == 'mongo':
+        if db_manager is None or not hasattr(db_manager, 'db'):
+            from mongodb_manager import MongoDBManager
+            db_manager = MongoDBManager()
+        return MongoJobQueue(db_manager, **options)
+    if name == 'sqlite':
+        return SQLiteJobQueue(**options)
+    raise ValueError(f"File de travaux inconnue: '{name}' (choix: {', '.join(QUEUES)})")
+
+
+# ----------------------------------------------------------------------
+# Worker
+# ----------------------------------------------------------------------
+# Champs de la page de liste prioritaires sur ceux lus dans la page de l'article
+PREVIEW_FIELDS = ('title', 'thumbnail', 'subcategory', 'summary', 'date', 'original_date')
+
+
+class CrawlWorker:
+    """
+    Boucle d'un worker : réserve un travail, l'exécute, écrit via le backend, acquitte
+    - liste   : extrait les prévisualisations et ajoute un travail par article
+    - article : récupère la page de l'article et la sauvegarde
+    `delay` espace les travaux d'un scraper sans limite de débit propre ; 0 avec SiteScrapers,
+    dont chaque hôte a déjà son HostLimiter
+    """
+
+    def __init__(self, queue: JobQueue, scraper, db_manager, worker_id: Optional[str] = None,
+                 delay: float = 1.0, idle_timeout: float = 30.0):
+        self.queue = queue
+        self.scraper = scraper
+        self.db_manager = db_manager
+        self.worker_id = worker_id or default_worker_id()
+        self.delay = delay
+        self.idle_timeout = idle_timeout
+        self.processed = 0
+        self.failed = 0
+
+    def handle_listing(self, job: Job) -> None:
+        max_articles = (job.payload or {}).get('max_articles', 30)
+        previews = self.scraper.fetch_listing(job.url, max_articles)
+        added = self.queue.enqueue(('article', preview.url, preview.to_json()) for preview in previews)
+        print(f"📰 {len(previews)} articles sur {job.url} ({added} nouveaux travaux)")
+
+    def handle_article(self, job: Job) -> None:
+        article = self.scraper.fetch_article(job.url)
+        if article is None:
+            raise RuntimeError("article introuvable ou illisible")
+        for field in PREVIEW_FIELDS:
+            value = (job.payload or {}).get(field)
+            if value:
+                setattr(article, field, value)
+        article.url = job.url
+        with stage('db_write'), self.db_manager.tracking_trends([article]):
+            saved = self.db_manager.save_article(article)
+        if not saved:
+            raise RuntimeError("échec de la sauvegarde")
+        # Quasi-doublon fusionné : son URL n'est pas un article stocké, rien à publier
+        if is_stored(saved):
+            self.db_manager.publish_saved([article])
+
+    def run_once(self) -> bool:
+        """Traite un travail ; False si la file n'en a aucun de disponible"""
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+        start = time.perf_counter()
+        try:
+            if job.kind == 'listing':
+                self.handle_listing(job)
+            elif job.kind == 'article':
+                self.handle_article(job)
+            else:
+                raise ValueError(f"type de travail inconnu: {job.kind}")
+        except Exception as e:
+            self.failed += 1
+            status = self.queue.fail(job, str(e))
+            print(f"⚠️ {job} en échec ({status}): {e}")
+        else:
+            self.processed += 1
+            if not self.queue.ack(job):
+                print(f"⚠️ Bail expiré avant l'acquittement: {job.url}")
+            print(f"✅ [{self.worker_id}] {job.kind} {job.url} ({time.perf_counter() - start:.1f}s)")
+        # Politesse envers le site : chaque worker espace ses requêtes
+        if self.delay:
+            time.sleep(self.delay)
+        return True
+
+    def run(self, max_jobs: Optional[int] = None) -> int:
+        """Boucle jusqu'à max_jobs travaux ou idle_timeout secondes sans travail disponible"""
+        print(f"👷 Worker {self.worker_id} démarré")
+        idle_since = None
+        while max_jobs is None or self.processed + self.failed < max_jobs:
+            if self.run_once():
+                idle_since = None
+                continue
+            idle_since = idle_since or time.monotonic()
+            if time.monotonic() - idle_since >= self.idle_timeout:
+                break
+            time.sleep(min(2.0, self.idle_timeout))
+        print(f"🏁 Worker {self.worker_id}: {self.processed} travaux faits, {self.failed} échecs")
+        return self.processed
+
+
+def seed_listings(queue: JobQueue, urls: List[str], max_articles: int = 30, refresh: bool = True) -> int:
+    """Ajoute les pages de liste à crawler (refresh : les pages déjà traitées repartent)"""
+    return queue.enqueue((('listing', url, {'max_articles': max_articles}) for url in urls), refresh=refresh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='File de travaux du crawl distribué')
+    parser.add_argument('action', choices=['stats', 'requeue-dead', 'purge'], help='Action à effectuer')
+    parser.add_argument('--queue', choices=QUEUES, default=None, help='File de travaux (default: JOB_QUEUE ou sqlite)')
+    args = parser.parse_args()
+
+    queue = get_job_queue(args.queue)
+    try:
+        if args.action == 'stats':
+            for status, count in queue.stats().items():
+                print(f"   {status:<8} {count}")
+        elif args.action == 'requeue-dead':
+            print(f"🔁 {queue.requeue_dead()} lettres mortes remises en attente")
+        elif args.action == 'purge':
+            print(f"🧹 {queue.purge()} travaux terminés supprimés")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de recherche embarqué (index inversé local) pour les exports JSON/JSONL
+Permet de servir les recherches sans MongoDB, avec les mêmes méthodes que MongoDBManager
+
+Format sur disque (répertoire d'index) :
+- lexicon.json : dictionnaire des termes et facettes -> (offset, nombre) dans postings.bin
+- postings.bin : listes de postings en uint32 (doc_id, tf) pour le texte, doc_id pour les facettes
+- doclens.bin  : longueur (en tokens) de chaque document, pour BM25
+  (les plages de dates et le tri portent sur created_at, comme MongoDB et SQLite)
+- docs.bin     : documents JSON concaténés, bornes dans lexicon.json
+Les fichiers binaires sont mappés en mémoire (mmap) à l'ouverture.
+"""
+
+import argparse
+import bisect
+import codecs
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from storage import ArticleRepository
+from text_utils import fold_accents, tokenize
+from trends import MemoryTrendStore, TrendRollups
+
+FACET_FIELDS = ('categories', 'subcategories', 'subcategory', 'author')
+DEFAULT_INDEX_PATH = 'search_index'
+
+
+READ_CHUNK_SIZE = 1 << 20
+_JSON_DECODER = json.JSONDecoder()
+# Entre deux éléments d'un tableau : blancs, virgules, et le crochet ouvrant du début
+_ARRAY_SEPARATORS = re.compile(r'[\s,\[]*')
+
+
+def _created_at_key(article: Dict) -> Optional[str]:
+    """created_at ISO de l'article (scraped_at à défaut, comme à l'import) : clé des plages de dates"""
+    value = article.get('created_at') or article.get('scraped_at')
+    if isinstance(value, dict):
+        value = value.get('$date')
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value:
+        return value.replace(' ', 'T').rstrip('Z')
+    return None
+
+
+def _is_json_array(f) -> bool:
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            return char == b'['
+
+
+def _element_end(buffer: str, index: int) -> Optional[int]:
+    """
+    Fin de l'élément qui commence à `index` : position de la virgule ou du crochet fermant
+    du tableau qui le suit (hors chaînes et sous-objets), None si le bloc s'arrête avant
+    """
+    depth, in_string, escaped = 0, False, False
+    for position in range(index, len(buffer)):
+        char = buffer[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            depth += 1
+        elif char in '}]':
+            if depth == 0:
+                return position
+            depth -= 1
+        elif char == ',' and depth == 0:
+            return position
+    return None
+
+
+def _iter_json_array(f, offset: int) -> Iterator[Tuple[Optional[Dict], int]]:
+    """
+    Éléments d'un tableau JSON lus par blocs (raw_decode), depuis l'octet `offset`
+    Un élément illisible donne (None, position) : la lecture reprend à la virgule suivante
+    """
+    f.seek(offset)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, position = '', offset  # position : octet du fichier qui correspond à buffer[0]
+    while True:
+        chunk = f.read(READ_CHUNK_SIZE)
+        buffer += decoder.decode(chunk, final=not chunk)
+        index = 0
+        while True:
+            # Séparateurs ASCII : un octet par caractère
+            skipped = _ARRAY_SEPARATORS.match(buffer, index).end()
+            position += skipped - index
+            index = skipped
+            if index == len(buffer) or buffer[index] == ']':
+                break
+            try:
+                document, end = _JSON_DECODER.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                end = _element_end(buffer, index)
+                if end is None and chunk:
+                    break  # élément coupé par la fin du bloc : lire la suite
+                # Élément complet mais mal formé (ou tronqué en fin de fichier) : ignoré
+                end = len(buffer) if end is None else end
+                print(f"⚠️ Élément JSON illisible à l'octet {position} ignoré")
+                document = None
+            position += len(buffer[index:end].encode('utf-8'))
+            index = end
+            yield document, position
+        buffer = buffer[index:]
+        if buffer.startswith(']') or not chunk:
+            return
+
+
+def iter_json_records(path: str, offset: int = 0) -> Iterator[Tuple[Optional[Dict], int]]:
+    """
+    Lit un export JSON (tableau) ou JSONL (un article par ligne) sans le charger en entier
+    Produit (article, position) : position est l'octet qui suit l'article, point de reprise
+    à repasser en `offset` pour continuer la lecture après lui ; article vaut None pour un
+    enregistrement illisible (ligne tronquée, JSON mal formé), ignoré sans arrêter la lecture
+    """
+    with open(path, 'rb') as f:
+        if _is_json_array(f):
+            yield from _iter_json_array(f, offset)
+            return
+        f.seek(offset)
+        position = offset
+        for line in f:
+            start = position
+            position += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                document = json.loads(line)
+            except ValueError:
+                print(f"⚠️ Ligne JSON illisible à l'octet {start} ignorée")
+                document = None
+            yield document, position
+
+
+def iter_json_articles(path: str) -> Iterator[Dict]:
+    """Lit les articles d'un export JSON (tableau) ou JSONL (un article par ligne), en flux"""
+    for article, _ in iter_json_records(path):
+        if article is not None:
+            yield article
+
+
+def _facet_values(article: Dict, field: str) -> List[str]:
+    value = article.get(field)
+    if isinstance(value, list):
+        return [v for v in value if v and v.strip()]
+    return [value] if value and str(value).strip() else []
+
+
+class LocalSearchIndex(ArticleRepository):
+    """Index inversé en lecture seule, mappé en mémoire"""
+
+    # Paramètres BM25
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH):
+        self.index_path = index_path
+        with open(os.path.join(index_path, 'lexicon.json'), 'r', encoding='utf-8') as f:
+            lexicon = json.load(f)
+
+        self.terms = lexicon['terms']
+        self.title_terms = lexicon['title_terms']
+        self.facets = lexicon['facets']
+        if 'created_at' in lexicon:
+            self.dates = lexicon['created_at']
+        else:
+            print(f"⚠️ Index {index_path} sans created_at (ancien format) : dates de publication utilisées, "
+                  f"reconstruire l'index")
+            self.dates = lexicon['dates']
+        self.date_keys = [entry[0] for entry in self.dates]
+        self.doc_offsets = lexicon['doc_offsets']
+        self.doc_count = lexicon['doc_count']
+        self.avgdl = lexicon['avgdl'] or 1.0
+
+        self._files = []
+        self._trends = None
+        self._doc_dates = None
+        self.postings = self._map('postings.bin')
+        self.doclens = self._map('doclens.bin')
+        self._docs_mmap = self._map('docs.bin', cast=False)
+        print(f"✅ Index local chargé - {self.doc_count} articles ({index_path})")
+
+    def _map(self, filename: str, cast: bool = True):
+        f = open(os.path.join(self.index_path, filename), 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(array('I')) if cast else b''
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._files.append(mapped)
+        return memoryview(mapped).cast('I') if cast else mapped
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, articles: Iterable[Dict], index_path: str = DEFAULT_INDEX_PATH) -> 'LocalSearchIndex':
+        """Construit l'index à partir d'articles (dicts) et l'écrit sur disque"""
+        os.makedirs(index_path, exist_ok=True)
+
+        text_postings = defaultdict(list)
+        title_postings = defaultdict(list)
+        facet_postings = {field: defaultdict(list) for field in FACET_FIELDS}
+        facet_labels = {field: {} for field in FACET_FIELDS}
+        date_postings = defaultdict(list)
+        doclens = array('I')
+        doc_offsets = [0]
+
+        with open(os.path.join(index_path, 'docs.bin'), 'wb') as docs_file:
+            seen_urls = set()
+            for article in articles:
+                if article.get('url') in seen_urls:
+                    continue
+                seen_urls.add(article.get('url'))
+                doc_id = len(doclens)
+
+                tokens = tokenize(' '.join(filter(None, (
+                    article.get('title'), article.get('summary'), article.get('content')
+                ))))
+                doclens.append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    text_postings[term].append((doc_id, tf))
+                for term in set(tokenize(article.get('title') or '', stem=False)):
+                    title_postings[term].append(doc_id)
+
+                for field in FACET_FIELDS:
+                    for value in _facet_values(article, field):
+                        key = fold_accents(value.strip())
+                        facet_labels[field].setdefault(key, value.strip())
+                        postings = facet_postings[field][key]
+                        if not postings or postings[-1] != doc_id:
+                            postings.append(doc_id)
+                created_at = _created_at_key(article)
+                if created_at:
+                    date_postings[created_at].append(doc_id)
+
+                encoded = json.dumps(article, ensure_ascii=False, default=str).encode('utf-8')
+                docs_file.write(encoded)
+                doc_offsets.append(doc_offsets[-1] + len(encoded))
+
+        postings = array('I')
+
+        def write_postings(values) -> List[int]:
+            offset = len(postings)
+            postings.extend(values)
+            return [offset, len(values)]
+
+        terms = {}
+        for term in sorted(text_postings):
+            flat = [v for pair in text_postings[term] for v in pair]
+            terms[term] = write_postings(flat)
+        title_terms = {term: write_postings(ids) for term, ids in sorted(title_postings.items())}
+        facets = {
+            field: {key: [facet_labels[field][key]] + write_postings(ids)
+                    for key, ids in sorted(facet_postings[field].items())}
+            for field in FACET_FIELDS
+        }
+        dates = [[date] + write_postings(ids) for date, ids in sorted(date_postings.items())]
+
+        with open(os.path.join(index_path, 'postings.bin'), 'wb') as f:
+            postings.tofile(f)
+        with open(os.path.join(index_path, 'doclens.bin'), 'wb') as f:
+            doclens.tofile(f)
+        with open(os.path.join(index_path, 'lexicon.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'terms': terms,
+                'title_terms': title_terms,
+                'facets': facets,
+                'created_at': dates,
+                'doc_offsets': doc_offsets,
+                'doc_count': len(doclens),
+                'avgdl': (sum(doclens) / len(doclens)) if doclens else 0
+            }, f, ensure_ascii=False)
+
+        print(f"📚 Index local construit: {len(doclens)} articles, {len(terms)} termes -> {index_path}")
+        return cls(index_path)
+
+    @classmethod
+    def build_from_file(cls, source_path: str, index_path: str = DEFAULT_INDEX_PATH) -> 'LocalSearchIndex':
+        return cls.build(iter_json_articles(source_path), index_path)
+
+    # ------------------------------------------------------------------
+    # Accès bas niveau
+    # ------------------------------------------------------------------
+    def _slice(self, entry) -> memoryview:
+        offset, count = entry[-2], entry[-1]
+        return self.postings[offset:offset + count]
+
+    def _facet_ids(self, field: str, value: str) -> List[int]:
+        entry = self.facets.get(field, {}).get(fold_accents(value.strip()))
+        return list(self._slice(entry)) if entry else []
+
+    def _subcategory_ids(self, subcategory: str) -> set:
+        return set(self._facet_ids('subcategories', subcategory)) | set(self._facet_ids('subcategory', subcategory))
+
+    def _date_ids(self, start_date: Optional[str], end_date: Optional[str]) -> List[int]:
+        """Documents dont created_at est entre les bornes AAAA-MM-JJ (à minuit, comme MongoDB et SQLite)"""
+        lo, hi = 0, len(self.date_keys)
+        if start_date:
+            lo = bisect.bisect_left(self.date_keys, datetime.strptime(start_date, '%Y-%m-%d').isoformat())
+        if end_date:
+            hi = bisect.bisect_right(self.date_keys, datetime.strptime(end_date, '%Y-%m-%d').isoformat())
+        return [doc_id for entry in self.dates[lo:hi] for doc_id in self._slice(entry)]
+
+    def get_document(self, doc_id: int) -> Dict:
+        start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+        return json.loads(self._docs_mmap[start:end].decode('utf-8'))
+
+    def _documents(self, doc_ids: Iterable[int]) -> List[Dict]:
+        return [self.get_document(doc_id) for doc_id in sorted(set(doc_ids))]
+
+    def _facet_labels(self, field: str) -> List[str]:
+        return [entry[0] for entry in self.facets.get(field, {}).values()]
+
+    # ------------------------------------------------------------------
+    # Recherche plein texte (BM25)
+    # ------------------------------------------------------------------
+    def _scores(self, text: str) -> Dict[int, float]:
+        """Score BM25 de chaque document contenant au moins un terme du texte"""
+        scores = defaultdict(float)
+        for term in set(tokenize(text)):
+            entry = self.terms.get(term)
+            if not entry:
+                continue
+            pairs = self._slice(entry)
+            df = len(pairs) // 2
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            for i in range(0, len(pairs), 2):
+                doc_id, tf = pairs[i], pairs[i + 1]
+                norm = self.K1 * (1 - self.B + self.B * self.doclens[doc_id] / self.avgdl)
+                scores[doc_id] += idf * tf * (self.K1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """Recherche plein texte classée par BM25 sur titre, résumé et contenu"""
+        scores = self._scores(text)
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        articles = []
+        for doc_id, score in best:
+            article = self.get_document(doc_id)
+            article['score'] = round(score, 4)
+            articles.append(article)
+        print(f"🔍 Trouvé {len(scores)} articles pour '{text}'")
+        return articles
+
+    # ------------------------------------------------------------------
+    # Interface compatible MongoDBManager
+    # ------------------------------------------------------------------
+    def get_all_categories(self):
+        categories = sorted(self._facet_labels('categories'))
+        print(f"📊 Catégories trouvées: {len(categories)}")
+        return categories
+
+    def get_all_subcategories(self):
+        subcategories = set(self._facet_labels('subcategories')) | set(self._facet_labels('subcategory'))
+        subcategories = sorted(subcategories)
+        print(f"📊 Sous-catégories trouvées: {len(subcategories)}")
+        return subcategories
+
+    def get_all_authors(self):
+        authors = sorted(self._facet_labels('author'))
+        print(f"📊 Auteurs trouvés: {len(authors)}")
+        return authors
+
+    def get_articles_by_category(self, category):
+        articles = self._documents(self._facet_ids('categories', category))
+        print(f"🔍 Trouvé {len(articles)} articles dans la catégorie '{category}'")
+        return articles
+
+    def get_articles_by_subcategory(self, subcategory):
+        articles = self._documents(self._subcategory_ids(subcategory))
+        print(f"🔍 Trouvé {len(articles)} articles avec la sous-catégorie '{subcategory}'")
+        return articles
+
+    def get_articles_by_category_and_subcategory(self, category, subcategory):
+        articles = self._documents(self._subcategory_ids(subcategory).intersection(self._facet_ids('categories', category)))
+        print(f"🔍 Trouvé {len(articles)} articles pour '{category}' > '{subcategory}'")
+        return articles
+
+    def get_subcategories_by_category(self, category):
+        subcategories = set()
+        for doc_id in self._facet_ids('categories', category):
+            article = self.get_document(doc_id)
+            subcategories.update(_facet_values(article, 'subcategories'))
+            subcategories.update(_facet_values(article, 'subcategory'))
+        subcategories = sorted(subcategories)
+        print(f"✅ Sous-catégories finales pour '{category}': {len(subcategories)}")
+        return subcategories
+
+    def get_articles_by_author(self, author):
+        articles = self._documents(self._facet_ids('author', author))
+        print(f"🔍 Trouvé {len(articles)} articles de l'auteur '{author}'")
+        return articles
+
+    def get_articles_by_date_range(self, start_date, end_date):
+        """Articles dont la date de création est dans la plage (même sémantique que MongoDBManager)"""
+        try:
+            articles = self._documents(self._date_ids(start_date, end_date))
+            print(f"🔍 Trouvé {len(articles)} articles entre {start_date} et {end_date}")
+            return articles
+        except ValueError as e:
+            print(f"❌ Erreur lors de la recherche par date: {e}")
+            return []
+
+    def _title_matches(self, search_term: str, candidates: Optional[Iterable[int]] = None):
+        """(doc_id, article) dont le titre contient le terme, parmi `candidates` (tous par défaut)"""
+        folded = fold_accents(search_term.strip())
+        words = tokenize(search_term, stem=False)
+        # Seuls les mots complets du terme (pas le premier/dernier, potentiellement tronqués) filtrent
+        for word in (words[1:-1] if len(words) > 2 else []):
+            entry = self.title_terms.get(word)
+            ids = set(self._slice(entry)) if entry else set()
+            candidates = ids if candidates is None else ids.intersection(candidates)
+        if candidates is None:
+            candidates = range(self.doc_count)
+
+        for doc_id in sorted(candidates):
+            article = self.get_document(doc_id)
+            if folded in fold_accents(article.get('title') or ''):
+                yield doc_id, article
+
+    def search_in_title(self, search_term):
+        """Recherche de sous-chaîne dans les titres, filtrée par les postings des mots complets"""
+        articles = [article for _, article in self._title_matches(search_term)]
+        print(f"🔍 Trouvé {len(articles)} articles avec '{search_term}' dans le titre")
+        return articles
+
+    @property
+    def doc_dates(self) -> Dict[int, str]:
+        """created_at de chaque document (tri de la recherche combinée)"""
+        if self._doc_dates is None:
+            self._doc_dates = {doc_id: entry[0] for entry in self.dates for doc_id in self._slice(entry)}
+        return self._doc_dates
+
+    def find_articles(self, query):
+        """
+        Recherche combinée paginée : intersection des postings de chaque filtre
+        (created_at, comme get_articles_by_date_range), puis tri et découpage
+        """
+        filters = []
+        if query.category:
+            filters.append(self._facet_ids('categories', query.category))
+        if query.subcategory:
+            filters.append(self._subcategory_ids(query.subcategory))
+        if query.author:
+            filters.append(self._facet_ids('author', query.author))
+        if query.start_date or query.end_date:
+            filters.append(self._date_ids(query.start_date, query.end_date))
+        scores = self._scores(query.text) if query.text else None
+        if scores is not None:
+            filters.append(scores)
+        candidates = None
+        for ids in filters:
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+        if query.title:
+            # Sous-chaîne du titre : vérifiée sur les seuls documents retenus par les autres filtres
+            candidates = [doc_id for doc_id, _ in self._title_matches(query.title, candidates)]
+        if candidates is None:
+            candidates = range(self.doc_count)
+
+        if query.sort == 'relevance':
+            ordered = sorted(candidates, key=lambda doc_id: (-scores[doc_id], doc_id))
+        else:
+            dates = self.doc_dates
+            ordered = sorted(candidates, key=lambda doc_id: (dates.get(doc_id, ''), doc_id),
+                             reverse=query.sort == 'recent')
+
+        articles = []
+        for doc_id in ordered[query.skip:query.skip + query.per_page]:
+            article = self.get_document(doc_id)
+            if scores is not None:
+                article['score'] = round(scores[doc_id], 4)
+            articles.append(article)
+        print(f"🔍 Trouvé {len(ordered)} articles ({query.describe()}), page {query.page}")
+        return query.page_result(articles, len(ordered))
+
+    def iter_all_articles(self, since=None):
+        since = since.isoformat() if since else None
+        for doc_id in range(self.doc_count):
+            article = self.get_document(doc_id)
+            if since is None or (article.get('scraped_at') or '') > since:
+                yield article
+
+    def get_stats(self):
+        return {
+            'total_articles': self.doc_count,
+            'categories_count': len(self.facets.get('categories', {})),
+            'subcategories_count': len(self.get_all_subcategories()),
+            'authors_count': len(self.facets.get('author', {}))
+        }
+
+    @property
+    def trends(self):
+        """Agrégats temporels calculés en mémoire à la première demande (index en lecture seule)"""
+        if self._trends is None:
+            self._trends = TrendRollups(MemoryTrendStore())
+            self._trends.rebuild(self.iter_all_articles())
+        return self._trends
+
+    def save_article(self, article_data):
+        """L'index local est en lecture seule : il se reconstruit depuis l'export JSON"""
+        print("⚠️ Index local en lecture seule, article ignoré (reconstruire avec 'build')")
+        return None
+
+    def close(self):
+        self.postings.release()
+        self.doclens.release()
+        for f in reversed(self._files):
+            f.close()
+        self._files = []
+        print("Index local fermé")
+
+
+def open_local_index(index_path: Optional[str] = None, source_path: Optional[str] = None) -> Optional[LocalSearchIndex]:
+    """
+    Ouvre l'index local, en le (re)construisant depuis l'export JSON s'il est absent ou périmé
+    Retourne None si aucune source n'est disponible
+    """
+    index_path = index_path or os.getenv('LOCAL_INDEX_PATH', DEFAULT_INDEX_PATH)
+    source_path = source_path or os.getenv('LOCAL_INDEX_SOURCE', 'articles.json')
+    lexicon_path = os.path.join(index_path, 'lexicon.json')
+
+    source_exists = os.path.exists(source_path)
+    if os.path.exists(lexicon_path):
+        if not source_exists or os.path.getmtime(lexicon_path) >= os.path.getmtime(source_path):
+            return LocalSearchIndex(index_path)
+    if source_exists:
+        return LocalSearchIndex.build_from_file(source_path, index_path)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index de recherche local (sans MongoDB)')
+    parser.add_argument('action', choices=['build', 'search'], help='Action à effectuer')
+    parser.add_argument('--source', default='articles.json', help='Export JSON/JSONL (default: articles.json)')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help=f'Répertoire de l\'index (default: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--query', default='', help='Texte à rechercher (action search)')
+    parser.add_argument('--limit', type=int, default=10, help='Nombre de résultats (default: 10)')
+    args = parser.parse_args()
+
+    if args.action == 'build':
+        LocalSearchIndex.build_from_file(args.source, args.index).close()
+    elif args.action == 'search':
+        if not args.query:
+            print("❌ --query est requis pour la recherche")
+            sys.exit(1)
+        index = LocalSearchIndex(args.index)
+        for i, article in enumerate(index.search(args.query, args.limit), 1):
+            print(f"{i}. [{article['score']}] {article.get('title', 'Sans titre')}")
+            print(f"   {article.get('url', 'N/A')}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migrations ponctuelles de la base MongoDB (provisionnement des index, etc.)
+À lancer une fois par déploiement plutôt qu'à chaque démarrage de processus
+"""
+
+import argparse
+import sys
+from mongodb_manager import MongoDBManager
+from job_queue import MongoJobQueue
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrations de la base MongoDB')
+    parser.add_argument('steps', nargs='*', choices=['indexes', 'split-bodies', 'trends'], default=['indexes'],
+                       help='Étapes à exécuter (default: indexes ; split-bodies : contenus vers <collection>_bodies ; '
+                            'trends : calcul initial des agrégats temporels)')
+
+    args = parser.parse_args()
+
+    print("🛠️ MIGRATION MONGODB")
+    print("=" * 60)
+
+    try:
+        db_manager = MongoDBManager()
+        db_manager.check_connection()
+
+        if 'indexes' in args.steps:
+            print("\n📊 Provisionnement des index...")
+            db_manager.create_indexes()
+            MongoJobQueue(db_manager).create_indexes()
+
+        if 'split-bodies' in args.steps:
+            print("\n🗜️ Séparation des contenus et images de la collection principale...")
+            db_manager.migrate_split_bodies()
+
+        if 'trends' in args.steps:
+            print("\n📈 Calcul des agrégats temporels depuis les articles existants...")
+            count = db_manager.rebuild_trends()
+            print(f"✅ Tendances calculées pour {count} articles")
+
+        db_manager.close()
+        print("\n✅ Migration terminée")
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modèles typés du pipeline de scraping (Article, Image)
+Objets à __slots__ : empreinte mémoire réduite, pas de copies de dicts entre les étapes,
+et toute faute de frappe sur un champ lève une AttributeError
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Union
+
+
+class Image:
+    """Image d'un article avec sa légende"""
+
+    __slots__ = ('url', 'caption')
+
+    def __init__(self, url: str, caption: str = ''):
+        self.url = url
+        self.caption = caption
+
+    def to_dict(self) -> Dict[str, str]:
+        return {'url': self.url, 'caption': self.caption}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Image':
+        return cls(data.get('url'), data.get('caption', ''))
+
+    def __eq__(self, other):
+        return isinstance(other, Image) and (self.url, self.caption) == (other.url, other.caption)
+
+    def __repr__(self):
+        return f"Image({self.url!r}, {self.caption!r})"
+
+
+class Article:
+    """Article du Blog du Modérateur, de la prévisualisation à la sauvegarde"""
+
+    __slots__ = (
+        'url', 'title', 'thumbnail', 'subcategory', 'summary', 'date', 'original_date',
+        'author', 'content', 'images', 'categories', 'subcategories', 'scraped_at',
+        'duplicate_urls', 'id', 'created_at', 'updated_at'
+    )
+
+    # Champs sérialisés, dans l'ordre historique des exports JSON
+    FIELDS = (
+        'title', 'thumbnail', 'subcategory', 'summary', 'date', 'original_date', 'url',
+        'author', 'content', 'images', 'categories', 'subcategories', 'scraped_at', 'duplicate_urls'
+    )
+    # Champs gérés par la base (présents dans les documents MongoDB)
+    DB_FIELDS = ('created_at', 'updated_at')
+
+    def __init__(self, url: str, title: str, *, thumbnail: Optional[str] = None,
+                 subcategory: Optional[str] = None, summary: Optional[str] = None,
+                 date: Optional[str] = None, original_date: Optional[str] = None,
+                 author: Optional[str] = None, content: Optional[str] = None,
+                 images: Optional[Dict[str, Image]] = None, categories: Optional[List[str]] = None,
+                 subcategories: Optional[List[str]] = None, scraped_at: Optional[datetime] = None,
+                 duplicate_urls: Optional[List[str]] = None, id=None,
+                 created_at: Optional[datetime] = None, updated_at: Optional[datetime] = None):
+        self.url = url
+        self.title = title
+        self.thumbnail = thumbnail
+        self.subcategory = subcategory
+        self.summary = summary
+        self.date = date
+        self.original_date = original_date
+        self.author = author
+        self.content = content
+        self.images = images if images is not None else {}
+        self.categories = categories if categories is not None else []
+        self.subcategories = subcategories if subcategories is not None else []
+        self.scraped_at = scraped_at
+        self.duplicate_urls = duplicate_urls if duplicate_urls is not None else []
+        self.id = id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    # ------------------------------------------------------------------
+    # Codecs
+    # ------------------------------------------------------------------
+    def _to_dict(self) -> Dict:
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if field == 'images':
+                value = {key: image.to_dict() for key, image in value.items()}
+            elif field == 'duplicate_urls' and not value:
+                continue
+            data[field] = value
+        return data
+
+    def to_mongo(self) -> Dict:
+        """Document MongoDB (datetimes natifs, sans _id ni horodatages de la base)"""
+        return self._to_dict()
+
+    def to_json(self) -> Dict:
+        """Dict sérialisable en JSON (datetimes au format ISO)"""
+        data = self._to_dict()
+        if isinstance(self.scraped_at, datetime):
+            data['scraped_at'] = self.scraped_at.isoformat()
+        return data
+
+    @classmethod
+    def _from_mapping(cls, data: Mapping, strict: bool) -> 'Article':
+        known = set(cls.FIELDS) | set(cls.DB_FIELDS) | {'_id'}
+        unknown = set(data) - known
+        if strict and unknown:
+            raise ValueError(f"Champ(s) d'article inconnu(s): {', '.join(sorted(unknown))}")
+
+        kwargs = {field: data[field] for field in cls.FIELDS + cls.DB_FIELDS
+                  if field in data and field not in ('url', 'title')}
+        kwargs['images'] = {key: Image.from_dict(image) for key, image in (data.get('images') or {}).items()}
+        if '_id' in data:
+            kwargs['id'] = data['_id']
+        return cls(data.get('url'), data.get('title'), **kwargs)
+
+    @classmethod
+    def from_mongo(cls, document: Mapping) -> 'Article':
+        """Depuis un document MongoDB (les champs additionnels, ex. score, sont ignorés)"""
+        return cls._from_mapping(document, strict=False)
+
+    @classmethod
+    def from_json(cls, data: Mapping, strict: bool = True) -> 'Article':
+        """Depuis un dict JSON (export articles.json) ; refuse les champs inconnus par défaut"""
+        article = cls._from_mapping(data, strict=strict)
+        if isinstance(article.scraped_at, str):
+            try:
+                article.scraped_at = datetime.fromisoformat(article.scraped_at)
+            except ValueError:
+                pass
+        return article
+
+    # ------------------------------------------------------------------
+    # Fusion des quasi-doublons
+    # ------------------------------------------------------------------
+    def absorb_duplicate(self, duplicate: 'Article') -> None:
+        """Ajoute l'URL et les catégories d'un quasi-doublon à cet article (canonique)"""
+        if duplicate.url and duplicate.url not in self.duplicate_urls:
+            self.duplicate_urls.append(duplicate.url)
+        for value in duplicate.categories:
+            if value not in self.categories:
+                self.categories.append(value)
+        for value in duplicate.subcategories:
+            if value not in self.subcategories:
+                self.subcategories.append(value)
+
+    def __repr__(self):
+        return f"Article({self.url!r}, {self.title!r})"
+
+
+def article_key(url: str) -> str:
+    """Identifiant stable d'un article (/api/related/<id>), dérivé de son URL"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def as_document(article: Union[Article, Mapping]) -> Dict:
+    """
+    Document à sauvegarder, sans modifier l'objet de l'appelant
+    Accepte un Article ou un dict (imports, anciens appels)
+    """
+    if isinstance(article, Article):
+        return article.to_mongo()
+    return dict(article)
@@ -1,17 +1,177 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne, UpdateOne
+from collections import defaultdict
 from datetime import datetime
 import json
 import re
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from archive import (
+    ARCHIVE_STORAGE_OPTIONS, CATALOG_REFRESH_SECONDS, HOT_BOUNDARY_ID, PartitionCatalog, archive_cutoff,
+    catalog_name, partition_name
+)
+from models import as_document
+from near_duplicates import NearDuplicateDetector, MongoLSHStore
+from query_audit import QueryAuditor, query_audit_enabled, summarize_explain
+from storage import ArticleRepository, MergedDuplicate
+from trends import TREND_FIELDS, MongoTrendStore, TrendRollups
 
 # Charger les variables d'environnement
 load_dotenv()
 
-class MongoDBManager:
-    def __init__(self, connection_string=None, database_name=None):
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+# Requêtes partagées par les gestionnaires synchrone et asynchrone
+def exact_match(value):
+    """Correspondance exacte insensible à la casse"""
+    return {'$regex': f'^{re.escape(value)}$', '$options': 'i'}
+
+
+def category_query(category):
+    return {'categories': exact_match(category)}
+
+
+def subcategory_query(subcategory):
+    return {
+        '$or': [
+            {'subcategories': exact_match(subcategory)},
+            {'subcategory': exact_match(subcategory)}
+        ]
+    }
+
+
+def category_and_subcategory_query(category, subcategory):
+    return {'$and': [category_query(category), subcategory_query(subcategory)]}
+
+
+def author_query(author):
+    return {'author': exact_match(author)}
+
+
+def created_at_range(start_date=None, end_date=None):
+    """Bornes sur created_at à partir de dates AAAA-MM-JJ (une borne absente est ouverte)"""
+    bounds = {}
+    if start_date:
+        bounds['$gte'] = datetime.strptime(start_date, '%Y-%m-%d')
+    if end_date:
+        bounds['$lte'] = datetime.strptime(end_date, '%Y-%m-%d')
+    return bounds
+
+
+def date_range_query(start_date, end_date):
+    """Plage sur created_at à partir de dates AAAA-MM-JJ"""
+    return {'created_at': created_at_range(start_date, end_date)}
+
+
+def title_query(search_term):
+    return {'title': {'$regex': re.escape(search_term), '$options': 'i'}}
+
+
+SUBCATEGORIES_PIPELINE = [
+    {'$unwind': '$subcategories'},
+    {'$group': {'_id': '$subcategories'}},
+    {'$sort': {'_id': 1}}
+]
+
+
+# Méthodes de recherche -> constructeur de requête (utilisé pour le streaming des résultats)
+SEARCH_QUERIES = {
+    'get_articles_by_category': category_query,
+    'get_articles_by_category_and_subcategory': category_and_subcategory_query,
+    'get_articles_by_subcategory': subcategory_query,
+    'get_articles_by_author': author_query,
+    'get_articles_by_date_range': date_range_query,
+    'search_in_title': title_query,
+}
+
+# Recherche combinée (article_query.ArticleQuery) : égalités simples sur les facettes avec une
+# collation insensible à la casse (au lieu de regex ^...$ qui parcourent tout l'index),
+# servies par des index composés égalité -> tri/plage sur created_at (_id départage la pagination)
+SEARCH_COLLATION = {'locale': 'fr', 'strength': 2}
+COMBINED_INDEXES = (
+    [('categories', 1), ('author', 1), ('created_at', -1), ('_id', -1)],
+    [('categories', 1), ('created_at', -1), ('_id', -1)],
+    [('subcategories', 1), ('created_at', -1), ('_id', -1)],
+    [('subcategory', 1), ('created_at', -1), ('_id', -1)],
+    [('author', 1), ('created_at', -1), ('_id', -1)],
+    [('created_at', -1), ('_id', -1)],
+)
+COMBINED_SORTS = {
+    'recent': [('created_at', -1), ('_id', -1)],
+    'oldest': [('created_at', 1), ('_id', 1)],
+    'relevance': [('score', {'$meta': 'textScore'})],
+}
+
+
+# Champs nécessaires à la liste de résultats (sans le contenu ni le détail des images)
+# images_count est stocké depuis la séparation des corps ; calculé pour les anciens documents
+LISTING_PROJECTION = {
+    'title': 1, 'subcategory': 1, 'categories': 1, 'subcategories': 1, 'author': 1,
+    'date': 1, 'summary': 1, 'url': 1, 'thumbnail': 1,
+    'images_count': {'$ifNull': ['$images_count', {'$size': {'$objectToArray': {'$ifNull': ['$images', {}]}}}]}
+}
+
+
+def combined_find(query):
+    """
+    Traduit une ArticleQuery en (filtre, projection, tri, collation) pour find / count_documents
+    Avec un texte, l'index texte (titre, résumé) sert la requête : il n'accepte pas de collation,
+    les facettes redeviennent des correspondances exactes insensibles à la casse
+    """
+    projection = dict(LISTING_PROJECTION)
+    conditions = {}
+    if query.text:
+        conditions['$text'] = {'$search': query.text}
+        projection['score'] = {'$meta': 'textScore'}
+        facet, collation = exact_match, None
+    else:
+        facet, collation = (lambda value: value), SEARCH_COLLATION
+    if query.category:
+        conditions['categories'] = facet(query.category)
+    if query.subcategory:
+        conditions['$or'] = [{'subcategories': facet(query.subcategory)},
+                             {'subcategory': facet(query.subcategory)}]
+    if query.author:
+        conditions['author'] = facet(query.author)
+    if query.start_date or query.end_date:
+        conditions['created_at'] = created_at_range(query.start_date, query.end_date)
+    if query.title:
+        # Sous-chaîne : filtre résiduel sur les documents sélectionnés par les autres critères
+        conditions['title'] = title_query(query.title)['title']
+    return conditions, projection, COMBINED_SORTS[query.sort], collation
+
+
+# Champs lourds rangés dans la collection compagnon `<collection>_bodies` (_id = URL),
+# compressée en zstd par WiredTiger : la collection principale ne garde que les métadonnées
+BODY_FIELDS = ('content', 'images')
+BODIES_STORAGE_OPTIONS = {'wiredTiger': {'configString': 'block_compressor=zstd'}}
+
+
+def split_article(document):
+    """Sépare un document article en (métadonnées de liste, corps)"""
+    listing = {key: value for key, value in document.items() if key not in BODY_FIELDS}
+    listing['images_count'] = len(document.get('images') or {})
+    body = {key: document[key] for key in BODY_FIELDS if key in document}
+    return listing, body
+
+
+def merge_facet_values(*value_lists):
+    """Combine, déduplique et trie des listes de valeurs de facettes"""
+    merged = set()
+    for values in value_lists:
+        merged.update(value for value in values if value and value.strip())
+    return sorted(merged)
+
+
+class MongoDBManager(ArticleRepository):
+    def __init__(self, connection_string=None, database_name=None, collection_name=None):
         """
-        Initialise la connexion MongoDB (Atlas par défaut via .env)
+        Prépare la connexion MongoDB (Atlas par défaut via .env) sans I/O :
+        le client (résolution DNS SRV, pool de connexions) est créé au premier accès,
+        et les index sont provisionnés une seule fois via `python migrate.py`
         """
         if connection_string is None:
             # Récupération depuis les variables d'environnement
@@ -19,21 +179,123 @@ class MongoDBManager:
             if not connection_string:
                 raise ValueError("MONGODB_URI non trouvé dans les variables d'environnement. Veuillez configurer le fichier .env")
         
-        if database_name is None:
-            database_name = os.getenv('MONGODB_DATABASE', 'wscrap')
+        self.connection_string = connection_string
+        self.database_name = database_name or os.getenv('MONGODB_DATABASE', 'wscrap')
+        self.collection_name = collection_name or os.getenv('MONGODB_COLLECTION', 'articles')
+        self.client_options = {
+            'maxPoolSize': _env_int('MONGODB_MAX_POOL_SIZE', 20),
+            'minPoolSize': _env_int('MONGODB_MIN_POOL_SIZE', 0),
+            'maxIdleTimeMS': _env_int('MONGODB_MAX_IDLE_TIME_MS', 60000),
+            'serverSelectionTimeoutMS': _env_int('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 5000),
+            'connectTimeoutMS': _env_int('MONGODB_CONNECT_TIMEOUT_MS', 5000),
+            'socketTimeoutMS': _env_int('MONGODB_SOCKET_TIMEOUT_MS', 30000),
+        }
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._duplicate_detector = None
+        # Mode diagnostic : durée, plan et documents examinés de chaque requête (query_audit.py)
+        self.query_auditor = QueryAuditor() if query_audit_enabled() else None
+        self.near_duplicates_enabled = os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() in ('1', 'true', 'yes')
+        self.split_bodies = os.getenv('MONGODB_SPLIT_BODIES', 'true').lower() in ('1', 'true', 'yes')
+        self.trend_rollups_enabled = os.getenv('TREND_ROLLUPS', 'true').lower() in ('1', 'true', 'yes')
+        self._trends = None
+        self._partitions = None
+        self._partitions_loaded_at = 0.0
         
+        # Ancien comportement (ping + index au démarrage) pour échouer immédiatement si besoin
+        if os.getenv('MONGODB_EAGER_INIT', 'false').lower() in ('1', 'true', 'yes'):
+            self.check_connection()
+            self.create_indexes()
+    
+    @property
+    def client(self):
+        """Client MongoDB créé paresseusement (une seule fois, thread-safe)"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        options = dict(self.client_options)
+                        if self.query_auditor:
+                            options['event_listeners'] = [self.query_auditor]
+                        self._client = MongoClient(self.connection_string, connect=False, **options)
+                        if self.query_auditor:
+                            self.query_auditor.attach(self._client)
+                    except Exception as e:
+                        print(f"❌ Erreur de connexion à MongoDB: {e}")
+                        raise
+        return self._client
+    
+    @property
+    def db(self):
+        return self.client[self.database_name]
+    
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+    
+    @property
+    def bodies(self):
+        """Collection compagnon des contenus et images (clé : URL de l'article)"""
+        return self.db[f"{self.collection_name}_bodies"]
+    
+    @property
+    def partitions_catalog(self):
+        """Catalogue des archives annuelles et de la borne de la collection chaude (archive.py)"""
+        return self.db[catalog_name(self.collection_name)]
+    
+    @property
+    def partitions(self):
+        """Catalogue des partitions (archive.PartitionCatalog), relu au plus toutes les CATALOG_REFRESH_SECONDS"""
+        if self._partitions is None or time.monotonic() - self._partitions_loaded_at > CATALOG_REFRESH_SECONDS:
+            self._partitions = PartitionCatalog(self.partitions_catalog.find())
+            self._partitions_loaded_at = time.monotonic()
+        return self._partitions
+    
+    def archive_partition(self, year):
+        return self.db[partition_name(self.collection_name, year)]
+    
+    def _tiers(self, conditions=None, newest_first=True):
+        """
+        Collections à interroger pour une requête : la collection chaude, puis les archives
+        dont l'année recoupe sa plage created_at (toutes si la requête n'en a pas)
+        """
+        bounds = (conditions or {}).get('created_at') or {}
+        years = self.partitions.years_for(bounds.get('$gte'), bounds.get('$lte'))
+        archives = [self.archive_partition(year) for year in sorted(years, reverse=newest_first)]
+        return [self.collection] + archives if newest_first else archives + [self.collection]
+    
+    def _find_all(self, query):
+        """Documents complets d'une recherche, collection chaude et archives concernées"""
+        articles = []
+        for tier in self._tiers(query):
+            articles.extend(tier.find(query))
+        return self.attach_bodies(articles)
+    
+    @property
+    def duplicate_detector(self):
+        """Détecteur de quasi-doublons (index LSH persisté dans une collection dédiée)"""
+        if self._duplicate_detector is None and self.near_duplicates_enabled:
+            self._duplicate_detector = NearDuplicateDetector(
+                MongoLSHStore(self.db[f"{self.collection_name}_minhash"]),
+                threshold=float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+            )
+        return self._duplicate_detector
+    
+    @property
+    def trends(self):
+        """Agrégats temporels (collection `<collection>_trends`), mis à jour par save_articles"""
+        if self._trends is None and self.trend_rollups_enabled:
+            self._trends = TrendRollups(MongoTrendStore(self.db[f"{self.collection_name}_trends"]))
+        return self._trends
+    
+    def check_connection(self):
+        """
+        Vérifie explicitement la connexion (ping)
+        """
         try:
-            self.client = MongoClient(connection_string)
-            self.db = self.client[database_name]
-            collection_name = os.getenv('MONGODB_COLLECTION', 'articles')
-            self.collection = self.db[collection_name]
-            
-            # Test de connexion
             self.client.admin.command('ping')
-            print(f"✅ Connexion à MongoDB Atlas réussie - Base: {database_name}")
-            
-            # Créer les index pour optimiser les recherches
-            self.create_indexes()
+            print(f"✅ Connexion à MongoDB Atlas réussie - Base: {self.database_name}")
+            return True
         except Exception as e:
             print(f"❌ Erreur de connexion à MongoDB: {e}")
             raise
@@ -41,50 +303,104 @@ class MongoDBManager:
     def create_indexes(self):
         """
         Crée les index pour optimiser les recherches
+        Opération ponctuelle de migration (python migrate.py), pas de démarrage
         """
         try:
-            # Index sur l'URL pour éviter les doublons
-            self.collection.create_index("url", unique=True)
+            self._create_search_indexes(self.collection)
+            
+            # Index texte pour la recherche full-text (le contenu est indexé dans la collection des corps)
+            if self.split_bodies:
+                self.collection.create_index([
+                    ("title", "text"),
+                    ("summary", "text")
+                ])
+                self.bodies.create_index([("content", "text")])
+            else:
+                self.collection.create_index([
+                    ("title", "text"),
+                    ("summary", "text"),
+                    ("content", "text")
+                ])
             
-            # Index sur les champs de recherche
-            self.collection.create_index("subcategory")
-            self.collection.create_index("author")
-            self.collection.create_index("date")
+            # Index LSH des quasi-doublons
+            if self.duplicate_detector:
+                self.duplicate_detector.store.create_indexes()
             
-            # Index texte pour la recherche full-text
-            self.collection.create_index([
-                ("title", "text"),
-                ("summary", "text"),
-                ("content", "text")
-            ])
+            # Agrégats temporels (séries de toute une facette)
+            if self.trends:
+                self.trends.store.create_indexes()
             
             print("📊 Index MongoDB créés pour optimiser les recherches")
         except Exception as e:
             print(f"⚠️ Erreur lors de la création des index: {e}")
             # Ne pas lever d'erreur, les index peuvent déjà exister
     
+    @staticmethod
+    def _create_search_indexes(collection):
+        """Index des recherches, communs à la collection chaude et aux archives"""
+        # Index sur l'URL pour éviter les doublons
+        collection.create_index("url", unique=True)
+        
+        # Index sur les champs de recherche
+        collection.create_index("subcategory")
+        collection.create_index("author")
+        collection.create_index("date")
+        
+        # Index composés de la recherche combinée (même collation que les requêtes)
+        for keys in COMBINED_INDEXES:
+            collection.create_index(keys, collation=SEARCH_COLLATION)
+    
     def save_article(self, article_data):
         """
-        Sauvegarde un article dans MongoDB avec gestion des doublons
+        Sauvegarde un article (Article ou dict) dans MongoDB avec gestion des doublons
+        L'objet de l'appelant n'est pas modifié
         """
         try:
+            article_data = as_document(article_data)
+
             # Vérifier que l'URL existe
             if not article_data.get('url'):
                 print("⚠️ Article sans URL, ignoré")
                 return None
+            
+            # Quasi-doublon d'un article déjà stocké sous une autre URL : fusion
+            # (article canonique introuvable : sauvegarde normale)
+            content = article_data.get('content')
+            signature = self.duplicate_detector.signature(content) if self.duplicate_detector and content else None
+            if signature:
+                duplicate = self.duplicate_detector.find_duplicate(article_data['url'], content, signature)
+                if duplicate:
+                    merged = self.merge_near_duplicate(duplicate, article_data)
+                    if merged:
+                        return merged
                 
             # Ajouter un timestamp de création
             article_data['created_at'] = datetime.now()
             article_data['updated_at'] = datetime.now()
             
+            update = {'$set': article_data}
+            if self.split_bodies:
+                # Corps d'abord : un corps orphelin est sans effet, une fiche sans corps non
+                article_data, body = split_article(article_data)
+                if body:
+                    self.bodies.update_one({'_id': article_data['url']},
+                                           {'$set': {**body, 'updated_at': article_data['updated_at']}},
+                                           upsert=True)
+                update = {'$set': article_data, '$unset': {field: '' for field in BODY_FIELDS}}
+            
             # Utiliser upsert pour gérer les doublons automatiquement
             result = self.collection.update_one(
                 {'url': article_data.get('url')},  # Condition de recherche
-                {'$set': article_data},            # Données à mettre à jour
+                update,                            # Données à mettre à jour
                 upsert=True                        # Insérer si pas trouvé
             )
             
+            # Signature indexée seulement une fois l'article stocké : jamais de canonique fantôme
+            if signature:
+                self.duplicate_detector.add(article_data['url'], content, signature)
+            
             if result.upserted_id:
+                self._drop_archived(article_data['url'])
                 print(f"✅ Nouvel article sauvegardé: {article_data.get('title', 'Sans titre')[:50]}...")
                 return result.upserted_id
             else:
@@ -95,18 +411,46 @@ class MongoDBManager:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
             return None
     
-    def save_articles(self, articles_list):
+    def merge_near_duplicate(self, duplicate, article_data):
+        """
+        Fusionne un quasi-doublon dans l'article canonique au lieu de le stocker
+        L'URL du doublon et ses catégories sont ajoutées à l'article existant
+        Retourne MergedDuplicate, ou None si l'article canonique n'existe dans aucune partition
+        """
+        canonical_url, score = duplicate
+        update = {
+            '$addToSet': {
+                'duplicate_urls': article_data['url'],
+                'categories': {'$each': article_data.get('categories') or []},
+                'subcategories': {'$each': article_data.get('subcategories') or []}
+            },
+            '$set': {'updated_at': datetime.now()}
+        }
+        # L'article canonique peut avoir été archivé : il y reste
+        for tier in self._tiers():
+            result = tier.update_one({'url': canonical_url}, update)
+            if result.matched_count:
+                print(f"♻️ Quasi-doublon ({score:.0%}) fusionné dans {canonical_url}: {article_data['url']}")
+                return MergedDuplicate(canonical_url)
+        print(f"⚠️ Article canonique {canonical_url} introuvable, {article_data['url']} sauvegardé tel quel")
+        return None
+    
+    def _drop_archived(self, url):
         """
-        Sauvegarde une liste d'articles
+        Un article archivé puis scrapé de nouveau revient dans la collection chaude
+        (created_at remis à maintenant comme toute sauvegarde) : sa copie archivée est supprimée
         """
-        saved_count = 0
-        for article in articles_list:
-            result = self.save_article(article)
-            if result:
-                saved_count += 1
-        
-        print(f"\nTotal: {saved_count}/{len(articles_list)} articles sauvegardés")
-        return saved_count
+        for year in self.partitions.years:
+            if self.archive_partition(year).delete_one({'url': url}).deleted_count:
+                break
+
+    def drop_archived_copies(self, urls):
+        """Copies archivées d'un lot d'URLs réécrites dans la collection chaude (imports) : une requête par archive"""
+        urls = list(urls)
+        if not urls:
+            return 0
+        return sum(self.archive_partition(year).delete_many({'url': {'$in': urls}}).deleted_count
+                   for year in self.partitions.years)
     
     def get_all_categories(self):
         """
@@ -115,9 +459,7 @@ class MongoDBManager:
         """
         try:
             # Récupérer les catégories depuis le champ categories (array)
-            categories = self.collection.distinct('categories')
-            categories = [cat for cat in categories if cat and cat.strip()]
-            categories.sort()
+            categories = merge_facet_values(*(tier.distinct('categories') for tier in self._tiers()))
             
             print(f"📊 Catégories trouvées: {len(categories)}")
             if categories:
@@ -135,22 +477,16 @@ class MongoDBManager:
         Ces sous-catégories viennent des <li> de la classe tags-list
         """
         try:
-            # Pipeline d'agrégation pour récupérer les subcategories (depuis les <li> de tags-list)
-            pipeline = [
-                {'$unwind': '$subcategories'},
-                {'$group': {'_id': '$subcategories'}},
-                {'$sort': {'_id': 1}}
-            ]
-            subcategories_from_array = [doc['_id'] for doc in self.collection.aggregate(pipeline)]
-            
-            # Ajouter aussi les subcategory (tag principal de la page d'accueil)
-            main_subcategories = self.collection.distinct('subcategory')
-            main_subcategories = [cat for cat in main_subcategories if cat and cat.strip()]
+            values = []
+            for tier in self._tiers():
+                # Pipeline d'agrégation pour récupérer les subcategories (depuis les <li> de tags-list)
+                values.append([doc['_id'] for doc in tier.aggregate(SUBCATEGORIES_PIPELINE)])
+                
+                # Ajouter aussi les subcategory (tag principal de la page d'accueil)
+                values.append(tier.distinct('subcategory'))
             
             # Combiner et dédupliquer
-            all_subcategories = list(set(subcategories_from_array + main_subcategories))
-            all_subcategories = [sub for sub in all_subcategories if sub and sub.strip()]
-            all_subcategories.sort()
+            all_subcategories = merge_facet_values(*values)
             
             print(f"📊 Sous-catégories trouvées: {len(all_subcategories)}")
             if all_subcategories:
@@ -167,11 +503,10 @@ class MongoDBManager:
         Recherche dans le champ categories (array) - une seule catégorie par article
         """
         try:
-            import re
             # Recherche exacte dans le tableau des catégories (qui ne contient qu'un élément)
-            query = {'categories': {'$regex': f'^{re.escape(category)}$', '$options': 'i'}}
+            query = category_query(category)
             
-            articles = list(self.collection.find(query))
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles dans la catégorie '{category}'")
             return articles
         except Exception as e:
@@ -183,20 +518,10 @@ class MongoDBManager:
         Récupère les articles d'une catégorie ET d'une sous-catégorie spécifiques
         """
         try:
-            import re
-            
             # Construire la requête avec catégorie ET sous-catégorie
-            query = {
-                '$and': [
-                    {'categories': {'$regex': f'^{re.escape(category)}$', '$options': 'i'}},
-                    {'$or': [
-                        {'subcategories': {'$regex': f'^{re.escape(subcategory)}$', '$options': 'i'}},
-                        {'subcategory': {'$regex': f'^{re.escape(subcategory)}$', '$options': 'i'}}
-                    ]}
-                ]
-            }
+            query = category_and_subcategory_query(category, subcategory)
             
-            articles = list(self.collection.find(query))
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles pour '{category}' > '{subcategory}'")
             return articles
         except Exception as e:
@@ -209,33 +534,26 @@ class MongoDBManager:
         Utilise maintenant les vraies catégories de la base
         """
         try:
-            import re
-            
             # Recherche des articles de cette catégorie
-            query = {'categories': {'$regex': f'^{re.escape(category)}$', '$options': 'i'}}
+            query = category_query(category)
             
             print(f"🔍 Recherche sous-catégories pour '{category}' avec requête: {query}")
             
             # Pipeline d'agrégation pour récupérer les subcategories uniques
-            pipeline = [
-                {'$match': query},
-                {'$unwind': '$subcategories'},
-                {'$group': {'_id': '$subcategories'}},
-                {'$sort': {'_id': 1}}
-            ]
+            pipeline = [{'$match': query}] + SUBCATEGORIES_PIPELINE
             
-            subcategories_from_array = [doc['_id'] for doc in self.collection.aggregate(pipeline)]
-            print(f"📦 Sous-catégories depuis array: {len(subcategories_from_array)}")
-            
-            # Récupérer aussi les subcategory (tags principaux) pour cette catégorie
-            articles = list(self.collection.find(query, {'subcategory': 1}))
-            main_subcategories = list(set([article.get('subcategory') for article in articles if article.get('subcategory')]))
+            subcategories_from_array, main_subcategories = [], set()
+            for tier in self._tiers():
+                subcategories_from_array.extend(doc['_id'] for doc in tier.aggregate(pipeline))
+                
+                # Récupérer aussi les subcategory (tags principaux) pour cette catégorie
+                articles = tier.find(query, {'subcategory': 1})
+                main_subcategories.update(article.get('subcategory') for article in articles if article.get('subcategory'))
+            print(f"📦 Sous-catégories depuis array: {len(set(subcategories_from_array))}")
             print(f"🎯 Tags principaux: {len(main_subcategories)}")
             
             # Combiner et dédupliquer
-            all_subcategories = list(set(subcategories_from_array + main_subcategories))
-            all_subcategories = [sub for sub in all_subcategories if sub and sub.strip()]
-            all_subcategories.sort()
+            all_subcategories = merge_facet_values(subcategories_from_array, main_subcategories)
             
             print(f"✅ Sous-catégories finales pour '{category}': {len(all_subcategories)}")
             if all_subcategories:
@@ -252,10 +570,8 @@ class MongoDBManager:
         Récupère tous les auteurs uniques
         """
         try:
-            authors = self.collection.distinct('author')
-            # Filtrer les valeurs None et vides
-            authors = [author for author in authors if author and author.strip()]
-            authors.sort()
+            # Valeurs de toutes les partitions, sans None ni vides
+            authors = merge_facet_values(*(tier.distinct('author') for tier in self._tiers()))
             
             print(f"📊 Auteurs trouvés: {len(authors)}")
             if authors:
@@ -271,7 +587,7 @@ class MongoDBManager:
         Récupère les statistiques pour l'interface web (optimisé)
         """
         try:
-            total_articles = self.collection.count_documents({})
+            total_articles = sum(tier.count_documents({}) for tier in self._tiers())
             
             # Catégories principales fixes
             categories = self.get_all_categories()
@@ -304,42 +620,15 @@ class MongoDBManager:
                 'authors_count': 0
             }
     
-    def get_data_for_interface(self):
-        """
-        Récupère toutes les données nécessaires pour l'interface web
-        """
-        try:
-            stats = self.get_stats()
-            categories = self.get_all_categories()
-            subcategories = self.get_all_subcategories()
-            authors = self.get_all_authors()
-            
-            return {
-                'stats': stats,
-                'categories': categories,
-                'subcategories': subcategories,
-                'authors': authors
-            }
-        except Exception as e:
-            print(f"❌ Erreur lors de la récupération des données: {e}")
-            return {
-                'stats': {
-                    'total_articles': 0,
-                    'categories_count': 4,
-                    'subcategories_count': 0,
-                    'authors_count': 0
-                },
-                'categories': ['Web', 'Marketing', 'Social', 'Tech'],
-                'subcategories': [],
-                'authors': []
-            }
-    
     def close(self):
         """
         Ferme la connexion MongoDB
         """
-        if self.client:
-            self.client.close()
+        if self._client:
+            if self.query_auditor:
+                self.query_auditor.close()
+            self._client.close()
+            self._client = None
             print("Connexion MongoDB fermée")
     
     def get_articles_by_subcategory(self, subcategory):
@@ -347,14 +636,8 @@ class MongoDBManager:
         Récupère tous les articles d'une sous-catégorie donnée
         """
         try:
-            import re
-            query = {
-                '$or': [
-                    {'subcategories': {'$regex': f'^{re.escape(subcategory)}$', '$options': 'i'}},
-                    {'subcategory': {'$regex': f'^{re.escape(subcategory)}$', '$options': 'i'}}
-                ]
-            }
-            articles = list(self.collection.find(query))
+            query = subcategory_query(subcategory)
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles avec la sous-catégorie '{subcategory}'")
             return articles
         except Exception as e:
@@ -366,9 +649,8 @@ class MongoDBManager:
         Récupère tous les articles d'un auteur donné
         """
         try:
-            import re
-            query = {'author': {'$regex': f'^{re.escape(author)}$', '$options': 'i'}}
-            articles = list(self.collection.find(query))
+            query = author_query(author)
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles de l'auteur '{author}'")
             return articles
         except Exception as e:
@@ -380,21 +662,10 @@ class MongoDBManager:
         Récupère les articles dans une plage de dates
         """
         try:
-            from datetime import datetime
-            
-            # Convertir les chaînes de date en format MongoDB
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
-            
             # Requête sur le champ created_at
-            query = {
-                'created_at': {
-                    '$gte': start,
-                    '$lte': end
-                }
-            }
+            query = date_range_query(start_date, end_date)
             
-            articles = list(self.collection.find(query))
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles entre {start_date} et {end_date}")
             return articles
         except Exception as e:
@@ -406,11 +677,306 @@ class MongoDBManager:
         Recherche dans les titres des articles
         """
         try:
-            import re
-            query = {'title': {'$regex': re.escape(search_term), '$options': 'i'}}
-            articles = list(self.collection.find(query))
+            query = title_query(search_term)
+            articles = self._find_all(query)
             print(f"🔍 Trouvé {len(articles)} articles avec '{search_term}' dans le titre")
             return articles
         except Exception as e:
             print(f"❌ Erreur lors de la recherche dans les titres: {e}")
             return []
+
+    def search(self, text, limit=20):
+        """
+        Recherche plein texte (index texte MongoDB) classée par pertinence
+        """
+        try:
+            cursor = self.collection.find(
+                {'$text': {'$search': text}},
+                {'score': {'$meta': 'textScore'}}
+            ).sort([('score', {'$meta': 'textScore'})]).limit(limit)
+            articles = list(cursor)
+            if self.split_bodies:
+                articles = self._search_with_bodies(text, articles, limit)
+            archives = self._tiers()[1:]
+            if archives:
+                # Archives : index texte des titres et résumés seulement (pas de contenu)
+                for tier in archives:
+                    articles.extend(tier.find({'$text': {'$search': text}}, {'score': {'$meta': 'textScore'}})
+                                    .sort([('score', {'$meta': 'textScore'})]).limit(limit))
+                articles = sorted(articles, key=lambda article: article['score'], reverse=True)[:limit]
+            print(f"🔍 Trouvé {len(articles)} articles pour '{text}'")
+            return self.attach_bodies(articles)
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche plein texte: {e}")
+            return []
+
+    def find_articles(self, query):
+        """
+        Recherche combinée paginée (article_query.ArticleQuery) en une requête,
+        servie par un index composé ; le total n'est compté que si la page est pleine
+        Une plage de dates antérieure à la borne chaude interroge aussi les archives concernées
+        """
+        try:
+            conditions, projection, sort, collation = combined_find(query)
+            tiers = self._tiers(conditions, newest_first=query.sort != 'oldest')
+            if len(tiers) > 1:
+                articles, total = self._find_articles_in_tiers(tiers, query, conditions, projection, sort, collation)
+            else:
+                cursor = (self.collection.find(conditions, projection, collation=collation)
+                          .sort(sort).skip(query.skip).limit(query.per_page))
+                articles = list(cursor)
+                total = query.total_from_page(len(articles))
+                if total is None:
+                    total = self.collection.count_documents(conditions, collation=collation)
+            print(f"🔍 Trouvé {total} articles ({query.describe()}), page {query.page}")
+            return query.page_result(articles, total)
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche combinée: {e}")
+            return query.page_result([], 0)
+
+    @staticmethod
+    def _find_articles_in_tiers(tiers, query, conditions, projection, sort, collation):
+        """
+        Page d'une recherche combinée répartie sur plusieurs partitions, retourne (articles, total)
+        Les partitions sont disjointes dans le temps et rangées dans l'ordre du tri : la page est
+        lue à la suite dans celles qu'elle recouvre. Par pertinence, les meilleurs de chaque
+        partition sont fusionnés.
+        """
+        total, skip, articles = 0, query.skip, []
+        for tier in tiers:
+            count = tier.count_documents(conditions, collation=collation)
+            total += count
+            if query.sort == 'relevance':
+                articles.extend(tier.find(conditions, projection).sort(sort).limit(query.skip + query.per_page))
+            elif skip >= count:
+                skip -= count
+            elif len(articles) < query.per_page:
+                articles.extend(tier.find(conditions, projection, collation=collation)
+                                .sort(sort).skip(skip).limit(query.per_page - len(articles)))
+                skip = 0
+        if query.sort == 'relevance':
+            articles.sort(key=lambda article: article['score'], reverse=True)
+            articles = articles[query.skip:query.skip + query.per_page]
+        return articles, total
+
+    def explain_articles(self, query):
+        """Plan gagnant et documents examinés de la recherche combinée (query_audit.summarize_explain)"""
+        conditions, projection, sort, collation = combined_find(query)
+        cursor = (self.collection.find(conditions, projection, collation=collation)
+                  .sort(sort).skip(query.skip).limit(query.per_page))
+        return summarize_explain(cursor.explain())
+
+    def _search_with_bodies(self, text, articles, limit):
+        """Ajoute les scores de l'index texte du contenu (collection des corps) et reclasse"""
+        scores = {article['url']: article['score'] for article in articles}
+        try:
+            cursor = self.bodies.find(
+                {'$text': {'$search': text}},
+                {'_id': 1, 'score': {'$meta': 'textScore'}}
+            ).sort([('score', {'$meta': 'textScore'})]).limit(limit)
+            for body in cursor:
+                scores[body['_id']] = scores.get(body['_id'], 0) + body['score']
+        except Exception as e:
+            # Index texte des corps absent (migration non lancée) : titres et résumés seulement
+            print(f"⚠️ Recherche dans les contenus indisponible: {e}")
+            return articles
+
+        top_urls = sorted(scores, key=scores.get, reverse=True)[:limit]
+        by_url = {article['url']: article for article in articles}
+        missing = [url for url in top_urls if url not in by_url]
+        if missing:
+            by_url.update((doc['url'], doc) for doc in self.collection.find({'url': {'$in': missing}}))
+        return [dict(by_url[url], score=scores[url]) for url in top_urls if url in by_url]
+
+    def attach_bodies(self, articles):
+        """
+        Complète des documents de la collection principale avec leur contenu et leurs images
+        (une requête par lot ; les documents non migrés les portent déjà)
+        """
+        missing = [article['url'] for article in articles if 'content' not in article and article.get('url')]
+        if not missing:
+            return articles
+        bodies = {body['_id']: body for body in self.bodies.find({'_id': {'$in': missing}})}
+        for article in articles:
+            body = bodies.get(article.get('url'))
+            if body:
+                for field in BODY_FIELDS:
+                    article[field] = body.get(field)
+        return articles
+
+    def get_trend_documents(self, urls):
+        """Facettes datées des articles existants (agrégats temporels)"""
+        urls = list(urls)
+        documents = []
+        for tier in self._tiers():
+            documents.extend(tier.find({'url': {'$in': urls}}, {field: 1 for field in TREND_FIELDS}))
+        return documents
+
+    def get_article_body(self, url):
+        """Contenu et images d'un article, chargés à la demande par URL"""
+        try:
+            body = self.bodies.find_one({'_id': url}, {field: 1 for field in BODY_FIELDS})
+            if body is None:
+                # Documents non migrés et archives : le corps est dans le document
+                for tier in self._tiers():
+                    body = tier.find_one({'url': url}, {field: 1 for field in BODY_FIELDS})
+                    if body is not None:
+                        break
+            if body is None:
+                return None
+            return {field: body.get(field) for field in BODY_FIELDS}
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération du contenu: {e}")
+            return None
+
+    def iter_articles(self, method_name, *args):
+        """
+        Itère sur le curseur MongoDB d'une recherche, document par document,
+        avec une projection limitée aux champs de la liste de résultats
+        """
+        query = SEARCH_QUERIES[method_name](*args)
+        for tier in self._tiers(query):
+            cursor = tier.find(query, LISTING_PROJECTION).batch_size(100)
+            try:
+                yield from cursor
+            finally:
+                cursor.close()
+
+    def iter_all_articles(self, since=None):
+        """
+        Itère sur tous les articles (documents complets) par ordre de scraping,
+        éventuellement limités à ceux scrapés après `since` (archives d'abord, des plus anciennes)
+        """
+        query = {'scraped_at': {'$gt': since}} if since else {}
+        for tier in self._tiers(newest_first=False):
+            cursor = tier.find(query).sort('scraped_at', 1).batch_size(500)
+            try:
+                batch = []
+                for article in cursor:
+                    batch.append(article)
+                    if len(batch) >= 500:
+                        yield from self.attach_bodies(batch)
+                        batch = []
+                yield from self.attach_bodies(batch)
+            finally:
+                cursor.close()
+
+    def iter_listings(self):
+        """Tous les articles avec la projection de liste (sans contenu ni images), archives comprises"""
+        for tier in self._tiers():
+            cursor = tier.find({}, LISTING_PROJECTION).batch_size(1000)
+            try:
+                yield from cursor
+            finally:
+                cursor.close()
+
+    def migrate_split_bodies(self, batch_size=200):
+        """
+        Migration : déplace contenu et images des documents existants vers la collection
+        des corps (compressée en zstd) et remplace l'index texte de la collection principale
+        Reprenable : seuls les documents qui portent encore un corps sont traités
+        """
+        if self.bodies.name not in self.db.list_collection_names():
+            try:
+                self.db.create_collection(self.bodies.name, storageEngine=BODIES_STORAGE_OPTIONS)
+                print(f"🗜️ Collection {self.bodies.name} créée (compression zstd)")
+            except Exception as e:
+                print(f"⚠️ Compression zstd indisponible, compression par défaut: {e}")
+
+        query = {'url': {'$exists': True}, '$or': [{field: {'$exists': True}} for field in BODY_FIELDS]}
+        moved = 0
+        while True:
+            documents = list(self.collection.find(query).limit(batch_size))
+            if not documents:
+                break
+            body_writes, listing_writes = [], []
+            for document in documents:
+                listing, body = split_article(document)
+                body_writes.append(ReplaceOne({'_id': document['url']},
+                                              {**body, 'updated_at': document.get('updated_at')},
+                                              upsert=True))
+                listing_writes.append(UpdateOne(
+                    {'_id': document['_id']},
+                    {'$set': {'images_count': listing['images_count']},
+                     '$unset': {field: '' for field in BODY_FIELDS}}
+                ))
+            self.bodies.bulk_write(body_writes, ordered=False)
+            self.collection.bulk_write(listing_writes, ordered=False)
+            moved += len(documents)
+            print(f"   📦 {moved} articles migrés...")
+
+        # Un seul index texte par collection : l'ancien (avec content) est remplacé
+        for index in self.collection.list_indexes():
+            if 'content' in index.get('weights', {}):
+                self.collection.drop_index(index['name'])
+                print(f"🗑️ Index texte {index['name']} supprimé")
+        self.create_indexes()
+        print(f"✅ {moved} articles migrés vers {self.bodies.name}")
+        return moved
+
+    def _ensure_partition(self, year):
+        """Crée l'archive d'une année (compression zstd, index de recherche) et l'inscrit au catalogue"""
+        partition = self.archive_partition(year)
+        if partition.name not in self.db.list_collection_names():
+            try:
+                self.db.create_collection(partition.name, storageEngine=ARCHIVE_STORAGE_OPTIONS)
+                print(f"🗜️ Archive {partition.name} créée (compression zstd)")
+            except Exception as e:
+                print(f"⚠️ Compression zstd indisponible, compression par défaut: {e}")
+        self._create_search_indexes(partition)
+        # Index texte des titres et résumés ; le contenu archivé n'est pas indexé
+        partition.create_index([("title", "text"), ("summary", "text")])
+        self.partitions_catalog.update_one({'_id': partition.name}, {'$set': {'year': year}}, upsert=True)
+        return partition
+
+    def compact_archive(self, older_than_days=None, batch_size=500):
+        """
+        Compaction : déplace les articles plus anciens que older_than_days jours (created_at,
+        default: ARCHIVE_AFTER_DAYS) de la collection chaude et de ses corps vers les archives
+        annuelles, document complet (contenu et images compris)
+        Reprenable : chaque lot est copié (remplacement sur _id) puis supprimé de la collection chaude
+        """
+        cutoff = archive_cutoff(older_than_days)
+        aged = {'created_at': {'$lt': cutoff}}
+        years = [doc['_id'] for doc in self.collection.aggregate([
+            {'$match': aged}, {'$group': {'_id': {'$year': '$created_at'}}}
+        ])]
+        if not years:
+            print(f"✅ Aucun article créé avant le {cutoff:%Y-%m-%d} à archiver")
+            return 0
+        for year in sorted(years):
+            self._ensure_partition(year)
+        # Borne avancée avant le déplacement : les plages antérieures interrogent déjà les archives
+        self.partitions_catalog.update_one({'_id': HOT_BOUNDARY_ID}, {'$max': {'since': cutoff}}, upsert=True)
+        self._partitions = None
+
+        moved = 0
+        while True:
+            documents = self.attach_bodies(list(self.collection.find(aged).sort('created_at', 1).limit(batch_size)))
+            if not documents:
+                break
+            writes = defaultdict(list)
+            for document in documents:
+                writes[document['created_at'].year].append(ReplaceOne({'_id': document['_id']}, document, upsert=True))
+            for year, year_writes in writes.items():
+                self.archive_partition(year).bulk_write(year_writes, ordered=False)
+            self.collection.delete_many({'_id': {'$in': [document['_id'] for document in documents]}})
+            self.bodies.delete_many({'_id': {'$in': [document['url'] for document in documents if document.get('url')]}})
+            moved += len(documents)
+            print(f"   🧊 {moved} articles archivés...")
+
+        print(f"✅ {moved} articles créés avant le {cutoff:%Y-%m-%d} archivés ({', '.join(map(str, sorted(years)))})")
+        return moved
+
+    def archive_status(self):
+        """Articles, taille des données (compressées) et des index de la collection chaude et de chaque archive"""
+        status = []
+        for tier in self._tiers():
+            stats = self.db.command('collStats', tier.name)
+            status.append({
+                'name': tier.name,
+                'count': stats.get('count', 0),
+                'storage_mb': stats.get('storageSize', 0) / 1e6,
+                'index_mb': stats.get('totalIndexSize', 0) / 1e6,
+            })
+        return status
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Détection des quasi-doublons d'articles (shingling + MinHash + LSH)
+Un même article peut apparaître dans plusieurs sections (/web/, /digital/, /tech/)
+ou être syndiqué sous une autre URL : la déduplication par URL ne suffit pas.
+"""
+
+import hashlib
+import json
+import os
+import random
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from text_utils import normalize_text
+
+# Nombre premier de Mersenne 2^61 - 1 pour le hachage universel
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Découpe le texte en n-grammes de mots hachés sur 32 bits"""
+    words = normalize_text(text).split()
+    if len(words) < size:
+        words_groups = [words] if words else []
+    else:
+        words_groups = [words[i:i + size] for i in range(len(words) - size + 1)]
+
+    hashed = set()
+    for group in words_groups:
+        digest = hashlib.blake2b(' '.join(group).encode('utf-8'), digest_size=4).digest()
+        hashed.add(int.from_bytes(digest, 'little'))
+    return hashed
+
+
+class MinHasher:
+    """Calcule des signatures MinHash à partir d'ensembles de shingles"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 42):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: Iterable[int]) -> List[int]:
+        """Signature MinHash (une valeur minimale par permutation)"""
+        values = list(shingle_set)
+        if not values:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min(((a * v + b) % _MERSENNE_PRIME) & _MAX_HASH for v in values)
+            for a, b in self.permutations
+        ]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimation de la similarité de Jaccard entre deux signatures"""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class MemoryLSHStore:
+    """Index LSH en mémoire, persisté optionnellement dans un fichier JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.buckets: Dict[str, Set[str]] = {}
+        self.signatures: Dict[str, List[int]] = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def candidates(self, band_keys: List[str]) -> Dict[str, List[int]]:
+        urls = set()
+        for key in band_keys:
+            urls.update(self.buckets.get(key, ()))
+        return {url: self.signatures[url] for url in urls if url in self.signatures}
+
+    def add(self, url: str, signature: List[int], band_keys: List[str]) -> None:
+        self.signatures[url] = signature
+        for key in band_keys:
+            self.buckets.setdefault(key, set()).add(url)
+
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.signatures = data.get('signatures', {})
+            self.buckets = {key: set(urls) for key, urls in data.get('buckets', {}).items()}
+            print(f"📂 Index quasi-doublons chargé: {len(self.signatures)} signatures")
+        except Exception as e:
+            print(f"⚠️ Erreur chargement index quasi-doublons '{self.path}': {e}")
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'signatures': self.signatures,
+                    'buckets': {key: sorted(urls) for key, urls in self.buckets.items()}
+                }, f)
+        except Exception as e:
+            print(f"⚠️ Erreur sauvegarde index quasi-doublons '{self.path}': {e}")
+
+
+class MongoLSHStore:
+    """Index LSH persisté dans une collection MongoDB (index multiclé sur les bandes)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def create_indexes(self) -> None:
+        self.collection.create_index("url", unique=True)
+        self.collection.create_index("bands")
+
+    def candidates(self, band_keys: List[str]) -> Dict[str, List[int]]:
+        cursor = self.collection.find({'bands': {'$in': band_keys}},
+                                      {'url': 1, 'signature': 1, '_id': 0})
+        return {doc['url']: doc['signature'] for doc in cursor}
+
+    def add(self, url: str, signature: List[int], band_keys: List[str]) -> None:
+        self.collection.update_one(
+            {'url': url},
+            {'$set': {'url': url, 'signature': signature, 'bands': band_keys}},
+            upsert=True
+        )
+
+    def save(self) -> None:
+        """Rien à faire : chaque ajout est déjà persisté"""
+
+
+class NearDuplicateDetector:
+    """
+    Détecteur de quasi-doublons basé sur MinHash + LSH par bandes
+    - threshold : similarité de Jaccard estimée à partir de laquelle deux contenus sont doublons
+    - bands : nombre de bandes LSH (num_perm doit être divisible par bands)
+    """
+
+    def __init__(self, store=None, num_perm: int = 128, bands: int = 32,
+                 shingle_size: int = 5, threshold: float = 0.8):
+        if num_perm % bands:
+            raise ValueError("num_perm doit être divisible par bands")
+        self.store = store if store is not None else MemoryLSHStore()
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+    def signature(self, content: str) -> List[int]:
+        return self.hasher.signature(shingles(content, self.shingle_size))
+
+    def band_keys(self, signature: List[int]) -> List[str]:
+        """Clés de buckets LSH : une par bande de `rows` valeurs"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(
+                b''.join(v.to_bytes(4, 'little') for v in chunk), digest_size=8
+            ).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+
+    def find_duplicate(self, url: str, content: Optional[str],
+                       signature: Optional[List[int]] = None) -> Optional[Tuple[str, float]]:
+        """
+        Cherche un article déjà indexé quasi identique (autre URL)
+        Retourne (url_canonique, similarité) ou None
+        """
+        if not content:
+            return None
+        signature = signature or self.signature(content)
+        best = None
+        for candidate_url, candidate_sig in self.store.candidates(self.band_keys(signature)).items():
+            if candidate_url == url:
+                continue
+            score = MinHasher.similarity(signature, candidate_sig)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate_url, score)
+        return best
+
+    def add(self, url: str, content: Optional[str], signature: Optional[List[int]] = None) -> None:
+        """Indexe le contenu d'un article"""
+        if not url or not content:
+            return
+        signature = signature or self.signature(content)
+        self.store.add(url, signature, self.band_keys(signature))
+
+    def check_and_add(self, url: str, content: Optional[str]) -> Optional[Tuple[str, float]]:
+        """Vérifie puis indexe l'article s'il n'est pas un doublon"""
+        if not content:
+            return None
+        signature = self.signature(content)
+        duplicate = self.find_duplicate(url, content, signature)
+        if not duplicate:
+            self.add(url, content, signature)
+        return duplicate
+
+    def save(self) -> None:
+        self.store.save()
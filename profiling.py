@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profilage intégré des crawls, des recherches et des requêtes web
+
+- étapes du pipeline (listing_fetch, detail_fetch, extraction, db_write, query, ...) :
+  temps cumulé, nombre de passages, mémoire retenue et principaux sites d'allocation
+  (instantanés tracemalloc avant / après chaque étape)
+- profil CPU au choix :
+    sample   : échantillonnage de la pile toutes les 5 ms → fichier .folded
+               (flamegraph.pl, speedscope, inferno), une racine par étape
+    cprofile : cProfile déterministe → fichier .prof (pstats, snakeviz)
+- sans profilage actif, stage() ne coûte qu'un test
+
+Fichiers écrits dans PROFILE_DIR (default: profiles/) : <nom>-<horodatage>.folded|.prof,
+-memory.txt et -summary.txt (le résumé est aussi affiché en fin d'exécution)
+
+Usage : python scraper_unified.py --profile [sample|cprofile]
+        python search_articles.py --profile --search author "Thomas"
+"""
+
+import cProfile
+import contextlib
+import hmac
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+PROFILE_MODES = ('sample', 'cprofile')
+DEFAULT_OUTPUT_DIR = os.getenv('PROFILE_DIR', 'profiles')
+SAMPLE_INTERVAL = 0.005
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 8
+
+_MODULE_GLOBALS = globals()
+# Allocations du profileur lui-même exclues des instantanés
+_SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+_NULL_STAGE = contextlib.nullcontext()
+_active: Optional['Profiler'] = None  # un seul profilage par processus (cProfile l'impose)
+_active_lock = threading.Lock()
+
+
+def stage(name: str):
+    """Délimite une étape du pipeline ; sans effet hors profilage"""
+    profiler = _active
+    if profiler is None or threading.get_ident() not in profiler.threads:
+        return _NULL_STAGE
+    return _Stage(profiler, name)
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Stage:
+    """Contexte d'une étape : chronomètre et instantanés mémoire"""
+
+    __slots__ = ('profiler', 'name', 'start', 'snapshot')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+        self.snapshot = self.profiler._snapshot()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.profiler._record(self.name, elapsed, self.snapshot)
+        self.profiler._pop()
+        return False
+
+
+class Profiler:
+    """Profil CPU + mémoire par étape d'une exécution (CLI) ou d'une requête (web)"""
+
+    def __init__(self, name: str, mode: str = 'sample', memory: Optional[bool] = None,
+                 output_dir: Optional[str] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Mode de profilage inconnu: '{mode}' (choix: {', '.join(PROFILE_MODES)})")
+        self.name = name
+        self.mode = mode
+        self.memory = (os.getenv('PROFILE_MEMORY', 'true').lower() == 'true') if memory is None else memory
+        self.output_dir = output_dir or DEFAULT_OUTPUT_DIR
+        self.threads = set()
+        self.stage_stacks: Dict[int, list] = defaultdict(list)
+        self.stage_times: Dict[str, float] = defaultdict(float)
+        self.stage_calls: Counter = Counter()
+        self.stage_memory: Dict[str, int] = defaultdict(int)
+        self.allocations: Dict[str, Counter] = defaultdict(Counter)
+        self.samples: Counter = Counter()
+        self.cprofile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_tracemalloc = False
+        self.started_at = None
+
+    # ------------------------------------------------------------------
+    # Étapes
+    # ------------------------------------------------------------------
+    def _push(self, name: str) -> None:
+        self.stage_stacks[threading.get_ident()].append(name)
+
+    def _pop(self) -> None:
+        self.stage_stacks[threading.get_ident()].pop()
+
+    def _snapshot(self):
+        if not self.memory:
+            return None
+        # Le coût de l'instantané ne doit pas apparaître dans le profil CPU
+        if self.cprofile:
+            self.cprofile.disable()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        if self.cprofile:
+            self.cprofile.enable()
+        return snapshot
+
+    def _record(self, name: str, elapsed: float, before) -> None:
+        self.stage_times[name] += elapsed
+        self.stage_calls[name] += 1
+        if before is None:
+            return
+        after = self._snapshot()
+        for stat in after.compare_to(before, 'lineno'):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            self.stage_memory[name] += stat.size_diff
+            self.allocations[name][f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+    # ------------------------------------------------------------------
+    # Échantillonnage
+    # ------------------------------------------------------------------
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frames = sys._current_frames()
+            for ident in self.threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    if frame.f_globals is _MODULE_GLOBALS:
+                        # Instantané mémoire en cours : échantillon ignoré
+                        stack = None
+                        break
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                stages = [f"étape:{name}" for name in self.stage_stacks.get(ident, [])]
+                self.samples[';'.join(stages[:1] + stack[::-1])] += 1
+
+    # ------------------------------------------------------------------
+    # Démarrage / arrêt
+    # ------------------------------------------------------------------
+    def start(self) -> 'Profiler':
+        global _active
+        with _active_lock:
+            if _active is not None:
+                raise RuntimeError("Un profilage est déjà en cours dans ce processus")
+            _active = self
+        self.threads = {threading.get_ident()}
+        self.started_at = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.mode == 'cprofile':
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self) -> Dict[str, str]:
+        """Arrête le profilage, écrit les fichiers et retourne leurs chemins"""
+        global _active
+        elapsed = time.perf_counter() - self.started_at
+        if self.cprofile:
+            self.cprofile.disable()
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        with _active_lock:
+            _active = None
+        return self.write(elapsed)
+
+    # ------------------------------------------------------------------
+    # Rapports
+    # ------------------------------------------------------------------
+    def summary(self, elapsed: float) -> str:
+        lines = [f"⏱️ Profil '{self.name}' ({self.mode}) : {elapsed:.2f}s au total"]
+        if self.stage_times:
+            lines.append(f"   {'étape':<16} {'passages':>8} {'temps':>9} {'part':>6} {'mémoire':>10}")
+            for name, seconds in sorted(self.stage_times.items(), key=lambda item: -item[1]):
+                memory = f"{self.stage_memory[name] / 1024:.0f} Kio" if self.memory else '-'
+                lines.append(f"   {name:<16} {self.stage_calls[name]:>8} {seconds:>8.2f}s "
+                             f"{seconds / elapsed:>6.0%} {memory:>10}")
+
+        lines.append("\n🔥 Fonctions les plus coûteuses")
+        if self.cprofile:
+            buffer = io.StringIO()
+            pstats.Stats(self.cprofile, stream=buffer).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+            lines.append(buffer.getvalue().strip())
+        else:
+            # Temps propre (sommet de pile) et temps inclusif, en part des échantillons
+            sampled = sum(self.samples.values())
+            total = sampled or 1
+            own, inclusive = Counter(), Counter()
+            for stack, count in self.samples.items():
+                frames = [frame for frame in stack.split(';') if not frame.startswith('étape:')]
+                if frames:
+                    own[frames[-1]] += count
+                for frame in set(frames):
+                    inclusive[frame] += count
+            lines.append(f"   {'propre':>7} {'inclusif':>8}  fonction ({sampled} échantillons)")
+            for frame, count in own.most_common(TOP_FUNCTIONS):
+                lines.append(f"   {count / total:>7.1%} {inclusive[frame] / total:>8.1%}  {frame}")
+
+        if self.memory and self.allocations:
+            lines.append("\n🧠 Principaux sites d'allocation (mémoire retenue par étape)")
+            for name, sites in self.allocations.items():
+                lines.append(f"   [{name}]")
+                for site, size in sites.most_common(TOP_ALLOCATIONS):
+                    lines.append(f"      {size / 1024:>8.1f} Kio  {site}")
+        return '\n'.join(lines)
+
+    def write(self, elapsed: float) -> Dict[str, str]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.name}-{datetime.now():%Y%m%d-%H%M%S-%f}")
+        paths = {}
+        try:
+            if self.cprofile:
+                paths['cpu'] = f"{base}.prof"
+                self.cprofile.dump_stats(paths['cpu'])
+            else:
+                paths['cpu'] = f"{base}.folded"
+                with open(paths['cpu'], 'w', encoding='utf-8') as f:
+                    for stack, count in self.samples.most_common():
+                        f.write(f"{stack} {count}\n")
+
+            if self.memory:
+                paths['memory'] = f"{base}-memory.txt"
+                with open(paths['memory'], 'w', encoding='utf-8') as f:
+                    for name, sites in self.allocations.items():
+                        f.write(f"[{name}] {self.stage_memory[name]} octets\n")
+                        for site, size in sites.most_common():
+                            f.write(f"{size:>12} {site}\n")
+
+            summary = self.summary(elapsed)
+            paths['summary'] = f"{base}-summary.txt"
+            with open(paths['summary'], 'w', encoding='utf-8') as f:
+                f.write(summary + '\n')
+            print('\n' + summary)
+            print(f"\n📁 Profil écrit : {', '.join(paths.values())}")
+        except Exception as e:
+            print(f"❌ Erreur écriture du profil: {e}")
+        return paths
+
+
+@contextlib.contextmanager
+def profiled(name: str, mode: Optional[str]):
+    """Profile le bloc si `mode` est donné (option --profile), sinon ne fait rien"""
+    if not mode:
+        yield None
+        return
+    profiler = Profiler(name, mode).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+
+
+# ----------------------------------------------------------------------
+# Interface web : profilage d'une requête à la demande
+# ----------------------------------------------------------------------
+def web_profiling_token() -> Optional[str]:
+    """Jeton exigé dans l'en-tête X-Profile ; None si le profilage web est désactivé"""
+    if os.getenv('WEB_PROFILING', 'false').lower() != 'true':
+        return None
+    return os.getenv('WEB_PROFILING_TOKEN') or None
+
+
+def start_request_profile(header_value: Optional[str], path: str) -> Optional[Profiler]:
+    """
+    Démarre le profilage d'une requête si WEB_PROFILING=true et si l'en-tête X-Profile
+    porte le jeton WEB_PROFILING_TOKEN ; une seule requête profilée à la fois
+    """
+    token = web_profiling_token()
+    if not token or not header_value:
+        return None
+    mode, _, value = header_value.rpartition(':')
+    if not hmac.compare_digest(value.encode('utf-8'), token.encode('utf-8')):
+        return None
+    name = 'web' + path.replace('/', '_').rstrip('_')
+    try:
+        return Profiler(name, mode if mode in PROFILE_MODES else 'sample').start()
+    except RuntimeError:
+        return None  # une autre requête est déjà profilée
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Audit des requêtes MongoDB (mode diagnostic, QUERY_AUDIT=true)
+
+Chaque find / aggregate / count / distinct émis par le client est observé via le
+monitoring des commandes de pymongo (getMore rattachés à leur requête d'origine) :
+durée serveur cumulée et documents retournés. Un thread de fond explique chaque forme
+de requête (valeurs remplacées par leur type) en executionStats, au plus une fois par
+QUERY_EXPLAIN_INTERVAL secondes : documents examinés, clés examinées, plan gagnant.
+
+- QUERY_AUDIT_LOG  (default: query_audit.jsonl)  : une ligne par requête
+- QUERY_SLOW_LOG   (default: slow_queries.jsonl) : requêtes au-delà de QUERY_SLOW_MS (default: 100)
+
+Rapport : python search_articles.py --report
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo import monitoring
+
+AUDITED_COMMANDS = ('find', 'aggregate', 'count', 'distinct')
+# Étapes de plan qui lisent un index plutôt que la collection entière
+INDEX_STAGES = ('IXSCAN', 'EXPRESS_IXSCAN', 'IDHACK', 'EXPRESS_IDHACK', 'COUNT_SCAN',
+                'DISTINCT_SCAN', 'TEXT', 'TEXT_MATCH', 'TEXT_OR')
+DEFAULT_AUDIT_LOG = os.getenv('QUERY_AUDIT_LOG', 'query_audit.jsonl')
+DEFAULT_SLOW_LOG = os.getenv('QUERY_SLOW_LOG', 'slow_queries.jsonl')
+SLOW_MS = float(os.getenv('QUERY_SLOW_MS', '100'))
+EXPLAIN_INTERVAL = float(os.getenv('QUERY_EXPLAIN_INTERVAL', '300'))
+MAX_OPEN_CURSORS = 1000
+# Champs de session / transport retirés avant explain
+_TRANSPORT_FIELDS = ('lsid', 'txnNumber', 'autocommit', 'startTransaction', 'signature')
+
+
+def query_audit_enabled() -> bool:
+    return os.getenv('QUERY_AUDIT', 'false').lower() in ('1', 'true', 'yes')
+
+
+def query_shape(value):
+    """Structure d'une requête, valeurs remplacées par leur type : une entrée par forme"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(item) for item in value]
+    return type(value).__name__
+
+
+def _shape_key(op: str, collection: str, command: Dict) -> str:
+    if op == 'find':
+        parts = {'filter': command.get('filter', {}), 'sort': command.get('sort')}
+    elif op == 'aggregate':
+        parts = {'pipeline': command.get('pipeline', [])}
+    elif op == 'distinct':
+        parts = {'key': command.get('key'), 'query': command.get('query', {})}
+    else:
+        parts = {'query': command.get('query', {})}
+    return f"{op} {collection} " + json.dumps(query_shape(parts), sort_keys=True, default=str)
+
+
+def _walk(document, key):
+    """Toutes les valeurs de `key` dans un document imbriqué (sortie d'explain)"""
+    if isinstance(document, dict):
+        for name, value in document.items():
+            if name == key:
+                yield value
+            yield from _walk(value, key)
+    elif isinstance(document, list):
+        for item in document:
+            yield from _walk(item, key)
+
+
+def summarize_explain(explain: Dict) -> Dict:
+    """Plan gagnant et compteurs d'exécution d'une sortie explain (find, aggregate, distinct)"""
+    stages, indexes = [], []
+    for plan in _walk(explain, 'winningPlan'):
+        stages.extend(_walk(plan, 'stage'))
+        indexes.extend(_walk(plan, 'indexName'))
+    stages = list(dict.fromkeys(stage for stage in stages if isinstance(stage, str)))
+    # Un bloc executionStats par plan exécuté (un seul hors cluster shardé)
+    executions = [stats for stats in _walk(explain, 'executionStats') if isinstance(stats, dict)]
+    return {
+        'plan': ' > '.join(stages) or 'inconnu',
+        'indexes': list(dict.fromkeys(indexes)),
+        'collscan': 'COLLSCAN' in stages,
+        'uses_index': any(stage in INDEX_STAGES for stage in stages),
+        'docs_examined': sum(stats.get('totalDocsExamined', 0) for stats in executions),
+        'keys_examined': sum(stats.get('totalKeysExamined', 0) for stats in executions),
+        'explain_returned': sum(stats.get('nReturned', 0) for stats in executions) if executions else None,
+    }
+
+
+class _Execution:
+    """Requête en cours : première commande + getMore éventuels"""
+
+    __slots__ = ('op', 'database', 'collection', 'command', 'started', 'duration_ms', 'returned')
+
+    def __init__(self, op, database, collection, command):
+        self.op = op
+        self.database = database
+        self.collection = collection
+        self.command = command
+        self.started = datetime.now()
+        self.duration_ms = 0.0
+        self.returned = 0
+
+
+def _batch_size(reply: Dict) -> int:
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        return len(cursor.get('firstBatch') or cursor.get('nextBatch') or [])
+    if 'values' in reply:
+        return len(reply['values'])
+    return 1 if 'n' in reply else 0
+
+
+class QueryAuditor(monitoring.CommandListener):
+    """
+    Écouteur de commandes pymongo (event_listeners du MongoClient)
+    Les callbacks ne font que mettre en file : explain et écritures ont lieu dans un thread de fond
+    """
+
+    def __init__(self, audit_log: Optional[str] = None, slow_log: Optional[str] = None,
+                 slow_ms: Optional[float] = None, explain_interval: Optional[float] = None):
+        self.audit_log = audit_log or DEFAULT_AUDIT_LOG
+        self.slow_log = slow_log or DEFAULT_SLOW_LOG
+        self.slow_ms = SLOW_MS if slow_ms is None else slow_ms
+        self.explain_interval = EXPLAIN_INTERVAL if explain_interval is None else explain_interval
+        self.client = None
+        self.started_commands: Dict[int, tuple] = {}
+        self.open_cursors: 'OrderedDict[int, _Execution]' = OrderedDict()
+        self.plans: Dict[str, tuple] = {}  # forme -> (horodatage, résumé explain)
+        self.audited = 0
+        self.slow = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, client) -> None:
+        """Client utilisé pour les explain (celui qui porte l'écouteur)"""
+        self.client = client
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name='query-audit', daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Callbacks pymongo (thread de l'appelant : aucune I/O ici)
+    # ------------------------------------------------------------------
+    def started(self, event):
+        name = event.command_name
+        if name in AUDITED_COMMANDS:
+            command = {key: value for key, value in event.command.items()
+                       if not key.startswith('$') and key not in _TRANSPORT_FIELDS}
+            with self._lock:
+                self.started_commands[event.request_id] = (name, event.database_name, command)
+        elif name in ('getMore', 'killCursors'):
+            with self._lock:
+                self.started_commands[event.request_id] = (name, event.database_name, event.command)
+
+    def succeeded(self, event):
+        with self._lock:
+            started = self.started_commands.pop(event.request_id, None)
+        if started is None:
+            return
+        name, database, command = started
+        duration_ms = event.duration_micros / 1000
+        reply = event.reply or {}
+
+        if name in AUDITED_COMMANDS:
+            execution = _Execution(name, database, command.get(name), command)
+            execution.duration_ms = duration_ms
+            execution.returned = _batch_size(reply)
+            cursor = reply.get('cursor')
+            cursor_id = cursor.get('id') if isinstance(cursor, dict) else 0
+            if cursor_id:
+                self._open(cursor_id, execution)
+            else:
+                self._queue.put(execution)
+        elif name == 'getMore':
+            with self._lock:
+                execution = self.open_cursors.get(command.get('getMore'))
+            if execution is None:
+                return
+            execution.duration_ms += duration_ms
+            execution.returned += _batch_size(reply)
+            if not (reply.get('cursor') or {}).get('id'):
+                self._close_cursor(command.get('getMore'))
+        else:
+            for cursor_id in command.get('cursors', []):
+                self._close_cursor(cursor_id)
+
+    def failed(self, event):
+        with self._lock:
+            self.started_commands.pop(event.request_id, None)
+
+    def _open(self, cursor_id, execution: _Execution) -> None:
+        with self._lock:
+            self.open_cursors[cursor_id] = execution
+            # Curseurs jamais épuisés ni fermés : les plus anciens sont clos
+            while len(self.open_cursors) > MAX_OPEN_CURSORS:
+                self._queue.put(self.open_cursors.popitem(last=False)[1])
+
+    def _close_cursor(self, cursor_id) -> None:
+        with self._lock:
+            execution = self.open_cursors.pop(cursor_id, None)
+        if execution is not None:
+            self._queue.put(execution)
+
+    # ------------------------------------------------------------------
+    # Thread de fond : explain + journaux
+    # ------------------------------------------------------------------
+    def explain(self, execution: _Execution, shape: str) -> Optional[Dict]:
+        """Résumé explain (executionStats) de la forme, recalculé après explain_interval"""
+        cached = self.plans.get(shape)
+        if cached and time.monotonic() - cached[0] < self.explain_interval:
+            return cached[1]
+        if self.client is None:
+            return cached[1] if cached else None
+        try:
+            # explain exécute la requête : une fois par forme et par intervalle seulement
+            result = self.client[execution.database].command(
+                {'explain': execution.command, 'verbosity': 'executionStats'})
+            plan = summarize_explain(result)
+        except Exception as e:
+            plan = {'plan': f'explain impossible: {e}', 'indexes': [], 'collscan': None, 'uses_index': None}
+        self.plans[shape] = (time.monotonic(), plan)
+        return plan
+
+    def record(self, execution: _Execution) -> Dict:
+        shape = _shape_key(execution.op, execution.collection, execution.command)
+        entry = {
+            'at': execution.started.isoformat(),
+            'op': execution.op,
+            'collection': execution.collection,
+            'shape': shape,
+            'duration_ms': round(execution.duration_ms, 3),
+            'returned': execution.returned,
+            'explain': self.explain(execution, shape),
+        }
+        self._append(self.audit_log, entry)
+        self.audited += 1
+        if execution.duration_ms >= self.slow_ms:
+            self._append(self.slow_log, dict(entry, command=execution.command))
+            self.slow += 1
+            print(f"🐢 Requête lente ({execution.duration_ms:.0f} ms) : {shape[:120]}")
+        return entry
+
+    def _append(self, path: str, entry: Dict) -> None:
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        except Exception as e:
+            print(f"❌ Erreur écriture du journal {path}: {e}")
+
+    def _worker(self) -> None:
+        while True:
+            execution = self._queue.get()
+            try:
+                if execution is None:
+                    return
+                self.record(execution)
+            except Exception as e:
+                print(f"❌ Erreur audit de requête: {e}")
+            finally:
+                self._queue.task_done()
+
+    def close(self) -> None:
+        """Journalise les curseurs encore ouverts et attend la fin des explain en file"""
+        with self._lock:
+            pending = list(self.open_cursors.values())
+            self.open_cursors.clear()
+        for execution in pending:
+            self._queue.put(execution)
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            print(f"🩺 Audit des requêtes : {self.audited} requêtes journalisées ({self.slow} lentes) "
+                  f"dans {self.audit_log}")
+
+
+# ----------------------------------------------------------------------
+# Rapport
+# ----------------------------------------------------------------------
+def _read_log(path: str) -> List[Dict]:
+    entries = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue  # ligne tronquée (processus interrompu)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def aggregate_log(entries: List[Dict]) -> List[Dict]:
+    """Statistiques par forme de requête (dernier explain connu), triées par temps cumulé"""
+    shapes = defaultdict(lambda: {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'returned': 0, 'explain': None})
+    for entry in entries:
+        stats = shapes[entry['shape']]
+        stats['shape'] = entry['shape']
+        stats['calls'] += 1
+        stats['total_ms'] += entry['duration_ms']
+        stats['max_ms'] = max(stats['max_ms'], entry['duration_ms'])
+        stats['returned'] += entry['returned']
+        stats['last_at'] = entry['at']
+        if entry.get('explain'):
+            stats['explain'] = entry['explain']
+    return sorted(shapes.values(), key=lambda stats: -stats['total_ms'])
+
+
+def audit_report(audit_log: Optional[str] = None, slow_log: Optional[str] = None, limit: int = 20) -> str:
+    """Requêtes sans index (COLLSCAN), index peu sélectifs et requêtes lentes"""
+    audit_log = audit_log or DEFAULT_AUDIT_LOG
+    slow_log = slow_log or DEFAULT_SLOW_LOG
+    shapes = aggregate_log(_read_log(audit_log))
+    if not shapes:
+        return (f"Aucune requête auditée dans {audit_log} "
+                f"(activer QUERY_AUDIT=true ou --audit puis relancer des recherches)")
+
+    def describe(stats):
+        explain = stats['explain'] or {}
+        examined = explain.get('docs_examined')
+        returned = explain.get('explain_returned')
+        ratio = f"{examined}/{returned}" if examined is not None and returned is not None else '?'
+        return (f"   {stats['calls']:>6} {stats['total_ms']:>10.1f} {stats['max_ms']:>9.1f} {ratio:>15}  "
+                f"{explain.get('plan', 'non expliquée')}\n      {stats['shape']}")
+
+    header = f"   {'appels':>6} {'total ms':>10} {'max ms':>9} {'examinés/ret.':>15}  plan"
+    no_index = [stats for stats in shapes if (stats['explain'] or {}).get('collscan')]
+    loose = [stats for stats in shapes
+             if stats not in no_index and (stats['explain'] or {}).get('docs_examined', 0)
+             > 10 * max(1, (stats['explain'] or {}).get('explain_returned') or 0)]
+    slow = _read_log(slow_log)
+
+    lines = [f"🩺 RAPPORT D'AUDIT DES REQUÊTES ({len(shapes)} formes, "
+             f"{sum(stats['calls'] for stats in shapes)} requêtes, {len(slow)} lentes)"]
+    lines.append(f"\n🚨 Requêtes sans index (COLLSCAN) : {len(no_index)}")
+    if no_index:
+        lines.append(header)
+        lines.extend(describe(stats) for stats in no_index[:limit])
+    lines.append(f"\n⚠️ Index peu sélectifs (plus de 10 documents examinés par document retourné) : {len(loose)}")
+    if loose:
+        lines.append(header)
+        lines.extend(describe(stats) for stats in loose[:limit])
+    if slow:
+        slow_shapes = aggregate_log(slow)
+        lines.append(f"\n🐢 Requêtes lentes par forme (journal {slow_log}) :")
+        lines.append(header)
+        lines.extend(describe(stats) for stats in slow_shapes[:limit])
+    return '\n'.join(lines)
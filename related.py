@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Articles similaires : modèle TF-IDF (titre, résumé, contenu) et plus proches voisins cosinus
+
+Vectorisation à l'ingestion : tokenisation française (accents repliés, mots vides retirés,
+pluriels réduits), tf sous-linéaire, titre x3 et résumé x2. Les vecteurs forment une
+matrice creuse au format COO, dans trois fichiers en ajout seul (rows.i4, cols.i4,
+vals.f4) mappés en mémoire ; meta.json porte le vocabulaire, les fréquences documentaires
+et la table des articles. L'IDF et les normes sont recalculés à la lecture : ajouter un
+article n'écrit que ses propres entrées, sans reconstruction. Un article modifié est
+marqué supprimé puis ajouté à nouveau ; les lignes supprimées sont compactées au-delà
+de 25 %.
+
+Les k voisins d'un article se calculent en une passe vectorisée sur toutes les entrées
+(np.bincount), sans boucle Python par article. numpy n'est importé qu'à la première
+utilisation de l'index : importer le module (identifiants, service) ne le charge pas.
+
+Usage : python related.py build [--backend sqlite]
+        python related.py similar --url https://www.blogdumoderateur.com/... [-k 5]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from models import article_key, as_document
+from text_utils import tokenize
+
+try:
+    import fcntl
+except ImportError:  # Windows : un seul processus écrivain
+    fcntl = None
+
+DEFAULT_INDEX_PATH = os.getenv('RELATED_INDEX_PATH', 'related_index')
+FIELD_WEIGHTS = (('title', 3), ('summary', 2), ('content', 1))
+DEFAULT_TOP_K = 5
+MAX_TOP_K = 50
+COMPACT_RATIO = 0.25
+BUILD_BATCH = 500
+
+# Colonnes de la table des articles dans meta.json
+_KEY, _URL, _TITLE, _START, _END, _DIGEST, _LIVE = range(7)
+_ARRAYS = (('rows', 'i4', 'int32'), ('cols', 'i4', 'int32'), ('vals', 'f4', 'float32'))
+
+
+def related_index_enabled() -> bool:
+    return os.getenv('RELATED_INDEX', 'true').lower() in ('1', 'true', 'yes')
+
+
+def term_weights(article: Dict) -> Counter:
+    """Fréquences pondérées des termes d'un article (titre x3, résumé x2, contenu)"""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in tokenize(article.get(field) or ''):
+            counts[token] += weight
+    return counts
+
+
+class _FileLock:
+    """Verrou inter-processus des écritures (crawler et interface web sur la même machine)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        if fcntl:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+        return False
+
+
+class RelatedIndex:
+    """Matrice TF creuse sur disque (COO, ajout seul) et voisins cosinus TF-IDF"""
+
+    def __init__(self, index_path: str = DEFAULT_INDEX_PATH):
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.docs: List[list] = []
+        self.by_key: Dict[str, int] = {}
+        self.vocab: Dict[str, int] = {}
+        self.df: List[int] = []
+        self.nnz = 0
+        self.live = 0
+        self._meta_stamp = None
+        self._arrays = None
+        self._weights = None
+
+    # ------------------------------------------------------------------
+    # Fichiers
+    # ------------------------------------------------------------------
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_path, name)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path('meta.json'))
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self._path('meta.json'))
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def reload(self) -> bool:
+        """Relit meta.json s'il a changé (écriture d'un autre processus) ; False si l'index n'existe pas"""
+        with self._lock:
+            stamp = self._stamp()
+            if stamp is None:
+                return False
+            if stamp == self._meta_stamp:
+                return True
+            with open(self._path('meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.docs = meta['docs']
+            self.vocab = meta['vocab']
+            self.df = meta['df']
+            self.nnz = meta['nnz']
+            self.live = sum(1 for doc in self.docs if doc[_LIVE])
+            self.by_key = {doc[_KEY]: row for row, doc in enumerate(self.docs) if doc[_LIVE]}
+            self._meta_stamp = stamp
+            self._arrays = None
+            self._weights = None
+            return True
+
+    def _write_meta(self) -> None:
+        tmp_path = self._path('meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'docs': self.docs, 'vocab': self.vocab, 'df': self.df, 'nnz': self.nnz},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self._path('meta.json'))
+        self._meta_stamp = self._stamp()
+        self._arrays = None
+        self._weights = None
+
+    def arrays(self):
+        """(rows, cols, vals) mappés en mémoire, limités aux nnz entrées validées"""
+        import numpy as np
+
+        if self._arrays is None:
+            arrays = []
+            for name, suffix, dtype in _ARRAYS:
+                if self.nnz:
+                    arrays.append(np.memmap(self._path(f'{name}.{suffix}'), dtype=dtype, mode='r', shape=(self.nnz,)))
+                else:
+                    arrays.append(np.zeros(0, dtype=dtype))
+            self._arrays = tuple(arrays)
+        return self._arrays
+
+    # ------------------------------------------------------------------
+    # Écriture incrémentale
+    # ------------------------------------------------------------------
+    def add_articles(self, articles: Iterable) -> int:
+        """
+        Vectorise et ajoute des articles (Article ou dict) ; un article déjà indexé avec
+        le même texte est ignoré, un article modifié remplace son ancienne ligne
+        """
+        import numpy as np
+
+        os.makedirs(self.index_path, exist_ok=True)
+        with self._lock, _FileLock(self._path('lock')):
+            self.reload()
+            # Entrées au-delà de nnz : écriture interrompue avant meta.json, à écraser
+            for name, suffix, dtype in _ARRAYS:
+                path = self._path(f'{name}.{suffix}')
+                with open(path, 'ab') as f:
+                    f.truncate(self.nnz * np.dtype(dtype).itemsize)
+
+            rows, cols, vals = [], [], []
+            added, changed = 0, False
+            for article in map(as_document, articles):
+                url = article.get('url')
+                if not url:
+                    continue
+                counts = term_weights(article)
+                digest = hashlib.blake2b(json.dumps(sorted(counts.items()), ensure_ascii=False).encode('utf-8'),
+                                         digest_size=8).hexdigest()
+                key = article_key(url)
+                previous = self.by_key.get(key)
+                if previous is not None:
+                    if self.docs[previous][_DIGEST] == digest:
+                        continue
+                    self._retire(previous, cols)
+                    changed = True
+                if not counts:
+                    continue
+
+                row = len(self.docs)
+                start = self.nnz + len(cols)
+                for term, count in counts.items():
+                    column = self.vocab.get(term)
+                    if column is None:
+                        column = self.vocab[term] = len(self.df)
+                        self.df.append(0)
+                    self.df[column] += 1
+                    rows.append(row)
+                    cols.append(column)
+                    vals.append(1.0 + math.log(count))
+                self.docs.append([key, url, article.get('title') or '', start, self.nnz + len(cols), digest, 1])
+                self.by_key[key] = row
+                self.live += 1
+                added += 1
+
+            if added or changed:
+                for (name, suffix, dtype), values in zip(_ARRAYS, (rows, cols, vals)):
+                    with open(self._path(f'{name}.{suffix}'), 'ab') as f:
+                        np.asarray(values, dtype=dtype).tofile(f)
+                self.nnz += len(cols)
+                self._write_meta()
+            if len(self.docs) - self.live > COMPACT_RATIO * max(1, len(self.docs)):
+                self._compact()
+            return added
+
+    def _retire(self, row: int, pending_cols: List[int]) -> None:
+        """Marque une ligne supprimée et retire ses termes des fréquences documentaires"""
+        doc = self.docs[row]
+        if doc[_START] >= self.nnz:
+            # Ligne ajoutée plus tôt dans le même lot, pas encore écrite
+            columns = pending_cols[doc[_START] - self.nnz:doc[_END] - self.nnz]
+        else:
+            columns = self.arrays()[1][doc[_START]:doc[_END]].tolist()
+        for column in columns:
+            self.df[column] -= 1
+        doc[_LIVE] = 0
+        self.by_key.pop(doc[_KEY], None)
+        self.live -= 1
+
+    def _compact(self) -> None:
+        """Réécrit la matrice sans les lignes supprimées (verrou déjà pris)"""
+        import numpy as np
+
+        rows, cols, vals = (np.array(array) for array in self.arrays())
+        live_rows = np.array([bool(doc[_LIVE]) for doc in self.docs], dtype=bool)
+        keep = live_rows[rows] if len(rows) else np.zeros(0, dtype=bool)
+        renumber = np.cumsum(live_rows) - 1
+        rows, cols, vals = renumber[rows[keep]].astype(np.int32), cols[keep], vals[keep]
+
+        docs, start = [], 0
+        for doc in self.docs:
+            if doc[_LIVE]:
+                length = doc[_END] - doc[_START]
+                docs.append([doc[_KEY], doc[_URL], doc[_TITLE], start, start + length, doc[_DIGEST], 1])
+                start += length
+        self._arrays = None
+        for (name, suffix, _), values in zip(_ARRAYS, (rows, cols, vals)):
+            tmp_path = self._path(f'{name}.{suffix}.tmp')
+            values.tofile(tmp_path)
+            os.replace(tmp_path, self._path(f'{name}.{suffix}'))
+        self.docs = docs
+        self.by_key = {doc[_KEY]: row for row, doc in enumerate(docs)}
+        self.nnz = len(cols)
+        self._write_meta()
+        print(f"🗜️ Index des articles similaires compacté: {len(docs)} articles, {self.nnz} entrées")
+
+    def build(self, articles: Iterable) -> int:
+        """Reconstruction complète (premier calcul, ou changement de tokenisation)"""
+        with self._lock:
+            os.makedirs(self.index_path, exist_ok=True)
+            for name in ('meta.json',) + tuple(f'{name}.{suffix}' for name, suffix, _ in _ARRAYS):
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
+            self._reset()
+            count, batch = 0, []
+            for article in articles:
+                batch.append(article)
+                if len(batch) >= BUILD_BATCH:
+                    count += self.add_articles(batch)
+                    batch = []
+            count += self.add_articles(batch)
+            return count
+
+    # ------------------------------------------------------------------
+    # Voisins
+    # ------------------------------------------------------------------
+    def _tfidf(self):
+        """Poids TF-IDF de toutes les entrées et normes des lignes (mis en cache jusqu'à la prochaine écriture)"""
+        import numpy as np
+
+        if self._weights is None:
+            rows, cols, vals = self.arrays()
+            df = np.asarray(self.df, dtype=np.float32)
+            idf = np.log((1.0 + self.live) / (1.0 + np.maximum(df, 0))) + 1.0
+            weights = vals * idf[cols]
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(self.docs)))
+            live = np.array([bool(doc[_LIVE]) for doc in self.docs], dtype=bool)
+            self._weights = (weights, norms, live)
+        return self._weights
+
+    def related(self, key: str, k: int = DEFAULT_TOP_K) -> List[Dict]:
+        """Les k articles les plus proches (cosinus TF-IDF) de l'article `key`"""
+        import numpy as np
+
+        with self._lock:
+            self.reload()
+            row = self.by_key.get(key)
+            if row is None:
+                raise KeyError(key)
+            rows, cols, _ = self.arrays()
+            weights, norms, live = self._tfidf()
+
+            doc = self.docs[row]
+            query = np.zeros(len(self.df), dtype=np.float32)
+            query[cols[doc[_START]:doc[_END]]] = weights[doc[_START]:doc[_END]]
+            # Produit scalaire avec toutes les lignes en une passe sur les entrées
+            dots = np.bincount(rows, weights=weights * query[cols], minlength=len(self.docs))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(live & (norms > 0), dots / (norms * norms[row]), -1.0)
+            scores[row] = -1.0
+
+            k = max(1, min(k, MAX_TOP_K, len(scores)))
+            top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            return [{'id': self.docs[i][_KEY], 'url': self.docs[i][_URL], 'title': self.docs[i][_TITLE],
+                     'score': round(float(scores[i]), 4)}
+                    for i in top if scores[i] > 0]
+
+    def related_by_url(self, url: str, k: int = DEFAULT_TOP_K) -> List[Dict]:
+        return self.related(article_key(url), k)
+
+
+class RelatedService:
+    """
+    Index des articles similaires d'un backend : ouvert (ou construit) au premier appel,
+    puis tenu à jour par les sauvegardes publiées sur le bus
+    """
+
+    def __init__(self, repository, event_bus, index_path: Optional[str] = None):
+        self.repository = repository
+        self.event_bus = event_bus
+        self.index = RelatedIndex(index_path or DEFAULT_INDEX_PATH)
+        self.listening = False
+        self._lock = threading.Lock()
+
+    def _bodies(self, articles: List[Dict]) -> List[Dict]:
+        """Documents du change stream sans contenu (collection des corps) : contenu chargé à part"""
+        get_body = getattr(self.repository, 'get_article_body', None)
+        for article in articles:
+            if 'content' not in article and article.get('url') and get_body and not asyncio.iscoroutinefunction(get_body):
+                article.update(get_body(article['url']) or {})
+        return articles
+
+    def on_saved(self, articles) -> None:
+        """Crochet du bus : n'alimente qu'un index déjà construit (sinon il serait partiel)"""
+        if self.index.exists():
+            self.index.add_articles(self._bodies([as_document(article) for article in articles]))
+
+    def listen(self) -> 'RelatedService':
+        if not self.listening:
+            self.event_bus.add_listener(self.on_saved)
+            self.listening = True
+        return self
+
+    def get(self) -> RelatedIndex:
+        if not self.index.reload():
+            with self._lock:
+                if not self.index.reload():
+                    if self.repository is None or not hasattr(self.repository, 'iter_all_articles'):
+                        raise ValueError("Index des articles similaires absent (python related.py build)")
+                    start = time.perf_counter()
+                    count = self.index.build(self.repository.iter_all_articles())
+                    print(f"🧭 Index des articles similaires: {count} articles en {time.perf_counter() - start:.2f}s")
+        self.listen()
+        return self.index
+
+    async def aget(self) -> RelatedIndex:
+        return await asyncio.to_thread(self.get)
+
+
+def follow_saves(repository) -> Optional[RelatedService]:
+    """Processus d'ingestion : les articles qu'il sauvegarde alimentent l'index sur disque"""
+    if not related_index_enabled():
+        return None
+    from events import event_bus
+    return RelatedService(repository, event_bus).listen()
+
+
+def main():
+    from storage import BACKENDS, get_storage_backend
+
+    parser = argparse.ArgumentParser(description='Articles similaires (TF-IDF)')
+    parser.add_argument('action', choices=['build', 'similar'],
+                        help='build : vectorise tous les articles ; similar : voisins d\'un article')
+    parser.add_argument('--backend', choices=BACKENDS, default=None, help='Backend de stockage (default: STORAGE_BACKEND)')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help=f'Répertoire de l\'index (default: {DEFAULT_INDEX_PATH})')
+    parser.add_argument('--url', default=None, help='URL de l\'article (action similar)')
+    parser.add_argument('--id', default=None, help='Identifiant de l\'article (action similar)')
+    parser.add_argument('-k', type=int, default=DEFAULT_TOP_K, help=f'Nombre de voisins (default: {DEFAULT_TOP_K})')
+    args = parser.parse_args()
+
+    index = RelatedIndex(args.index)
+    try:
+        if args.action == 'build':
+            db_manager = get_storage_backend(args.backend)
+            start = time.perf_counter()
+            count = index.build(db_manager.iter_all_articles())
+            db_manager.close()
+            print(f"🧭 {count} articles vectorisés ({len(index.vocab)} termes, {index.nnz} entrées) "
+                  f"en {time.perf_counter() - start:.2f}s")
+        else:
+            if not (args.url or args.id):
+                print("❌ --url ou --id est requis")
+                return
+            if not index.reload():
+                print("❌ Index absent : lancer d'abord 'python related.py build'")
+                return
+            start = time.perf_counter()
+            neighbours = index.related(args.id or article_key(args.url), args.k)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"🧭 {len(neighbours)} articles similaires en {elapsed:.2f} ms")
+            for i, neighbour in enumerate(neighbours, 1):
+                print(f"{i}. [{neighbour['score']:.3f}] {neighbour['title']}")
+                print(f"   {neighbour['url']}")
+    except KeyError:
+        print("❌ Article absent de l'index")
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
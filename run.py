@@ -8,26 +8,89 @@ import subprocess
 import sys
 import argparse
 
+def serve_and_crawl(args):
+    """
+    Interface web et crawls planifiés dans un seul processus : une seule connexion
+    au stockage, et les caches web réchauffés juste après chaque crawl
+    """
+    import web_interface
+    from scheduler import CrawlScheduler, make_crawl
+
+    db_manager = web_interface.db_manager
+    if not db_manager:
+        print("❌ Stockage indisponible : impossible de planifier des crawls")
+        sys.exit(1)
+
+    interval = args.interval * 60
+    jitter = args.jitter * 60
+    cache = web_interface.web_cache
+    if cache.enabled:
+        # Les données ne changent qu'aux crawls : les entrées vivent jusqu'au rafraîchissement suivant,
+        # programmé par les sauvegardes du crawl (WebCache.on_saved) puis refait après le crawl
+        cache.ttl = max(cache.ttl, interval + jitter)
+
+    # Réchauffage avant la première requête
+    cache.refresh()
+    web_interface.suggest_service.get()
+
+    def after_crawl(saved):
+        print(f"💾 {saved} articles sauvegardés")
+        cache.refresh()
+
+    scheduler = CrawlScheduler(
+        make_crawl(db_manager, args.crawl_mode, args.count),
+        interval, jitter,
+        on_complete=after_crawl,
+        run_at_start=args.crawl_at_start
+    )
+    scheduler.start()
+    print(f"🕒 Crawl ({args.crawl_mode}) toutes les {args.interval:g} min ± {args.jitter:g} min")
+    print(f"🌐 Interface web disponible sur: http://localhost:{args.port}")
+    try:
+        # Pas de rechargeur : il lancerait un second planificateur
+        web_interface.app.run(host=args.host, port=args.port, debug=False, use_reloader=False, threaded=True)
+    finally:
+        scheduler.stop(timeout=0)
+        db_manager.close()
+
 def main():
     parser = argparse.ArgumentParser(description='Lanceur unifié du projet')
-    parser.add_argument('action', choices=['scrape', 'web'], 
+    parser.add_argument('action', choices=['scrape', 'web', 'migrate', 'serve-and-crawl'],
                        help='Action à effectuer')
-    parser.add_argument('--mode', choices=['mongo', 'multi'], 
+    parser.add_argument('--mode', choices=['mongo', 'multi'],
                        default='mongo', help='Mode de scraping')
-    parser.add_argument('--count', type=int, default=30, 
+    parser.add_argument('--count', type=int, default=30,
                        help='Nombre d\'articles')
-    
+    parser.add_argument('--interval', type=float, default=60,
+                       help='serve-and-crawl : minutes entre deux crawls (default: 60)')
+    parser.add_argument('--jitter', type=float, default=5,
+                       help='serve-and-crawl : variation aléatoire de l\'intervalle, en minutes (default: 5)')
+    parser.add_argument('--crawl-mode', choices=['sections', 'discover'], default='sections',
+                       help='serve-and-crawl : pages de section ou découverte RSS (default: sections)')
+    parser.add_argument('--crawl-at-start', action='store_true',
+                       help='serve-and-crawl : premier crawl dès le démarrage')
+    parser.add_argument('--host', default='0.0.0.0', help='serve-and-crawl : adresse d\'écoute')
+    parser.add_argument('--port', type=int, default=5000, help='serve-and-crawl : port (default: 5000)')
+
     args = parser.parse_args()
-    
+
     if args.action == 'scrape':
         # Lancer le scraper
-        cmd = [sys.executable, 'scraper_unified.py', 
+        cmd = [sys.executable, 'scraper_unified.py',
                '--mode', args.mode, '--count', str(args.count)]
         subprocess.run(cmd)
-    
+
     elif args.action == 'web':
         # Lancer l'interface web
         subprocess.run([sys.executable, 'web_interface.py'])
 
+    elif args.action == 'migrate':
+        # Provisionner les index (opération ponctuelle)
+        subprocess.run([sys.executable, 'migrate.py'])
+
+    elif args.action == 'serve-and-crawl':
+        # Interface web + crawls planifiés dans le même processus
+        serve_and_crawl(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
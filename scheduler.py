@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificateur de crawls en processus : un thread de fond relance le scraper à
+intervalle régulier (± gigue aléatoire pour ne pas frapper le site à heure fixe),
+dans le même processus que l'interface web (connexion au stockage partagée)
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from core_scraper import BlogScraperCore
+from discovery import ChangeDiscovery, SECTION_FEEDS
+
+CRAWL_MODES = ('sections', 'discover')
+
+
+class CrawlScheduler:
+    """Exécute `crawl()` toutes les `interval` ± `jitter` secondes, puis `on_complete(résultat)`"""
+
+    def __init__(self, crawl: Callable, interval: float, jitter: float = 0.0,
+                 on_complete: Optional[Callable] = None, run_at_start: bool = True):
+        self.crawl = crawl
+        self.interval = interval
+        self.jitter = jitter
+        self.on_complete = on_complete
+        self.run_at_start = run_at_start
+        self.runs = 0
+        self.last_run: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_delay(self) -> float:
+        return max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def run_once(self) -> None:
+        start = time.perf_counter()
+        print(f"🕒 Crawl planifié n°{self.runs + 1}")
+        try:
+            result = self.crawl()
+        except Exception as e:
+            print(f"❌ Erreur crawl planifié: {e}")
+            return
+        finally:
+            self.runs += 1
+            self.last_run = datetime.now()
+        print(f"✅ Crawl planifié terminé en {time.perf_counter() - start:.0f}s")
+        if self.on_complete:
+            try:
+                self.on_complete(result)
+            except Exception as e:
+                print(f"⚠️ Erreur après le crawl: {e}")
+
+    def _loop(self) -> None:
+        delay = 0.0 if self.run_at_start else self.next_delay()
+        while not self._stop.wait(delay):
+            self.run_once()
+            delay = self.next_delay()
+            print(f"⏳ Prochain crawl dans {delay / 60:.1f} min")
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(target=self._loop, name='crawl-scheduler', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrêt après le crawl en cours"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def make_crawl(db_manager, mode: str = 'sections', count: int = 30,
+               discovery_state: str = 'discovery_state.json') -> Callable:
+    """
+    Crawl à planifier, écrivant via le backend déjà ouvert
+    - sections : pages de liste des sections (comme scraper_unified --mode mongo)
+    - discover : seuls les articles nouveaux ou modifiés des flux RSS (--mode discover)
+    """
+    from scraper_unified import SECTIONS, fetch_discovered
+
+    scraper = BlogScraperCore()
+
+    def crawl_sections():
+        articles = scraper.fetch_articles_multi_pages(SECTIONS, count)
+        return db_manager.save_articles(articles) if articles else 0
+
+    def crawl_discover():
+        discovery = ChangeDiscovery(discovery_state)
+        pending = discovery.discover(SECTION_FEEDS)[:count]
+        return len(fetch_discovered(scraper, db_manager, discovery, pending))
+
+    if mode == 'discover':
+        return crawl_discover
+    if mode == 'sections':
+        return crawl_sections
+    raise ValueError(f"Mode de crawl inconnu: '{mode}' (choix: {', '.join(CRAWL_MODES)})")
@@ -3,23 +3,101 @@
 """
 Script unifié de scraping - Blog du Modérateur
 Remplace tous les autres scrapers avec options flexibles
+Le mode sites crawle en parallèle tous les sites décrits dans sites/ (site_profiles)
 """
 
 import argparse
 import sys
+import time
 from core_scraper import BlogScraperCore
-from mongodb_manager import MongoDBManager
+from storage import get_storage_backend, is_stored
+from near_duplicates import NearDuplicateDetector, MemoryLSHStore
+from image_assets import ImageAssetStore
+from discovery import ChangeDiscovery, SECTION_FEEDS, SITEMAP_INDEX
+from job_queue import CrawlWorker, QUEUES, get_job_queue, seed_listings
+from profiling import PROFILE_MODES, Profiler, stage
+from related import follow_saves
+from site_crawler import MultiSiteCrawler, SiteScrapers
+from site_profiles import default_profile, load_profiles
+
+SECTIONS = default_profile().seeds
+
+
+def fetch_discovered(scraper, db_manager, discovery, pending):
+    """Récupère et sauvegarde les articles découverts ; retourne ceux qui ont été sauvegardés"""
+    articles = []
+    try:
+        for i, (url, lastmod) in enumerate(pending, 1):
+            print(f"📄 Article {i}/{len(pending)}: {url}")
+            article = scraper.fetch_article(url)
+            with stage('db_write'), db_manager.tracking_trends([article] if article else []):
+                saved = bool(article) and db_manager.save_article(article)
+            if saved:
+                discovery.mark_done(url)
+                if is_stored(saved):
+                    articles.append(article)
+            time.sleep(1)
+    finally:
+        # Les articles non traités restent en attente pour le prochain passage
+        discovery.save_state()
+        db_manager.publish_saved(articles)
+    return articles
+
+
+def run_worker(queue_name, backend, full_parse, idle_timeout, sites=None):
+    """
+    Un processus worker : ses scrapers (un par site), sa connexion au stockage et à la file
+    Pas de pause fixe entre les travaux : le HostLimiter de chaque site règle le débit
+    """
+    scrapers = SiteScrapers(load_profiles(sites), selective=False if full_parse else None)
+    db_manager = get_storage_backend(backend)
+    follow_saves(db_manager)
+    queue = get_job_queue(queue_name, db_manager)
+    try:
+        return CrawlWorker(queue, scrapers, db_manager, delay=0, idle_timeout=idle_timeout).run()
+    finally:
+        queue.close()
+        db_manager.close()
+        scrapers.close()
+
 
 def main():
     parser = argparse.ArgumentParser(description='Scraper unifié Blog du Modérateur')
-    parser.add_argument('--mode', choices=['mongo', 'multi'], default='mongo',
+    parser.add_argument('--mode', choices=['mongo', 'multi', 'discover', 'seed', 'worker', 'sites'],
+                       default='mongo',
                        help='Mode de fonctionnement (default: mongo)')
     parser.add_argument('--count', type=int, default=30,
-                       help='Nombre d\'articles à récupérer (default: 30)')
+                       help='Nombre d\'articles à récupérer, par site en mode sites (default: 30)')
     parser.add_argument('--output', default='articles.json',
                        help='Fichier de sortie JSON (default: articles.json)')
     parser.add_argument('--url', default='https://www.blogdumoderateur.com/web/',
                        help='URL de base (default: web section)')
+    parser.add_argument('--backend', choices=['mongo', 'sqlite'], default=None,
+                       help='Backend de stockage en mode base (default: STORAGE_BACKEND ou mongo)')
+    parser.add_argument('--dedup-index', default='minhash_index.json',
+                       help='Index des quasi-doublons en mode multi (default: minhash_index.json)')
+    parser.add_argument('--discovery-state', default='discovery_state.json',
+                       help='État de la découverte RSS/sitemap en mode discover (default: discovery_state.json)')
+    parser.add_argument('--sitemap', action='store_true',
+                       help='Mode discover : lit aussi le sitemap XML (rattrapage des mises à jour)')
+    parser.add_argument('--assets', action='store_true',
+                       help='Télécharge les images dans le cache local (miniatures WebP)')
+    parser.add_argument('--queue', choices=QUEUES, default=None,
+                       help='Modes seed/worker : file de travaux partagée (default: JOB_QUEUE ou sqlite)')
+    parser.add_argument('--pages', type=int, default=1,
+                       help='Modes seed/sites : pages de liste par section (default: 1)')
+    parser.add_argument('--site', action='append', default=None,
+                       help='Modes sites/seed/worker : profil de site (sites/<nom>.json), répétable '
+                            '(default: tous les profils)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Mode worker : processus workers lancés sur cette machine, chacun avec '
+                            'ses propres limites de débit par hôte (default: 1)')
+    parser.add_argument('--idle-timeout', type=float, default=30,
+                       help='Mode worker : arrêt après N secondes sans travail disponible (default: 30)')
+    parser.add_argument('--profile', nargs='?', const='sample', choices=PROFILE_MODES, default=None,
+                       help='Profile l\'exécution par étape (sample : flamegraph .folded ; cprofile : .prof)')
+    parser.add_argument('--full-parse', action='store_true',
+                       help='Analyse les pages entières (désactive l\'analyse sélective)')
     
     args = parser.parse_args()
     
@@ -29,26 +107,23 @@ def main():
     print(f"📰 Articles: {args.count}")
     
     # Initialisation du scraper
-    scraper = BlogScraperCore()
+    scraper = BlogScraperCore(selective=False if args.full_parse else None)
+    # Profilage du processus principal (les workers lancés par --workers > 1 ne sont pas profilés)
+    profiler = Profiler(f"crawl-{args.mode}", args.profile).start() if args.profile else None
     
     try:
         if args.mode == 'multi':
             # Mode multi-pages avec sauvegarde JSON
             print(f"\n📥 Mode multi-pages - récupération depuis plusieurs sources")
-            urls = [
-                "https://www.blogdumoderateur.com/web/",
-                "https://www.blogdumoderateur.com/digital/",
-                "https://www.blogdumoderateur.com/social-media/",
-                "https://www.blogdumoderateur.com/tech/",
-                "https://www.blogdumoderateur.com/marketing/",
-                "https://www.blogdumoderateur.com/web/page/2/",
-                "https://www.blogdumoderateur.com/digital/page/2/",
-            ]
+            urls = default_profile().listing_pages(2)
             
-            articles = scraper.fetch_articles_multi_pages(urls, args.count)
+            duplicate_detector = NearDuplicateDetector(MemoryLSHStore(args.dedup_index))
+            articles = scraper.fetch_articles_multi_pages(urls, args.count, duplicate_detector)
             
             if articles:
                 scraper.save_to_json(articles, args.output)
+                if args.assets:
+                    ImageAssetStore().download_for_articles(articles)
                 scraper.display_summary(articles)
             else:
                 print("❌ Aucun article récupéré")
@@ -57,24 +132,19 @@ def main():
             # Mode MongoDB - récupération et sauvegarde en base
             print(f"\n📥 Mode MongoDB - récupération et sauvegarde en base")
             
-            # Connexion MongoDB
-            print("🔗 Connexion à MongoDB...")
-            db_manager = MongoDBManager()
+            # Connexion au backend de stockage configuré
+            print("🔗 Connexion au stockage...")
+            db_manager = get_storage_backend(args.backend)
+            follow_saves(db_manager)
             
             # Récupération multi-pages par défaut pour MongoDB
-            urls = [
-                "https://www.blogdumoderateur.com/web/",
-                "https://www.blogdumoderateur.com/digital/",
-                "https://www.blogdumoderateur.com/social-media/",
-                "https://www.blogdumoderateur.com/tech/",
-                "https://www.blogdumoderateur.com/marketing/",
-            ]
-            
-            articles = scraper.fetch_articles_multi_pages(urls, args.count)
+            articles = scraper.fetch_articles_multi_pages(SECTIONS, args.count)
             
             if articles:
-                print(f"\n💾 Sauvegarde de {len(articles)} articles en MongoDB...")
+                print(f"\n💾 Sauvegarde de {len(articles)} articles en base...")
                 saved_count = db_manager.save_articles(articles)
+                if args.assets:
+                    ImageAssetStore().download_for_articles(articles)
                 
                 print(f"\n✅ TERMINÉ!")
                 print(f"   • {len(articles)} articles récupérés")
@@ -88,12 +158,88 @@ def main():
             
             db_manager.close()
         
+        elif args.mode == 'discover':
+            # Mode découverte - flux RSS / sitemaps, seuls les articles nouveaux ou modifiés
+            print(f"\n📥 Mode découverte - flux RSS et sitemaps")
+            discovery = ChangeDiscovery(args.discovery_state)
+            sources = SECTION_FEEDS + ([SITEMAP_INDEX] if args.sitemap else [])
+            pending = discovery.discover(sources)[:args.count]
+            
+            if not pending:
+                print("✅ Aucun changement depuis le dernier passage")
+                return
+            
+            print("🔗 Connexion au stockage...")
+            db_manager = get_storage_backend(args.backend)
+            follow_saves(db_manager)
+            try:
+                articles = fetch_discovered(scraper, db_manager, discovery, pending)
+            finally:
+                db_manager.close()
+            
+            if args.assets and articles:
+                ImageAssetStore().download_for_articles(articles)
+            print(f"\n✅ TERMINÉ: {len(articles)}/{len(pending)} articles récupérés et sauvegardés")
+        
+        elif args.mode == 'seed':
+            # Mode seed - pages de liste ajoutées à la file partagée des workers
+            print(f"\n📥 Mode seed - {args.pages} page(s) par section vers la file de travaux")
+            urls = [url for profile in load_profiles(args.site) for url in profile.listing_pages(args.pages)]
+            db_manager = get_storage_backend(args.backend) if args.queue == 'mongo' else None
+            queue = get_job_queue(args.queue, db_manager)
+            added = seed_listings(queue, urls, args.count)
+            print(f"✅ {len(urls)} pages de liste en file ({added} nouvelles)")
+            print(f"📊 File: {queue.stats()}")
+            queue.close()
+            if db_manager:
+                db_manager.close()
+        
+        elif args.mode == 'worker':
+            # Mode worker - réserve les travaux de la file jusqu'à ce qu'elle soit vide
+            print(f"\n📥 Mode worker - {args.workers} processus")
+            worker_args = (args.queue, args.backend, args.full_parse, args.idle_timeout, args.site)
+            if args.workers == 1:
+                run_worker(*worker_args)
+            else:
+                from multiprocessing import Pool
+                with Pool(args.workers) as pool:
+                    processed = pool.starmap(run_worker, [worker_args] * args.workers)
+                print(f"\n✅ TERMINÉ: {sum(processed)} travaux traités par {args.workers} workers")
+        
+        elif args.mode == 'sites':
+            # Mode multi-sites - tous les sites en parallèle, chacun à son rythme (politesse par hôte)
+            profiles = load_profiles(args.site)
+            print(f"\n📥 Mode multi-sites - {len(profiles)} site(s) en parallèle, {args.pages} page(s) par section")
+            for profile in profiles:
+                print(f"   • {profile.name} ({profile.host}) : {profile.requests_per_second:g} req/s, "
+                      f"{profile.concurrency} connexion(s)")
+            
+            print("🔗 Connexion au stockage...")
+            db_manager = get_storage_backend(args.backend)
+            follow_saves(db_manager)
+            crawler = MultiSiteCrawler(profiles, db_manager, selective=False if args.full_parse else None)
+            try:
+                results = crawler.crawl(args.pages, args.count)
+            finally:
+                crawler.close()
+                db_manager.close()
+            
+            articles = [article for site_articles in results.values() for article in site_articles]
+            if args.assets and articles:
+                ImageAssetStore().download_for_articles(articles)
+            print(f"\n✅ TERMINÉ: {len(articles)} articles récupérés, {crawler.saved} sauvegardés")
+            for name, site_articles in results.items():
+                print(f"   • {name}: {len(site_articles)} articles")
+        
     except KeyboardInterrupt:
         print("\n⏹️ Arrêt demandé par l'utilisateur")
         sys.exit(0)
     except Exception as e:
         print(f"❌ Erreur: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
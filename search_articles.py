@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Script pour interroger la base de données MongoDB du Blog du Modérateur
+Script pour interroger la base de données du Blog du Modérateur (MongoDB ou SQLite)
 """
 
-from mongodb_manager import MongoDBManager
+from article_query import DEFAULT_PER_PAGE, FILTER_FIELDS, SORTS, ArticleQuery
+from storage import get_storage_backend
+from local_search_index import open_local_index
+from profiling import PROFILE_MODES, profiled, stage
+from query_audit import audit_report
+import argparse
+import os
 import sys
 
+# Recherches non interactives (--search TYPE VALEUR...) : méthode du backend et nombre de valeurs
+SEARCHES = {
+    'category': ('get_articles_by_category', 1),
+    'subcategory': ('get_articles_by_subcategory', 1),
+    'author': ('get_articles_by_author', 1),
+    'title': ('search_in_title', 1),
+    'text': ('search', 1),
+    'date': ('get_articles_by_date_range', 2),
+}
+
+def query(method, *args):
+    """Appel d'une recherche du backend (étape 'query' du profilage)"""
+    with stage('query'):
+        return method(*args)
+
 def display_articles(articles, title="Articles trouvés"):
     """Affiche une liste d'articles de manière formatée"""
+    with stage('display'):
+        _display_articles(articles, title)
+
+def _display_articles(articles, title):
     print(f"\n{title}")
     print("=" * len(title))
     
@@ -25,102 +50,169 @@ def display_articles(articles, title="Articles trouvés"):
         if article.get('summary'):
             print(f"   Résumé: {article['summary'][:100]}...")
 
+def open_backend():
+    try:
+        return get_storage_backend()
+    except Exception as e:
+        print(f"⚠️ Stockage indisponible ({e}), tentative avec l'index local...")
+        db_manager = open_local_index()
+        if not db_manager:
+            raise
+        return db_manager
+
+def run_search(db_manager, search):
+    """Recherche unique en ligne de commande (--search TYPE VALEUR...)"""
+    search_type, values = search[0], search[1:]
+    if search_type not in SEARCHES:
+        raise ValueError(f"Type de recherche inconnu: {search_type} (choix: {', '.join(SEARCHES)})")
+    method_name, arity = SEARCHES[search_type]
+    if len(values) != arity:
+        raise ValueError(f"La recherche '{search_type}' attend {arity} valeur(s)")
+    articles = query(getattr(db_manager, method_name), *values)
+    display_articles(articles, f"Recherche {search_type}: {' '.join(values)} ({len(articles)} articles)")
+
+def run_combined(db_manager, query):
+    """Recherche combinée en ligne de commande (--category, --author, --start, ...)"""
+    with stage('query'):
+        page = db_manager.find_articles(query)
+    display_articles(page['articles'], f"Recherche combinée: {query.describe()} "
+                                       f"({page['total']} articles, page {page['page']}/{max(page['pages'], 1)})")
+
 def main():
     """Fonction principale avec menu interactif"""
+    parser = argparse.ArgumentParser(description="Recherche d'articles du Blog du Modérateur")
+    parser.add_argument('--search', nargs='+', metavar=('TYPE', 'VALEUR'),
+                        help=f"Recherche unique sans menu ({', '.join(SEARCHES)}) ; date : DEBUT FIN")
+    combined = parser.add_argument_group('recherche combinée', 'filtres cumulables, triés et paginés')
+    combined.add_argument('--category', help="Catégorie")
+    combined.add_argument('--subcategory', help="Sous-catégorie")
+    combined.add_argument('--author', help="Auteur")
+    combined.add_argument('--start', dest='start_date', metavar='AAAA-MM-JJ', help="Date de début")
+    combined.add_argument('--end', dest='end_date', metavar='AAAA-MM-JJ', help="Date de fin")
+    combined.add_argument('--text', help="Texte (titre et résumé)")
+    combined.add_argument('--title', help="Sous-chaîne du titre")
+    combined.add_argument('--sort', choices=SORTS, default='recent', help="Tri (default: recent)")
+    combined.add_argument('--page', type=int, default=1, help="Page (default: 1)")
+    combined.add_argument('--per-page', type=int, default=DEFAULT_PER_PAGE,
+                          help=f"Articles par page (default: {DEFAULT_PER_PAGE})")
+    parser.add_argument('--profile', nargs='?', const='sample', choices=PROFILE_MODES, default=None,
+                        help="Profile les recherches (sample : flamegraph .folded ; cprofile : .prof)")
+    parser.add_argument('--audit', action='store_true',
+                        help="Audite les requêtes MongoDB (plan, documents examinés, journal des requêtes lentes)")
+    parser.add_argument('--report', action='store_true',
+                        help="Rapport d'audit : requêtes sans index, index peu sélectifs, requêtes lentes")
+    args = parser.parse_args()
+
+    if args.report:
+        print(audit_report())
+        return
+    if args.audit:
+        os.environ['QUERY_AUDIT'] = 'true'
+    filters = {field: getattr(args, field) for field in FILTER_FIELDS if getattr(args, field)}
+
     try:
-        db_manager = MongoDBManager()
-        
-        while True:
-            print("\n" + "="*60)
-            print("RECHERCHE D'ARTICLES - BLOG DU MODÉRATEUR")
-            print("="*60)
-            print("1. Rechercher par catégorie")
-            print("2. Rechercher par sous-catégorie") 
-            print("3. Rechercher par auteur")
-            print("4. Rechercher par plage de dates")
-            print("5. Rechercher dans les titres")
-            print("6. Afficher toutes les catégories")
-            print("7. Afficher tous les auteurs")
-            print("8. Afficher les statistiques")
-            print("9. Quitter")
-            
-            choice = input("\nChoisissez une option (1-9): ").strip()
-            
-            if choice == '1':
-                categories = db_manager.get_all_categories()
-                if categories:
-                    print(f"\nCatégories disponibles: {', '.join(categories)}")
-                    category = input("Entrez le nom de la catégorie: ").strip()
-                    articles = db_manager.get_articles_by_category(category)
-                    display_articles(articles, f"Articles dans la catégorie '{category}'")
-                else:
-                    print("Aucune catégorie trouvée.")
-            
-            elif choice == '2':
-                categories = db_manager.get_all_categories()
-                if categories:
-                    print(f"\nSous-catégories disponibles: {', '.join(categories)}")
-                    subcategory = input("Entrez le nom de la sous-catégorie: ").strip()
-                    articles = db_manager.get_articles_by_subcategory(subcategory)
-                    display_articles(articles, f"Articles dans la sous-catégorie '{subcategory}'")
-                else:
-                    print("Aucune sous-catégorie trouvée.")
-            
-            elif choice == '3':
-                authors = db_manager.get_all_authors()
-                if authors:
-                    print(f"\nAuteurs disponibles: {', '.join(authors)}")
-                    author = input("Entrez le nom de l'auteur: ").strip()
-                    articles = db_manager.get_articles_by_author(author)
-                    display_articles(articles, f"Articles de l'auteur '{author}'")
-                else:
-                    print("Aucun auteur trouvé.")
-            
-            elif choice == '4':
-                print("\nFormat de date: AAAA-MM-JJ (ex: 2025-07-15)")
-                start_date = input("Date de début: ").strip()
-                end_date = input("Date de fin: ").strip()
-                
-                try:
-                    articles = db_manager.get_articles_by_date_range(start_date, end_date)
-                    display_articles(articles, f"Articles entre {start_date} et {end_date}")
-                except Exception as e:
-                    print(f"Erreur de format de date: {e}")
-            
-            elif choice == '5':
-                search_term = input("Entrez le terme à rechercher dans les titres: ").strip()
-                articles = db_manager.search_in_title(search_term)
-                display_articles(articles, f"Articles contenant '{search_term}' dans le titre")
-            
-            elif choice == '6':
-                categories = db_manager.get_all_categories()
-                print(f"\nCatégories disponibles ({len(categories)}):")
-                for i, cat in enumerate(categories, 1):
-                    print(f"{i}. {cat}")
-            
-            elif choice == '7':
-                authors = db_manager.get_all_authors()
-                print(f"\nAuteurs disponibles ({len(authors)}):")
-                for i, author in enumerate(authors, 1):
-                    print(f"{i}. {author}")
-            
-            elif choice == '8':
-                db_manager.get_stats()
-            
-            elif choice == '9':
-                print("Au revoir!")
-                break
-            
+        db_manager = open_backend()
+        with profiled('search', args.profile):
+            if args.search:
+                run_search(db_manager, args.search)
+            elif filters:
+                run_combined(db_manager, ArticleQuery(sort=args.sort, page=args.page,
+                                                      per_page=args.per_page, **filters))
             else:
-                print("Option invalide. Veuillez choisir entre 1 et 9.")
-            
-            input("\nAppuyez sur Entrée pour continuer...")
-        
+                interactive_menu(db_manager)
         db_manager.close()
         
     except Exception as e:
         print(f"Erreur: {e}")
         print("Assurez-vous que MongoDB est installé et en cours d'exécution.")
 
+def interactive_menu(db_manager):
+    """Menu interactif de recherche"""
+    while True:
+        print("\n" + "="*60)
+        print("RECHERCHE D'ARTICLES - BLOG DU MODÉRATEUR")
+        print("="*60)
+        print("1. Rechercher par catégorie")
+        print("2. Rechercher par sous-catégorie") 
+        print("3. Rechercher par auteur")
+        print("4. Rechercher par plage de dates")
+        print("5. Rechercher dans les titres")
+        print("6. Afficher toutes les catégories")
+        print("7. Afficher tous les auteurs")
+        print("8. Afficher les statistiques")
+        print("9. Quitter")
+        
+        choice = input("\nChoisissez une option (1-9): ").strip()
+        
+        if choice == '1':
+            categories = db_manager.get_all_categories()
+            if categories:
+                print(f"\nCatégories disponibles: {', '.join(categories)}")
+                category = input("Entrez le nom de la catégorie: ").strip()
+                articles = query(db_manager.get_articles_by_category, category)
+                display_articles(articles, f"Articles dans la catégorie '{category}'")
+            else:
+                print("Aucune catégorie trouvée.")
+        
+        elif choice == '2':
+            categories = db_manager.get_all_categories()
+            if categories:
+                print(f"\nSous-catégories disponibles: {', '.join(categories)}")
+                subcategory = input("Entrez le nom de la sous-catégorie: ").strip()
+                articles = query(db_manager.get_articles_by_subcategory, subcategory)
+                display_articles(articles, f"Articles dans la sous-catégorie '{subcategory}'")
+            else:
+                print("Aucune sous-catégorie trouvée.")
+        
+        elif choice == '3':
+            authors = db_manager.get_all_authors()
+            if authors:
+                print(f"\nAuteurs disponibles: {', '.join(authors)}")
+                author = input("Entrez le nom de l'auteur: ").strip()
+                articles = query(db_manager.get_articles_by_author, author)
+                display_articles(articles, f"Articles de l'auteur '{author}'")
+            else:
+                print("Aucun auteur trouvé.")
+        
+        elif choice == '4':
+            print("\nFormat de date: AAAA-MM-JJ (ex: 2025-07-15)")
+            start_date = input("Date de début: ").strip()
+            end_date = input("Date de fin: ").strip()
+            
+            try:
+                articles = query(db_manager.get_articles_by_date_range, start_date, end_date)
+                display_articles(articles, f"Articles entre {start_date} et {end_date}")
+            except Exception as e:
+                print(f"Erreur de format de date: {e}")
+        
+        elif choice == '5':
+            search_term = input("Entrez le terme à rechercher dans les titres: ").strip()
+            articles = query(db_manager.search_in_title, search_term)
+            display_articles(articles, f"Articles contenant '{search_term}' dans le titre")
+        
+        elif choice == '6':
+            categories = db_manager.get_all_categories()
+            print(f"\nCatégories disponibles ({len(categories)}):")
+            for i, cat in enumerate(categories, 1):
+                print(f"{i}. {cat}")
+        
+        elif choice == '7':
+            authors = db_manager.get_all_authors()
+            print(f"\nAuteurs disponibles ({len(authors)}):")
+            for i, author in enumerate(authors, 1):
+                print(f"{i}. {author}")
+        
+        elif choice == '8':
+            db_manager.get_stats()
+        
+        elif choice == '9':
+            print("Au revoir!")
+            break
+        
+        else:
+            print("Option invalide. Veuillez choisir entre 1 et 9.")
+        
+        input("\nAppuyez sur Entrée pour continuer...")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyse sélective des pages HTML du Blog du Modérateur
+Seules les régions utiles deviennent des objets BeautifulSoup ; en-tête de site,
+menus, scripts, barre latérale et pied de page sont ignorés par le tokenizer
+
+- pages de liste : le sous-arbre <main>
+- pages d'article : <article>, les balises <meta> (Open Graph), le titre <h1>,
+  la date et les listes de catégories / tags
+- la lecture de la réponse s'arrête dès la fermeture de </main> : le reste de
+  la page (pied de page, scripts de fin) n'est pas téléchargé
+
+Les régions ci-dessous sont celles du Blog du Modérateur ; un profil de site (site_profiles)
+peut fournir les siennes (parse_listing / parse_detail, paramètre region).
+
+Désactivable avec SELECTIVE_PARSING=false (analyse complète, comportement historique)
+"""
+
+import os
+from typing import Iterable, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from bs4.filter import ElementFilter  # bs4 >= 4.13
+except ImportError:
+    ElementFilter = None
+
+CHUNK_SIZE = 16 * 1024
+# Les deux types de page se terminent par </main> : tout ce qui suit est du gabarit
+END_MARKER = b'</main>'
+
+LISTING_TAGS = ('main',)
+DETAIL_TAGS = ('article', 'meta', 'h1', 'time')
+DETAIL_CLASSES = ('cats-list', 'tags-list', 'entry-meta')
+
+
+def selective_parsing_enabled() -> bool:
+    return os.getenv('SELECTIVE_PARSING', 'true').lower() == 'true'
+
+
+class RegionRules:
+    """Balises conservées (avec tout leur sous-arbre) : par nom ou par classe CSS"""
+
+    def __init__(self, names: Iterable[str], classes: Iterable[str] = ()):
+        self.names = frozenset(names)
+        self.classes = frozenset(classes)
+
+    def matches(self, name: str, attrs: Optional[dict]) -> bool:
+        if name in self.names:
+            return True
+        if self.classes and attrs:
+            value = attrs.get('class')
+            if value:
+                classes = value.split() if isinstance(value, str) else value
+                return not self.classes.isdisjoint(classes)
+        return False
+
+
+if ElementFilter is not None:
+    class _RegionFilter(ElementFilter):
+        """bs4 >= 4.13 : décision prise avant la création de chaque balise de premier niveau"""
+
+        def __init__(self, rules: RegionRules):
+            super().__init__()
+            self.rules = rules
+
+        @property
+        def includes_everything(self) -> bool:
+            return False
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return self.rules.matches(name, attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            # Texte hors des régions conservées
+            return False
+
+
+def region_filter(names: Iterable[str], classes: Iterable[str] = ()):
+    """Filtre `parse_only` compatible bs4 4.12 (SoupStrainer) et >= 4.13 (ElementFilter)"""
+    rules = RegionRules(names, classes)
+    if ElementFilter is None:
+        # bs4 4.12 : une fonction passée comme nom reçoit (nom, attributs)
+        return SoupStrainer(lambda name, attrs=None: rules.matches(name, attrs))
+    return _RegionFilter(rules)
+
+
+LISTING_FILTER = region_filter(LISTING_TAGS)
+DETAIL_FILTER = region_filter(DETAIL_TAGS, DETAIL_CLASSES)
+
+
+def read_until(response: requests.Response, marker: bytes = END_MARKER) -> Tuple[str, int, bool]:
+    """
+    Lit une réponse en flux (stream=True) jusqu'à la première occurrence de `marker`
+    Retourne (html décodé, octets lus, lecture interrompue avant la fin)
+    """
+    chunks = []
+    tail = b''
+    read = 0
+    stopped = False
+    for chunk in response.iter_content(CHUNK_SIZE):
+        chunks.append(chunk)
+        read += len(chunk)
+        # Le marqueur peut être à cheval sur deux blocs
+        if marker in tail + chunk:
+            stopped = True
+            break
+        tail = chunk[-len(marker):]
+    response.close()
+    encoding = response.encoding or 'utf-8'
+    return b''.join(chunks).decode(encoding, errors='replace'), read, stopped
+
+
+def fetch_html(url: str, headers: dict, selective: bool = True, timeout: Optional[int] = None,
+               session: Optional[requests.Session] = None, end_marker: Optional[bytes] = END_MARKER) -> str:
+    """
+    Télécharge une page : entière (response.text) ou seulement jusqu'à `end_marker`
+    Avec une session, la connexion est prise dans son pool (réutilisée d'une page à l'autre)
+    """
+    http = session or requests
+    if not selective or not end_marker:
+        response = http.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+    response = http.get(url, headers=headers, stream=True, timeout=timeout)
+    response.raise_for_status()
+    html, _, _ = read_until(response, end_marker)
+    return html
+
+
+def parse_listing(html: str, selective: bool = True, region=None) -> BeautifulSoup:
+    """Page de liste : seul <main> (ou la région du profil de site) est construit en mode sélectif"""
+    region = LISTING_FILTER if region is None else region
+    return BeautifulSoup(html, 'html.parser', parse_only=region if selective else None)
+
+
+def parse_detail(html: str, selective: bool = True, region=None) -> BeautifulSoup:
+    """Page d'article : <article>, meta, titre, date et catégories (ou la région du profil) en mode sélectif"""
+    region = DETAIL_FILTER if region is None else region
+    return BeautifulSoup(html, 'html.parser', parse_only=region if selective else None)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crawl multi-sites : chaque site (profil sites/<nom>.json) est parcouru en même temps que
+les autres, avec son propre pool de connexions HTTP et sa propre limite de débit
+
+- HostLimiter      : au plus `concurrency` requêtes simultanées vers un hôte, démarrées à
+                     1/requests_per_second secondes d'intervalle au minimum
+- host_session     : session requests dont le pool garde `concurrency` connexions vers l'hôte
+- SiteCrawler      : pages de liste d'un site, puis ses pages d'article en parallèle
+- MultiSiteCrawler : un SiteCrawler par site, tous en parallèle ; le débit total croît avec
+                     le nombre de sites, chaque hôte restant à son propre rythme
+- SiteScrapers     : scraper de l'hôte de chaque URL, pour les workers d'une file multi-sites
+
+Usage : python scraper_unified.py --mode sites [--site blogdumoderateur ...] [--pages 2] [--count 30]
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core_scraper import BlogScraperCore
+from models import Article
+from site_profiles import SiteProfile
+
+
+class HostLimiter:
+    """Politesse envers un hôte, partagée par tous les threads qui l'interrogent (contexte `with`)"""
+
+    def __init__(self, requests_per_second: float, concurrency: int):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._slots.acquire()
+        # Chaque requête réserve son créneau de départ, puis attend hors du verrou
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._slots.release()
+        return False
+
+
+def host_session(profile: SiteProfile) -> requests.Session:
+    """Session d'un site : un pool de `concurrency` connexions gardées ouvertes vers son hôte"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=profile.concurrency)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': profile.user_agent})
+    return session
+
+
+class SiteCrawler:
+    """Crawl d'un site : ses pages de liste dans l'ordre, les articles de chaque page en parallèle"""
+
+    def __init__(self, profile: SiteProfile, selective: Optional[bool] = None):
+        self.profile = profile
+        self.session = host_session(profile)
+        self.limiter = HostLimiter(profile.requests_per_second, profile.concurrency)
+        self.scraper = BlogScraperCore(selective, profile, self.session, self.limiter)
+
+    def _complete(self, preview: Article) -> Article:
+        """Complète la prévisualisation avec sa page de détail (sur le même objet)"""
+        (preview.author, preview.content, preview.images,
+         preview.categories, preview.subcategories) = self.scraper.fetch_article_details(preview.url)
+        preview.scraped_at = datetime.now()
+        return preview
+
+    def crawl(self, pages: int = 1, target_count: int = 30,
+              on_articles: Optional[Callable[[SiteProfile, List[Article]], None]] = None) -> List[Article]:
+        """
+        Jusqu'à target_count articles depuis `pages` pages de liste par page de départ
+        on_articles reçoit les articles de chaque page de liste dès qu'ils sont complets
+        """
+        articles = []
+        seen_urls = set()
+        with ThreadPoolExecutor(max_workers=self.profile.concurrency,
+                                thread_name_prefix=self.profile.name) as executor:
+            for url in self.profile.listing_pages(pages):
+                remaining = target_count - len(articles)
+                if remaining <= 0:
+                    break
+                try:
+                    previews = self.scraper.fetch_listing(url, remaining)
+                except requests.exceptions.RequestException as e:
+                    print(f"❌ [{self.profile.name}] Erreur requête {url}: {e}")
+                    continue
+
+                previews = [preview for preview in previews if preview.url not in seen_urls][:remaining]
+                seen_urls.update(preview.url for preview in previews)
+                completed = list(executor.map(self._complete, previews))
+                articles.extend(completed)
+                if on_articles and completed:
+                    on_articles(self.profile, completed)
+
+        print(f"📊 [{self.profile.name}] {len(articles)} articles collectés")
+        return articles
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class MultiSiteCrawler:
+    """Plusieurs sites crawlés en parallèle ; les articles sont sauvegardés page par page"""
+
+    def __init__(self, profiles: List[SiteProfile], db_manager=None, selective: Optional[bool] = None):
+        self.crawlers = [SiteCrawler(profile, selective) for profile in profiles]
+        self.db_manager = db_manager
+        self._save_lock = threading.Lock()
+        self.saved = 0
+
+    def _save(self, profile: SiteProfile, articles: List[Article]) -> None:
+        if self.db_manager is None:
+            return
+        # Un lot à la fois : les agrégats de tendances suivent chaque sauvegarde
+        with self._save_lock:
+            saved = self.db_manager.save_articles(articles)
+            self.saved += saved
+        print(f"💾 [{profile.name}] {saved}/{len(articles)} articles sauvegardés")
+
+    def crawl(self, pages: int = 1, count_per_site: int = 30) -> Dict[str, List[Article]]:
+        """Articles collectés par site (nom du profil) ; l'échec d'un site n'arrête pas les autres"""
+        results = {}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, len(self.crawlers))) as executor:
+            futures = {executor.submit(crawler.crawl, pages, count_per_site, self._save): crawler.profile.name
+                       for crawler in self.crawlers}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"❌ Erreur site {name}: {e}")
+                    results[name] = []
+
+        elapsed = time.perf_counter() - start
+        total = sum(len(articles) for articles in results.values())
+        print(f"\n⏱️ {total} articles de {len(results)} site(s) en {elapsed:.1f}s ({total / elapsed:.2f} articles/s)")
+        return results
+
+    def close(self) -> None:
+        for crawler in self.crawlers:
+            crawler.close()
+
+
+class SiteScrapers:
+    """
+    Scraper du site de chaque URL, choisi d'après son hôte : un CrawlWorker sert ainsi une file
+    de travaux multi-sites, chaque hôte gardant son pool de connexions et sa limite de débit
+    Les limites sont propres au processus : N workers interrogent un hôte jusqu'à N fois son débit
+    """
+
+    def __init__(self, profiles: List[SiteProfile], selective: Optional[bool] = None):
+        self.crawlers = {profile.host: SiteCrawler(profile, selective) for profile in profiles}
+
+    def for_url(self, url: str) -> BlogScraperCore:
+        crawler = self.crawlers.get(urlparse(url).netloc)
+        if crawler is None:
+            raise ValueError(f"Aucun profil de site pour l'hôte de {url}")
+        return crawler.scraper
+
+    def fetch_listing(self, url: str, max_articles: int = 30) -> List[Article]:
+        return self.for_url(url).fetch_listing(url, max_articles)
+
+    def fetch_article(self, url: str) -> Optional[Article]:
+        return self.for_url(url).fetch_article(url)
+
+    def close(self) -> None:
+        for crawler in self.crawlers.values():
+            crawler.close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Profils de sites : tout ce qui est propre à une source (pages de départ, sélecteurs CSS,
+formats de date, politesse) dans un fichier JSON déclaratif, sites/<nom>.json
+
+    {
+      "name": "blogdumoderateur",
+      "seeds": ["https://www.blogdumoderateur.com/web/", ...],     pages de liste de départ
+      "pagination": "{url}page/{page}/",                            pages suivantes d'une liste
+      "politeness": {"requests_per_second": 1.0, "concurrency": 2, "timeout": 20},
+      "selective": {"end_marker": "</main>", "listing_tags": [...],
+                    "detail_tags": [...], "detail_classes": [...]},  optionnel (analyse sélective)
+      "listing": {"items", "url", "title", "thumbnail", "subcategory", "summary"},
+      "article": {"root", "title", "author", "content", "category", "category_attribute", "tags"},
+      "dates": {"selectors", "attribute", "pattern", "months", "formats"}
+    }
+
+Chaque champ de "listing" et "article" est une liste de sélecteurs essayés dans l'ordre
+(le premier qui trouve un élément l'emporte). Les dates sont lues dans l'attribut ISO
+(`attribute`) si présent, sinon dans le texte : jour, mois et année capturés par `pattern`
+(dans cet ordre, ou groupes nommés day/month/year), le mois traduit par `months`, puis
+formats strptime (`formats`).
+
+Le profil par défaut (DEFAULT_SITE) est celui du Blog du Modérateur.
+Usage : python site_profiles.py [--dir sites]   (vérifie et liste les profils)
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selective_parse import region_filter
+
+# Chemin relatif : depuis le répertoire du projet, quel que soit le répertoire courant
+SITES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('SITES_DIR') or 'sites')
+DEFAULT_SITE = 'blogdumoderateur'
+DEFAULT_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+DEFAULT_POLITENESS = {'requests_per_second': 1.0, 'concurrency': 2, 'timeout': 20}
+
+LISTING_FIELDS = ('items', 'url', 'title', 'thumbnail', 'subcategory', 'summary')
+ARTICLE_FIELDS = ('root', 'title', 'author', 'content', 'category', 'tags')
+REQUIRED_FIELDS = {'listing': ('items', 'url', 'title'), 'article': ('root',)}
+
+
+def _selectors(section: Dict, field: str) -> List[str]:
+    value = section.get(field) or []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def select_first(node, selectors: List[str]):
+    """Premier élément trouvé, en essayant les sélecteurs dans l'ordre (None sinon)"""
+    for selector in selectors:
+        element = node.select_one(selector)
+        if element is not None:
+            return element
+    return None
+
+
+def select_all(node, selectors: List[str]) -> list:
+    """Éléments du premier sélecteur qui en trouve"""
+    for selector in selectors:
+        elements = node.select(selector)
+        if elements:
+            return elements
+    return []
+
+
+class SiteProfile:
+    """Profil d'extraction d'un site, chargé depuis son fichier JSON"""
+
+    def __init__(self, data: Dict, path: Optional[str] = None):
+        self.path = path
+        self.name = data.get('name') or (os.path.splitext(os.path.basename(path))[0] if path else None)
+        if not self.name:
+            raise ValueError("Profil de site sans nom")
+        self.label = data.get('label') or self.name
+        self.seeds = list(data.get('seeds') or [])
+        if not self.seeds:
+            raise ValueError(f"Profil '{self.name}' : aucune page de départ (seeds)")
+        hosts = {urlparse(seed).netloc for seed in self.seeds}
+        if len(hosts) != 1 or '' in hosts:
+            raise ValueError(f"Profil '{self.name}' : les pages de départ doivent être des URLs d'un même hôte")
+        self.host = hosts.pop()
+        self.pagination = data.get('pagination')
+        self.user_agent = data.get('user_agent') or DEFAULT_USER_AGENT
+
+        politeness = {**DEFAULT_POLITENESS, **(data.get('politeness') or {})}
+        self.requests_per_second = float(politeness['requests_per_second'])
+        self.concurrency = max(1, int(politeness['concurrency']))
+        self.timeout = politeness['timeout']
+
+        self.listing = {field: _selectors(data.get('listing') or {}, field) for field in LISTING_FIELDS}
+        self.article = {field: _selectors(data.get('article') or {}, field) for field in ARTICLE_FIELDS}
+        for section, fields in REQUIRED_FIELDS.items():
+            missing = [field for field in fields if not getattr(self, section)[field]]
+            if missing:
+                raise ValueError(f"Profil '{self.name}' : sélecteurs manquants dans {section} ({', '.join(missing)})")
+        self.category_attribute = (data.get('article') or {}).get('category_attribute')
+
+        dates = data.get('dates') or {}
+        self.date_selectors = _selectors(dates, 'selectors')
+        self.date_attribute = dates.get('attribute')
+        self.date_pattern = re.compile(dates['pattern']) if dates.get('pattern') else None
+        self.months = {name.lower(): number for name, number in (dates.get('months') or {}).items()}
+        self.date_formats = list(dates.get('formats') or [])
+
+        # Analyse sélective : seulement si le profil décrit les régions utiles de ses pages
+        selective = data.get('selective') or {}
+        self.selective = bool(selective.get('listing_tags') and selective.get('detail_tags'))
+        self.end_marker = selective.get('end_marker', '').encode('utf-8') or None
+        self.listing_filter = region_filter(selective.get('listing_tags') or ())
+        self.detail_filter = region_filter(selective.get('detail_tags') or (), selective.get('detail_classes') or ())
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SiteProfile':
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"Profil de site invalide {path}: {e}")
+        return cls(data, path)
+
+    def listing_pages(self, pages: int = 1) -> List[str]:
+        """Pages de liste à parcourir : les pages de départ, puis leurs pages suivantes"""
+        urls = list(self.seeds)
+        if self.pagination:
+            urls += [self.pagination.format(url=seed, page=page)
+                     for page in range(2, pages + 1) for seed in self.seeds]
+        return urls
+
+    def __repr__(self):
+        return f"SiteProfile({self.name!r}, {self.host!r})"
+
+
+def profile_path(name: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or SITES_DIR, f"{name}.json")
+
+
+def load_profile(name: str, directory: Optional[str] = None) -> SiteProfile:
+    path = profile_path(name, directory)
+    if not os.path.exists(path):
+        available = ', '.join(available_sites(directory)) or 'aucun'
+        raise ValueError(f"Profil de site inconnu: '{name}' (disponibles: {available})")
+    return SiteProfile.from_file(path)
+
+
+def available_sites(directory: Optional[str] = None) -> List[str]:
+    return sorted(os.path.splitext(os.path.basename(path))[0]
+                  for path in glob.glob(os.path.join(directory or SITES_DIR, '*.json')))
+
+
+def load_profiles(names: Optional[List[str]] = None, directory: Optional[str] = None) -> List[SiteProfile]:
+    """Profils demandés (default: tous ceux du répertoire) ; deux profils ne partagent pas un hôte"""
+    profiles = [load_profile(name, directory) for name in (names or available_sites(directory))]
+    hosts = {}
+    for profile in profiles:
+        if profile.host in hosts:
+            raise ValueError(f"Profils '{hosts[profile.host]}' et '{profile.name}' sur le même hôte {profile.host}")
+        hosts[profile.host] = profile.name
+    return profiles
+
+
+_default_profile = None
+
+
+def default_profile() -> SiteProfile:
+    """Profil du Blog du Modérateur, chargé une fois"""
+    global _default_profile
+    if _default_profile is None:
+        _default_profile = load_profile(DEFAULT_SITE)
+    return _default_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profils de sites (sites/*.json)')
+    parser.add_argument('--dir', default=None, help=f'Répertoire des profils (default: {SITES_DIR})')
+    args = parser.parse_args()
+
+    try:
+        for profile in load_profiles(directory=args.dir):
+            print(f"✅ {profile.name:<20} {profile.host:<32} {len(profile.seeds)} pages de départ, "
+                  f"{profile.requests_per_second:g} req/s, {profile.concurrency} connexion(s)"
+                  f"{', analyse sélective' if profile.selective else ''}")
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
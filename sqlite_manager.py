@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backend de stockage SQLite embarqué (FTS5, mode WAL)
+Même interface que MongoDBManager, sans serveur : déploiements mono-nœud et benchmarks CI
+
+Une connexion d'écriture (self.conn, sous verrou) et une connexion en lecture seule par
+thread (self.reader) : en mode WAL, les lectures de l'interface web ne voient que des
+transactions validées et ne sont pas bloquées par une sauvegarde groupée en cours
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, List
+from urllib.parse import quote
+
+from models import as_document
+from near_duplicates import NearDuplicateDetector
+from profiling import stage
+from storage import ArticleRepository, MergedDuplicate, is_stored
+from trends import SQLiteTrendStore, TrendRollups
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    thumbnail TEXT,
+    subcategory TEXT,
+    subcategory_key TEXT,
+    summary TEXT,
+    date TEXT,
+    original_date TEXT,
+    author TEXT,
+    author_key TEXT,
+    content TEXT,
+    images TEXT,
+    duplicate_urls TEXT,
+    scraped_at TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_subcategory ON articles(subcategory_key);
+CREATE INDEX IF NOT EXISTS idx_articles_author ON articles(author_key);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+CREATE INDEX IF NOT EXISTS idx_articles_created_at ON articles(created_at);
+CREATE INDEX IF NOT EXISTS idx_articles_author_created_at ON articles(author_key, created_at);
+
+CREATE TABLE IF NOT EXISTS article_categories (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    PRIMARY KEY (article_id, category_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_categories_key ON article_categories(category_key, article_id);
+
+CREATE TABLE IF NOT EXISTS article_subcategories (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    subcategory TEXT NOT NULL,
+    subcategory_key TEXT NOT NULL,
+    PRIMARY KEY (article_id, subcategory_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_subcategories_key ON article_subcategories(subcategory_key, article_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content,
+    content='articles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+    VALUES ('delete', old.id, old.title, old.summary, old.content);
+    INSERT INTO articles_fts(rowid, title, summary, content)
+    VALUES (new.id, new.title, new.summary, new.content);
+END;
+
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    url TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (band, url)
+) WITHOUT ROWID;
+"""
+
+_ARTICLE_COLUMNS = ('url', 'title', 'thumbnail', 'subcategory', 'summary', 'date',
+                    'original_date', 'author', 'content')
+
+
+def _key(value) -> str:
+    return value.strip().casefold() if value else ''
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class SQLiteLSHStore:
+    """Index LSH des quasi-doublons stocké dans la base SQLite"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def candidates(self, band_keys: List[str]) -> Dict[str, List[int]]:
+        placeholders = ','.join('?' * len(band_keys))
+        rows = self.conn.execute(
+            f"SELECT DISTINCT s.url, s.signature FROM minhash_bands b "
+            f"JOIN minhash_signatures s ON s.url = b.url WHERE b.band IN ({placeholders})",
+            band_keys
+        ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def add(self, url: str, signature: List[int], band_keys: List[str]) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO minhash_signatures(url, signature) VALUES (?, ?)",
+                          (url, json.dumps(signature)))
+        self.conn.execute("DELETE FROM minhash_bands WHERE url = ?", (url,))
+        self.conn.executemany("INSERT OR IGNORE INTO minhash_bands(band, url) VALUES (?, ?)",
+                              [(band, url) for band in band_keys])
+
+    def save(self) -> None:
+        """Rien à faire : les ajouts sont écrits dans la transaction courante"""
+
+
+def _connect(target, **options):
+    conn = sqlite3.connect(target, check_same_thread=False, **options)
+    conn.row_factory = sqlite3.Row
+    conn.create_function('casefold', 1, lambda value: value.casefold() if value else value, deterministic=True)
+    return conn
+
+
+class _Reader:
+    """Connexion en lecture d'un thread, fermée quand le thread (et son stockage local) disparaît"""
+
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __del__(self):
+        self.conn.close()
+
+
+class SQLiteManager(ArticleRepository):
+    def __init__(self, db_path='articles.db'):
+        """
+        Ouvre (ou crée) la base SQLite en mode WAL
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = weakref.WeakSet()
+        try:
+            self.conn = _connect(db_path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript(SCHEMA)
+            # Agrégats temporels mis à jour dans la transaction des sauvegardes groupées
+            if os.getenv('TREND_ROLLUPS', 'true').lower() in ('1', 'true', 'yes'):
+                self.trends = TrendRollups(SQLiteTrendStore(self.conn, lambda: self.reader))
+
+            self.duplicate_detector = None
+            if os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() in ('1', 'true', 'yes'):
+                self.duplicate_detector = NearDuplicateDetector(
+                    SQLiteLSHStore(self.conn),
+                    threshold=float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+                )
+
+            print(f"✅ Base SQLite ouverte - {db_path}")
+        except Exception as e:
+            print(f"❌ Erreur d'ouverture SQLite: {e}")
+            raise
+
+    @property
+    def reader(self):
+        """Connexion en lecture seule du thread courant (la connexion d'écriture pour une base en mémoire)"""
+        if self.db_path == ':memory:':
+            return self.conn
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            conn = _connect(f"file:{quote(os.path.abspath(self.db_path))}?mode=ro", uri=True)
+            reader = self._local.reader = _Reader(conn)
+            self._readers.add(reader)
+        return reader.conn
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+    def _upsert(self, article_data):
+        """
+        Insère ou met à jour un article dans la transaction courante
+        Retourne (id, créé), ou MergedDuplicate quand l'article a été fusionné dans son quasi-doublon
+        """
+        url = article_data['url']
+        now = datetime.now().isoformat()
+
+        # Quasi-doublon : fusion dans l'article canonique (introuvable : sauvegarde normale)
+        content = article_data.get('content')
+        signature = self.duplicate_detector.signature(content) if self.duplicate_detector and content else None
+        if signature:
+            duplicate = self.duplicate_detector.find_duplicate(url, content, signature)
+            if duplicate:
+                merged = self._merge_near_duplicate(duplicate, article_data, now)
+                if merged:
+                    return merged
+
+        values = {column: article_data.get(column) for column in _ARTICLE_COLUMNS}
+        values.update({
+            'subcategory_key': _key(article_data.get('subcategory')),
+            'author_key': _key(article_data.get('author')),
+            'images': json.dumps(article_data.get('images') or {}, ensure_ascii=False),
+            'duplicate_urls': json.dumps(article_data.get('duplicate_urls') or [], ensure_ascii=False),
+            'scraped_at': _iso(article_data.get('scraped_at')),
+            # Un created_at fourni (import d'un historique) est gardé à l'insertion ; une mise à jour ne le change pas
+            'created_at': _iso(article_data.get('created_at')) or now,
+            'updated_at': now
+        })
+
+        existing = self.conn.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()
+        if existing:
+            article_id = existing['id']
+            columns = [column for column in values if column not in ('url', 'created_at')]
+            self.conn.execute(
+                f"UPDATE articles SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                [values[c] for c in columns] + [article_id]
+            )
+            self.conn.execute("DELETE FROM article_categories WHERE article_id = ?", (article_id,))
+            self.conn.execute("DELETE FROM article_subcategories WHERE article_id = ?", (article_id,))
+        else:
+            columns = list(values)
+            cursor = self.conn.execute(
+                f"INSERT INTO articles ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [values[c] for c in columns]
+            )
+            article_id = cursor.lastrowid
+
+        self._insert_facets(article_id, article_data)
+        # Signature indexée avec l'article, dans la même transaction
+        if signature:
+            self.duplicate_detector.add(url, content, signature)
+        return (article_id, not existing)
+
+    def _insert_facets(self, article_id, article_data):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO article_categories(article_id, category, category_key) VALUES (?, ?, ?)",
+            [(article_id, c.strip(), _key(c)) for c in article_data.get('categories') or [] if c and c.strip()]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO article_subcategories(article_id, subcategory, subcategory_key) VALUES (?, ?, ?)",
+            [(article_id, s.strip(), _key(s)) for s in article_data.get('subcategories') or [] if s and s.strip()]
+        )
+
+    def _merge_near_duplicate(self, duplicate, article_data, now):
+        """Ajoute l'URL et les catégories du quasi-doublon à l'article canonique"""
+        canonical_url, score = duplicate
+        row = self.conn.execute("SELECT id, duplicate_urls FROM articles WHERE url = ?",
+                                (canonical_url,)).fetchone()
+        if not row:
+            print(f"⚠️ Article canonique {canonical_url} introuvable, {article_data['url']} sauvegardé tel quel")
+            return None
+        duplicate_urls = json.loads(row['duplicate_urls'] or '[]')
+        if article_data['url'] not in duplicate_urls:
+            duplicate_urls.append(article_data['url'])
+        self.conn.execute("UPDATE articles SET duplicate_urls = ?, updated_at = ? WHERE id = ?",
+                          (json.dumps(duplicate_urls, ensure_ascii=False), now, row['id']))
+        self._insert_facets(row['id'], article_data)
+        print(f"♻️ Quasi-doublon ({score:.0%}) fusionné dans {canonical_url}: {article_data['url']}")
+        return MergedDuplicate(canonical_url)
+
+    def save_article(self, article_data):
+        """
+        Sauvegarde un article (Article ou dict, upsert sur l'URL)
+        """
+        try:
+            article_data = as_document(article_data)
+            if not article_data.get('url'):
+                print("⚠️ Article sans URL, ignoré")
+                return None
+
+            with self._lock, self.conn:
+                result = self._upsert(article_data)
+            if not result:
+                return None
+            if isinstance(result, MergedDuplicate):
+                # Fusionné dans l'article canonique (déjà affiché)
+                return result
+
+            article_id, created = result
+            title = (article_data.get('title') or 'Sans titre')[:50]
+            print(f"{'✅ Nouvel article sauvegardé' if created else '🔄 Article mis à jour'}: {title}...")
+            return article_id
+        except Exception as e:
+            print(f"❌ Erreur lors de la sauvegarde: {e}")
+            return None
+
+    def save_articles(self, articles_list, strict=False):
+        """
+        Sauvegarde une liste d'articles en une seule transaction
+        Chaque article a son point de sauvegarde : un article en erreur est annulé seul.
+        Les quasi-doublons fusionnés ne comptent pas comme sauvegardés (ni publiés).
+        strict : une erreur annule la transaction et est levée au lieu d'être affichée (imports)
+        """
+        saved = []
+        try:
+            with stage('db_write'), self._lock, self.conn, self.tracking_trends(articles_list):
+                if not self.conn.in_transaction:
+                    # Transaction explicite : libérer un point de sauvegarde ne la valide pas
+                    self.conn.execute("BEGIN")
+                for article in map(as_document, articles_list):
+                    if not article.get('url'):
+                        continue
+                    self.conn.execute("SAVEPOINT article")
+                    try:
+                        result = self._upsert(article)
+                    except Exception as e:
+                        self.conn.execute("ROLLBACK TO SAVEPOINT article")
+                        self.conn.execute("RELEASE SAVEPOINT article")
+                        if strict:
+                            raise
+                        print(f"❌ Erreur lors de la sauvegarde de {article['url']}: {e}")
+                        continue
+                    self.conn.execute("RELEASE SAVEPOINT article")
+                    if is_stored(result):
+                        saved.append(article)
+        except Exception as e:
+            if strict:
+                raise
+            print(f"❌ Erreur lors de la sauvegarde groupée: {e}")
+            saved = []
+
+        saved_count = len(saved)
+        self.publish_saved(saved)
+
+        print(f"\nTotal: {saved_count}/{len(articles_list)} articles sauvegardés")
+        return saved_count
+
+    def get_trend_documents(self, urls):
+        """Facettes datées des articles existants (agrégats temporels)"""
+        urls = list(urls)
+        if not urls:
+            return []
+        rows = self.conn.execute(
+            f"SELECT id, url, date, subcategory, author FROM articles WHERE url IN ({','.join('?' * len(urls))})",
+            urls
+        ).fetchall()
+        documents = {row['id']: {**dict(row), 'categories': [], 'subcategories': []} for row in rows}
+        if documents:
+            placeholders = ','.join('?' * len(documents))
+            for article_id, value in self.conn.execute(
+                    f"SELECT article_id, category FROM article_categories WHERE article_id IN ({placeholders})",
+                    list(documents)):
+                documents[article_id]['categories'].append(value)
+            for article_id, value in self.conn.execute(
+                    f"SELECT article_id, subcategory FROM article_subcategories WHERE article_id IN ({placeholders})",
+                    list(documents)):
+                documents[article_id]['subcategories'].append(value)
+        return list(documents.values())
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+    def _fetch_articles(self, where, params=()) -> List[Dict]:
+        rows = self.reader.execute(f"SELECT * FROM articles a WHERE {where} ORDER BY a.id", params).fetchall()
+        return self._rows_to_articles(rows)
+
+    def _rows_to_articles(self, rows) -> List[Dict]:
+        if not rows:
+            return []
+        ids = [row['id'] for row in rows]
+        placeholders = ','.join('?' * len(ids))
+        categories, subcategories = {}, {}
+        for article_id, value in self.reader.execute(
+                f"SELECT article_id, category FROM article_categories WHERE article_id IN ({placeholders})", ids):
+            categories.setdefault(article_id, []).append(value)
+        for article_id, value in self.reader.execute(
+                f"SELECT article_id, subcategory FROM article_subcategories WHERE article_id IN ({placeholders})", ids):
+            subcategories.setdefault(article_id, []).append(value)
+
+        articles = []
+        for row in rows:
+            article = {column: row[column] for column in _ARTICLE_COLUMNS}
+            article.update({
+                '_id': row['id'],
+                'images': json.loads(row['images'] or '{}'),
+                'categories': categories.get(row['id'], []),
+                'subcategories': subcategories.get(row['id'], []),
+                'scraped_at': row['scraped_at'],
+                'created_at': row['created_at'],
+                'updated_at': row['updated_at']
+            })
+            duplicate_urls = json.loads(row['duplicate_urls'] or '[]')
+            if duplicate_urls:
+                article['duplicate_urls'] = duplicate_urls
+            if 'score' in row.keys():
+                article['score'] = row['score']
+            articles.append(article)
+        return articles
+
+    def get_all_categories(self):
+        try:
+            categories = sorted({row[0] for row in self.reader.execute(
+                "SELECT MIN(category) FROM article_categories GROUP BY category_key")})
+            print(f"📊 Catégories trouvées: {len(categories)}")
+            return categories
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des catégories: {e}")
+            return ['Web', 'Marketing', 'Social', 'Tech']
+
+    def get_all_subcategories(self):
+        try:
+            subcategories = {row[0] for row in self.reader.execute(
+                "SELECT subcategory FROM article_subcategories "
+                "UNION SELECT subcategory FROM articles WHERE subcategory IS NOT NULL")}
+            subcategories = sorted(sub for sub in subcategories if sub and sub.strip())
+            print(f"📊 Sous-catégories trouvées: {len(subcategories)}")
+            return subcategories
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des sous-catégories: {e}")
+            return []
+
+    def get_subcategories_by_category(self, category):
+        try:
+            subcategories = {row[0] for row in self.reader.execute(
+                "SELECT s.subcategory FROM article_categories c "
+                "JOIN article_subcategories s ON s.article_id = c.article_id WHERE c.category_key = ? "
+                "UNION SELECT a.subcategory FROM article_categories c "
+                "JOIN articles a ON a.id = c.article_id WHERE c.category_key = ? AND a.subcategory IS NOT NULL",
+                (_key(category), _key(category)))}
+            subcategories = sorted(sub for sub in subcategories if sub and sub.strip())
+            print(f"✅ Sous-catégories finales pour '{category}': {len(subcategories)}")
+            return subcategories
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des sous-catégories pour '{category}': {e}")
+            return []
+
+    def get_all_authors(self):
+        try:
+            authors = sorted(row[0] for row in self.reader.execute(
+                "SELECT MIN(author) FROM articles WHERE author_key != '' GROUP BY author_key"))
+            print(f"📊 Auteurs trouvés: {len(authors)}")
+            return authors
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des auteurs: {e}")
+            return []
+
+    def get_articles_by_category(self, category):
+        try:
+            articles = self._fetch_articles(
+                "a.id IN (SELECT article_id FROM article_categories WHERE category_key = ?)", (_key(category),))
+            print(f"🔍 Trouvé {len(articles)} articles dans la catégorie '{category}'")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche par catégorie: {e}")
+            return []
+
+    _SUBCATEGORY_CLAUSE = ("(a.subcategory_key = ? OR a.id IN "
+                           "(SELECT article_id FROM article_subcategories WHERE subcategory_key = ?))")
+
+    def get_articles_by_category_and_subcategory(self, category, subcategory):
+        try:
+            articles = self._fetch_articles(
+                "a.id IN (SELECT article_id FROM article_categories WHERE category_key = ?) AND "
+                + self._SUBCATEGORY_CLAUSE,
+                (_key(category), _key(subcategory), _key(subcategory)))
+            print(f"🔍 Trouvé {len(articles)} articles pour '{category}' > '{subcategory}'")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche par catégorie + sous-catégorie: {e}")
+            return []
+
+    def get_articles_by_subcategory(self, subcategory):
+        try:
+            articles = self._fetch_articles(self._SUBCATEGORY_CLAUSE, (_key(subcategory), _key(subcategory)))
+            print(f"🔍 Trouvé {len(articles)} articles avec la sous-catégorie '{subcategory}'")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche par sous-catégorie: {e}")
+            return []
+
+    def get_articles_by_author(self, author):
+        try:
+            articles = self._fetch_articles("a.author_key = ?", (_key(author),))
+            print(f"🔍 Trouvé {len(articles)} articles de l'auteur '{author}'")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche par auteur: {e}")
+            return []
+
+    def get_articles_by_date_range(self, start_date, end_date):
+        """
+        Articles dont la date de création est dans la plage (même sémantique que MongoDBManager)
+        """
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d').isoformat()
+            end = datetime.strptime(end_date, '%Y-%m-%d').isoformat()
+            articles = self._fetch_articles("a.created_at BETWEEN ? AND ?", (start, end))
+            print(f"🔍 Trouvé {len(articles)} articles entre {start_date} et {end_date}")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche par date: {e}")
+            return []
+
+    _TITLE_CLAUSE = "casefold(a.title) LIKE ? ESCAPE '\\'"
+
+    @staticmethod
+    def _title_pattern(search_term):
+        escaped = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f'%{escaped.casefold()}%'
+
+    def search_in_title(self, search_term):
+        try:
+            articles = self._fetch_articles(self._TITLE_CLAUSE, (self._title_pattern(search_term),))
+            print(f"🔍 Trouvé {len(articles)} articles avec '{search_term}' dans le titre")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche dans les titres: {e}")
+            return []
+
+    @staticmethod
+    def _match_expression(text):
+        """Expression FTS5 : termes entre guillemets combinés en OU (comme $text), None si vide"""
+        terms = [term.replace('"', '""') for term in text.split() if term.strip()]
+        return ' OR '.join(f'"{term}"' for term in terms) if terms else None
+
+    def search(self, text, limit=20):
+        """
+        Recherche plein texte FTS5 classée par BM25 (termes combinés en OU, comme $text)
+        """
+        try:
+            match = self._match_expression(text)
+            if not match:
+                return []
+            rows = self.reader.execute(
+                "SELECT a.*, -bm25(articles_fts) AS score FROM articles_fts "
+                "JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts) LIMIT ?",
+                (match, limit)
+            ).fetchall()
+            articles = self._rows_to_articles(rows)
+            print(f"🔍 Trouvé {len(articles)} articles pour '{text}'")
+            return articles
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche plein texte: {e}")
+            return []
+
+    _COMBINED_ORDER = {
+        'recent': 'a.created_at DESC, a.id DESC',
+        'oldest': 'a.created_at, a.id',
+        'relevance': 'bm25(articles_fts)',
+    }
+
+    def find_articles(self, query):
+        """
+        Recherche combinée paginée : une clause WHERE par filtre (mêmes clauses que les
+        recherches simples), texte via FTS5 ; le total n'est compté que si la page est pleine
+        """
+        try:
+            clauses, params = [], []
+            if query.category:
+                clauses.append("a.id IN (SELECT article_id FROM article_categories WHERE category_key = ?)")
+                params.append(_key(query.category))
+            if query.subcategory:
+                clauses.append(self._SUBCATEGORY_CLAUSE)
+                params += [_key(query.subcategory)] * 2
+            if query.author:
+                clauses.append("a.author_key = ?")
+                params.append(_key(query.author))
+            if query.start_date:
+                clauses.append("a.created_at >= ?")
+                params.append(datetime.strptime(query.start_date, '%Y-%m-%d').isoformat())
+            if query.end_date:
+                clauses.append("a.created_at <= ?")
+                params.append(datetime.strptime(query.end_date, '%Y-%m-%d').isoformat())
+
+            if query.title:
+                clauses.append(self._TITLE_CLAUSE)
+                params.append(self._title_pattern(query.title))
+
+            source, columns = "articles a", "a.*"
+            if query.text:
+                source = "articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+                columns = "a.*, -bm25(articles_fts) AS score"
+                clauses.append("articles_fts MATCH ?")
+                params.append(self._match_expression(query.text))
+            where = ' AND '.join(clauses) or '1'
+
+            rows = self.reader.execute(
+                f"SELECT {columns} FROM {source} WHERE {where} "
+                f"ORDER BY {self._COMBINED_ORDER[query.sort]} LIMIT ? OFFSET ?",
+                params + [query.per_page, query.skip]
+            ).fetchall()
+            total = query.total_from_page(len(rows))
+            if total is None:
+                total = self.reader.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+            print(f"🔍 Trouvé {total} articles ({query.describe()}), page {query.page}")
+            return query.page_result(self._rows_to_articles(rows), total)
+        except Exception as e:
+            print(f"❌ Erreur lors de la recherche combinée: {e}")
+            return query.page_result([], 0)
+
+    def iter_all_articles(self, since=None, batch_size=500):
+        """
+        Itère sur tous les articles par lots (pagination sur l'id),
+        éventuellement limités à ceux scrapés après `since`
+        """
+        last_id = 0
+        since = _iso(since) if since else ''
+        while True:
+            rows = self.reader.execute(
+                "SELECT * FROM articles a WHERE a.id > ? AND (? = '' OR a.scraped_at > ?) ORDER BY a.id LIMIT ?",
+                (last_id, since, since, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield from self._rows_to_articles(rows)
+            last_id = rows[-1]['id']
+
+    def get_stats(self):
+        try:
+            total_articles = self.reader.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            categories_count = len(self.get_all_categories())
+            subcategories_count = len(self.get_all_subcategories())
+            authors_count = len(self.get_all_authors())
+
+            print(f"\n=== STATISTIQUES DE LA BASE ===")
+            print(f"📰 Total d'articles: {total_articles}")
+            print(f"🏷️ Nombre de catégories: {categories_count}")
+            print(f"🔖 Nombre de sous-catégories: {subcategories_count}")
+            print(f"✍️ Nombre d'auteurs: {authors_count}")
+
+            return {
+                'total_articles': total_articles,
+                'categories_count': categories_count,
+                'subcategories_count': subcategories_count,
+                'authors_count': authors_count
+            }
+        except Exception as e:
+            print(f"❌ Erreur lors du calcul des statistiques: {e}")
+            return {
+                'total_articles': 0,
+                'categories_count': 4,
+                'subcategories_count': 0,
+                'authors_count': 0
+            }
+
+    def close(self):
+        """
+        Ferme la connexion SQLite
+        """
+        for reader in list(self._readers):
+            reader.conn.close()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            print("Connexion SQLite fermée")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Abstraction du stockage des articles
+Toutes les implémentations (MongoDB, SQLite, index local) exposent la même interface,
+et le backend est choisi par configuration (variable STORAGE_BACKEND ou option --backend)
+"""
+
+import contextlib
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+from profiling import stage
+
+BACKENDS = ('mongo', 'sqlite', 'local')
+
+
+class MergedDuplicate:
+    """
+    Résultat de save_article pour un quasi-doublon fusionné dans son article canonique :
+    vrai (l'article est traité), mais ni compté comme sauvegardé ni publié (son URL n'est pas stockée)
+    """
+
+    __slots__ = ('canonical_url',)
+
+    def __init__(self, canonical_url: str):
+        self.canonical_url = canonical_url
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f"MergedDuplicate({self.canonical_url!r})"
+
+
+def is_stored(result) -> bool:
+    """Résultat de save_article d'un article enregistré sous sa propre URL (ni échec, ni fusion)"""
+    return bool(result) and not isinstance(result, MergedDuplicate)
+
+
+class ArticleRepository(ABC):
+    """Interface commune des backends de stockage d'articles"""
+
+    # Agrégats temporels (trends.TrendRollups), None si le backend ne les maintient pas
+    trends = None
+
+    # Écriture
+    @abstractmethod
+    def save_article(self, article_data):
+        """
+        Sauvegarde (upsert sur l'URL) un article (models.Article ou dict), sans le modifier
+        Retourne None en cas d'échec, MergedDuplicate pour un quasi-doublon fusionné
+        """
+
+    def save_articles(self, articles_list, strict=False):
+        """
+        Sauvegarde une liste d'articles
+        strict : un article refusé par le backend (None) lève une erreur au lieu d'être ignoré (imports)
+        Les quasi-doublons fusionnés ne comptent pas comme sauvegardés (ni publiés)
+        """
+        saved = []
+        with stage('db_write'), self.tracking_trends(articles_list):
+            for article in articles_list:
+                result = self.save_article(article)
+                if result is None and strict:
+                    raise RuntimeError("Article refusé par le backend de stockage")
+                if is_stored(result):
+                    saved.append(article)
+        self.publish_saved(saved)
+
+        print(f"\nTotal: {len(saved)}/{len(articles_list)} articles sauvegardés")
+        return len(saved)
+
+    def publish_saved(self, articles) -> None:
+        """Pousse les articles sauvegardés aux navigateurs connectés (/events), sauf si un change stream s'en charge"""
+        if not articles:
+            return
+        # Import différé : le stockage ne dépend pas de la couche web (SSE) tant que rien n'est publié
+        from events import event_bus
+        if not event_bus.external_source:
+            event_bus.publish_articles(articles, self)
+
+    # Tendances
+    def tracking_trends(self, articles):
+        """Contexte de sauvegarde : les agrégats temporels suivent les articles sauvegardés dans le bloc"""
+        if self.trends is None:
+            return contextlib.nullcontext()
+        return self.trends.tracking(self, articles)
+
+    def get_trend_documents(self, urls) -> List[Dict]:
+        """Champs des agrégats (url, date, catégories, sous-catégories, auteur) des articles existants"""
+        return []
+
+    def get_trends(self, facet='all', value=None, start=None, end=None, days=None, bucket='day', limit=5) -> Dict:
+        """Séries temporelles d'une facette (trends.TrendRollups.series)"""
+        if self.trends is None:
+            raise ValueError("Tendances non disponibles pour ce backend")
+        return self.trends.series(facet, value, start, end, days, bucket, limit)
+
+    def rebuild_trends(self) -> int:
+        """Recalcule les agrégats temporels depuis tous les articles"""
+        if self.trends is None:
+            raise ValueError("Tendances non disponibles pour ce backend")
+        return self.trends.rebuild(self.iter_listings())
+
+    # Facettes
+    @abstractmethod
+    def get_all_categories(self) -> List[str]:
+        """Catégories principales uniques, triées"""
+
+    @abstractmethod
+    def get_all_subcategories(self) -> List[str]:
+        """Sous-catégories (tags-list + tag principal) uniques, triées"""
+
+    @abstractmethod
+    def get_subcategories_by_category(self, category) -> List[str]:
+        """Sous-catégories des articles d'une catégorie"""
+
+    @abstractmethod
+    def get_all_authors(self) -> List[str]:
+        """Auteurs uniques, triés"""
+
+    # Recherches
+    @abstractmethod
+    def get_articles_by_category(self, category) -> List[Dict]:
+        """Articles d'une catégorie (insensible à la casse)"""
+
+    @abstractmethod
+    def get_articles_by_category_and_subcategory(self, category, subcategory) -> List[Dict]:
+        """Articles d'une catégorie ET d'une sous-catégorie"""
+
+    @abstractmethod
+    def get_articles_by_subcategory(self, subcategory) -> List[Dict]:
+        """Articles d'une sous-catégorie"""
+
+    @abstractmethod
+    def get_articles_by_author(self, author) -> List[Dict]:
+        """Articles d'un auteur"""
+
+    @abstractmethod
+    def get_articles_by_date_range(self, start_date, end_date) -> List[Dict]:
+        """Articles dont created_at est dans une plage de dates AAAA-MM-JJ (pas la date de publication)"""
+
+    @abstractmethod
+    def search_in_title(self, search_term) -> List[Dict]:
+        """Recherche de sous-chaîne dans les titres"""
+
+    @abstractmethod
+    def search(self, text, limit=20) -> List[Dict]:
+        """Recherche plein texte classée par pertinence"""
+
+    @abstractmethod
+    def find_articles(self, query) -> Dict:
+        """
+        Recherche combinée (article_query.ArticleQuery) : filtres, tri et pagination en une requête
+        Retourne {'articles', 'total', 'page', 'per_page', 'pages'} (ArticleQuery.page_result)
+        """
+
+    def iter_articles(self, method_name, *args) -> Iterator[Dict]:
+        """
+        Itère sur les résultats d'une méthode de recherche (get_articles_by_*, search_in_title)
+        Les backends capables de streamer (curseur MongoDB) surchargent cette méthode
+        """
+        yield from getattr(self, method_name)(*args)
+
+    @abstractmethod
+    def iter_all_articles(self, since=None) -> Iterator[Dict]:
+        """Itère sur les articles complets, éventuellement scrapés après `since` (datetime)"""
+
+    def iter_listings(self) -> Iterator[Dict]:
+        """
+        Itère sur tous les articles, champs de liste seulement (titre, auteur, facettes)
+        Les backends qui stockent le contenu à part surchargent cette méthode
+        """
+        yield from self.iter_all_articles()
+
+    # Statistiques
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """Compteurs affichés par l'interface"""
+
+    def get_data_for_interface(self):
+        """
+        Récupère toutes les données nécessaires pour l'interface web
+        """
+        try:
+            return {
+                'stats': self.get_stats(),
+                'categories': self.get_all_categories(),
+                'subcategories': self.get_all_subcategories(),
+                'authors': self.get_all_authors()
+            }
+        except Exception as e:
+            print(f"❌ Erreur lors de la récupération des données: {e}")
+            return {
+                'stats': {
+                    'total_articles': 0,
+                    'categories_count': 4,
+                    'subcategories_count': 0,
+                    'authors_count': 0
+                },
+                'categories': ['Web', 'Marketing', 'Social', 'Tech'],
+                'subcategories': [],
+                'authors': []
+            }
+
+    def close(self):
+        """Libère les ressources du backend"""
+
+
+def get_storage_backend(name: Optional[str] = None) -> ArticleRepository:
+    """
+    Instancie le backend de stockage configuré
+    - mongo  : MongoDB (MONGODB_URI, MONGODB_DATABASE, MONGODB_COLLECTION)
+    - sqlite : base SQLite embarquée avec FTS5 (SQLITE_PATH, default: articles.db)
+    - local  : index local en lecture seule construit depuis un export JSON
+    """
+    name = (name or os.getenv('STORAGE_BACKEND', 'mongo')).lower()
+
+    if name == 'mongo':
+        from mongodb_manager import MongoDBManager
+        return MongoDBManager()
+    if name == 'sqlite':
+        from sqlite_manager import SQLiteManager
+        return SQLiteManager(os.getenv('SQLITE_PATH', 'articles.db'))
+    if name == 'local':
+        from local_search_index import open_local_index
+        index = open_local_index()
+        if index is None:
+            raise ValueError("Aucun index local ni export JSON disponible (LOCAL_INDEX_PATH / LOCAL_INDEX_SOURCE)")
+        return index
+
+    raise ValueError(f"Backend de stockage inconnu: '{name}' (choix: {', '.join(BACKENDS)})")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index de préfixes en mémoire pour l'autocomplétion (titres, auteurs, catégories, sous-catégories)
+
+Tableau trié de clés repliées (minuscules, sans accents) parcouru par recherche
+dichotomique : chaque valeur est indexée à partir de chacun de ses mots, de sorte que
+"pat" propose "Alexandra Patard". Mis à jour article par article à chaque sauvegarde
+(crochet du bus d'événements), sans reconstruction complète.
+
+Usage : python suggest.py "goog" [--type subcategory] [--source articles.json]
+"""
+
+import argparse
+import asyncio
+import inspect
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import as_document
+from text_utils import FRENCH_STOPWORDS, normalize_text
+
+SUGGEST_TYPES = ('title', 'author', 'category', 'subcategory')
+# Nombre maximal de clés examinées par requête (borne le coût des préfixes très courts)
+MAX_SCAN = 400
+
+
+def article_values(article) -> List[Tuple[str, str]]:
+    """Couples (type, valeur) d'un article (dict) à indexer"""
+    values = []
+    if article.get('title'):
+        values.append(('title', article['title']))
+    if article.get('author'):
+        values.append(('author', article['author']))
+    for category in article.get('categories') or []:
+        values.append(('category', category))
+    subcategories = list(article.get('subcategories') or [])
+    if article.get('subcategory') and article['subcategory'] not in subcategories:
+        subcategories.append(article['subcategory'])
+    for subcategory in subcategories:
+        values.append(('subcategory', subcategory))
+    return [(kind, value.strip()) for kind, value in values if value and value.strip()]
+
+
+class PrefixIndex:
+    """Suggestions classées par préfixe, insensibles à la casse et aux accents"""
+
+    def __init__(self):
+        self.keys: List[Tuple[str, str, str]] = []   # (clé repliée, type, valeur), trié
+        self.weights: Dict[Tuple[str, str], int] = {}  # (type, valeur) → nombre d'articles
+        self.folded: Dict[Tuple[str, str], str] = {}   # (type, valeur) → valeur repliée
+        self.by_url: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.weights)
+
+    @staticmethod
+    def _keys_for(kind: str, value: str) -> List[str]:
+        """Clé de la valeur entière, puis une clé par mot (hors mots vides pour les titres)"""
+        words = normalize_text(value).split()
+        keys = []
+        for i, word in enumerate(words):
+            if i and kind == 'title' and word in FRENCH_STOPWORDS:
+                continue
+            keys.append(' '.join(words[i:]))
+        return list(dict.fromkeys(keys))
+
+    def _add_value(self, kind: str, value: str) -> None:
+        entry = (kind, value)
+        if entry not in self.weights:
+            self.weights[entry] = 0
+            self.folded[entry] = normalize_text(value)
+            for key in self._keys_for(kind, value):
+                insort(self.keys, (key, kind, value))
+        self.weights[entry] += 1
+
+    def _remove_value(self, kind: str, value: str) -> None:
+        entry = (kind, value)
+        if entry not in self.weights:
+            return
+        self.weights[entry] -= 1
+        if self.weights[entry] > 0:
+            return
+        del self.weights[entry]
+        del self.folded[entry]
+        for key in self._keys_for(kind, value):
+            position = bisect_left(self.keys, (key, kind, value))
+            if position < len(self.keys) and self.keys[position] == (key, kind, value):
+                del self.keys[position]
+
+    def add_article(self, article) -> None:
+        """Indexe un article ; une mise à jour (même URL) remplace ses anciennes valeurs"""
+        values = article_values(article)
+        url = article.get('url')
+        with self._lock:
+            if url:
+                for kind, value in self.by_url.pop(url, []):
+                    self._remove_value(kind, value)
+                self.by_url[url] = values
+            for kind, value in values:
+                self._add_value(kind, value)
+
+    def add_articles(self, articles: Iterable) -> None:
+        for article in articles:
+            self.add_article(as_document(article))
+
+    def build(self, articles: Iterable) -> 'PrefixIndex':
+        """Construction initiale en un seul tri (plus rapide que des insertions successives)"""
+        with self._lock:
+            self.keys, self.weights, self.folded, self.by_url = [], {}, {}, {}
+            for article in articles:
+                values = article_values(article)
+                if article.get('url'):
+                    self.by_url[article['url']] = values
+                for entry in values:
+                    self.weights[entry] = self.weights.get(entry, 0) + 1
+            self.folded = {entry: normalize_text(entry[1]) for entry in self.weights}
+            self.keys = sorted((key, kind, value) for kind, value in self.weights
+                               for key in self._keys_for(kind, value))
+        return self
+
+    def suggest(self, query: str, kind: Optional[str] = None, limit: int = 8) -> List[Dict]:
+        """
+        Valeurs dont un mot commence par `query`, classées : début de valeur d'abord,
+        puis nombre d'articles décroissant, puis valeur la plus courte
+        """
+        prefix = normalize_text(query or '')
+        if not prefix:
+            return []
+
+        candidates = {}
+        with self._lock:
+            position = bisect_left(self.keys, (prefix,))
+            for key, entry_kind, value in self.keys[position:position + MAX_SCAN]:
+                if not key.startswith(prefix):
+                    break
+                if kind and entry_kind != kind:
+                    continue
+                entry = (entry_kind, value)
+                at_start = self.folded[entry].startswith(prefix)
+                rank = (0 if at_start else 1, -self.weights[entry], len(value), value)
+                if entry not in candidates or rank < candidates[entry]:
+                    candidates[entry] = rank
+
+            ranked = sorted(candidates.items(), key=lambda item: item[1])[:limit]
+            return [{'type': entry_kind, 'value': value, 'count': self.weights[(entry_kind, value)]}
+                    for (entry_kind, value), _ in ranked]
+
+
+class SuggestService:
+    """
+    Index d'autocomplétion d'un backend : construit au premier appel (aucune I/O au
+    démarrage du serveur), puis tenu à jour par les sauvegardes publiées sur le bus
+    """
+
+    def __init__(self, repository, event_bus):
+        self.repository = repository
+        self.event_bus = event_bus
+        self.index: Optional[PrefixIndex] = None
+        self._lock = threading.Lock()
+
+    def _install(self, index: PrefixIndex, start: float) -> PrefixIndex:
+        self.index = index
+        self.event_bus.add_listener(index.add_articles)
+        print(f"🔤 Index d'autocomplétion: {len(index)} valeurs en {time.perf_counter() - start:.2f}s")
+        return index
+
+    def get(self) -> PrefixIndex:
+        if self.index is None:
+            with self._lock:
+                if self.index is None:
+                    start = time.perf_counter()
+                    self._install(PrefixIndex().build(self.repository.iter_listings()), start)
+        return self.index
+
+    async def aget(self) -> PrefixIndex:
+        """Variante asynchrone : curseur motor, ou construction synchrone dans un thread"""
+        if self.index is not None:
+            return self.index
+        if inspect.isasyncgenfunction(self.repository.iter_listings):
+            start = time.perf_counter()
+            listings = [article async for article in self.repository.iter_listings()]
+            if self.index is None:
+                self._install(PrefixIndex().build(listings), start)
+            return self.index
+        return await asyncio.to_thread(self.get)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index d'autocomplétion (préfixes)")
+    parser.add_argument('query', help='Début de mot à compléter')
+    parser.add_argument('--type', choices=SUGGEST_TYPES, default=None, help='Type de valeur (default: tous)')
+    parser.add_argument('--source', default='articles.json', help='Export JSON/JSONL (default: articles.json)')
+    parser.add_argument('--limit', type=int, default=8, help='Nombre de suggestions (default: 8)')
+    args = parser.parse_args()
+
+    from local_search_index import iter_json_articles
+    index = PrefixIndex().build(iter_json_articles(args.source))
+
+    start = time.perf_counter()
+    suggestions = index.suggest(args.query, args.type, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"🔤 {len(suggestions)} suggestion(s) pour '{args.query}' en {elapsed:.3f} ms")
+    for suggestion in suggestions:
+        print(f"   [{suggestion['type']}] {suggestion['value']} ({suggestion['count']})")
+
+
+if __name__ == "__main__":
+    main()
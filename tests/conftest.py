@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Fixtures communes : modules du projet importables, base SQLite temporaire"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """SQLiteManager sur un fichier neuf, fermé après le test"""
+    from sqlite_manager import SQLiteManager
+
+    manager = SQLiteManager(str(tmp_path / 'articles.db'))
+    yield manager
+    manager.close()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Recherche combinée : pagination d'ArticleQuery et pages servies par les backends sans serveur"""
+
+import pytest
+
+from article_query import MAX_PER_PAGE, ArticleQuery
+from local_search_index import LocalSearchIndex
+
+
+def _articles(count):
+    return [{'url': f'https://example.com/{i}', 'title': f'Article {i}', 'categories': ['Tech'],
+             'author': 'Thomas Coëffé', 'created_at': f'2024-03-{i + 1:02d}T08:00:00'}
+            for i in range(count)]
+
+
+def test_paginate_keeps_filters_and_where_returns_to_first_page():
+    query = ArticleQuery(category='Tech', per_page=10).paginate(3)
+    assert (query.category, query.page, query.per_page, query.skip) == ('Tech', 3, 10, 20)
+
+    filtered = query.where(author='Thomas Coëffé')
+    assert (filtered.page, filtered.per_page, filtered.author) == (1, 10, 'Thomas Coëffé')
+    assert query.sorted_by('oldest').page == 1
+
+
+def test_page_bounds_are_clamped():
+    query = ArticleQuery(page=0, per_page=10_000)
+    assert (query.page, query.per_page) == (1, MAX_PER_PAGE)
+
+
+def test_total_from_page_only_when_page_is_incomplete():
+    query = ArticleQuery(per_page=10).paginate(3)
+    assert query.total_from_page(4) == 24
+    assert query.total_from_page(10) is None
+    # Page vide au-delà de la fin : le total reste à compter
+    assert query.total_from_page(0) is None
+    assert ArticleQuery().total_from_page(0) == 0
+
+
+def test_page_result_counts_pages():
+    result = ArticleQuery(per_page=10).paginate(2).page_result(['a'] * 10, 21)
+    assert (result['page'], result['per_page'], result['total'], result['pages']) == (2, 10, 21, 3)
+
+
+def test_from_mapping_rejects_invalid_pagination():
+    assert ArticleQuery.from_mapping({'page': '2', 'per_page': '5', 'q': 'ia'}).skip == 5
+    with pytest.raises(ValueError):
+        ArticleQuery.from_mapping({'page': '-1'})
+
+
+def _pages(repository, query):
+    """URLs de toutes les pages, jusqu'à la première page vide"""
+    urls = []
+    while True:
+        articles = repository.find_articles(query)['articles']
+        if not articles:
+            return urls
+        urls.extend(article['url'] for article in articles)
+        query = query.paginate(query.page + 1)
+
+
+def test_sqlite_pages_cover_results_once_in_order(sqlite_db):
+    articles = _articles(7)
+    sqlite_db.save_articles(articles)
+    query = ArticleQuery(category='Tech', sort='oldest', per_page=3)
+
+    first = sqlite_db.find_articles(query)
+    assert (first['total'], first['pages']) == (7, 3)
+    assert _pages(sqlite_db, query) == [article['url'] for article in articles]
+
+
+def test_local_index_pages_cover_results_once_in_order(tmp_path):
+    articles = _articles(7)
+    index = LocalSearchIndex.build(articles, str(tmp_path / 'index'))
+    query = ArticleQuery(author='Thomas Coëffé', sort='recent', per_page=3)
+
+    first = index.find_articles(query)
+    assert (first['total'], first['pages']) == (7, 3)
+    assert _pages(index, query) == [article['url'] for article in reversed(articles)]
+    index.close()
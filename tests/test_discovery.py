@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Lecture en flux des sitemaps et flux RSS/Atom (ChangeDiscovery.iter_entries)"""
+
+import io
+
+from discovery import ChangeDiscovery
+
+
+class FakeResponse:
+    """Réponse requests minimale : corps brut lu par iterparse"""
+
+    def __init__(self, body):
+        self.raw = io.BytesIO(body.encode('utf-8'))
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def entries(tmp_path, monkeypatch, body):
+    discovery = ChangeDiscovery(state_path=str(tmp_path / 'state.json'))
+    response = FakeResponse(body)
+    monkeypatch.setattr(discovery, '_open', lambda url: response)
+    result = list(discovery.iter_entries('https://example.com/flux'))
+    assert response.closed
+    return result
+
+
+def test_sitemap_entries_and_index(tmp_path, monkeypatch):
+    urls = ''.join(f'<url><loc>https://example.com/a{i}</loc><lastmod>2024-01-0{i + 1}</lastmod>'
+                   f'<image:image><image:loc>https://example.com/i{i}.png</image:loc></image:image></url>'
+                   for i in range(3))
+    body = ('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+            f'{urls}<sitemap><loc>https://example.com/sitemap-2.xml</loc></sitemap></urlset>')
+
+    result = entries(tmp_path, monkeypatch, body)
+
+    assert [link for link, _, _ in result] == ['https://example.com/a0', 'https://example.com/a1',
+                                               'https://example.com/a2', 'https://example.com/sitemap-2.xml']
+    assert [is_index for _, _, is_index in result] == [False, False, False, True]
+    assert all(lastmod for _, lastmod, _ in result[:3])
+
+
+def test_rss_and_atom_entries_ignore_channel_link(tmp_path, monkeypatch):
+    rss = ('<rss><channel><link>https://example.com/</link><lastBuildDate>Mon, 01 Jan 2024 00:00:00 GMT</lastBuildDate>'
+           + ''.join(f'<item><title>T{i}</title><link>https://example.com/p{i}</link></item>' for i in range(2))
+           + '</channel></rss>')
+    atom = ('<feed xmlns="http://www.w3.org/2005/Atom"><link href="https://example.com/"/>'
+            '<entry><link href="https://example.com/e1"/><updated>2024-02-01T00:00:00Z</updated></entry></feed>')
+
+    assert [(link, lastmod) for link, lastmod, _ in entries(tmp_path, monkeypatch, rss)] == [
+        ('https://example.com/p0', None), ('https://example.com/p1', None)]
+    assert [link for link, _, _ in entries(tmp_path, monkeypatch, atom)] == ['https://example.com/e1']
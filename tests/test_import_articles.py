@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Import en masse vers SQLite : point de reprise, lot en échec, articles illisibles"""
+
+import json
+import sqlite3
+
+import pytest
+
+import local_search_index
+from import_articles import ImportState, import_file
+from local_search_index import iter_json_records
+
+
+def _write_jsonl(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return str(path)
+
+
+def _records(count):
+    return [{'url': f'https://example.com/{i}', 'title': f'Article {i}', 'categories': 'Tech',
+             'scraped_at': {'$date': '2024-03-01T08:00:00Z'}} for i in range(count)]
+
+
+def _state(source):
+    with open(source + '.import.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_import_then_second_run_is_skipped(sqlite_db, tmp_path):
+    source = _write_jsonl(tmp_path / 'dump.jsonl', _records(5))
+
+    summary = import_file(sqlite_db, source, batch_size=2)
+    assert (summary['imported'], summary['skipped']) == (5, 0)
+    assert sqlite_db.get_stats()['total_articles'] == 5
+    state = _state(source)
+    assert state['completed'] and state['imported'] == 5
+
+    assert import_file(sqlite_db, source, batch_size=2)['imported'] == 0
+
+
+def test_failed_batch_stops_import_and_resume_finishes_it(sqlite_db, tmp_path, monkeypatch):
+    source = _write_jsonl(tmp_path / 'dump.jsonl', _records(6))
+    save_articles = sqlite_db.save_articles
+    calls = []
+
+    def failing_second_batch(articles, strict=False):
+        calls.append(len(articles))
+        if len(calls) == 2:
+            raise RuntimeError("disque plein")
+        return save_articles(articles, strict)
+
+    monkeypatch.setattr(sqlite_db, 'save_articles', failing_second_batch)
+    with pytest.raises(RuntimeError):
+        import_file(sqlite_db, source, batch_size=2)
+
+    state = _state(source)
+    assert not state['completed']
+    assert state['imported'] == 2
+    first_batch_end = state['offset']
+    assert 0 < first_batch_end < (tmp_path / 'dump.jsonl').stat().st_size
+
+    monkeypatch.setattr(sqlite_db, 'save_articles', save_articles)
+    summary = import_file(sqlite_db, source, batch_size=2)
+    assert summary['imported'] == 4
+    assert sqlite_db.get_stats()['total_articles'] == 6
+    assert _state(source)['completed'] and _state(source)['imported'] == 6
+
+
+def test_strict_batch_rejected_by_sqlite_is_not_counted(sqlite_db, tmp_path):
+    # Valeur non sérialisable en SQLite : le lot entier est levé au lieu d'être ignoré
+    records = _records(2) + [{'url': 'https://example.com/bad', 'title': {'fr': 'Titre'}}]
+    source = _write_jsonl(tmp_path / 'dump.jsonl', records)
+
+    with pytest.raises(sqlite3.Error):
+        import_file(sqlite_db, source, batch_size=10)
+    assert not _state(source)['completed']
+    assert _state(source)['offset'] == 0
+
+
+def test_malformed_and_url_less_records_are_skipped(sqlite_db, tmp_path):
+    records = _records(2) + [{'url': 'https://example.com/bad', 'images': 5}, {'title': 'Sans URL'}]
+    source = _write_jsonl(tmp_path / 'dump.jsonl', records)
+
+    summary = import_file(sqlite_db, source, batch_size=10)
+    assert (summary['imported'], summary['skipped']) == (2, 2)
+    assert _state(source)['completed']
+
+
+def test_imported_created_at_is_kept(sqlite_db, tmp_path):
+    record = {'url': 'https://example.com/old', 'title': 'Ancien', 'created_at': '2020-01-02T10:00:00'}
+    source = _write_jsonl(tmp_path / 'dump.jsonl', [record])
+
+    import_file(sqlite_db, source)
+    assert [a['url'] for a in sqlite_db.get_articles_by_date_range('2020-01-02', '2020-01-03')] == [record['url']]
+
+
+def test_state_is_ignored_when_source_changes(tmp_path):
+    source = _write_jsonl(tmp_path / 'dump.jsonl', _records(1))
+    state = ImportState(source)
+    state.advance(10, 1, force=True)
+
+    _write_jsonl(tmp_path / 'dump.jsonl', _records(3))
+    assert not ImportState(source).load()
+
+
+def test_truncated_jsonl_line_is_skipped_and_resume_moves_past_it(sqlite_db, tmp_path):
+    path = tmp_path / 'dump.jsonl'
+    _write_jsonl(path, _records(3))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://example.com/bad", "title": "Coup\n')
+        f.write(json.dumps(_records(4)[3]) + '\n')
+        f.write('{"url": "https://example.com/truncated", "ti')
+
+    summary = import_file(sqlite_db, str(path), batch_size=2)
+    assert (summary['imported'], summary['skipped']) == (4, 2)
+    state = _state(str(path))
+    assert state['completed'] and state['offset'] == path.stat().st_size
+
+
+def test_malformed_array_element_is_skipped_at_next_comma(tmp_path, monkeypatch):
+    # Petits blocs : les éléments sont aussi coupés par la lecture
+    monkeypatch.setattr(local_search_index, 'READ_CHUNK_SIZE', 7)
+    path = tmp_path / 'dump.json'
+    path.write_text('[{"url": "a", "t": "x, ]"}, {"url": "b", "t": [1 2]}, {"url": "c"}, {"url": "d"',
+                    encoding='utf-8')
+
+    records = list(iter_json_records(str(path)))
+    assert [record and record['url'] for record, _ in records] == ['a', None, 'c', None]
+    assert records[-1][1] == path.stat().st_size
+    # Reprise après l'élément illisible
+    resumed = [record and record['url'] for record, _ in iter_json_records(str(path), records[1][1])]
+    assert resumed == ['c', None]
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""File de travaux SQLite : réservation, expiration des baux, échecs et lettres mortes"""
+
+import pytest
+
+import job_queue
+from job_queue import SQLiteJobQueue
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SQLiteJobQueue(str(tmp_path / 'jobs.db'), lease_seconds=60, max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_enqueue_is_idempotent_and_articles_come_first(queue):
+    assert queue.enqueue([('listing', 'https://example.com/web/', None),
+                          ('article', 'https://example.com/a', {'title': 'A'})]) == 2
+    assert queue.enqueue([('article', 'https://example.com/a', None)]) == 0
+
+    first = queue.lease('w1')
+    assert (first.kind, first.url, first.payload, first.attempts) == \
+        ('article', 'https://example.com/a', {'title': 'A'}, 1)
+    assert queue.lease('w2').kind == 'listing'
+    assert queue.lease('w3') is None
+    assert queue.stats()['leased'] == 2
+
+
+def test_ack_only_by_current_lease_holder(queue, clock):
+    queue.enqueue([('article', 'https://example.com/a', None)])
+    expired = queue.lease('w1')
+
+    # Bail expiré : le travail est repris par un autre worker
+    clock.now += 61
+    current = queue.lease('w2')
+    assert current is not None and current.attempts == 2
+    assert not queue.ack(expired)
+    assert queue.ack(current)
+    assert queue.stats()['done'] == 1
+    assert queue.lease('w3') is None
+
+
+def test_fail_retries_after_backoff(queue, clock):
+    queue.enqueue([('article', 'https://example.com/a', None)])
+    job = queue.lease('w1')
+
+    assert queue.fail(job, 'HTTP 503') == 'pending'
+    assert queue.lease('w1') is None
+    clock.now += queue.retry_delay(job.attempts)
+    retried = queue.lease('w1')
+    assert retried is not None and retried.attempts == 2
+
+
+def test_fail_dead_letters_after_max_attempts_and_requeue(queue, clock):
+    queue.enqueue([('article', 'https://example.com/a', None)])
+    queue.fail(queue.lease('w1'), 'HTTP 503')
+    clock.now += job_queue.RETRY_BASE_SECONDS
+
+    assert queue.fail(queue.lease('w1'), 'HTTP 503') == 'dead'
+    assert queue.stats()['dead'] == 1
+    assert queue.lease('w1') is None
+
+    assert queue.requeue_dead() == 1
+    job = queue.lease('w1')
+    assert job is not None and job.attempts == 1
+
+
+def test_expired_lease_at_max_attempts_becomes_dead(queue, clock):
+    queue.enqueue([('article', 'https://example.com/a', None)])
+    queue.lease('w1')
+    clock.now += 61
+    queue.lease('w2')
+    clock.now += 61
+
+    # Plus d'essai possible : le bail expiré passe en lettre morte
+    assert queue.lease('w3') is None
+    assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 0, 'dead': 1}
+
+
+def test_purge_removes_done_jobs(queue):
+    queue.enqueue([('article', 'https://example.com/a', None), ('article', 'https://example.com/b', None)])
+    queue.ack(queue.lease('w1'))
+
+    assert queue.purge() == 1
+    assert queue.stats()['pending'] == 1
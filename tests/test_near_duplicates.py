@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Quasi-doublons : détection MinHash/LSH et fusion dans l'article canonique (SQLite)"""
+
+from near_duplicates import MemoryLSHStore, NearDuplicateDetector
+from sqlite_manager import SQLiteManager
+from storage import ArticleRepository, MergedDuplicate, is_stored
+
+CONTENT = (
+    "Google présente une nouvelle version de son moteur de recherche qui intègre des réponses "
+    "générées par intelligence artificielle directement dans la page de résultats, avec des liens "
+    "vers les sources consultées et un mode conversationnel pour affiner la recherche au fil des questions"
+)
+OTHER_CONTENT = (
+    "Instagram teste un nouveau format de publication réservé aux abonnés payants des créateurs, "
+    "avec des contenus exclusifs, des messages privés prioritaires et des statistiques détaillées "
+    "sur les revenus générés chaque mois par la communauté de chaque compte professionnel"
+)
+
+
+def test_detects_near_duplicate_under_another_url():
+    detector = NearDuplicateDetector(MemoryLSHStore())
+    assert detector.check_and_add('https://example.com/web/a', CONTENT) is None
+
+    duplicate = detector.check_and_add('https://example.com/tech/a', CONTENT + " Mise à jour")
+    assert duplicate is not None
+    assert duplicate[0] == 'https://example.com/web/a'
+    assert duplicate[1] >= detector.threshold
+
+
+def test_distinct_content_and_same_url_are_not_duplicates():
+    detector = NearDuplicateDetector(MemoryLSHStore())
+    detector.add('https://example.com/web/a', CONTENT)
+
+    assert detector.find_duplicate('https://example.com/web/b', OTHER_CONTENT) is None
+    assert detector.find_duplicate('https://example.com/web/a', CONTENT) is None
+    assert detector.find_duplicate('https://example.com/web/c', '') is None
+
+
+def test_check_and_add_does_not_index_duplicates():
+    store = MemoryLSHStore()
+    detector = NearDuplicateDetector(store)
+    detector.check_and_add('https://example.com/web/a', CONTENT)
+    detector.check_and_add('https://example.com/tech/a', CONTENT)
+
+    assert list(store.signatures) == ['https://example.com/web/a']
+
+
+def test_sqlite_merges_near_duplicate_into_canonical(sqlite_db):
+    canonical = {'url': 'https://example.com/web/a', 'title': 'IA', 'content': CONTENT, 'categories': ['Web']}
+    copy = {'url': 'https://example.com/tech/a', 'title': 'IA', 'content': CONTENT, 'categories': ['Tech']}
+
+    assert sqlite_db.save_articles([canonical]) == 1
+    # Fusionné : ni compté comme sauvegardé, ni enregistré comme un second article
+    assert sqlite_db.save_articles([copy]) == 0
+
+    articles = sqlite_db.get_articles_by_category('Tech')
+    assert [article['url'] for article in articles] == [canonical['url']]
+    assert articles[0]['duplicate_urls'] == [copy['url']]
+    assert sqlite_db.get_stats()['total_articles'] == 1
+
+
+def test_sqlite_saves_distinct_articles_separately(sqlite_db):
+    first = {'url': 'https://example.com/web/a', 'title': 'IA', 'content': CONTENT}
+    second = {'url': 'https://example.com/web/b', 'title': 'Instagram', 'content': OTHER_CONTENT}
+
+    assert sqlite_db.save_articles([first, second]) == 2
+    assert sqlite_db.get_stats()['total_articles'] == 2
+
+
+def test_merged_save_article_returns_merged_duplicate(sqlite_db):
+    sqlite_db.save_article({'url': 'https://example.com/web/a', 'content': CONTENT})
+
+    result = sqlite_db.save_article({'url': 'https://example.com/tech/a', 'content': CONTENT})
+    assert isinstance(result, MergedDuplicate)
+    assert result.canonical_url == 'https://example.com/web/a'
+    assert result and not is_stored(result)
+
+
+class MergingRepository(SQLiteManager):
+    """Backend dont save_article fusionne tout article dont l'URL contient /tech/"""
+
+    def save_article(self, article_data):
+        if '/tech/' in article_data['url']:
+            return MergedDuplicate('https://example.com/web/a')
+        return super().save_article(article_data)
+
+
+def test_base_save_articles_neither_counts_nor_publishes_merges(tmp_path, monkeypatch):
+    repository = MergingRepository(str(tmp_path / 'articles.db'))
+    published = []
+    monkeypatch.setattr(repository, 'publish_saved', published.extend)
+
+    saved = ArticleRepository.save_articles(repository, [
+        {'url': 'https://example.com/web/a', 'content': CONTENT},
+        {'url': 'https://example.com/tech/a', 'content': CONTENT},
+    ])
+    assert saved == 1
+    assert [article['url'] for article in published] == ['https://example.com/web/a']
+    repository.close()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Backend SQLite : aller-retour d'un article, mise à jour sur l'URL, lots avec un article en erreur"""
+
+import threading
+from datetime import datetime
+
+from models import Article, Image, as_document
+
+
+def _article(**changes):
+    values = dict(url='https://example.com/web/ia', title="L'IA générative au bureau",
+                  thumbnail='https://example.com/t.jpg', subcategory='IA', summary='Résumé',
+                  date='2024-03-01', author='Thomas Coëffé',
+                  content='Les assistants conversationnels arrivent dans les suites bureautiques',
+                  images={'image_1': Image('https://example.com/1.jpg', 'Capture')},
+                  categories=['Tech'], subcategories=['IA', 'Bureautique'],
+                  scraped_at=datetime(2024, 3, 1, 8, 30))
+    values.update(changes)
+    return Article(**values)
+
+
+def _only(articles):
+    assert len(articles) == 1
+    return articles[0]
+
+
+def test_article_round_trip(sqlite_db):
+    article = _article()
+    assert sqlite_db.save_article(article)
+
+    stored = _only(sqlite_db.get_articles_by_author('thomas coëffé'))
+    for field in ('url', 'title', 'thumbnail', 'subcategory', 'summary', 'date', 'author', 'content'):
+        assert stored[field] == getattr(article, field)
+    assert stored['images'] == {'image_1': {'url': 'https://example.com/1.jpg', 'caption': 'Capture'}}
+    assert sorted(stored['categories']) == ['Tech']
+    assert sorted(stored['subcategories']) == ['Bureautique', 'IA']
+    assert stored['scraped_at'] == '2024-03-01T08:30:00'
+    assert _only(sqlite_db.get_articles_by_subcategory('bureautique'))['url'] == article.url
+    assert _only(sqlite_db.search('assistants'))['url'] == article.url
+
+
+def test_update_on_same_url_keeps_id_and_created_at(sqlite_db):
+    first_id = sqlite_db.save_article(_article())
+    created_at = _only(sqlite_db.get_articles_by_category('Tech'))['created_at']
+
+    second_id = sqlite_db.save_article(_article(title='Titre corrigé', categories=['Web'], subcategories=[]))
+    assert second_id == first_id
+
+    stored = _only(sqlite_db.search_in_title('corrigé'))
+    assert stored['created_at'] == created_at
+    assert stored['categories'] == ['Web']
+    assert stored['subcategories'] == []
+    assert sqlite_db.get_articles_by_category('Tech') == []
+    assert sqlite_db.get_stats()['total_articles'] == 1
+
+
+def test_failed_article_is_rolled_back_alone(sqlite_db):
+    articles = [
+        _article(url='https://example.com/a', content='Premier contenu sans rapport'),
+        # Valeur non sérialisable : seul cet article est annulé
+        {'url': 'https://example.com/bad', 'title': {'fr': 'Titre'}, 'categories': ['Tech']},
+        _article(url='https://example.com/b', content='Second contenu tout à fait différent'),
+    ]
+    assert sqlite_db.save_articles(articles) == 2
+
+    assert sorted(a['url'] for a in sqlite_db.get_articles_by_category('Tech')) == [
+        'https://example.com/a', 'https://example.com/b']
+    assert not sqlite_db.conn.in_transaction
+
+
+def test_article_without_url_is_ignored(sqlite_db):
+    assert sqlite_db.save_article({'title': 'Sans URL'}) is None
+    assert sqlite_db.save_articles([{'title': 'Sans URL'}]) == 0
+    assert sqlite_db.get_stats()['total_articles'] == 0
+
+
+def test_reads_from_other_threads_see_only_committed_rows(sqlite_db):
+    sqlite_db.save_article(_article(url='https://example.com/committed'))
+    seen = {}
+
+    def read(name):
+        seen[name] = sorted(a['url'] for a in sqlite_db.get_articles_by_category('Tech'))
+
+    # Sauvegarde groupée en cours : transaction ouverte sur la connexion d'écriture
+    with sqlite_db._lock:
+        sqlite_db.conn.execute("BEGIN")
+        sqlite_db._upsert(as_document(_article(url='https://example.com/pending', content='Autre contenu')))
+        thread = threading.Thread(target=read, args=('during',))
+        thread.start()
+        thread.join(timeout=5)
+        sqlite_db.conn.rollback()
+    read('after')
+
+    assert seen['during'] == ['https://example.com/committed']
+    assert seen['after'] == ['https://example.com/committed']
+
+
+def test_each_thread_has_its_own_read_connection(sqlite_db):
+    readers = []
+    thread = threading.Thread(target=lambda: readers.append(sqlite_db.reader))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert sqlite_db.reader is sqlite_db.reader
+    assert sqlite_db.reader is not readers[0]
+    assert sqlite_db.reader is not sqlite_db.conn
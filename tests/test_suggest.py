@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Index de préfixes : ajout, remplacement d'un article (même URL) et retrait des valeurs"""
+
+from suggest import PrefixIndex
+
+
+def _values(index, query, kind=None):
+    return [(entry['type'], entry['value'], entry['count']) for entry in index.suggest(query, kind)]
+
+
+def test_add_matches_any_word_ignoring_case_and_accents():
+    index = PrefixIndex()
+    index.add_article({'url': 'u1', 'title': 'Le Référencement naturel', 'author': 'Alexandra Patard',
+                       'categories': ['Web'], 'subcategory': 'SEO'})
+
+    assert _values(index, 'pat') == [('author', 'Alexandra Patard', 1)]
+    assert _values(index, 'refer') == [('title', 'Le Référencement naturel', 1)]
+    assert _values(index, 'seo', kind='subcategory') == [('subcategory', 'SEO', 1)]
+    assert _values(index, 'seo', kind='author') == []
+
+
+def test_counts_articles_and_ranks_value_starts_first():
+    index = PrefixIndex()
+    index.add_article({'url': 'u1', 'author': 'Thomas Coëffé'})
+    index.add_article({'url': 'u2', 'author': 'Thomas Coëffé'})
+    index.add_article({'url': 'u3', 'author': 'Anne Thomasset'})
+
+    assert _values(index, 'thom') == [('author', 'Thomas Coëffé', 2), ('author', 'Anne Thomasset', 1)]
+
+
+def test_same_url_replaces_previous_values():
+    index = PrefixIndex()
+    index.add_article({'url': 'u1', 'title': 'Google Gemini', 'author': 'Thomas Coëffé'})
+    index.add_article({'url': 'u1', 'title': 'Google Bard', 'author': 'Thomas Coëffé'})
+
+    assert _values(index, 'google') == [('title', 'Google Bard', 1)]
+    assert _values(index, 'gemini') == []
+    # L'auteur inchangé n'est pas compté deux fois
+    assert _values(index, 'thomas') == [('author', 'Thomas Coëffé', 1)]
+
+
+def test_value_removed_when_last_article_drops_it():
+    index = PrefixIndex()
+    index.add_article({'url': 'u1', 'categories': ['Tech']})
+    index.add_article({'url': 'u2', 'categories': ['Tech']})
+
+    index.add_article({'url': 'u1', 'categories': ['Web']})
+    assert _values(index, 'tech') == [('category', 'Tech', 1)]
+
+    index.add_article({'url': 'u2', 'categories': ['Web']})
+    assert _values(index, 'tech') == []
+    assert ('category', 'Tech') not in index.weights
+    assert all(value != 'Tech' for _, _, value in index.keys)
+    assert len(index) == 1
+
+
+def test_build_matches_incremental_adds():
+    articles = [
+        {'url': 'u1', 'title': 'Intelligence artificielle', 'author': 'Alexandra Patard', 'categories': ['Tech']},
+        {'url': 'u2', 'title': 'Instagram Reels', 'author': 'Alexandra Patard', 'subcategories': ['Réseaux sociaux']},
+    ]
+    built = PrefixIndex().build(articles)
+    incremental = PrefixIndex()
+    incremental.add_articles(articles)
+
+    assert built.keys == incremental.keys
+    assert built.weights == incremental.weights
+    assert _values(built, 'in') == _values(incremental, 'in')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Tendances : rééchantillonnage par semaine et par mois, variations lors d'une nouvelle sauvegarde"""
+
+from datetime import date
+
+import pytest
+
+from trends import ALL_KEY, resample, trend_deltas
+
+
+def test_resample_weeks_start_on_monday():
+    rows = [('2024-01-31', 2), ('2024-02-01', 3), ('2024-02-05', 1)]
+    labels, counts = resample(rows, date(2024, 1, 31), date(2024, 2, 11), 'week')
+
+    # Le 31 janvier 2024 est un mercredi : sa semaine commence le lundi 29
+    assert labels == ['2024-01-29', '2024-02-05']
+    assert counts == [5, 1]
+
+
+def test_resample_months_ignore_days_outside_window():
+    rows = [('2023-12-31', 9), ('2024-01-31', 2), ('2024-02-01', 3), ('2024-02-29', 1), ('2024-03-11', 4)]
+    labels, counts = resample(rows, date(2024, 1, 15), date(2024, 3, 10), 'month')
+
+    assert labels == ['2024-01', '2024-02', '2024-03']
+    assert counts == [2, 4, 0]
+
+
+def test_resample_days_is_dense():
+    labels, counts = resample([('2024-01-02', 1)], date(2024, 1, 1), date(2024, 1, 3))
+
+    assert labels == ['2024-01-01', '2024-01-02', '2024-01-03']
+    assert counts == [0, 1, 0]
+
+
+def test_resample_rejects_unknown_bucket():
+    with pytest.raises(ValueError):
+        resample([], date(2024, 1, 1), date(2024, 1, 3), 'year')
+
+
+def test_deltas_of_unchanged_resave_are_empty():
+    article = {'url': 'u1', 'date': '2024-03-01', 'categories': ['Tech'], 'author': 'Thomas Coëffé'}
+
+    deltas, _ = trend_deltas([article], [dict(article)])
+    assert not deltas
+
+
+def test_deltas_move_count_when_author_and_date_change():
+    before = {'url': 'u1', 'date': '2024-03-01', 'author': 'Thomas Coëffé'}
+    after = {'url': 'u1', 'date': '2024-03-02', 'author': 'Alexandra Patard'}
+
+    deltas, labels = trend_deltas([before], [after])
+    assert deltas == {
+        ('all', ALL_KEY, '2024-03-01'): -1, ('all', ALL_KEY, '2024-03-02'): 1,
+        ('author', 'thomas coëffé', '2024-03-01'): -1, ('author', 'alexandra patard', '2024-03-02'): 1,
+    }
+    assert labels[('author', 'alexandra patard')] == 'Alexandra Patard'
+
+
+def test_sqlite_resave_is_not_counted_twice(sqlite_db):
+    article = {'url': 'https://example.com/a', 'title': 'A', 'date': '2024-03-01',
+               'categories': ['Tech'], 'author': 'Thomas Coëffé'}
+    sqlite_db.save_articles([article])
+    sqlite_db.save_articles([article])
+    sqlite_db.save_articles([{**article, 'author': 'Alexandra Patard'}])
+
+    def total(facet, value=None):
+        series = sqlite_db.get_trends(facet, value, '2024-03-01', '2024-03-31', bucket='month')['series']
+        return series[0]['total'] if series else 0
+
+    assert total('all') == 1
+    assert total('category', 'Tech') == 1
+    assert total('author', 'Alexandra Patard') == 1
+    assert total('author', 'Thomas Coëffé') == 0
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Cache web : une sauvegarde ne vide pas le cache, le rafraîchissement remplace les valeurs"""
+
+from web_cache import WebCache
+
+
+class CountingRepository:
+    """Backend minimal : compte les calculs des statistiques"""
+
+    def __init__(self):
+        self.total = 1
+        self.computed = 0
+
+    def get_stats(self):
+        self.computed += 1
+        return {'total_articles': self.total}
+
+    def get_data_for_interface(self):
+        return {'total_articles': self.total}
+
+    def get_all_categories(self):
+        return []
+
+
+def test_request_after_save_is_served_from_cache():
+    repository = CountingRepository()
+    cache = WebCache(repository, ttl=600, refresh_delay=60)
+    assert cache.stats() == {'total_articles': 1}
+
+    repository.total = 2
+    cache.on_saved([{'url': 'https://example.com/a'}])
+
+    # Avant le rafraîchissement : ancienne valeur, sans recalcul pendant la requête
+    assert cache.stats() == {'total_articles': 1}
+    assert repository.computed == 1
+
+    cache.refresh()
+    computed = repository.computed
+    assert cache.stats() == {'total_articles': 2}
+    assert repository.computed == computed
+
+
+def test_saves_schedule_one_background_refresh():
+    repository = CountingRepository()
+    cache = WebCache(repository, ttl=600, refresh_delay=0.05)
+    cache.stats()
+
+    repository.total = 3
+    for _ in range(5):
+        cache.on_saved([{'url': 'https://example.com/a'}])
+    thread = cache._refresh_thread
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert cache._refresh_thread is None
+    # Un seul rafraîchissement pour les cinq sauvegardes
+    assert repository.computed == 2
+    assert cache.stats() == {'total_articles': 3}
+
+
+def test_disabled_cache_ignores_saves():
+    cache = WebCache(CountingRepository(), ttl=0)
+    cache.on_saved([{'url': 'https://example.com/a'}])
+    assert cache._refresh_thread is None
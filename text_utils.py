@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Outils de traitement de texte partagés (normalisation, tokenisation française)
+"""
+
+import re
+import unicodedata
+from typing import List
+
+FRENCH_STOPWORDS = frozenset("""
+a ai aie aient aies ait alors as au aucun aucune aupres auquel aura aurai auraient aurais
+aurait auras aurez auriez aurions aurons auront aussi autre autres aux auxquelles auxquels avaient
+avais avait avant avec avez aviez avions avoir avons ayant ayez ayons c ca car ce ceci cela celle
+celles celui cependant certain certaine certaines certains ces cet cette ceux chacun chacune chaque
+chez ci comme comment d dans de des donc dont du elle elles en encore entre es est et etaient etais
+etait etant ete etes etiez etions etre eu eue eues eurent eus eut eux fait faire fois font furent
+fut il ils j je jusqu l la laquelle le lequel les lesquelles lesquels leur leurs lui m ma mais
+me meme memes mes moi mon n ne ni nos notre nous on ont ou par parce pas pendant peu peut plus
+pour pourquoi puis qu quand que quel quelle quelles quels qui quoi s sa sans se sera serai seraient
+serais serait seras serez seriez serions serons seront ses si sien sienne son sont sous soyez
+soyons suis sur t ta te tes toi ton tous tout toute toutes tres tu un une unes uns vers via vos
+votre vous y
+""".split())
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def fold_accents(text: str) -> str:
+    """Minuscule et suppression des accents ("Éditeur" -> "editeur")"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def normalize_text(text: str) -> str:
+    """Texte replié (minuscule, sans accents), ponctuation remplacée par des espaces"""
+    return re.sub(r'\W+', ' ', fold_accents(text)).strip()
+
+
+def light_stem(token: str) -> str:
+    """Racinisation légère du français : pluriels en -s / -x"""
+    if len(token) > 4 and token[-1] in 'sx' and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str, stem: bool = True) -> List[str]:
+    """
+    Tokenisation française : repli des accents, élisions (l', d', qu'...) coupées,
+    mots vides supprimés, pluriels réduits
+    """
+    if not text:
+        return []
+    tokens = []
+    for token in _TOKEN_RE.findall(fold_accents(text)):
+        if token in FRENCH_STOPWORDS or token.isdigit() and len(token) < 2:
+            continue
+        tokens.append(light_stem(token) if stem else token)
+    return tokens
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agrégats temporels des articles (tendances) maintenus à l'ingestion
+
+Nombre d'articles par jour de publication, pour chaque catégorie, sous-catégorie, auteur
+et pour l'ensemble ('all'). save_articles lit les facettes des articles concernés avant
+et après la sauvegarde et applique la différence : une nouvelle sauvegarde d'un article
+déjà connu ne le compte pas deux fois, et un changement d'auteur ou de date déplace son
+compte. Une série se lit sans parcourir les articles, puis est rééchantillonnée par
+semaine ou par mois avec NumPy.
+
+Stockage :
+- MongoDB : collection `<collection>_trends`, un document par (facette, valeur, année)
+- SQLite  : table trend_rollups, dans la transaction de la sauvegarde
+- index local : agrégats calculés en mémoire à la première demande
+
+Usage : python trends.py rebuild
+        python trends.py series --facet author --value "Thomas Coëffé" --bucket month
+"""
+
+import argparse
+import contextlib
+import re
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pymongo import UpdateOne
+
+TREND_FACETS = ('all', 'category', 'subcategory', 'author')
+TREND_BUCKETS = ('day', 'week', 'month')
+TREND_FIELDS = ('url', 'date', 'categories', 'subcategories', 'subcategory', 'author')
+DEFAULT_WINDOW_DAYS = 365
+MAX_WINDOW_DAYS = 3660
+TOP_VALUES = 5
+ALL_KEY = '*'
+ALL_LABEL = 'Tous les articles'
+_DAY_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def _article_url(article) -> Optional[str]:
+    return article.get('url') if isinstance(article, Mapping) else getattr(article, 'url', None)
+
+
+def _facet_key(value: str) -> str:
+    return value.strip().casefold()
+
+
+def article_day(article: Mapping) -> Optional[str]:
+    """Jour de publication AAAA-MM-JJ (champ date), None s'il est absent ou invalide"""
+    day = article.get('date')
+    if not isinstance(day, str) or not _DAY_PATTERN.match(day):
+        return None
+    try:
+        date.fromisoformat(day)
+    except ValueError:
+        return None
+    return day
+
+
+def trend_entries(article: Mapping) -> List[Tuple[str, str, str, str]]:
+    """(facette, clé, libellé, jour) auxquels un article (dict) contribue"""
+    day = article_day(article)
+    if day is None:
+        return []
+    values = [('all', ALL_LABEL)]
+    values.extend(('category', category) for category in article.get('categories') or [])
+    subcategories = list(article.get('subcategories') or [])
+    if article.get('subcategory'):
+        subcategories.append(article['subcategory'])
+    values.extend(('subcategory', subcategory) for subcategory in subcategories)
+    if article.get('author'):
+        values.append(('author', article['author']))
+
+    entries = {}
+    for facet, label in values:
+        if not isinstance(label, str) or not label.strip():
+            continue
+        key = ALL_KEY if facet == 'all' else _facet_key(label)
+        entries.setdefault((facet, key), label.strip())
+    return [(facet, key, label, day) for (facet, key), label in entries.items()]
+
+
+def trend_deltas(before: Iterable[Mapping], after: Iterable[Mapping]) -> Tuple[Counter, Dict]:
+    """Variations des compteurs (facette, clé, jour) entre deux états des mêmes articles, et libellés"""
+    deltas, labels = Counter(), {}
+    for documents, sign in ((before, -1), (after, 1)):
+        for document in documents:
+            for facet, key, label, day in trend_entries(document):
+                deltas[(facet, key, day)] += sign
+                labels[(facet, key)] = label
+    return Counter({entry: count for entry, count in deltas.items() if count}), labels
+
+
+def parse_window(start: Optional[str] = None, end: Optional[str] = None,
+                 days: Optional[int] = None) -> Tuple[date, date]:
+    """Fenêtre [start, end] ; par défaut les `days` (365) derniers jours"""
+    end_day = date.fromisoformat(end) if end else date.today()
+    if start:
+        start_day = date.fromisoformat(start)
+    else:
+        start_day = end_day - timedelta(days=(days or DEFAULT_WINDOW_DAYS) - 1)
+    if start_day > end_day:
+        raise ValueError("La date de début doit précéder la date de fin")
+    if (end_day - start_day).days >= MAX_WINDOW_DAYS:
+        raise ValueError(f"Fenêtre limitée à {MAX_WINDOW_DAYS} jours")
+    return start_day, end_day
+
+
+def resample(rows: Iterable[Tuple[str, int]], start: date, end: date, bucket: str = 'day') -> Tuple[List[str], List[int]]:
+    """
+    Série dense sur [start, end] à partir de couples (jour, compte), regroupée par jour,
+    semaine (commençant le lundi) ou mois
+    """
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"Regroupement inconnu: '{bucket}' (choix: {', '.join(TREND_BUCKETS)})")
+    # Import différé : les backends (qui mettent les agrégats à jour) ne chargent pas numpy
+    import numpy as np
+
+    first = np.datetime64(start, 'D')
+    span = np.arange(first, np.datetime64(end, 'D') + 1)
+    daily = np.zeros(len(span), dtype=np.int64)
+
+    rows = list(rows)
+    if rows:
+        days = np.array([day for day, _ in rows], dtype='datetime64[D]')
+        counts = np.array([count for _, count in rows], dtype=np.int64)
+        offsets = (days - first).astype(np.int64)
+        inside = (offsets >= 0) & (offsets < len(span))
+        np.add.at(daily, offsets[inside], counts[inside])
+
+    if bucket == 'day':
+        return [str(day) for day in span], daily.tolist()
+    if bucket == 'week':
+        # L'époque NumPy (1970-01-01) est un jeudi : décalage de 3 jours pour des semaines au lundi
+        mondays = span - ((span.astype(np.int64) + 3) % 7)
+        index = ((mondays - mondays[0]) // 7).astype(np.int64)
+        labels = mondays[0] + 7 * np.arange(index[-1] + 1)
+    else:
+        months = span.astype('datetime64[M]')
+        index = (months - months[0]).astype(np.int64)
+        labels = months[0] + np.arange(index[-1] + 1)
+    totals = np.bincount(index, weights=daily, minlength=index[-1] + 1).astype(np.int64)
+    return [str(label) for label in labels], totals.tolist()
+
+
+# ----------------------------------------------------------------------
+# Stockages
+# ----------------------------------------------------------------------
+def mongo_trend_id(facet: str, key: str, year: int) -> str:
+    return f"{facet}|{key}|{year}"
+
+
+def mongo_trend_filter(facet: str, key: Optional[str], start: date, end: date) -> Dict:
+    """Documents d'une valeur (ou de toute la facette) couvrant la fenêtre : au plus un par année"""
+    years = list(range(start.year, end.year + 1))
+    if key is not None:
+        return {'_id': {'$in': [mongo_trend_id(facet, key, year) for year in years]}}
+    return {'facet': facet, 'year': {'$in': years}}
+
+
+def mongo_trend_rows(documents: Iterable[Mapping]) -> Iterable[Tuple[str, str, str, int]]:
+    """(clé, libellé, jour, compte) depuis les documents `<collection>_trends`"""
+    for document in documents:
+        for month_day, count in (document.get('days') or {}).items():
+            if count:
+                yield document['key'], document.get('label', document['key']), f"{document['year']}-{month_day}", count
+
+
+class MongoTrendStore:
+    """Un document par (facette, valeur, année) : {days: {'MM-JJ': compte}}"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def create_indexes(self) -> None:
+        self.collection.create_index([('facet', 1), ('year', 1)])
+
+    def apply(self, deltas: Counter, labels: Dict) -> None:
+        updates = defaultdict(Counter)
+        for (facet, key, day), count in deltas.items():
+            updates[(facet, key, int(day[:4]))][f"days.{day[5:]}"] += count
+        writes = [
+            UpdateOne(
+                {'_id': mongo_trend_id(facet, key, year)},
+                {'$inc': dict(increments),
+                 '$set': {'label': labels.get((facet, key), key)},
+                 '$setOnInsert': {'facet': facet, 'key': key, 'year': year}},
+                upsert=True
+            )
+            for (facet, key, year), increments in updates.items()
+        ]
+        if writes:
+            self.collection.bulk_write(writes, ordered=False)
+
+    def clear(self) -> None:
+        self.collection.delete_many({})
+
+    def rows(self, facet: str, key: Optional[str], start: date, end: date):
+        return mongo_trend_rows(self.collection.find(mongo_trend_filter(facet, key, start, end)))
+
+
+class SQLiteTrendStore:
+    """Table trend_rollups (clé primaire facette, clé, jour) dans la base des articles"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS trend_rollups (
+        facet TEXT NOT NULL,
+        value_key TEXT NOT NULL,
+        day TEXT NOT NULL,
+        value TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (facet, value_key, day)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, conn, read_connection=None):
+        """read_connection : connexion des lectures de séries (default: celle des écritures)"""
+        self.conn = conn
+        self.read_connection = read_connection or (lambda: conn)
+        self.conn.executescript(self.SCHEMA)
+
+    def apply(self, deltas: Counter, labels: Dict) -> None:
+        """Validé avec la transaction en cours (celle de la sauvegarde groupée des articles)"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO trend_rollups(facet, value_key, day, value, count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(facet, value_key, day) DO UPDATE SET "
+                "count = count + excluded.count, value = excluded.value",
+                [(facet, key, day, labels.get((facet, key), key), count)
+                 for (facet, key, day), count in deltas.items()]
+            )
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM trend_rollups")
+
+    def rows(self, facet: str, key: Optional[str], start: date, end: date):
+        query = "SELECT value_key, value, day, count FROM trend_rollups WHERE facet = ? AND day BETWEEN ? AND ?"
+        params = [facet, start.isoformat(), end.isoformat()]
+        if key is not None:
+            query += " AND value_key = ?"
+            params.append(key)
+        return [tuple(row) for row in self.read_connection().execute(query, params) if row[3]]
+
+
+class MemoryTrendStore:
+    """Compteurs en mémoire (index local en lecture seule)"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.labels: Dict = {}
+
+    def apply(self, deltas: Counter, labels: Dict) -> None:
+        self.counts.update(deltas)
+        self.labels.update(labels)
+
+    def clear(self) -> None:
+        self.counts.clear()
+
+    def rows(self, facet: str, key: Optional[str], start: date, end: date):
+        start, end = start.isoformat(), end.isoformat()
+        return [(entry_key, self.labels.get((facet, entry_key), entry_key), day, count)
+                for (entry_facet, entry_key, day), count in self.counts.items()
+                if entry_facet == facet and (key is None or entry_key == key) and start <= day <= end and count]
+
+
+class TrendRollups:
+    """Maintenance incrémentale et lecture des séries d'un stockage d'agrégats"""
+
+    def __init__(self, store):
+        self.store = store
+
+    @contextlib.contextmanager
+    def tracking(self, repository, articles):
+        """Applique, après le bloc, la variation des facettes des articles sauvegardés"""
+        urls = list(dict.fromkeys(url for url in map(_article_url, articles) if url))
+        before = repository.get_trend_documents(urls) if urls else []
+        yield
+        if not urls:
+            return
+        try:
+            deltas, labels = trend_deltas(before, repository.get_trend_documents(urls))
+            if deltas:
+                self.store.apply(deltas, labels)
+        except Exception as e:
+            # Les articles sont sauvegardés : `python trends.py rebuild` resynchronise les agrégats
+            print(f"⚠️ Erreur mise à jour des tendances: {e}")
+
+    def rebuild(self, articles: Iterable[Mapping]) -> int:
+        """Recalcule tous les agrégats (historique existant, ou après une désynchronisation)"""
+        self.store.clear()
+        count, batch = 0, []
+        for article in articles:
+            batch.append(article)
+            count += 1
+            if len(batch) >= 1000:
+                self.store.apply(*trend_deltas([], batch))
+                batch = []
+        if batch:
+            self.store.apply(*trend_deltas([], batch))
+        return count
+
+    def series(self, facet: str = 'all', value: Optional[str] = None, start: Optional[str] = None,
+               end: Optional[str] = None, days: Optional[int] = None, bucket: str = 'day',
+               limit: int = TOP_VALUES) -> Dict:
+        """
+        Séries d'une valeur de facette (ou des `limit` valeurs les plus fréquentes sur la fenêtre)
+        Coût proportionnel à la fenêtre, indépendant du nombre d'articles stockés
+        """
+        key, start_day, end_day = resolve_trend_query(facet, value, start, end, days, bucket)
+        return build_series(self.store.rows(facet, key, start_day, end_day),
+                            facet, start_day, end_day, bucket, limit)
+
+
+def resolve_trend_query(facet: str, value: Optional[str], start: Optional[str], end: Optional[str],
+                        days: Optional[int], bucket: str) -> Tuple[Optional[str], date, date]:
+    """Valide une demande de série : (clé de la valeur ou None pour toute la facette, début, fin)"""
+    if facet not in TREND_FACETS:
+        raise ValueError(f"Facette inconnue: '{facet}' (choix: {', '.join(TREND_FACETS)})")
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"Regroupement inconnu: '{bucket}' (choix: {', '.join(TREND_BUCKETS)})")
+    start_day, end_day = parse_window(start, end, days)
+    key = ALL_KEY if facet == 'all' else (_facet_key(value) if value and value.strip() else None)
+    return key, start_day, end_day
+
+
+def build_series(rows: Iterable[Tuple[str, str, str, int]], facet: str, start: date, end: date,
+                 bucket: str, limit: int = TOP_VALUES) -> Dict:
+    """Réponse de /api/trends depuis les lignes (clé, libellé, jour, compte) d'une fenêtre"""
+    by_key, labels = defaultdict(list), {}
+    first, last = start.isoformat(), end.isoformat()
+    for key, label, day, count in rows:
+        if not first <= day <= last:
+            continue  # documents annuels MongoDB : jours hors fenêtre
+        by_key[key].append((day, count))
+        labels[key] = label
+    totals = {key: sum(count for _, count in day_counts) for key, day_counts in by_key.items()}
+    top = sorted(totals, key=lambda key: (-totals[key], labels[key]))[:max(1, limit)]
+
+    bucket_labels, _ = resample([], start, end, bucket)
+    series = []
+    for key in top:
+        _, counts = resample(by_key[key], start, end, bucket)
+        series.append({'value': labels[key], 'total': totals[key], 'counts': counts})
+    return {
+        'facet': facet,
+        'bucket': bucket,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'labels': bucket_labels,
+        'series': series
+    }
+
+
+def main():
+    from storage import BACKENDS, get_storage_backend
+
+    parser = argparse.ArgumentParser(description='Agrégats temporels des articles')
+    parser.add_argument('action', choices=['rebuild', 'series'],
+                        help='rebuild : recalcul complet des agrégats ; series : affiche une série')
+    parser.add_argument('--backend', choices=BACKENDS, default=None, help='Backend de stockage (default: STORAGE_BACKEND)')
+    parser.add_argument('--facet', choices=TREND_FACETS, default='all')
+    parser.add_argument('--value', default=None, help='Valeur de la facette (default: valeurs les plus fréquentes)')
+    parser.add_argument('--start', default=None, help='Début AAAA-MM-JJ')
+    parser.add_argument('--end', default=None, help='Fin AAAA-MM-JJ (default: aujourd\'hui)')
+    parser.add_argument('--days', type=int, default=None, help=f'Fenêtre en jours (default: {DEFAULT_WINDOW_DAYS})')
+    parser.add_argument('--bucket', choices=TREND_BUCKETS, default='month')
+    args = parser.parse_args()
+
+    try:
+        db_manager = get_storage_backend(args.backend)
+        if args.action == 'rebuild':
+            count = db_manager.rebuild_trends()
+            print(f"📈 Tendances recalculées depuis {count} articles")
+        else:
+            result = db_manager.get_trends(args.facet, args.value, args.start, args.end,
+                                           args.days, args.bucket)
+            print(f"📈 {result['facet']} par {result['bucket']} du {result['start']} au {result['end']}")
+            for serie in result['series']:
+                print(f"\n{serie['value']} ({serie['total']} articles)")
+                for label, count in zip(result['labels'], serie['counts']):
+                    if count:
+                        print(f"   {label}  {count:>4} {'█' * min(count, 60)}")
+        db_manager.close()
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache en mémoire de l'interface web : page d'accueil (compteurs, catégories),
+statistiques, sous-catégories par catégorie et résultats de recherche
+
+- une entrée est servie jusqu'à son expiration (WEB_CACHE_TTL secondes, 0 = désactivé)
+- les recherches les plus demandées sont comptées ; refresh() recalcule les facettes,
+  les compteurs et ces recherches populaires puis remplace le cache d'un seul coup :
+  après un crawl, les utilisateurs ne tombent jamais sur un cache froid
+- chaque sauvegarde publiée sur le bus d'événements programme un rafraîchissement en arrière-plan
+  (regroupé sur WEB_CACHE_REFRESH_DELAY secondes) : les entrées en place restent servies jusqu'à
+  ce que les nouvelles valeurs les remplacent, jamais de cache froid pendant un crawl
+"""
+
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from article_query import ArticleQuery
+from web_utils import format_article_page, format_article_result
+
+DEFAULT_TTL = float(os.getenv('WEB_CACHE_TTL', '60'))
+MAX_ENTRIES = 256
+# Recherches populaires recalculées à chaque rafraîchissement
+WARM_QUERIES = int(os.getenv('WEB_CACHE_WARM_QUERIES', '20'))
+# Sauvegardes regroupées dans un seul rafraîchissement (une page de liste en produit une par article)
+REFRESH_DELAY = float(os.getenv('WEB_CACHE_REFRESH_DELAY', '2'))
+
+
+class WebCache:
+    """Cache LRU à expiration, réchauffé après chaque crawl"""
+
+    def __init__(self, repository, asset_store=None, ttl: Optional[float] = None,
+                 max_entries: int = MAX_ENTRIES, warm_queries: int = WARM_QUERIES, event_bus=None,
+                 refresh_delay: float = REFRESH_DELAY):
+        self.repository = repository
+        self.asset_store = asset_store
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.max_entries = max_entries
+        self.warm_queries = warm_queries
+        self.entries: 'OrderedDict[Tuple, Tuple[float, object]]' = OrderedDict()
+        self.hits: Counter = Counter()
+        self.refresh_delay = refresh_delay
+        self._lock = threading.Lock()
+        self._refresh_pending = False
+        self._refresh_thread: Optional[threading.Thread] = None
+        if event_bus is not None:
+            event_bus.add_listener(self.on_saved)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    # ------------------------------------------------------------------
+    # Calcul des entrées
+    # ------------------------------------------------------------------
+    def _compute(self, key: Tuple):
+        kind = key[0]
+        if kind == 'interface':
+            return self.repository.get_data_for_interface()
+        if kind == 'stats':
+            return self.repository.get_stats()
+        if kind == 'subcategories':
+            return self.repository.get_subcategories_by_category(key[1])
+        if kind == 'search':
+            _, method_name, args = key
+            return [format_article_result(article, self.asset_store)
+                    for article in self.repository.iter_articles(method_name, *args)]
+        if kind == 'articles':
+            return format_article_page(self.repository.find_articles(key[1]), self.asset_store)
+        raise KeyError(kind)
+
+    def _lookup(self, key: Tuple):
+        """Valeur en cache encore fraîche, sinon None"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def _store(self, key: Tuple, value) -> None:
+        with self._lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get(self, key: Tuple):
+        if not self.enabled:
+            return self._compute(key)
+        value = self._lookup(key)
+        if value is None:
+            value = self._compute(key)
+            self._store(key, value)
+        return value
+
+    # ------------------------------------------------------------------
+    # Accès utilisés par les routes
+    # ------------------------------------------------------------------
+    def interface_data(self) -> Dict:
+        return self.get(('interface',))
+
+    def stats(self) -> Dict:
+        return self.get(('stats',))
+
+    def subcategories(self, category: str) -> List[str]:
+        return self.get(('subcategories', category))
+
+    def articles(self, query) -> Dict:
+        """Page formatée d'une recherche combinée (article_query.ArticleQuery, hachable), comptée pour le réchauffage"""
+        return self.get(self._hit(('articles', query)))
+
+    def _count(self, method_name: str, args: tuple) -> Tuple:
+        return self._hit(('search', method_name, tuple(args)))
+
+    def _hit(self, key: Tuple) -> Tuple:
+        with self._lock:
+            self.hits[key] += 1
+            # Compteurs bornés : seules les recherches fréquentes sont conservées
+            if len(self.hits) > 10 * self.max_entries:
+                self.hits = Counter(dict(self.hits.most_common(self.max_entries)))
+        return key
+
+    def search(self, method_name: str, args: tuple) -> List[Dict]:
+        """Résultats formatés d'une recherche (comptée pour le réchauffage)"""
+        return self.get(self._count(method_name, args))
+
+    def cached_search(self, method_name: str, args: tuple) -> Optional[List[Dict]]:
+        """Résultats déjà en cache, sans recalcul (None sinon) : le flux NDJSON lit alors le curseur"""
+        key = self._count(method_name, args)
+        return self._lookup(key) if self.enabled else None
+
+    # ------------------------------------------------------------------
+    # Nouvelles données
+    # ------------------------------------------------------------------
+    def on_saved(self, articles) -> None:
+        """Rappel du bus d'événements : les entrées sont gardées, un rafraîchissement est programmé"""
+        if articles and self.enabled:
+            self.schedule_refresh()
+
+    def schedule_refresh(self) -> None:
+        """
+        Rafraîchissement en arrière-plan après refresh_delay secondes ; un seul thread à la fois,
+        les sauvegardes arrivées pendant un calcul en déclenchent un seul autre
+        """
+        with self._lock:
+            self._refresh_pending = True
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, name='web-cache-refresh', daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_delay)
+            with self._lock:
+                if not self._refresh_pending:
+                    self._refresh_thread = None
+                    return
+                self._refresh_pending = False
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Erreur de rafraîchissement du cache web: {e}")
+
+    # ------------------------------------------------------------------
+    # Réchauffage
+    # ------------------------------------------------------------------
+    def warm_keys(self) -> List[Tuple]:
+        """Accueil, compteurs, sous-catégories et première page de chaque catégorie, puis recherches populaires"""
+        keys = [('interface',), ('stats',)]
+        try:
+            categories = self.repository.get_all_categories()
+        except Exception as e:
+            print(f"⚠️ Erreur catégories pour le réchauffage: {e}")
+            categories = []
+        for category in categories:
+            keys.append(('subcategories', category))
+            # Première page affichée par l'interface pour une recherche par catégorie
+            keys.append(('articles', ArticleQuery(category=category)))
+        with self._lock:
+            keys.extend(key for key, _ in self.hits.most_common(self.warm_queries))
+        return list(dict.fromkeys(keys))
+
+    def refresh(self) -> int:
+        """
+        Recalcule les entrées à réchauffer hors verrou, puis remplace le cache :
+        les anciennes valeurs restent servies pendant le calcul
+        """
+        if not self.enabled:
+            return 0
+        start = time.perf_counter()
+        fresh = OrderedDict()
+        for key in self.warm_keys():
+            try:
+                fresh[key] = (time.monotonic(), self._compute(key))
+            except Exception as e:
+                print(f"⚠️ Réchauffage impossible pour {key}: {e}")
+        with self._lock:
+            self.entries = fresh
+        print(f"♨️ Cache web réchauffé: {len(fresh)} entrées en {time.perf_counter() - start:.2f}s")
+        return len(fresh)
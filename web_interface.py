@@ -4,32 +4,93 @@
 Interface web unifiée pour la recherche d'articles
 """
 
-from flask import Flask, render_template, request, jsonify
-from mongodb_manager import MongoDBManager
+from flask import Flask, Response, abort, g, render_template, request, jsonify, send_file, stream_with_context
+from storage import get_storage_backend
+from local_search_index import open_local_index
+from image_assets import open_asset_store
+from events import SSE_HEADERS, SSE_MIMETYPE, event_bus, start_change_stream_thread
+from suggest import SUGGEST_TYPES, SuggestService
+from web_cache import WebCache
+from article_query import ArticleQuery
+from related import DEFAULT_TOP_K, MAX_TOP_K, RelatedService, related_index_enabled
+from profiling import stage, start_request_profile
+from web_utils import (ASSET_MAX_AGE, NDJSON_MIMETYPE, resolve_search, resolve_trends,
+                       format_article_result, ndjson_line, wants_stream)
 from datetime import datetime
 import re
+import threading
 
 app = Flask(__name__)
 
-# Initialiser MongoDB
+# Initialiser le stockage (STORAGE_BACKEND: mongo, sqlite ou local)
 try:
-    db_manager = MongoDBManager()
-    print("✅ Connexion MongoDB réussie")
+    db_manager = get_storage_backend()
+    print("✅ Connexion au stockage réussie")
 except Exception as e:
-    print(f"❌ Erreur MongoDB: {e}")
-    db_manager = None
+    print(f"❌ Erreur stockage: {e}")
+    # Repli sur l'index de recherche local construit depuis l'export JSON
+    db_manager = open_local_index()
+    if db_manager:
+        print("📚 Recherche servie par l'index local (sans MongoDB)")
+
+# Cache local des miniatures (IMAGE_ASSETS=true), sinon images distantes
+asset_store = open_asset_store()
+
+# Autocomplétion : index construit à la première frappe, mis à jour à chaque sauvegarde
+suggest_service = SuggestService(db_manager, event_bus) if db_manager else None
+
+# Articles similaires : index TF-IDF sur disque, ouvert au premier appel, mis à jour à chaque sauvegarde
+related_service = RelatedService(db_manager, event_bus) if db_manager and related_index_enabled() else None
+
+# Accueil, compteurs, facettes et recherches fréquentes (réchauffé après chaque crawl planifié)
+web_cache = WebCache(db_manager, asset_store, event_bus=event_bus) if db_manager else None
+
+# Écritures MongoDB d'autres processus relayées vers /events : lancé à la première requête, pas à l'import
+change_stream_thread = None
+_change_stream_lock = threading.Lock()
+
+@app.before_request
+def start_change_stream():
+    """Démarre une seule fois le relais du change stream (backend MongoDB uniquement)"""
+    global change_stream_thread
+    if change_stream_thread is not None or not db_manager:
+        return
+    with _change_stream_lock:
+        if change_stream_thread is None:
+            # None (SQLite, index local, SSE_CHANGE_STREAMS=false) : rien à relayer, ne plus réessayer
+            change_stream_thread = start_change_stream_thread(db_manager) or False
+
+@app.before_request
+def start_profile():
+    """Profilage d'une requête : WEB_PROFILING=true et en-tête X-Profile: [cprofile:]<WEB_PROFILING_TOKEN>"""
+    g.profiler = start_request_profile(request.headers.get('X-Profile'), request.path)
+
+@app.after_request
+def stop_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler:
+        # Réponses en flux : seul le début (avant le premier octet envoyé) est profilé
+        paths = profiler.stop()
+        if paths.get('summary'):
+            response.headers['X-Profile-Summary'] = paths['summary']
+    return response
+
+@app.teardown_request
+def abort_profile(exc):
+    # Exception non gérée : after_request n'est pas appelé, le profilage doit tout de même s'arrêter
+    profiler = g.pop('profiler', None)
+    if profiler:
+        profiler.stop()
 
 @app.route('/')
 def index():
     """Page d'accueil"""
     try:
         if db_manager:
-            # Récupérer toutes les données en une seule fois
-            data = db_manager.get_data_for_interface()
+            # Statistiques et catégories ; auteurs et sous-catégories via /api/suggest
+            data = web_cache.interface_data()
             stats = data['stats']
             categories = data['categories']
-            subcategories = data['subcategories']
-            authors = data['authors']
             
             print(f"📊 Interface: {stats.get('total_articles', 0)} articles, "
                   f"{stats.get('categories_count', 0)} catégories, "
@@ -38,13 +99,9 @@ def index():
         else:
             stats = {}
             categories = []
-            subcategories = []
-            authors = []
         
         return render_template('index.html', 
                              categories=categories,
-                             subcategories=subcategories,
-                             authors=authors,
                              stats=stats)
     except Exception as e:
         return f"Erreur: {e}"
@@ -56,65 +113,19 @@ def search():
         if not db_manager:
             return jsonify({'error': 'Base de données non disponible'})
         
-        search_type = request.form.get('search_type', '')
-        
-        articles = []
-        
-        if search_type == 'category':
-            category = request.form.get('category', '').strip()
-            subcategory = request.form.get('category_subcategory', '').strip()
-            
-            if category and subcategory:
-                # Recherche par catégorie ET sous-catégorie
-                articles = db_manager.get_articles_by_category_and_subcategory(category, subcategory)
-            elif category:
-                # Recherche par catégorie seulement
-                articles = db_manager.get_articles_by_category(category)
+        try:
+            search_call = resolve_search(request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)})
         
-        elif search_type == 'subcategory':
-            subcategory = request.form.get('subcategory', '').strip()
-            if subcategory:
-                articles = db_manager.get_articles_by_subcategory(subcategory)
+        if wants_stream(request):
+            return Response(stream_with_context(stream_search(search_call)), mimetype=NDJSON_MIMETYPE)
         
-        elif search_type == 'author':
-            author = request.form.get('author', '').strip()
-            if author:
-                articles = db_manager.get_articles_by_author(author)
-        
-        elif search_type == 'date':
-            start_date = request.form.get('start_date', '').strip()
-            end_date = request.form.get('end_date', '').strip()
-            if start_date and end_date:
-                articles = db_manager.get_articles_by_date_range(start_date, end_date)
-        
-        elif search_type == 'title':
-            title_search = request.form.get('title_search', '').strip()
-            if title_search:
-                articles = db_manager.search_in_title(title_search)
-        
-        else:
-            return jsonify({'error': 'Type de recherche invalide'})
-        
-        # Format des résultats
+        # Format des résultats, directement depuis le curseur (projection de liste)
         results = []
-        for article in articles:
-            # Conversion des ObjectId en string
-            for field in ['_id', 'created_at', 'updated_at', 'scraped_at']:
-                if field in article:
-                    article[field] = str(article[field])
-            
-            results.append({
-                'title': article.get('title', 'Sans titre'),
-                'subcategory': article.get('subcategory', 'N/A'),
-                'categories': article.get('categories', []),
-                'subcategories': article.get('subcategories', []),
-                'author': article.get('author', 'N/A'),
-                'date': article.get('date', 'N/A'),
-                'summary': article.get('summary', 'Pas de résumé'),
-                'url': article.get('url', '#'),
-                'thumbnail': article.get('thumbnail', ''),
-                'images_count': len(article.get('images', {}))
-            })
+        if search_call:
+            with stage('query'):
+                results = web_cache.search(*search_call)
         
         return jsonify({
             'success': True,
@@ -125,6 +136,54 @@ def search():
     except Exception as e:
         return jsonify({'error': str(e)})
 
+def stream_search(search_call):
+    """
+    Flux NDJSON : une ligne par article dès sa lecture sur le curseur,
+    puis une ligne finale {"done": true, "count": N}
+    """
+    count = 0
+    try:
+        if search_call:
+            method_name, args = search_call
+            cached = web_cache.cached_search(method_name, args)
+            if cached is not None:
+                for result in cached:
+                    count += 1
+                    yield ndjson_line(result)
+            else:
+                for article in db_manager.iter_articles(method_name, *args):
+                    count += 1
+                    yield ndjson_line(format_article_result(article, asset_store))
+        yield ndjson_line({'done': True, 'count': count})
+    except Exception as e:
+        yield ndjson_line({'error': str(e)})
+
+@app.route('/events')
+def events():
+    """
+    Flux Server-Sent Events : articles nouveaux ou mis à jour et compteurs à jour
+    (un thread par connexion ici ; web_interface_async pour de nombreux navigateurs inactifs)
+    """
+    subscription = event_bus.subscribe()
+
+    def stream():
+        try:
+            yield from subscription.frames()
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return Response(stream(), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+
+@app.route('/assets/<digest>.webp')
+def asset_thumbnail(digest):
+    """Miniature WebP en cache, adressée par son SHA-256 (cache navigateur d'un an)"""
+    path = asset_store.open_thumbnail(digest) if asset_store else None
+    if not path:
+        abort(404)
+    response = send_file(path, mimetype='image/webp', max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
 @app.route('/api/stats')
 def api_stats():
     """API statistiques"""
@@ -132,11 +191,111 @@ def api_stats():
         if not db_manager:
             return jsonify({'error': 'Base de données non disponible'})
         
-        stats = db_manager.get_stats()
+        stats = web_cache.stats()
         return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/api/suggest')
+def api_suggest():
+    """API d'autocomplétion (titres, auteurs, catégories, sous-catégories) par préfixe"""
+    try:
+        if not suggest_service:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+        
+        kind = request.args.get('type') or None
+        if kind and kind not in SUGGEST_TYPES:
+            return jsonify({
+                'success': False,
+                'error': 'Type de suggestion invalide'
+            })
+        limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+        
+        index = suggest_service.get()
+        return jsonify({
+            'success': True,
+            'suggestions': index.suggest(request.args.get('q', ''), kind, limit)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/articles')
+def api_articles():
+    """
+    API recherche combinée : category, subcategory, author, start, end (AAAA-MM-JJ), q (texte),
+    sort (recent, oldest, relevance), page, per_page
+    """
+    try:
+        if not db_manager:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+        
+        query = ArticleQuery.from_mapping(request.args)
+        with stage('query'):
+            page = web_cache.articles(query)
+        return jsonify({'success': True, 'count': len(page['articles']), **page})
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/trends')
+def api_trends():
+    """API tendances : articles par jour, semaine ou mois d'une catégorie, sous-catégorie ou d'un auteur"""
+    try:
+        if not db_manager:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+        
+        with stage('query'):
+            trends = db_manager.get_trends(**resolve_trends(request.args))
+        return jsonify({'success': True, **trends})
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+@app.route('/api/related/<article_id>')
+def api_related(article_id):
+    """API articles similaires : k plus proches voisins TF-IDF (id : champ 'id' des résultats)"""
+    try:
+        if not related_service:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+        
+        k = max(1, min(request.args.get('k', DEFAULT_TOP_K, type=int), MAX_TOP_K))
+        with stage('query'):
+            related = related_service.get().related(article_id, k)
+        return jsonify({
+            'success': True,
+            'id': article_id,
+            'related': related
+        })
+    except KeyError:
+        return jsonify({
+            'success': False,
+            'error': 'Article inconnu'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
 @app.route('/api/subcategories/<category>')
 def get_subcategories_for_category(category):
     """API pour récupérer les sous-catégories d'une catégorie"""
@@ -148,7 +307,7 @@ def get_subcategories_for_category(category):
             })
         
         print(f"🔍 API: Recherche sous-catégories pour: {category}")
-        subcategories = db_manager.get_subcategories_by_category(category)
+        subcategories = web_cache.subcategories(category)
         
         print(f"✅ API: Trouvé {len(subcategories)} sous-catégories pour {category}")
         
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Variante asynchrone de l'interface web (Quart + motor)
+Mêmes routes et mêmes réponses JSON que web_interface.py, sans bloquer
+un thread par requête pendant les accès MongoDB
+
+Lancement : hypercorn web_interface_async:app --bind 0.0.0.0:5000
+"""
+
+import asyncio
+import os
+
+from quart import Quart, Response, abort, render_template, request, jsonify, send_file
+
+from article_query import ArticleQuery
+from async_mongodb_manager import AsyncMongoDBManager, AsyncRepositoryAdapter
+from events import SSE_HEADERS, SSE_MIMETYPE, event_bus, watch_change_stream
+from image_assets import open_asset_store
+from related import DEFAULT_TOP_K, MAX_TOP_K, RelatedService, related_index_enabled
+from suggest import SUGGEST_TYPES, SuggestService
+from storage import get_storage_backend
+from web_utils import (ASSET_MAX_AGE, NDJSON_MIMETYPE, resolve_search, resolve_trends,
+                       format_article_page, format_article_result, ndjson_line, wants_stream)
+
+app = Quart(__name__)
+
+
+def create_backend():
+    """MongoDB via motor ; les autres backends passent par un adaptateur threadé"""
+    backend = os.getenv('STORAGE_BACKEND', 'mongo').lower()
+    try:
+        if backend == 'mongo':
+            return AsyncMongoDBManager()
+        return AsyncRepositoryAdapter(get_storage_backend(backend))
+    except Exception as e:
+        print(f"❌ Erreur stockage: {e}")
+        return None
+
+
+db_manager = create_backend()
+asset_store = open_asset_store()
+background_tasks = set()
+
+# Autocomplétion : index construit à la première frappe, mis à jour à chaque sauvegarde
+suggest_service = None
+if db_manager:
+    suggest_service = SuggestService(getattr(db_manager, 'repository', db_manager), event_bus)
+
+# Articles similaires : avec motor, l'index est construit hors du serveur (python related.py build)
+related_service = None
+if db_manager and related_index_enabled():
+    related_service = RelatedService(getattr(db_manager, 'repository', None), event_bus)
+
+
+@app.before_serving
+async def start_event_sources():
+    """Relais du change stream MongoDB vers /events pendant toute la durée du serveur"""
+    if db_manager:
+        background_tasks.add(asyncio.create_task(watch_change_stream(db_manager)))
+
+
+@app.after_serving
+async def stop_event_sources():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+
+
+@app.route('/')
+async def index():
+    """Page d'accueil"""
+    try:
+        if db_manager:
+            # Statistiques et catégories (en parallèle) ; auteurs et sous-catégories via /api/suggest
+            data = await db_manager.get_data_for_interface()
+            stats = data['stats']
+            categories = data['categories']
+        else:
+            stats = {}
+            categories = []
+
+        return await render_template('index.html',
+                                     categories=categories,
+                                     stats=stats)
+    except Exception as e:
+        return f"Erreur: {e}"
+
+
+@app.route('/search', methods=['POST'])
+async def search():
+    """Recherche unifiée"""
+    try:
+        if not db_manager:
+            return jsonify({'error': 'Base de données non disponible'})
+
+        form = await request.form
+        try:
+            search_call = resolve_search(form)
+        except ValueError as e:
+            return jsonify({'error': str(e)})
+
+        if wants_stream(request):
+            return Response(stream_search(search_call), mimetype=NDJSON_MIMETYPE)
+
+        # Format des résultats, directement depuis le curseur (projection de liste)
+        results = []
+        if search_call:
+            method_name, args = search_call
+            results = [format_article_result(article, asset_store)
+                       async for article in db_manager.iter_articles(method_name, *args)]
+
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'articles': results
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+
+async def stream_search(search_call):
+    """Flux NDJSON : une ligne par article, puis {"done": true, "count": N}"""
+    count = 0
+    try:
+        if search_call:
+            method_name, args = search_call
+            async for article in db_manager.iter_articles(method_name, *args):
+                count += 1
+                yield ndjson_line(format_article_result(article, asset_store))
+        yield ndjson_line({'done': True, 'count': count})
+    except Exception as e:
+        yield ndjson_line({'error': str(e)})
+
+
+@app.route('/events')
+async def events():
+    """Flux Server-Sent Events : une connexion inactive ne coûte qu'une file asyncio"""
+    subscription = event_bus.subscribe(asynchronous=True)
+
+    async def stream():
+        try:
+            async for frame in subscription.frames():
+                yield frame
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    response = Response(stream(), mimetype=SSE_MIMETYPE, headers=SSE_HEADERS)
+    response.timeout = None  # connexion longue : pas de RESPONSE_TIMEOUT
+    return response
+
+
+@app.route('/assets/<digest>.webp')
+async def asset_thumbnail(digest):
+    """Miniature WebP en cache, adressée par son SHA-256 (cache navigateur d'un an)"""
+    path = asset_store.open_thumbnail(digest) if asset_store else None
+    if not path:
+        abort(404)
+    response = await send_file(path, mimetype='image/webp')
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
+
+@app.route('/api/stats')
+async def api_stats():
+    """API statistiques"""
+    try:
+        if not db_manager:
+            return jsonify({'error': 'Base de données non disponible'})
+
+        return jsonify(await db_manager.get_stats())
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+
+@app.route('/api/suggest')
+async def api_suggest():
+    """API d'autocomplétion (titres, auteurs, catégories, sous-catégories) par préfixe"""
+    try:
+        if not suggest_service:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+
+        kind = request.args.get('type') or None
+        if kind and kind not in SUGGEST_TYPES:
+            return jsonify({
+                'success': False,
+                'error': 'Type de suggestion invalide'
+            })
+        limit = max(1, min(request.args.get('limit', 8, type=int), 20))
+
+        index = await suggest_service.aget()
+        return jsonify({
+            'success': True,
+            'suggestions': index.suggest(request.args.get('q', ''), kind, limit)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@app.route('/api/articles')
+async def api_articles():
+    """API recherche combinée (mêmes paramètres que web_interface.py)"""
+    try:
+        if not db_manager:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+
+        query = ArticleQuery.from_mapping(request.args)
+        page = format_article_page(await db_manager.find_articles(query), asset_store)
+        return jsonify({'success': True, 'count': len(page['articles']), **page})
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@app.route('/api/trends')
+async def api_trends():
+    """API tendances : articles par jour, semaine ou mois d'une catégorie, sous-catégorie ou d'un auteur"""
+    try:
+        if not db_manager:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+
+        trends = await db_manager.get_trends(**resolve_trends(request.args))
+        return jsonify({'success': True, **trends})
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@app.route('/api/related/<article_id>')
+async def api_related(article_id):
+    """API articles similaires : k plus proches voisins TF-IDF (id : champ 'id' des résultats)"""
+    try:
+        if not related_service:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+
+        k = max(1, min(request.args.get('k', DEFAULT_TOP_K, type=int), MAX_TOP_K))
+        index = await related_service.aget()
+        related = await asyncio.to_thread(index.related, article_id, k)
+        return jsonify({
+            'success': True,
+            'id': article_id,
+            'related': related
+        })
+    except KeyError:
+        return jsonify({
+            'success': False,
+            'error': 'Article inconnu'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
+@app.route('/api/subcategories/<category>')
+async def get_subcategories_for_category(category):
+    """API pour récupérer les sous-catégories d'une catégorie"""
+    try:
+        if not db_manager:
+            return jsonify({
+                'success': False,
+                'error': 'Base de données non disponible'
+            })
+
+        subcategories = await db_manager.get_subcategories_by_category(category)
+
+        return jsonify({
+            'success': True,
+            'category': category,
+            'subcategories': subcategories,
+            'count': len(subcategories)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        })
+
+
+if __name__ == '__main__':
+    print("🌐 Interface web asynchrone disponible sur: http://localhost:5000")
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fonctions partagées par les interfaces web (Flask synchrone et variante asynchrone)
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+
+from models import article_key
+
+try:
+    import orjson  # requirements.txt : encodeur rapide des flux NDJSON et SSE
+except ImportError:  # installation partielle : sérialisation standard, signalée une fois
+    orjson = None
+    print("⚠️ orjson absent : flux NDJSON encodés avec json (pip install -r requirements.txt)")
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Miniatures adressées par contenu : une URL ne change jamais de contenu
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+SEARCH_TYPES = ('category', 'subcategory', 'author', 'date', 'title')
+
+
+def resolve_search(form) -> Optional[Tuple[str, tuple]]:
+    """
+    Traduit les champs du formulaire de recherche en appel du backend
+    Retourne (nom_de_méthode, arguments), None si les champs sont vides,
+    et lève ValueError si le type de recherche est invalide
+    """
+    search_type = form.get('search_type', '')
+    if search_type not in SEARCH_TYPES:
+        raise ValueError('Type de recherche invalide')
+
+    if search_type == 'category':
+        category = form.get('category', '').strip()
+        subcategory = form.get('category_subcategory', '').strip()
+        if category and subcategory:
+            # Recherche par catégorie ET sous-catégorie
+            return 'get_articles_by_category_and_subcategory', (category, subcategory)
+        if category:
+            # Recherche par catégorie seulement
+            return 'get_articles_by_category', (category,)
+
+    elif search_type == 'subcategory':
+        subcategory = form.get('subcategory', '').strip()
+        if subcategory:
+            return 'get_articles_by_subcategory', (subcategory,)
+
+    elif search_type == 'author':
+        author = form.get('author', '').strip()
+        if author:
+            return 'get_articles_by_author', (author,)
+
+    elif search_type == 'date':
+        start_date = form.get('start_date', '').strip()
+        end_date = form.get('end_date', '').strip()
+        if start_date and end_date:
+            return 'get_articles_by_date_range', (start_date, end_date)
+
+    elif search_type == 'title':
+        title_search = form.get('title_search', '').strip()
+        if title_search:
+            return 'search_in_title', (title_search,)
+
+    return None
+
+
+def resolve_trends(args) -> Dict:
+    """
+    Paramètres de /api/trends (facet, value, start, end, days, bucket, limit) pour get_trends
+    Facette et fenêtre sont validées par le backend (ValueError)
+    """
+    days = args.get('days', '').strip()
+    if days and not days.isdigit():
+        raise ValueError('Paramètre days invalide')
+    limit = args.get('limit', '').strip()
+    return {
+        'facet': args.get('facet', 'all').strip() or 'all',
+        'value': args.get('value', '').strip() or None,
+        'start': args.get('start', '').strip() or None,
+        'end': args.get('end', '').strip() or None,
+        'days': int(days) if days else None,
+        'bucket': args.get('bucket', 'day').strip() or 'day',
+        'limit': max(1, min(int(limit), 20)) if limit.isdigit() else 5
+    }
+
+
+def format_article_result(article: Dict, asset_store=None) -> Dict:
+    """
+    Résumé JSON d'un article pour la liste de résultats
+    Avec un cache d'images (image_assets), la miniature pointe vers la route locale si elle y est
+    """
+    thumbnail = article.get('thumbnail', '')
+    if asset_store is not None:
+        thumbnail = asset_store.local_thumbnail_url(thumbnail) or thumbnail
+    return {
+        'id': article_key(article['url']) if article.get('url') else None,
+        'title': article.get('title', 'Sans titre'),
+        'subcategory': article.get('subcategory', 'N/A'),
+        'categories': article.get('categories', []),
+        'subcategories': article.get('subcategories', []),
+        'author': article.get('author', 'N/A'),
+        'date': article.get('date', 'N/A'),
+        'summary': article.get('summary', 'Pas de résumé'),
+        'url': article.get('url', '#'),
+        'thumbnail': thumbnail,
+        'images_count': article.get('images_count', len(article.get('images') or {}))
+    }
+
+
+def format_article_page(page: Dict, asset_store=None) -> Dict:
+    """Page d'une recherche combinée (find_articles) avec les articles au format de la liste de résultats"""
+    return dict(page, articles=[format_article_result(article, asset_store) for article in page['articles']])
+
+
+def wants_stream(request) -> bool:
+    """Le client demande une réponse en flux NDJSON (en-tête Accept ou champ format)"""
+    return (NDJSON_MIMETYPE in request.headers.get('Accept', '')
+            or request.args.get('format') == 'ndjson')
+
+
+def ndjson_line(payload: Dict) -> bytes:
+    """Une ligne NDJSON (orjson si disponible)"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str) + b'\n'
+    return (json.dumps(payload, ensure_ascii=False, default=str) + '\n').encode('utf-8')